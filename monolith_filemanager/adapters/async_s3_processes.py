@@ -0,0 +1,110 @@
+from typing import Any, List, Optional, Tuple, Union
+
+from monolith_filemanager.adapters.s3_processes import S3ProcessesAdapter
+from monolith_filemanager.file.base import FilePath
+from monolith_filemanager.s3storage.async_engine import AsyncV1Engine
+
+
+class AsyncS3ProcessesAdapter:
+    """
+    This is a class for managing the interface of s3 file commands from asyncio code. Every command is awaitable and
+    runs the blocking S3ProcessesAdapter command on a thread of the AsyncV1Engine, so hundreds of commands can be
+    awaited at once on a single event loop without blocking it. Only max_concurrency commands run at a time, each
+    on its own thread, the others wait for a free slot.
+
+    Attributes:
+        path (FilePath): path to the file or folder concerned
+    """
+    def __init__(self, file_path: Union[FilePath, str], caching: Optional[Any] = None) -> None:
+        """
+        The constructor for the AsyncS3ProcessesAdapter class.
+
+        :param file_path: (Union[FilePath, str]) path to the file concerned
+        :param caching: (Optional[Any]) the CacheManager object to be used which is to be initialized before being passed through
+        """
+        self._adapter: S3ProcessesAdapter = S3ProcessesAdapter(file_path=FilePath(file_path), caching=caching)
+        self._engine: AsyncV1Engine = AsyncV1Engine()
+
+    @property
+    def path(self) -> FilePath:
+        return self._adapter.path
+
+    async def read_raw_file(self) -> Any:
+        """
+        Gets the raw data from the file.
+
+        :return: (Any) raw data from the file
+        """
+        return await self._engine.run(self._adapter.read_raw_file)
+
+    async def write_raw_file(self, data: Any) -> None:
+        """
+        Writes raw data to the file.
+
+        :param data: (Any) data to be written
+        :return: None
+        """
+        await self._engine.run(self._adapter.write_raw_file, data=data)
+
+    async def exists(self, path: Optional[FilePath] = None) -> bool:
+        """
+        Checks to see if the path exists.
+
+        :param path: (Optional[FilePath]) path to be checked, self.path if None
+        :return: (bool) True if path exists, False if not
+        """
+        return await self._engine.run(self._adapter.exists, path=path)
+
+    async def ls(self, path: Optional[FilePath] = None) -> Tuple[dict, List[str]]:
+        """
+        Lists all the sub directories and sub files belonging to the path.
+
+        :param path: (Optional[FilePath]) path to be inspected, self.path if None
+        :return: (Tuple[dict, List[str]]) sub directories and sub files
+        """
+        return await self._engine.run(self._adapter.ls, path=path)
+
+    async def delete_file(self, path: Optional[FilePath] = None) -> None:
+        """
+        Deletes the file.
+
+        :param path: (Optional[FilePath]) path to the file, self.path if None
+        :return: None
+        """
+        await self._engine.run(self._adapter.delete_file, path=path)
+
+    async def delete_folder(self, path: Optional[FilePath] = None) -> None:
+        """
+        Deletes the folder and everything in it.
+
+        :param path: (Optional[FilePath]) path to the folder, self.path if None
+        :return: None
+        """
+        await self._engine.run(self._adapter.delete_folder, path=path)
+
+    async def copy_file(self, new_path: FilePath) -> None:
+        """
+        Copies self.path file to a new file path.
+
+        :param new_path: (FilePath) destination path for file to be copied to
+        :return: None
+        """
+        await self._engine.run(self._adapter.copy_file, new_path=new_path)
+
+    async def copy_folder(self, new_folder: str) -> List[str]:
+        """
+        Copies self.path folder to another folder.
+
+        :param new_folder: (str) the directory to where the folder will be copied to
+        :return: (List[str]) keys of the objects in the folder that was copied
+        """
+        return await self._engine.run(self._adapter.copy_folder, new_folder=new_folder)
+
+    async def search(self, file_pattern: str) -> List[str]:
+        """
+        Gets paths for all files matching a glob pattern.
+
+        :param file_pattern: (str) glob pattern of the file being searched for
+        :return: (List[str]) paths to the found files
+        """
+        return await self._engine.run(self._adapter.search, file_pattern=file_pattern)
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Any, Tuple, List, Union, Optional
+from typing import Any, Dict, Iterator, Tuple, List, Union, Optional
 
+from monolith_filemanager.components.dir_entry import DirEntry
 from monolith_filemanager.file import FileMap
 from monolith_filemanager.path import FilePath
 
@@ -58,11 +59,22 @@ class Base(ABC):
         pass
 
     @abstractmethod
-    def write_file(self, data) -> None:
+    def open(self, mode: str = "rb", **kwargs) -> Any:
+        """
+        Placeholder for opening the file as a file object.
+
+        :param mode: (str) the mode the file is opened in
+        :return: file object
+        """
+        pass
+
+    @abstractmethod
+    def write_file(self, data, compression_level: Optional[int] = None) -> None:
         """
         Placeholder for writing data to a file.
 
         :param data: data that has to be written to a file
+        :param compression_level: (Optional[int]) level compressed files are written at
         :return: None
         """
         pass
@@ -97,6 +109,14 @@ class Base(ABC):
     def exists(self) -> bool:
         pass
 
+    @abstractmethod
+    def exists_many(self, paths: List[str]) -> Dict[str, bool]:
+        pass
+
+    @abstractmethod
+    def stat_many(self, paths: List[str]) -> Dict[str, Optional[dict]]:
+        pass
+
     @abstractmethod
     def ls(self) -> Tuple[List[str], List[str]]:
         """
@@ -106,6 +126,15 @@ class Base(ABC):
         """
         pass
 
+    @abstractmethod
+    def iterdir(self, path: Optional[FilePath] = None) -> Iterator[DirEntry]:
+        pass
+
+    @abstractmethod
+    def list_page(self, page_size: int = 1000, cursor: Optional[str] = None,
+                  path: Optional[FilePath] = None) -> Tuple[List[DirEntry], Optional[str]]:
+        pass
+
     @abstractmethod
     def copy_folder(self, new_folder: str) -> None:
         pass
@@ -1,14 +1,23 @@
-from typing import Any, Union, Tuple, List, Optional
+from typing import Any, Dict, Iterator, Union, Tuple, List, Optional
+import base64
+import bisect
 import shutil
+import uuid
 from distutils.dir_util import copy_tree
 import os
 import glob
 from datetime import datetime
+from stat import S_ISDIR
 
 from monolith_filemanager.adapters.base import Base
+from monolith_filemanager.components.dir_entry import DirEntry
+from monolith_filemanager.components.lru_cache import LRUCache
+from monolith_filemanager.components.name_increment import candidate_names
+from monolith_filemanager.components.object_cache import ObjectCache
 from monolith_filemanager.path import FilePath
 from monolith_filemanager.errors import FileManagerError
 from monolith_filemanager.file.base import File
+from monolith_filemanager.file.compressed_file import CompressedFile
 from .errors import LocalProcessesAdapterError
 
 
@@ -19,6 +28,8 @@ class LocalFileProcessesAdapter(Base):
     Attributes:
         python_path (str): the path of the PYTHONPATH env variable
     """
+    LISTINGS = LRUCache(max_entries=32, ttl=300.0)
+
     def __init__(self, file_path: Union[str, FilePath]) -> None:
         """
         The constructor for the LocalFileProcessesAdapter class.
@@ -41,14 +52,20 @@ class LocalFileProcessesAdapter(Base):
         elif path.file_exists is False:
             raise FileManagerError(message="file {} does not exist".format(path.file))
 
-    def local_file_object(self) -> File:
+    def local_file_object(self, compression_level: Optional[int] = None) -> File:
         """
-        Gets the reading and writing protocols based on the file type from the path.
+        Gets the reading and writing protocols based on the file type from the path. Compressed files get the
+        protocols of the file type inside the compression wrapped in a CompressedFile.
 
+        :param compression_level: (Optional[int]) level compressed files, and file types that compress their own
+                                  data, are written at
         :return: (File) containing read and write protocols for the type of file
         """
-        file_object = self.file_types.get_file(file_path=self.path)
-        return file_object(path=self.path)
+        file_object = self.file_types.get_file(file_path=self.path)(path=self.path)
+        if self.path.compression is not None:
+            return CompressedFile(file=file_object, compression_level=compression_level)
+        file_object.compression_level = compression_level
+        return file_object
 
     def export_file(self):
         """
@@ -68,12 +85,18 @@ class LocalFileProcessesAdapter(Base):
 
     def read_file(self, **kwargs) -> Any:
         """
-        Reads file.
+        Reads file. When the ObjectCache is enabled the object is only read again if the modification time or
+        size of the file has changed.
 
         :return: (Any) loaded data from the file
         """
         self.check_local_file(path=self.path)
-        return self.local_file_object().read(**kwargs)
+        cache = ObjectCache()
+        if not cache.enabled:
+            return self.local_file_object().read(**kwargs)
+        stat = os.stat(self.path)
+        return cache.get_or_read(path=str(self.path), validator=(stat.st_mtime_ns, stat.st_size), kwargs=kwargs,
+                                 read=lambda: self.local_file_object().read(**kwargs))
 
     def read_raw_file(self):
         """
@@ -85,6 +108,20 @@ class LocalFileProcessesAdapter(Base):
         with open(self.path, "rb") as f:
             return f.read()
 
+    def open(self, mode: str = "rb", **kwargs) -> Any:
+        """
+        Opens the file as a file object.
+
+        :param mode: (str) the mode the file is opened in
+        :param kwargs: passed to the builtin open function
+        :return: the file object
+        """
+        if "r" in mode:
+            self.check_local_file(path=self.path)
+        else:
+            self._create_directory_if_not_exists()
+        return open(self.path, mode, **kwargs)
+
     def custom_read_file(self, custom_read_function: Any) -> Any:
         """
         Takes a custom reading function and runs it in order to read a file based on the self.path.
@@ -95,15 +132,18 @@ class LocalFileProcessesAdapter(Base):
         self.check_local_file(path=self.path)
         return custom_read_function(self.path)
 
-    def write_file(self, data):
+    def write_file(self, data, compression_level: Optional[int] = None):
         """
         Writes data to file.
 
         :param data: data to be written to file
+        :param compression_level: (Optional[int]) level compressed files such as data.csv.gz, and npz archives, are
+                                  written at, the default level of the codec (stored members for npz) if None
         :return: None
         """
         self._create_directory_if_not_exists()
-        self.local_file_object().write(data=data)
+        self.local_file_object(compression_level=compression_level).write(data=data)
+        ObjectCache().invalidate_path(path=str(self.path))
 
     def write_raw_file(self, data):
         """
@@ -147,18 +187,26 @@ class LocalFileProcessesAdapter(Base):
     def write_stream(self, stream) -> str:
         """
         Write stream of bytes. First checks whether file name shares name of existing folder in same directory level.
-        If file with same name exists already, file name is incremented before writing.
+        If file with same name exists already, file name is incremented before writing, and the empty file claiming
+        the incremented name is removed if the write fails.
         :param stream: stream of data
         :return: (str) Name file saved as
         :raises: (LocalProcessesAdapterError) if new file name taken by existing folder
         """
+        incremented = False
         if os.path.isdir(self.path):
             raise LocalProcessesAdapterError("New file name already taken by folder in this folder")
         elif os.path.isfile(path=self.path):
             self.increment_files()
+            incremented = True
 
         self._create_directory_if_not_exists()
-        stream.save(self.path)
+        try:
+            stream.save(self.path)
+        except Exception:
+            if incremented and os.path.isfile(self.path):
+                os.remove(self.path)
+            raise
         file_name = self.path.split("/")[-1]
         return file_name
 
@@ -166,16 +214,18 @@ class LocalFileProcessesAdapter(Base):
         """
         Increments file name integer suffix based on how many files with same filename prefix exist.
         Fills in gaps in contiguous numeric sequence first. Assigns final name to self.path.
+        The suffixes in use are read from one listing of the parent directory and the new name is claimed by
+        creating the file exclusively so concurrent writers get different names.
         :return: None
         """
-        count = 2
         prefix = "/".join(self.path.split("/")[:-1])
-        ext = os.path.splitext(self.path)[-1]
-        file = ".".join(self.path.split("/")[-1].split(".")[:-1])
-        new_file = prefix + "/" + file + f" {count}{ext}"
-        while os.path.exists(new_file):
-            count += 1
-            new_file = prefix + "/" + file + f" {count}{ext}"
+        for name in candidate_names(name=self.path.split("/")[-1], existing_names=os.listdir(prefix or ".")):
+            new_file = prefix + "/" + name if prefix else name
+            try:
+                os.close(os.open(new_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                break
+            except FileExistsError:
+                continue
         self.path = new_file
 
     def _create_directory_if_not_exists(self) -> None:
@@ -208,18 +258,19 @@ class LocalFileProcessesAdapter(Base):
     def increment_folders(dirname: FilePath) -> str:
         """
         Increment folder name suffix if name prefix already exists within parent directory.
+        The suffixes in use are read from one listing of the parent directory and the new folder is created with
+        os.mkdir so concurrent callers get different names.
         :param dirname: (FilePath) folder/directory name to increment
         :return: (str) new folder name
         """
-        count = 2
         prefix = "/".join(dirname.split("/")[:-1])
         folder = dirname.split("/")[-1]
-        new_folder = prefix + "/" + folder + f" {count}"
-        while os.path.exists(new_folder):
-            count += 1
-            new_folder = prefix + "/" + folder + f" {count}"
-        os.makedirs(new_folder)
-        return new_folder.split("/")[-1]
+        for name in candidate_names(name=folder, existing_names=os.listdir(prefix or "."), folder=True):
+            try:
+                os.mkdir(prefix + "/" + name if prefix else name)
+                return name
+            except FileExistsError:
+                continue
 
     def exists(self, path: Optional[FilePath] = None) -> bool:
         """
@@ -232,6 +283,33 @@ class LocalFileProcessesAdapter(Base):
             path = self.path
         return os.path.exists(path)
 
+    def exists_many(self, paths: List[str]) -> Dict[str, bool]:
+        """
+        Checks to see if many paths exist.
+
+        :param paths: (List[str]) paths to be checked
+        :return: (Dict[str, bool]) True for each path that exists, False if not
+        """
+        return {path: os.path.exists(path) for path in paths}
+
+    def stat_many(self, paths: List[str]) -> Dict[str, Optional[dict]]:
+        """
+        Gets the last modified date and size of many paths.
+
+        :param paths: (List[str]) paths to be checked
+        :return: (Dict[str, Optional[dict]]) last_modified and size of each path, None for missing paths
+        """
+        stats: Dict[str, Optional[dict]] = {}
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                stats[path] = None
+                continue
+            stats[path] = {"last_modified": datetime.utcfromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S"),
+                           "size": stat.st_size}
+        return stats
+
     def ls(self) -> Tuple[dict, List[str]]:
         """
         Lists the directories and files in a path.
@@ -247,6 +325,83 @@ class LocalFileProcessesAdapter(Base):
             file_dict[file] = {"last_modified": last_mod, "size": size}
         return file_dict, dirs
 
+    def iterdir(self, path: Optional[FilePath] = None) -> Iterator[DirEntry]:
+        """
+        Yields the directories and files in a path as they are scanned, in no particular order.
+
+        :param path: (Optional[FilePath]) directory path if different from self.path
+        :return: (Iterator[DirEntry]) the entries of the directory
+        """
+        with os.scandir(os.path.expanduser(path if path else self.path)) as entries:
+            for entry in entries:
+                yield self._dir_entry(entry)
+
+    def list_page(self, page_size: int = 1000, cursor: Optional[str] = None,
+                  path: Optional[FilePath] = None) -> Tuple[List[DirEntry], Optional[str]]:
+        """
+        Lists one page of the directories and files in a path, ordered by name. The first page scans and sorts the
+        names of the directory once and keeps them in LISTINGS under a token carried by the cursors, so the next
+        pages are sliced from that listing. Only the entries of the page are stat-ed, entries deleted since the
+        listing are skipped and entries added since are not listed. If the listing has been evicted the directory
+        is scanned again from the name in the cursor.
+
+        :param page_size: (int) maximum number of entries in the page
+        :param cursor: (Optional[str]) opaque cursor returned with the previous page, the first page if None
+        :param path: (Optional[FilePath]) directory path if different from self.path
+        :return: (Tuple[List[DirEntry], Optional[str]]) entries of the page and the cursor of the next page, None
+                 if this is the last page
+        """
+        directory = os.path.expanduser(path if path else self.path)
+        token, after = None, None
+        if cursor:
+            token, after = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("/", 1)
+        names = self.LISTINGS.get((directory, token)) if token is not None else LRUCache.MISSING
+        if names is LRUCache.MISSING:
+            with os.scandir(directory) as entries:
+                names = sorted(entry.name for entry in entries)
+            token = uuid.uuid4().hex
+            self.LISTINGS.put((directory, token), names)
+        start = bisect.bisect_right(names, after) if after is not None else 0
+        page_names = names[start:start + page_size]
+        next_cursor = None
+        if start + page_size < len(names):
+            next_cursor = base64.urlsafe_b64encode("{}/{}".format(token, page_names[-1]).encode("utf-8")).decode(
+                "ascii")
+        page = [self._path_entry(directory=directory, name=name) for name in page_names]
+        return [entry for entry in page if entry is not None], next_cursor
+
+    @staticmethod
+    def _path_entry(directory: str, name: str) -> Optional[DirEntry]:
+        """
+        Packages a directory or file in a directory as a DirEntry, files are stat-ed (private).
+
+        :param directory: (str) path to the directory
+        :param name: (str) name of the directory or file
+        :return: (Optional[DirEntry]) the entry, None if it no longer exists
+        """
+        try:
+            stat = os.stat(os.path.join(directory, name))
+        except FileNotFoundError:
+            return None
+        if S_ISDIR(stat.st_mode):
+            return DirEntry(name=name, is_dir=True)
+        return DirEntry(name=name, is_dir=False, size=stat.st_size,
+                        last_modified=datetime.utcfromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S"))
+
+    @staticmethod
+    def _dir_entry(entry: os.DirEntry) -> DirEntry:
+        """
+        Packages an entry of os.scandir as a DirEntry, files are stat-ed (private).
+
+        :param entry: (os.DirEntry) the scanned entry
+        :return: (DirEntry) the entry
+        """
+        if entry.is_dir():
+            return DirEntry(name=entry.name, is_dir=True)
+        stat = entry.stat()
+        return DirEntry(name=entry.name, is_dir=False, size=stat.st_size,
+                        last_modified=datetime.utcfromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S"))
+
     @staticmethod
     def _get_file_info(file: str) -> Tuple[str, int]:
         """
@@ -1,13 +1,21 @@
+import os
 import posixpath
-from typing import Any, Union, Tuple, List, Optional
-from urllib.parse import unquote
+import tempfile
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Union, Tuple, List, Optional
+from urllib.parse import quote, unquote
 
 import globre
 
 from monolith_filemanager.adapters.base import Base
 from monolith_filemanager.adapters.errors import S3ProcessesAdapterError
+from monolith_filemanager.components.dir_entry import DirEntry
+from monolith_filemanager.components.name_increment import candidate_names
+from monolith_filemanager.components.object_cache import ObjectCache
 from monolith_filemanager.file.base import File, FilePath
+from monolith_filemanager.file.compressed_file import CompressedFile
 from monolith_filemanager.s3storage import V1Engine
+from monolith_filemanager.s3storage.copy_journal import CopyJournal
 
 
 class S3ProcessesAdapter(Base):
@@ -29,18 +37,28 @@ class S3ProcessesAdapter(Base):
         self._s3: bool = True
         self._strip_path_slash()
 
-    def local_file_object(self) -> File:
+    def local_file_object(self, compression_level: Optional[int] = None) -> File:
         """
-        Gets the reading and writing protocols based on the file type from the path.
+        Gets the reading and writing protocols based on the file type from the path. Compressed files get the
+        protocols of the file type inside the compression wrapped in a CompressedFile.
 
+        :param compression_level: (Optional[int]) level compressed files, and file types that compress their own
+                                  data, are written at
         :return: Object containing read and write protocols for the type of file
         """
-        file_object = self.file_types.get_file(file_path=self.path)
-        return file_object(path=self.path)
+        file_object = self.file_types.get_file(file_path=self.path)(path=self.path)
+        if self.path.compression is not None:
+            return CompressedFile(file=file_object, compression_level=compression_level)
+        file_object.compression_level = compression_level
+        return file_object
 
     def read_file(self, **kwargs) -> Any:
         """
-        Reads file from s3 storage.
+        Reads file from s3 storage. When the ObjectCache is enabled the object is only read again if the ETag of the
+        file has changed. Passing chunksize to file types that read from file objects streams the object and returns
+        an iterator of its parts. Passing mmap_mode to npy files returns a LazyArray that downloads only the rows it
+        is indexed with, npz files return an NpzArchive that downloads only the arrays accessed and hdf5 files are
+        opened without downloading them first.
 
         :return: data from file
         """
@@ -56,26 +74,66 @@ class S3ProcessesAdapter(Base):
             raw_data = self._engine.download_raw_data_file(storage_path=self.path.to_string())
             return pickle_factory.load(file=raw_data, memory=True)
 
+        elif kwargs.get("chunksize") is not None and self.local_file_object().supports_buffer_read():
+            return self._read_chunks(**kwargs)
+
+        elif self.path.file_type == "npy" and self.path.compression is None and kwargs.get("mmap_mode") is not None:
+            # only the header and the rows the array is indexed with are downloaded
+            return self.local_file_object().read_lazy(buffer=self.open(mode="rb"), mmap_mode=kwargs["mmap_mode"])
+
+        elif self.path.file_type == "npz" and self.path.compression is None:
+            # members are found through the central directory and downloaded when they are accessed
+            return self.local_file_object().read_lazy(buffer=self.open(mode="rb"))
+
+        elif self.path.file_type in ("h5", "hdf5", "hdf") and self.path.compression is None:
+            # the file is opened on the ranged reader so only the metadata and chunks sliced are downloaded
+            return self.local_file_object().read_lazy(buffer=self.open(mode="rb"), **kwargs)
+
         elif self.path.file_type == "parquet":
-            # read_parquet can support s3 paths
-            return self.local_file_object().read()
+            # only the footer and the column chunks selected by columns, filters and row_groups are downloaded
+            with self.open(mode="rb") as buffer:
+                return self.local_file_object().read_from_buffer(buffer=buffer, **kwargs)
 
         else:
-            if self._cache is None:
-                self.raise_missing_cache_error(usage=f'read file \'{self.path}\'')
-            self._cache.create_cache()
-            stored_file_path = self._engine.download_data_file(storage_path=self.path.to_string(),
-                                                               file_path=self._cache.cache_path)
-            self.path = FilePath(stored_file_path)
-            return self.local_file_object().read(**kwargs)
+            storage_path = self.path.to_string()
+            with self._download(storage_path=storage_path) as local_path:
+                self.path = FilePath(local_path)
+                cache = ObjectCache()
+                if not cache.enabled:
+                    return self.local_file_object().read(**kwargs)
+                return cache.get_or_read(path=storage_path,
+                                         validator=self._engine.cached_etag(storage_path=storage_path),
+                                         kwargs=kwargs, read=lambda: self.local_file_object().read(**kwargs))
+
+    def _read_chunks(self, **kwargs) -> Iterator[Any]:
+        """
+        Reads a file part by part straight from the s3 stream without staging it on disk (private). The object stays
+        open until the iterator is exhausted or closed.
 
-    def read_raw_file(self) -> Any:
+        :return: (Iterator[Any]) the parts of the file, for example data frames of chunksize rows
+        """
+        with self.open(mode="rb") as buffer:
+            yield from self.local_file_object().read_from_buffer(buffer=buffer, **kwargs)
+
+    def read_raw_file(self, parallel: bool = False) -> Any:
         """
         Reads raw file from s3 storage.
 
+        :param parallel: (bool) if True, downloads with concurrent ranged requests returning a memoryview
         :return: (bytes) data from file
         """
-        return self._engine.download_raw_data_file(storage_path=self.path.to_string())
+        return self._engine.download_raw_data_file(storage_path=self.path.to_string(), parallel=parallel)
+
+    def open(self, mode: str = "rb", **kwargs) -> Any:
+        """
+        Opens the s3 object as a file object. "rb" gives a seekable read-only object that downloads the byte ranges
+        that are read, "wb" gives a writer that streams parts to s3 as they fill.
+
+        :param mode: (str) the mode the file is opened in, "rb" or "wb"
+        :param kwargs: passed to the S3ReadFile or S3WriteFile constructor
+        :return: (Union[S3ReadFile, S3WriteFile]) the file object
+        """
+        return self._engine.open(storage_path=self.path.to_string(), mode=mode, **kwargs)
 
     def custom_read_file(self, custom_read_function: Any) -> Any:
         """
@@ -84,13 +142,29 @@ class S3ProcessesAdapter(Base):
         :param custom_read_function:
         :return:
         """
-        if self._cache is None:
-            self.raise_missing_cache_error(usage=f'custom read file \'{self.path}\'')
-        self._cache.create_cache()
-        stored_file_path = self._engine.download_data_file(storage_path=self.path,
-                                                           file_path=self._cache.cache_path)
-        self.path = stored_file_path
-        return custom_read_function(self.path)
+        with self._download(storage_path=self.path) as local_path:
+            self.path = local_path
+            return custom_read_function(self.path)
+
+    @contextmanager
+    def _download(self, storage_path: Union[FilePath, str]) -> Iterator[str]:
+        """
+        Downloads a file to the CacheManager passed to the constructor, or gets it from the content cache of the
+        engine if none was passed and the content cache is enabled (private). Files too large for the content cache
+        are downloaded to a temporary folder deleted once the file has been read.
+
+        :param storage_path: (Union[FilePath, str]) path to the file in s3
+        :return: (Iterator[str]) path to the local copy of the file
+        """
+        if self._cache is not None:
+            self._cache.create_cache()
+            yield self._engine.download_data_file(storage_path=storage_path, file_path=self._cache.cache_path)
+            return
+        if self._engine.content_cache is not None:
+            with tempfile.TemporaryDirectory() as directory:
+                yield self._engine.download_cached_file(storage_path=storage_path, file_path=directory)
+            return
+        self.raise_missing_cache_error(usage=f'read file \'{storage_path}\'')
 
     def raise_missing_cache_error(self, usage: str):
         """
@@ -99,27 +173,41 @@ class S3ProcessesAdapter(Base):
         :return: None
         """
         raise S3ProcessesAdapterError(
-            f'You are trying to {usage} without providing a CacheManager object from the caching module. '
+            f'You are trying to {usage} without providing a CacheManager object from the caching module or '
+            f'enabling the content cache of the engine. '
             f'Try the following:\n'
             '1) pip install the Monolith caching module;\n'
             '2) Create file objects passing an instance of `caching.CacheManager()` to `file_manager` method;\n'
             'For example:'
-            '`file = general_filemanager.file_manager(file_path=file_path, caching=caching.CacheManager())`'
+            '`file = general_filemanager.file_manager(file_path=file_path, caching=caching.CacheManager())`\n'
+            'or call `V1Engine().enable_content_cache()` once.'
         )
 
-    def write_file(self, data: Any) -> None:
+    def write_file(self, data: Any, compression_level: Optional[int] = None) -> None:
         """
-        Uploads data to s3 bucket.
+        Uploads data to s3 bucket. File types that can write to a file object, and all compressed files, are
+        streamed to s3 part by part, other file types are written to the cache, or a temporary folder if no
+        CacheManager was passed, and then uploaded.
 
         :param data: (Any) data to be uploaded to bucket
+        :param compression_level: (Optional[int]) level compressed files such as data.csv.gz, and npz archives, are
+                                  written at, the default level of the codec (stored members for npz) if None
         :return: None
         """
-        file_object = self.local_file_object()
+        ObjectCache().invalidate_path(path=self.path.to_string())
+        file_object = self.local_file_object(compression_level=compression_level)
         if file_object.supports_s3():
             return file_object.write(data)
+        elif file_object.supports_buffer_write():
+            with self.open(mode="wb") as buffer:
+                file_object.write_to_buffer(data=data, buffer=buffer)
+        elif self._cache is None:
+            with tempfile.TemporaryDirectory() as directory:
+                file_object.path = FilePath(os.path.join(directory, file_object.path.split("/")[-1]))
+                file_object.write(data)
+                self._engine.upload_data_from_file(storage_path=self.path.to_string(),
+                                                   file_path=file_object.path.to_string())
         else:
-            if self._cache is None:
-                self.raise_missing_cache_error(usage=f'write file \'{self.path}\'')
             self._cache.create_cache()
             file_object.path = FilePath(self._cache.cache_path + file_object.path.split("/")[-1])
             file_object.write(data)
@@ -158,47 +246,68 @@ class S3ProcessesAdapter(Base):
         # ensure folder names being passed as s3 "Prefix" args are terminated with a "/"
         self._engine.delete_file(bucket_name=bucket, file_name=f"{folder_name}/")
 
+    def batch_delete(self, paths: List[str]) -> Dict[str, str]:
+        """
+        Batch delete files or folders within the parent directory of self.path. Every key under each path is deleted
+        with DeleteObjects requests of up to 1000 keys that are sent concurrently.
+
+        :param paths: (List[str]) file/folder paths within self.path to be deleted
+        :return: (Dict[str, str]) error message for each key that could not be deleted, empty if all were deleted
+        """
+        bucket_name, _, _ = self._split_s3_path(storage_path=self.path)
+        prefixes = [self._split_s3_path(storage_path=f"{self.path}/{path}")[1] for path in paths]
+        return self._engine.delete_prefixes(bucket_name=bucket_name, prefixes=prefixes)
+
     def write_stream(self, stream: Any) -> str:
         """
-        Writes a stream of data to a cache and then uploads it to a s3 path.
+        Streams data to a s3 path part by part without staging it on disk.
         Checks that filename for path is not already taken by folder in the parent directory.
-        If file with name already exists, name is incremented.
+        If file with name already exists, name is incremented, and the empty object claiming the incremented name
+        is deleted if the write fails.
 
-        :param stream: (Any) the stream to be written
+        :param stream: (Any) the stream to be written (has to have a save method accepting a file object)
         :return: (str) Name file saved as
         :raises: (S3ProcessesAdapterError) If file name already used by existing folder parent directory
         """
-        if self._cache is None:
-            self.raise_missing_cache_error(usage=f'write stream \'{self.path}\'')
-        self._cache.create_cache()
         file_name = self.path.split("/")[-1]
-        file_path = self._cache.cache_path + file_name
         parent_dir = FilePath("/".join(self.path.split("/")[:-1]) + "/")
-        stream.save(file_path)
         files, dirs = self.ls(path=parent_dir)
         if self.check_name_taken(file_name, dirs):
             raise S3ProcessesAdapterError("New file name already taken by folder in this folder")
-        if self.exists():
-            self.increment_files()
-
-        self._engine.upload_data_from_file(storage_path=self.path, file_path=file_path)
+        incremented = file_name in files
+        if incremented:
+            self.increment_files(existing_names=list(files.keys()) + dirs)
+
+        try:
+            with self.open(mode="wb") as buffer:
+                stream.save(buffer)
+        except Exception:
+            if incremented:
+                bucket_name, key, _ = self._split_s3_path(storage_path=self.path)
+                self._engine.delete_keys(bucket_name=bucket_name, keys=[key])
+            raise
         file_name = self.path.split("/")[-1]
         return file_name
 
-    def increment_files(self) -> None:
+    def increment_files(self, existing_names: Optional[List[str]] = None) -> None:
         """
         Increments file name integer suffix based on how many files with same filename prefix exist within S3 folder obj.
         Fills in gaps in contiguous numeric sequence first. Assigns final name to self.path.
+        The suffixes in use are read from one listing of the parent folder and the new name is claimed with a
+        conditional put of an empty object so concurrent writers get different names.
+        :param existing_names: (Optional[List[str]]) names in the parent folder, listed if not passed
         :return: None
         """
-        count = 2
         prefix = "/".join(self.path.split("/")[:-1])
-        ext = f".{self.path.split('.')[-1]}"
-        file = ".".join(self.path.split("/")[-1].split(".")[:-1])
-        new_file = FilePath(prefix + "/" + file + f" {count}{ext}")
-        while self.exists(path=new_file):
-            count += 1
-            new_file = FilePath(prefix + "/" + file + f" {count}{ext}")
+        if existing_names is None:
+            files, dirs = self.ls(path=FilePath(prefix + "/"))
+            existing_names = list(files.keys()) + dirs
+        bucket_name, _, _ = self._split_s3_path(storage_path=self.path)
+        for name in candidate_names(name=self.path.split("/")[-1], existing_names=existing_names):
+            new_file = FilePath(prefix + "/" + name)
+            _, key, _ = self._split_s3_path(storage_path=new_file)
+            if self._engine.put_if_absent(bucket_name=bucket_name, file_name=key):
+                break
         self.path = new_file
 
     def create_directory_if_not_exists(self) -> str:
@@ -219,6 +328,25 @@ class S3ProcessesAdapter(Base):
         else:
             return self._engine.exists(storage_path=self.path)
 
+    def exists_many(self, paths: List[str]) -> Dict[str, bool]:
+        """
+        Checks to see if many paths exist. Paths in the same folder are checked with one listing of the folder.
+
+        :param paths: (List[str]) paths to be checked
+        :return: (Dict[str, bool]) True for each path that exists, False if not
+        """
+        return self._engine.exists_many(storage_paths=paths)
+
+    def stat_many(self, paths: List[str]) -> Dict[str, Optional[dict]]:
+        """
+        Gets the last modified date and size of many paths. Paths in the same folder are checked with one listing of
+        the folder.
+
+        :param paths: (List[str]) paths to be checked
+        :return: (Dict[str, Optional[dict]]) last_modified, size and etag of each path, None for missing paths
+        """
+        return self._engine.stat_many(storage_paths=paths)
+
     def ls(self, path: Optional[FilePath] = None) -> Tuple[dict, List[str]]:
         """
         Lists all the sub directories and sub files belonging to the self.path.
@@ -231,6 +359,29 @@ class S3ProcessesAdapter(Base):
         else:
             return self._engine.ls(storage_path=self.path.to_string())
 
+    def iterdir(self, path: Optional[FilePath] = None) -> Iterator[DirEntry]:
+        """
+        Yields the sub directories and sub files belonging to the self.path as each page of the listing arrives.
+
+        :param path: (Optional[FilePath]) directory path if different from self.path
+        :return: (Iterator[DirEntry]) the entries of the directory
+        """
+        return self._engine.iterdir(storage_path=path if path else self.path.to_string())
+
+    def list_page(self, page_size: int = 1000, cursor: Optional[str] = None,
+                  path: Optional[FilePath] = None) -> Tuple[List[DirEntry], Optional[str]]:
+        """
+        Lists one page of the sub directories and sub files belonging to the self.path.
+
+        :param page_size: (int) maximum number of entries in the page (s3 caps this at 1000)
+        :param cursor: (Optional[str]) opaque cursor returned with the previous page, the first page if None
+        :param path: (Optional[FilePath]) directory path if different from self.path
+        :return: (Tuple[List[DirEntry], Optional[str]]) entries of the page and the cursor of the next page, None
+                 if this is the last page
+        """
+        return self._engine.list_page(storage_path=path if path else self.path.to_string(), page_size=page_size,
+                                      cursor=cursor)
+
     def _extract_info(self, path: str) -> Tuple[str, str, str]:
         bucket_name = self.config[5:].split("/")[0]
         base_prefix = self.config[5 + len(bucket_name) + 1:]
@@ -246,16 +397,56 @@ class S3ProcessesAdapter(Base):
         :param file_pattern: (str) glob pattern of the file being searched for
         :return: list of strings which are paths to the found files
         """
+        return list(self.iter_search(file_pattern=file_pattern))
+
+    def iter_search(self, file_pattern: str) -> Iterator[str]:
+        """
+        Yields paths for all files matching a glob pattern as they are listed. Only the longest literal prefix of the
+        pattern is listed, folders are walked one level at a time with a delimiter and only descended into if they
+        match their part of the pattern, until a part containing "**" is reached which is listed recursively.
+
+        :param file_pattern: (str) glob pattern of the file being searched for
+        :return: (Iterator[str]) paths to the found files
+        """
         bucket_name, base_prefix, prefix = self._extract_info(self.path)
-        bucket = self._engine.resource.Bucket(bucket_name)
         if len(prefix) > 0 and not prefix.endswith("/"):
             prefix = prefix + "/"
-        all_objects = bucket.objects.filter(Prefix=prefix)
         if len(prefix) > 0:
             file_pattern = posixpath.join(prefix, file_pattern)
-        all_files = [obj.key for obj in all_objects]
-        return [posixpath.join("./", posixpath.relpath(self._clean_name(file), base_prefix)) for file in all_files if
-                self._glob_match(file_pattern, self._clean_name(file))]
+        literal_prefix, pattern = globre.compile(file_pattern, flags=globre.EXACT, split_prefix=True)
+        literal_prefix = self._listing_prefix(literal_prefix)
+        directory = literal_prefix[:literal_prefix.rfind("/") + 1]
+        segments = [globre.compile(segment, flags=globre.EXACT, split_prefix=True) + ("**" in segment,)
+                    for segment in file_pattern[len(directory):].split("/")]
+        for key in self._walk_search(bucket_name=bucket_name, directory=directory, segments=segments):
+            file = self._clean_name(key)
+            if pattern.match(file):
+                yield posixpath.join("./", posixpath.relpath(file, base_prefix))
+
+    def _walk_search(self, bucket_name: str, directory: str, segments: List[Tuple[Optional[str], Any, bool]]) \
+            -> Iterator[str]:
+        """
+        Lists the keys below directory that can match the remaining segments of a glob pattern (private).
+
+        :param bucket_name: (str) name of the bucket
+        :param directory: (str) prefix of the folder being walked, ending in "/" unless it is the bucket root
+        :param segments: (List[Tuple[Optional[str], Any, bool]]) literal prefix, compiled pattern and whether it
+                         contains "**" for each remaining "/" separated part of the pattern
+        :return: (Iterator[str]) keys that may match the pattern
+        """
+        literal_prefix, pattern, recursive = segments[0]
+        prefix = directory + self._listing_prefix(literal_prefix)
+        if recursive:
+            for key, _ in self._engine.list_prefix(bucket_name=bucket_name, prefix=prefix):
+                yield key
+            return
+        last = len(segments) == 1
+        for key, folder in self._engine.list_prefix(bucket_name=bucket_name, prefix=prefix, delimiter="/"):
+            if not folder:
+                if last:
+                    yield key
+            elif not last and pattern.match(self._clean_name(key[len(directory):-1])):
+                yield from self._walk_search(bucket_name=bucket_name, directory=key, segments=segments[1:])
 
     def copy_file(self, new_path: FilePath) -> None:
         """
@@ -267,29 +458,46 @@ class S3ProcessesAdapter(Base):
         old_bucket_name, old_file_name, _ = self._engine._split_s3_path(self.path)
         new_bucket_name, new_file_name, _ = self._engine._split_s3_path(new_path)
 
-        self._engine.resource.Object(new_bucket_name, new_file_name).copy_from(
-            CopySource=f"{old_bucket_name}/{old_file_name}")
+        self._engine.copy_object(bucket_name=old_bucket_name, file_name=old_file_name,
+                                 new_bucket_name=new_bucket_name, new_file_name=new_file_name)
 
-    def copy_folder(self, new_folder: str) -> None:
+    def copy_folder(self, new_folder: str, journal: Optional[CopyJournal] = None) -> List[str]:
         """
-        Copies one folder to another folder.
+        Copies one folder to another folder. Objects are copied server side on a bounded thread pool while the
+        folder is still being listed.
 
         :param new_folder: (str) the directory to where the folder will be copied to
-        :return: None
+        :param journal: (Optional[CopyJournal]) journal of completed copies used to resume an interrupted copy
+        :return: (List[str]) keys of the objects in the folder that was copied
         """
         old_bucket_name, old_folder_name, _ = self._engine._split_s3_path(self.path)
         new_bucket_name, new_folder_name, _ = self._engine._split_s3_path(new_folder)
 
-        old_bucket = self._engine.resource.Bucket(old_bucket_name)
-        new_bucket = self._engine.resource.Bucket(new_bucket_name)
+        return self._engine.copy_prefix(bucket_name=old_bucket_name, prefix=f"{old_folder_name}/",
+                                        new_bucket_name=new_bucket_name, new_prefix=f"{new_folder_name}/",
+                                        journal=journal)
 
-        for obj in old_bucket.objects.filter(Prefix=f"{old_folder_name}/"):
-            old_source = {'Bucket': old_bucket_name,
-                          'Key': obj.key}
+    def _transfer_folder(self, new_folder: FilePath) -> None:
+        """
+        Copies self.path folder to new_folder and then deletes the copied objects in bulk. A journal of the copied
+        objects is kept until the transfer has finished so calling this again after an interruption resumes it
+        (private).
 
-            new_key = obj.key.replace(old_folder_name, new_folder_name, 1)
-            new_obj = new_bucket.Object(new_key)
-            new_obj.copy(old_source)
+        :param new_folder: (FilePath) the folder self.path is moved to
+        :return: None
+        :raises: (S3ProcessesAdapterError) if any of the copied objects could not be deleted
+        """
+        journal = CopyJournal.for_copy(source=self.path, destination=new_folder)
+        try:
+            keys = self.copy_folder(new_folder=new_folder, journal=journal)
+        finally:
+            journal.close()
+        bucket_name, _, _ = self._split_s3_path(storage_path=self.path)
+        errors = self._engine.delete_keys(bucket_name=bucket_name, keys=keys)
+        if errors:
+            raise S3ProcessesAdapterError("{} objects were copied but could not be deleted from {}: {}".format(
+                len(errors), self.path, errors))
+        journal.remove()
 
     @staticmethod
     def _split_s3_path(storage_path: Union[FilePath, str]) -> Tuple[str, str, str]:
@@ -306,6 +514,22 @@ class S3ProcessesAdapter(Base):
         short_file_name = path[-1]
         return bucket_name, file_name, short_file_name
 
+    @staticmethod
+    def _listing_prefix(literal_prefix: Optional[str]) -> str:
+        """
+        Cuts the literal prefix of a pattern before the first character that is percent-quoted in keys (private).
+        Keys are matched once unquoted, so a key listed under the prefix has to be the same quoted and unquoted up to
+        the end of the prefix.
+
+        :param literal_prefix: (Optional[str]) literal prefix of a glob pattern
+        :return: (str) the part of the prefix that can be listed
+        """
+        literal_prefix = literal_prefix or ""
+        for index, character in enumerate(literal_prefix):
+            if quote(character) != character:
+                return literal_prefix[:index]
+        return literal_prefix
+
     @staticmethod
     def _clean_name(text: str) -> str:
         """
@@ -317,10 +541,6 @@ class S3ProcessesAdapter(Base):
         res = unquote(text)
         return res
 
-    @staticmethod
-    def _glob_match(pattern: str, file: str):
-        return bool(globre.match(pattern, file))
-
     def rename_file(self, new_name: str) -> None:
         """
         Checks file to rename exists, checks new name not already taken.
@@ -347,6 +567,7 @@ class S3ProcessesAdapter(Base):
         """
         Checks new name not already taken.
         Copies folder object and contents to new location/name within bucket and then deletes old object and contents.
+        An interrupted rename resumes from where it stopped when it is called again.
 
         :param new_name: (str) new folder name
         :return: None
@@ -354,12 +575,10 @@ class S3ProcessesAdapter(Base):
         """
         new_path = FilePath("/".join(self.path.split("/")[:-1]) + f"/{new_name}")
 
-        if self.exists(path=new_path):
+        if not CopyJournal.in_progress(source=self.path, destination=new_path) and self.exists(path=new_path):
             raise S3ProcessesAdapterError("New folder name already taken by a file or directory in this folder")
 
-        self.copy_folder(new_folder=new_path)
-
-        self.delete_folder()
+        self._transfer_folder(new_folder=new_path)
 
     def move_file(self, destination_folder: str) -> None:
         """
@@ -373,7 +592,7 @@ class S3ProcessesAdapter(Base):
         file = self.path.split("/")[-1]
         new_path = FilePath(f"{destination_folder}/{file}")
         if self.exists(path=new_path):
-            S3ProcessesAdapterError("File with same name already exists in destination folder")
+            raise S3ProcessesAdapterError("File with same name already exists in destination folder")
 
         self.copy_file(new_path=new_path)
         self.delete_file()
@@ -382,6 +601,7 @@ class S3ProcessesAdapter(Base):
         """
         Checks new folder path not already taken.
         Copies folder object and contents to new location/name within bucket and then deletes old folder.
+        An interrupted move resumes from where it stopped when it is called again.
 
         :param destination_folder: (str) folder to be moved to
         :return: None
@@ -390,12 +610,10 @@ class S3ProcessesAdapter(Base):
         folder = self.path.split("/")[-1]
         new_path = FilePath(f"{destination_folder}/{folder}")
 
-        if self.exists(path=new_path):
-            S3ProcessesAdapterError("File/Folder with same name already exists in folder")
-
-        self.copy_folder(new_folder=new_path)
+        if not CopyJournal.in_progress(source=self.path, destination=new_path) and self.exists(path=new_path):
+            raise S3ProcessesAdapterError("File/Folder with same name already exists in folder")
 
-        self.delete_folder()
+        self._transfer_folder(new_folder=new_path)
 
     def batch_move(self, paths: List[str], destination_folder: str) -> None:
         """
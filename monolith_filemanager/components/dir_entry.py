@@ -0,0 +1,17 @@
+from typing import NamedTuple, Optional
+
+
+class DirEntry(NamedTuple):
+    """
+    This is a class for a compact record of one entry in a directory listing.
+
+    Attributes:
+        name (str): name of the file or folder without its parent directories
+        is_dir (bool): True if the entry is a folder
+        size (Optional[int]): size in bytes of a file, None for folders
+        last_modified (Optional[str]): "%Y-%m-%d %H:%M:%S" date a file was last modified, None for folders
+    """
+    name: str
+    is_dir: bool
+    size: Optional[int] = None
+    last_modified: Optional[str] = None
@@ -0,0 +1,151 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class LRUCache:
+    """
+    This is a class for a thread safe in-process cache that evicts the least recently used entries once it holds too
+    many entries or bytes, and drops entries older than the time to live.
+
+    Attributes:
+        max_entries (int): maximum number of entries held
+        ttl (Optional[float]): seconds an entry is valid for, entries never expire if None
+        max_bytes (Optional[int]): maximum total size of the entries held, unbounded if None
+        hits (int): number of lookups that found a valid entry
+        misses (int): number of lookups that did not find a valid entry
+        evictions (int): number of entries dropped to make space
+    """
+    MISSING: object = object()
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = None, max_bytes: Optional[int] = None,
+                 size_function: Optional[Callable[[Any], int]] = None) -> None:
+        """
+        The constructor for the LRUCache class.
+
+        :param max_entries: (int) maximum number of entries held
+        :param ttl: (Optional[float]) seconds an entry is valid for, entries never expire if None
+        :param max_bytes: (Optional[int]) maximum total size of the entries held, unbounded if None
+        :param size_function: (Optional[Callable[[Any], int]]) gets the size of a value, used with max_bytes
+        """
+        self.max_entries: int = max_entries
+        self.ttl: Optional[float] = ttl
+        self.max_bytes: Optional[int] = max_bytes
+        self.size_function: Callable[[Any], int] = size_function if size_function is not None else (lambda value: 0)
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.current_bytes: int = 0
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float, int]]" = OrderedDict()
+        self._lock: threading.RLock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and not self._expired(entry)
+
+    def _expired(self, entry: Tuple[Any, float, int]) -> bool:
+        """
+        Checks if an entry is older than the time to live (private).
+
+        :param entry: (Tuple[Any, float, int]) value, time stored and size of the entry
+        :return: (bool) True if the entry has expired
+        """
+        return self.ttl is not None and time.monotonic() - entry[1] > self.ttl
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        """
+        Gets a value from the cache, marking it as the most recently used.
+
+        :param key: (Hashable) key of the entry
+        :param default: (Any) returned if there is no valid entry, LRUCache.MISSING by default
+        :return: (Any) the cached value or the default
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._expired(entry):
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Stores a value in the cache, evicting the least recently used entries if the cache is full. Values larger
+        than max_bytes are not stored.
+
+        :param key: (Hashable) key of the entry
+        :param value: (Any) value to be stored
+        :return: None
+        """
+        size = self.size_function(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._entries[key] = (value, time.monotonic(), size)
+            self.current_bytes += size
+            while len(self._entries) > self.max_entries or \
+                    (self.max_bytes is not None and self.current_bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key: Hashable) -> None:
+        """
+        Removes an entry keeping the byte count up to date (private).
+
+        :param key: (Hashable) key of the entry
+        :return: None
+        """
+        _, _, size = self._entries.pop(key)
+        self.current_bytes -= size
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Removes an entry if it is in the cache.
+
+        :param key: (Hashable) key of the entry
+        :return: None
+        """
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        """
+        Removes every entry whose key matches the predicate.
+
+        :param predicate: (Callable[[Hashable], bool]) returns True for the keys to be removed
+        :return: None
+        """
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                self._remove(key)
+
+    def clear(self) -> None:
+        """
+        Removes every entry, keeping the counters.
+
+        :return: None
+        """
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Gets the counters of the cache.
+
+        :return: (Dict[str, int]) hits, misses, evictions, entries and bytes
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "entries": len(self._entries), "bytes": self.current_bytes}
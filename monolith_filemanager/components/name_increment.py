@@ -0,0 +1,47 @@
+import posixpath
+import re
+from typing import Iterable, Iterator, Tuple
+
+from ..path import FilePath
+
+
+def candidate_names(name: str, existing_names: Iterable[str], folder: bool = False, start: int = 2) -> Iterator[str]:
+    """
+    Yields the free names for a file or folder whose name is taken, in the form "name N.ext". The " N" suffixes
+    already used in existing_names are parsed once so gaps in the sequence are filled first. More than one name is
+    yielded so a caller that loses a race for a name can move on to the next one.
+
+    :param name: (str) the name that is taken, without any parent directories
+    :param existing_names: (Iterable[str]) names of the files and folders in the parent directory
+    :param folder: (bool) if True, the name is not split into a stem and an extension, compressed files such as
+                   data.csv.gz keep both extensions after the suffix
+    :param start: (int) the first suffix that can be used
+    :return: (Iterator[str]) the free names, smallest suffix first
+    """
+    stem, extension = (name, "") if folder else _split_extension(name=name)
+    pattern = re.compile(re.escape(stem) + r" (\d+)" + re.escape(extension) + "$")
+    used = set()
+    for existing_name in existing_names:
+        match = pattern.match(existing_name)
+        if match is not None:
+            used.add(int(match.group(1)))
+    count = start
+    while True:
+        if count not in used:
+            yield f"{stem} {count}{extension}"
+        count += 1
+
+
+def _split_extension(name: str) -> Tuple[str, str]:
+    """
+    Splits a file name into a stem and an extension, the extension including the compression extension of compressed
+    files (private).
+
+    :param name: (str) the file name
+    :return: (Tuple[str, str]) the stem and the extension
+    """
+    compression = FilePath.get_compression(file_string=name)
+    if compression is None:
+        return posixpath.splitext(name)
+    stem, extension = posixpath.splitext(name[:-len(compression) - 1])
+    return stem, extension + "." + compression
@@ -0,0 +1,134 @@
+import copy
+import sys
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional
+
+from .lru_cache import LRUCache
+from ..singleton import Singleton
+
+
+def estimate_size(value: Any, depth: int = 4) -> int:
+    """
+    Estimates the memory used by an object read from a file. Arrays and data frames report their own buffers,
+    containers are walked down to a few levels and anything below that is counted with sys.getsizeof.
+
+    :param value: (Any) the object
+    :param depth: (int) number of container levels walked
+    :return: (int) estimated size in bytes
+    """
+    if hasattr(value, "memory_usage") and hasattr(value, "columns"):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if hasattr(value, "nbytes") and hasattr(value, "dtype"):
+        return int(value.nbytes)
+    size = sys.getsizeof(value)
+    if depth == 0:
+        return size
+    if isinstance(value, dict):
+        size += sum(estimate_size(key, depth - 1) + estimate_size(item, depth - 1) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, depth - 1) for item in value)
+    return size
+
+
+class ObjectCache(LRUCache, metaclass=Singleton):
+    """
+    This is a class for an opt-in, process wide cache of the objects returned by read_file. Entries are keyed by
+    path, a validator that changes whenever the file changes ((mtime, size) for local files, the ETag for s3
+    objects) and the read arguments, so a changed file is read again. The cache is bounded by the estimated size
+    of the objects it holds.
+
+    Attributes:
+        enabled (bool): if False, read_file does not use the cache
+        copy_on_read (bool): if True, every read gets its own deep copy of the cached object, if False the cached
+                             object is shared and numpy arrays are made read-only
+    """
+    def __init__(self) -> None:
+        """
+        The constructor for the ObjectCache class. The cache is disabled until enable is called.
+        """
+        super().__init__(max_entries=1024, max_bytes=256 * 1024 ** 2, size_function=estimate_size)
+        self.enabled: bool = False
+        self.copy_on_read: bool = True
+
+    def enable(self, max_bytes: int = 256 * 1024 ** 2, max_entries: int = 1024, ttl: Optional[float] = None,
+               copy_on_read: bool = True) -> "ObjectCache":
+        """
+        Starts caching the objects returned by read_file, dropping any objects already cached.
+
+        :param max_bytes: (int) maximum estimated size of the objects held
+        :param max_entries: (int) maximum number of objects held
+        :param ttl: (Optional[float]) seconds an object is kept for, kept until evicted if None
+        :param copy_on_read: (bool) if True, every read gets its own copy of the object, if False the cached object
+                             is shared and has to be treated as read-only
+        :return: (ObjectCache) the cache, exposing its hit, miss and eviction counters
+        """
+        with self._lock:
+            self.clear()
+            self.max_bytes = max_bytes
+            self.max_entries = max_entries
+            self.ttl = ttl
+            self.copy_on_read = copy_on_read
+            self.enabled = True
+        return self
+
+    def disable(self) -> None:
+        """
+        Stops caching the objects returned by read_file and drops the objects cached.
+
+        :return: None
+        """
+        with self._lock:
+            self.enabled = False
+            self.clear()
+
+    def get_or_read(self, path: str, validator: Hashable, read: Callable[[], Any],
+                    kwargs: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Gets the object read from a file, reading it only if the file has changed since it was cached. Objects
+        read from an older version of the file are dropped. Objects read with arguments that cannot be hashed,
+        memory maps read with mmap_mode, iterators and objects that keep the file open (anything with a close
+        method, such as lazy arrays and npz archives) are not cached.
+
+        :param path: (str) path to the file
+        :param validator: (Hashable) value that changes whenever the file changes, the object is not cached if None
+        :param read: (Callable[[], Any]) reads the object from the file
+        :param kwargs: (Optional[Dict[str, Any]]) arguments the file is read with
+        :return: (Any) the object
+        """
+        if not self.enabled or validator is None or (kwargs or {}).get("mmap_mode") is not None:
+            return read()
+        key = (path, validator, tuple(sorted((kwargs or {}).items())))
+        try:
+            hash(key)
+        except TypeError:
+            return read()
+        value = self.get(key)
+        if value is self.MISSING:
+            value = read()
+            # iterators are consumed by the caller and open files are closed by it so they cannot be shared
+            if isinstance(value, Iterator) or callable(getattr(value, "close", None)):
+                return value
+            if not self.copy_on_read:
+                self._freeze(value)
+            self.invalidate_where(lambda cached_key: cached_key[0] == path and cached_key[1] != validator)
+            self.put(key, value)
+        return copy.deepcopy(value) if self.copy_on_read else value
+
+    def invalidate_path(self, path: str) -> None:
+        """
+        Drops every object read from a path.
+
+        :param path: (str) path to the file
+        :return: None
+        """
+        self.invalidate_where(lambda key: key[0] == path)
+
+    @staticmethod
+    def _freeze(value: Any) -> None:
+        """
+        Makes numpy arrays read-only so a shared object cannot be changed in place by accident (private).
+
+        :param value: (Any) the object to be shared
+        :return: None
+        """
+        if hasattr(value, "flags") and hasattr(value, "dtype"):
+            value.flags.writeable = False
@@ -38,6 +38,8 @@ class FileMap(dict, metaclass=Singleton):
             self.add_binding(file_object=KerasModelFile)
             from monolith_filemanager.file.numpy_file import NumpyFile
             self.add_binding(file_object=NumpyFile)
+            from monolith_filemanager.file.npz_file import NpzFile
+            self.add_binding(file_object=NpzFile)
             from monolith_filemanager.file.pandas_file import PandasFile
             self.add_binding(file_object=PandasFile)
             from monolith_filemanager.file.standard_pickle_file import StandardPickleFile
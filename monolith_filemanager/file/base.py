@@ -1,5 +1,7 @@
+import io
 from abc import ABC, abstractmethod
-from typing import Union
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional, Union
 
 from .errors import BaseFileError
 from ..path import FilePath
@@ -11,7 +13,11 @@ class File(ABC):
 
     Attributes:
         path (FilePath): path to file
+        compression_level (Optional[int]): level file types that compress their own data, such as npz, are written
+                                           at, set by write_file
     """
+    compression_level: Optional[int] = None
+
     def __init__(self, path: Union[str, FilePath]) -> None:
         """
         The constructor for the File base path.
@@ -37,3 +43,54 @@ class File(ABC):
     @staticmethod
     def supports_s3() -> bool:
         return False
+
+    def supports_buffer_write(self) -> bool:
+        """
+        Checks to see if the file can be written to a binary file object with write_to_buffer.
+
+        :return: True if supported, False if not
+        """
+        return False
+
+    def write_to_buffer(self, data: Any, buffer: Any) -> None:
+        """
+        Writes data to a binary file object instead of self.path.
+
+        :param data: (Any) data to be written
+        :param buffer: (Any) writable binary file object
+        :return: None
+        """
+        raise BaseFileError("{} does not support writing to a file object".format(self.__class__.__name__))
+
+    def supports_buffer_read(self) -> bool:
+        """
+        Checks to see if the file can be read from a seekable binary file object with read_from_buffer.
+
+        :return: True if supported, False if not
+        """
+        return False
+
+    def read_from_buffer(self, buffer: Any, **kwargs) -> Any:
+        """
+        Reads data from a seekable binary file object instead of self.path.
+
+        :param buffer: (Any) readable, seekable binary file object
+        :return: (Any) data from the file object
+        """
+        raise BaseFileError("{} does not support reading from a file object".format(self.__class__.__name__))
+
+    @staticmethod
+    @contextmanager
+    def text_buffer(buffer: Any) -> Iterator[io.TextIOWrapper]:
+        """
+        Wraps a binary file object so text can be written to it. The binary file object is left open.
+
+        :param buffer: (Any) binary file object
+        :return: (io.TextIOWrapper) text file object writing to buffer
+        """
+        wrapper = io.TextIOWrapper(buffer, encoding="utf-8", newline="")
+        try:
+            yield wrapper
+        finally:
+            wrapper.flush()
+            wrapper.detach()
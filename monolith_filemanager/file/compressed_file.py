@@ -0,0 +1,208 @@
+import bz2
+import gzip
+import io
+import lzma
+import os
+import shutil
+import tempfile
+from typing import Any, Iterator, Optional
+
+from .base import File
+from .errors import CompressedFileError
+from ..path import FilePath
+
+
+STREAM_CHUNK_SIZE: int = 1024 * 1024
+
+
+def open_compressed(buffer: Any, compression: str, mode: str = "rb", level: Optional[int] = None,
+                    threads: int = -1) -> Any:
+    """
+    Wraps a binary file object in a stream that compresses what is written to it or decompresses what is read from
+    it. Closing the stream finishes the compressed data but leaves buffer open. zstandard is only needed for zst
+    files.
+
+    :param buffer: (Any) binary file object holding the compressed data
+    :param compression: (str) compression extension, one of FilePath.COMPRESSION_EXTENSIONS
+    :param mode: (str) "rb" to decompress or "wb" to compress
+    :param level: (Optional[int]) compression level, the default level of the codec if None
+    :param threads: (int) number of threads compressing zst files, -1 for one per cpu
+    :return: (Any) binary file object of the uncompressed data
+    """
+    if mode not in ("rb", "wb"):
+        raise CompressedFileError(message="compressed files can only be opened in rb or wb mode, not {}".format(mode))
+    writing = mode == "wb"
+    if compression == "gz":
+        return gzip.GzipFile(fileobj=buffer, mode=mode, compresslevel=level if level is not None else 6)
+    if compression == "bz2":
+        return bz2.BZ2File(buffer, mode=mode, compresslevel=level if level is not None else 9)
+    if compression == "xz":
+        return lzma.LZMAFile(buffer, mode=mode, preset=level if writing else None)
+    if compression == "zst":
+        try:
+            import zstandard
+        except ImportError:
+            raise CompressedFileError(
+                message="reading and writing zst files relies on the zstandard module, install it with "
+                        "pip install zstandard")
+        if writing:
+            compressor = zstandard.ZstdCompressor(level=level if level is not None else 3, threads=threads)
+            return compressor.stream_writer(buffer, closefd=False)
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(buffer, closefd=False),
+                                 buffer_size=STREAM_CHUNK_SIZE)
+    raise CompressedFileError(message="{} is not a supported compression, please use one of {}".format(
+        compression, FilePath.COMPRESSION_EXTENSIONS))
+
+
+class CompressedFile(File):
+    """
+    This is a class for managing the reading and writing of compressed files such as data.csv.gz. The data is
+    serialised by the file object of the file type inside the compression and streamed through the codec. File types
+    that cannot use file objects are staged uncompressed in a temporary folder.
+
+    Attributes:
+        file (File): file object of the file type inside the compression
+        compression_level (Optional[int]): level files are compressed at, the default level of the codec if None
+        threads (int): number of threads compressing zst files, -1 for one per cpu
+    """
+    RANDOM_ACCESS_FORMATS = ["parquet"]
+    SPOOL_SIZE: int = 64 * 1024 * 1024
+
+    def __init__(self, file: File, compression_level: Optional[int] = None, threads: int = -1) -> None:
+        """
+        The constructor for the CompressedFile class.
+
+        :param file: (File) file object of the file type inside the compression, with the path of the compressed file
+        :param compression_level: (Optional[int]) level files are compressed at
+        :param threads: (int) number of threads compressing zst files
+        """
+        super().__init__(path=file.path)
+        if self.path.compression is None:
+            raise CompressedFileError(message="{} is not a compressed file".format(self.path))
+        self.file: File = file
+        self.compression_level: Optional[int] = compression_level
+        self.threads: int = threads
+
+    def read(self, **kwargs) -> Any:
+        """
+        Gets data from the compressed file defined by the file path.
+
+        :return: (Any) data from the file, an iterator if chunksize is passed to a file type that supports it
+        """
+        if kwargs.get("chunksize") is not None and self.file.supports_buffer_read():
+            return self._read_chunks(**kwargs)
+        with open(self.path, "rb") as buffer:
+            return self.read_from_buffer(buffer=buffer, **kwargs)
+
+    def _read_chunks(self, **kwargs) -> Iterator[Any]:
+        """
+        Reads the compressed file part by part, keeping it open until the iterator is exhausted or closed (private).
+
+        :return: (Iterator[Any]) the parts of the file
+        """
+        with open(self.path, "rb") as buffer:
+            yield from self.read_from_buffer(buffer=buffer, **kwargs)
+
+    def write(self, data: Any) -> None:
+        """
+        Writes data to the compressed file defined by the file path.
+
+        :param data: (Any) data to be written
+        :return: None
+        """
+        with open(self.path, "wb") as buffer:
+            self.write_to_buffer(data=data, buffer=buffer)
+
+    def supports_buffer_read(self) -> bool:
+        """
+        Checks to see if the data can be streamed out of a file object, which depends on the file type inside the
+        compression.
+
+        :return: True if the file type inside the compression can be read from a file object, False if not
+        """
+        return self.file.supports_buffer_read()
+
+    def read_from_buffer(self, buffer: Any, **kwargs) -> Any:
+        """
+        Reads data from a binary file object of compressed data. File types that need to seek, such as parquet, are
+        spooled to memory, or to disk if larger than SPOOL_SIZE, when the codec cannot seek.
+
+        :param buffer: (Any) readable binary file object
+        :return: (Any) data from the file object
+        """
+        if kwargs.get("chunksize") is not None and self.file.supports_buffer_read():
+            return self._read_chunks_from_buffer(buffer=buffer, **kwargs)
+        with open_compressed(buffer=buffer, compression=self.path.compression, mode="rb") as stream:
+            if not self.file.supports_buffer_read():
+                return self._read_staged(stream=stream, **kwargs)
+            if self.path.file_type in self.RANDOM_ACCESS_FORMATS and not stream.seekable():
+                with tempfile.SpooledTemporaryFile(max_size=self.SPOOL_SIZE) as spool:
+                    shutil.copyfileobj(stream, spool, STREAM_CHUNK_SIZE)
+                    spool.seek(0)
+                    return self.file.read_from_buffer(buffer=spool, **kwargs)
+            return self.file.read_from_buffer(buffer=stream, **kwargs)
+
+    def _read_chunks_from_buffer(self, buffer: Any, **kwargs) -> Iterator[Any]:
+        """
+        Decompresses a file object as its parts are read (private).
+
+        :param buffer: (Any) readable binary file object
+        :return: (Iterator[Any]) the parts of the file
+        """
+        with open_compressed(buffer=buffer, compression=self.path.compression, mode="rb") as stream:
+            yield from self.file.read_from_buffer(buffer=stream, **kwargs)
+
+    def _read_staged(self, stream: Any, **kwargs) -> Any:
+        """
+        Decompresses a stream to a temporary file and reads it with the file object of the file type (private).
+
+        :param stream: (Any) readable binary file object of the uncompressed data
+        :return: (Any) data from the file
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            self.file.path = FilePath(os.path.join(directory, self._uncompressed_name()))
+            try:
+                with open(self.file.path, "wb") as staged_file:
+                    shutil.copyfileobj(stream, staged_file, STREAM_CHUNK_SIZE)
+                return self.file.read(**kwargs)
+            finally:
+                self.file.path = self.path
+
+    def supports_buffer_write(self) -> bool:
+        """
+        Checks to see if the file can be written to a binary file object with write_to_buffer.
+
+        :return: True
+        """
+        return True
+
+    def write_to_buffer(self, data: Any, buffer: Any) -> None:
+        """
+        Writes compressed data to a binary file object. File types that cannot write to a file object are written to
+        a temporary file which is then streamed through the codec.
+
+        :param data: (Any) data to be written
+        :param buffer: (Any) writable binary file object
+        :return: None
+        """
+        with open_compressed(buffer=buffer, compression=self.path.compression, mode="wb",
+                             level=self.compression_level, threads=self.threads) as stream:
+            if self.file.supports_buffer_write():
+                self.file.write_to_buffer(data=data, buffer=stream)
+                return
+            with tempfile.TemporaryDirectory() as directory:
+                self.file.path = FilePath(os.path.join(directory, self._uncompressed_name()))
+                try:
+                    self.file.write(data)
+                    with open(self.file.path, "rb") as staged_file:
+                        shutil.copyfileobj(staged_file, stream, STREAM_CHUNK_SIZE)
+                finally:
+                    self.file.path = self.path
+
+    def _uncompressed_name(self) -> str:
+        """
+        Gets the name of the file without the compression extension (private).
+
+        :return: (str) the name, for example data.csv for data.csv.gz
+        """
+        return self.path.file[:-len(self.path.compression) - 1]
@@ -75,4 +75,16 @@ class KerasModelFileError(Exception):
 class ProtobufFileError(Exception):
 
     def __init__(self, message: str) -> None:
-        super().__init__(message)
\ No newline at end of file
+        super().__init__(message)
+
+
+class CompressedFileError(Exception):
+
+    def __init__(self, message: str) -> None:
+        super().__init__(message)
+
+
+class NumpyFileError(Exception):
+
+    def __init__(self, message: str) -> None:
+        super().__init__(message)
@@ -1,17 +1,81 @@
-from typing import Any, Union
+import itertools
+import os
+import zlib
+from collections import deque
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Hashable, Iterator, Optional, Tuple, Union
 
 import h5py
+import numpy as np
 
 from .base import File
 from .errors import Hdf5FileError
+from .hdf5_pool import Hdf5Handle, Hdf5HandlePool
 from ..file import FilePath
 
 
+class Hdf5Dataset:
+    """
+    This is a class for an array written to an hdf5 file with its own storage options, overriding those of the
+    Hdf5File.
+
+    Attributes:
+        data (Any): the array
+        options (Dict[str, Any]): chunks, compression, compression_level and shuffle options of the dataset
+    """
+    OPTIONS = ["chunks", "compression", "compression_level", "shuffle"]
+
+    def __init__(self, data: Any, **options) -> None:
+        """
+        The constructor for the Hdf5Dataset class.
+
+        :param data: (Any) the array
+        :param options: chunks (True for a shape chosen by h5py, a tuple or None for contiguous storage),
+                        compression ("gzip", "lzf" or None), compression_level (gzip level) and shuffle (bool)
+        """
+        unknown = set(options) - set(self.OPTIONS)
+        if unknown:
+            raise Hdf5FileError(message="{} are not dataset options, please use {}".format(sorted(unknown),
+                                                                                         self.OPTIONS))
+        self.data: Any = data
+        self.options: Dict[str, Any] = options
+
+
+def _filter_chunk(block: np.ndarray, level: int, shuffle: bool) -> bytes:
+    """
+    Applies the shuffle and gzip filters of hdf5 to a chunk, giving the bytes stored for it.
+
+    :param block: (np.ndarray) the chunk, padded to the full chunk shape
+    :param level: (int) gzip level
+    :param shuffle: (bool) True if bytes are shuffled before compression
+    :return: (bytes) the filtered chunk
+    """
+    raw = block.tobytes()
+    if shuffle and block.dtype.itemsize > 1:
+        raw = np.frombuffer(raw, dtype=np.uint8).reshape(-1, block.dtype.itemsize).T.tobytes()
+    return zlib.compress(raw, level)
+
+
 class Hdf5File(File):
     """
-    This is a class for managing the reading and writing of hdf5 objects.
+    This is a class for managing the reading and writing of hdf5 objects. Dictionaries are written as groups and
+    arrays as datasets, chunked and compressed with the options below unless an Hdf5Dataset overrides them. Chunks
+    of gzip compressed datasets are compressed across threads and written with write_direct_chunk.
+
+    Attributes:
+        chunks (Any): True for chunk shapes chosen by h5py, None for contiguous datasets unless compressed
+        compression (Optional[str]): "gzip", "lzf" or None, gzip if None and compression_level is set
+        shuffle (bool): if True, bytes are shuffled before compression which often makes numbers compress better
+        max_workers (Optional[int]): number of threads compressing gzip chunks, 1 leaves compression to h5py
     """
     SUPPORTED_FORMATS = ["h5", "hdf5", "hdf"]
+    COMPRESSION_FILTERS = ["gzip", "lzf"]
+    DEFAULT_GZIP_LEVEL: int = 4
+    chunks: Any = True
+    compression: Optional[str] = None
+    shuffle: bool = False
+    max_workers: Optional[int] = None
 
     def __init__(self, path: Union[str, FilePath]) -> None:
         """
@@ -21,20 +85,169 @@ class Hdf5File(File):
         """
         super().__init__(path=path)
 
-    def read(self, **kwargs) -> Any:
+    def read(self, **kwargs) -> Hdf5Handle:
+        """
+        Gets data from file defined by the file path. The file is opened read-only through the Hdf5HandlePool, so
+        reads of the same version of a file share one open file and its chunk cache, and in SWMR mode where the file
+        supports it.
+
+        :param kwargs: passed to h5py.File, for example rdcc_nbytes
+        :return: (Hdf5Handle) the file, to be closed when done with
+        """
+        pool = Hdf5HandlePool()
+        options = pool.open_options(**kwargs)
+        path = str(self.path)
+        status = os.stat(path)
+        key = self._pool_key(source=(path, status.st_mtime_ns, status.st_size), options=options)
+
+        def open_file() -> h5py.File:
+            if pool.swmr and "swmr" not in options and "driver" not in options:
+                try:
+                    return h5py.File(path, mode="r", swmr=True, **options)
+                except (OSError, ValueError):
+                    pass
+            return h5py.File(path, mode="r", **options)
+
+        return pool.acquire(key=key, open_file=open_file)
+
+    def read_lazy(self, buffer: Any, **kwargs) -> Hdf5Handle:
+        """
+        Opens an hdf5 file held in a seekable binary file object, such as an S3ReadFile, so slicing a dataset only
+        reads the metadata and chunks it needs. File objects with an etag share one open file per version through
+        the Hdf5HandlePool, in which case the file object passed is closed if the version is already open.
+
+        :param buffer: (Any) readable, seekable binary file object, closed with the file
+        :param kwargs: passed to h5py.File, for example rdcc_nbytes
+        :return: (Hdf5Handle) the file, opened read-only and to be closed when done with
+        """
+        pool = Hdf5HandlePool()
+        options = pool.open_options(**kwargs)
+        key = None
+        if getattr(buffer, "etag", None) is not None:
+            key = self._pool_key(source=(buffer.name, buffer.etag, buffer.size), options=options)
+        # SWMR needs the sec2 driver so file objects are opened without it
+        return pool.acquire(key=key, open_file=lambda: h5py.File(buffer, mode="r", **options), resources=[buffer])
+
+    @staticmethod
+    def _pool_key(source: Tuple[Any, ...], options: Dict[str, Any]) -> Optional[Hashable]:
+        """
+        Gets the key a file is shared under in the Hdf5HandlePool (private).
+
+        :param source: (Tuple[Any, ...]) path and version of the file
+        :param options: (Dict[str, Any]) arguments the file is opened with
+        :return: (Optional[Hashable]) the key, None if the arguments cannot be hashed and the file is not shared
+        """
+        key = source + tuple(sorted(options.items()))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def write(self, data: Dict[str, Any]) -> None:
+        """
+        Writes data to file.
+
+        :param data: (Dict[str, Any]) arrays, Hdf5Datasets and dictionaries of them keyed by name
+        :return: None
+        """
+        if not isinstance(data, Mapping):
+            raise Hdf5FileError(message="data written to {} has to be a dictionary of arrays and dictionaries".format(
+                self.path))
+        Hdf5HandlePool().invalidate_path(path=str(self.path))
+        with h5py.File(self.path, mode="w") as h5:
+            self._write_group(group=h5, data=data)
+
+    def _write_group(self, group: h5py.Group, data: Mapping) -> None:
         """
-        Gets data from file defined by the file path.
+        Writes the datasets and nested groups of a dictionary to a group (private).
 
-        :return: Data from the hdf5 file
+        :param group: (h5py.Group) the group written to
+        :param data: (Mapping) arrays, Hdf5Datasets and dictionaries of them keyed by name
+        :return: None
         """
-        h5 = h5py.File(self.path, mode='r')
-        return h5
+        for name, value in data.items():
+            if isinstance(value, Mapping):
+                self._write_group(group=group.create_group(name), data=value)
+            elif isinstance(value, Hdf5Dataset):
+                self._write_dataset(group=group, name=name, data=value.data, options=value.options)
+            else:
+                self._write_dataset(group=group, name=name, data=value, options={})
 
-    def write(self, data: Any) -> Exception:
+    def _write_dataset(self, group: h5py.Group, name: str, data: Any, options: Dict[str, Any]) -> None:
         """
-        Writes data to file (WARNING: not supported, raises exception).
+        Writes an array to a dataset (private). Scalars, empty arrays and strings are written without chunks or
+        filters.
 
-        :param data: (python object) data to be written to file
+        :param group: (h5py.Group) the group written to
+        :param name: (str) name of the dataset
+        :param data: (Any) the array
+        :param options: (Dict[str, Any]) options overriding those of the file
         :return: None
         """
-        raise Hdf5FileError('write method not yet implemented')
+        options = dict({"chunks": self.chunks, "compression": self.compression,
+                        "compression_level": self.compression_level, "shuffle": self.shuffle}, **options)
+        array = np.asarray(data)
+        if array.dtype.kind == "U":
+            group.create_dataset(name, data=array.astype(object), dtype=h5py.string_dtype())
+            return
+        if array.ndim == 0 or array.size == 0 or array.dtype.hasobject:
+            group.create_dataset(name, data=array)
+            return
+        compression = options["compression"]
+        if compression is None and options["compression_level"] is not None:
+            compression = "gzip"
+        if compression is not None and compression not in self.COMPRESSION_FILTERS:
+            raise Hdf5FileError(message="{} is not a supported compression, please use one of {}".format(
+                compression, self.COMPRESSION_FILTERS))
+        level = options["compression_level"] if options["compression_level"] is not None else self.DEFAULT_GZIP_LEVEL
+        kwargs = {"chunks": options["chunks"], "compression": compression, "shuffle": bool(options["shuffle"])}
+        if compression == "gzip":
+            kwargs["compression_opts"] = level
+        if compression != "gzip" or self.max_workers == 1:
+            group.create_dataset(name, data=array, **kwargs)
+            return
+        dataset = group.create_dataset(name, shape=array.shape, dtype=array.dtype, **kwargs)
+        self._write_chunks(dataset=dataset, array=array, level=level, shuffle=bool(options["shuffle"]))
+
+    def _write_chunks(self, dataset: h5py.Dataset, array: np.ndarray, level: int, shuffle: bool) -> None:
+        """
+        Compresses the chunks of a gzip dataset across threads and writes them in order with write_direct_chunk
+        (private). A bounded number of chunks is compressed ahead of the one being written.
+
+        :param dataset: (h5py.Dataset) the chunked dataset, created with the gzip and shuffle filters
+        :param array: (np.ndarray) the data of the dataset
+        :param level: (int) gzip level
+        :param shuffle: (bool) True if bytes are shuffled before compression
+        :return: None
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = deque()
+            for offset, block in self._chunk_blocks(array=array, chunks=dataset.chunks):
+                pending.append((offset, executor.submit(_filter_chunk, block, level, shuffle)))
+                if len(pending) > 2 * executor._max_workers:
+                    offset, future = pending.popleft()
+                    dataset.id.write_direct_chunk(offset, future.result())
+            while pending:
+                offset, future = pending.popleft()
+                dataset.id.write_direct_chunk(offset, future.result())
+
+    @staticmethod
+    def _chunk_blocks(array: np.ndarray, chunks: Tuple[int, ...]) -> Iterator[Tuple[Tuple[int, ...], np.ndarray]]:
+        """
+        Cuts an array into chunks, padding the chunks at the edges to the full chunk shape as hdf5 stores them
+        (private).
+
+        :param array: (np.ndarray) the array
+        :param chunks: (Tuple[int, ...]) the chunk shape
+        :return: (Iterator[Tuple[Tuple[int, ...], np.ndarray]]) offset and data of each chunk
+        """
+        for offset in itertools.product(*(range(0, size, chunk) for size, chunk in zip(array.shape, chunks))):
+            selection = tuple(slice(start, min(start + chunk, size))
+                              for start, chunk, size in zip(offset, chunks, array.shape))
+            block = array[selection]
+            if block.shape != tuple(chunks):
+                padded = np.zeros(chunks, dtype=array.dtype)
+                padded[tuple(slice(0, length) for length in block.shape)] = block
+                block = padded
+            yield offset, np.ascontiguousarray(block)
@@ -0,0 +1,283 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional
+
+import h5py
+
+from ..singleton import Singleton
+
+
+class _PoolEntry:
+    """
+    This is a class for an open hdf5 file in an Hdf5HandlePool (private).
+    """
+    def __init__(self, key: Hashable, file: h5py.File, resources: List[Any]) -> None:
+        self.key: Hashable = key
+        self.file: h5py.File = file
+        self.resources: List[Any] = resources
+        self.references: int = 0
+        self.last_used: float = time.monotonic()
+        self.stale: bool = False
+
+    def close(self) -> None:
+        self.file.close()
+        for resource in self.resources:
+            resource.close()
+
+
+class Hdf5Handle:
+    """
+    This is a class for a reference to an hdf5 file shared through an Hdf5HandlePool. It behaves like the h5py.File
+    it refers to, except that closing it returns the file to the pool instead of closing it.
+    """
+    def __init__(self, pool: "Hdf5HandlePool", entry: _PoolEntry) -> None:
+        """
+        The constructor for the Hdf5Handle class.
+
+        :param pool: (Hdf5HandlePool) the pool the file belongs to
+        :param entry: (_PoolEntry) the open file
+        """
+        self._pool: "Hdf5HandlePool" = pool
+        self._entry: Optional[_PoolEntry] = entry
+
+    @property
+    def file(self) -> h5py.File:
+        """
+        Gets the shared file, which must not be closed directly.
+
+        :return: (h5py.File) the file
+        """
+        if self._entry is None:
+            raise ValueError("the hdf5 handle has been closed")
+        return self._entry.file
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.file, name)
+
+    def __getitem__(self, name: str) -> Any:
+        return self.file[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.file
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.file)
+
+    def __len__(self) -> int:
+        return len(self.file)
+
+    def __repr__(self) -> str:
+        return "Hdf5Handle({})".format(self._entry.file if self._entry is not None else "closed")
+
+    def __enter__(self) -> "Hdf5Handle":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Returns the file to the pool. The file is closed by the pool once no handle refers to it and it has been
+        idle for idle_timeout seconds, or more than max_idle files are idle.
+
+        :return: None
+        """
+        entry, self._entry = self._entry, None
+        if entry is not None:
+            self._pool.release(entry=entry)
+
+    def __del__(self) -> None:
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class Hdf5HandlePool(metaclass=Singleton):
+    """
+    This is a class for sharing open hdf5 files between the reads of a process. Files are opened read-only, in SWMR
+    mode where the file supports it, and keyed by path, version and open arguments, so every thread reading a hot
+    file uses the same file and chunk cache. Files no handle refers to are kept open until they have been idle for
+    idle_timeout seconds or more than max_idle files are idle.
+
+    Attributes:
+        rdcc_nbytes (Optional[int]): size in bytes of the chunk cache of each dataset, the hdf5 default if None
+        rdcc_nslots (Optional[int]): number of slots of the chunk cache hash table, ideally a prime about 100 times
+                                     the number of chunks the cache holds
+        rdcc_w0 (Optional[float]): chunk cache eviction policy, 1 evicts fully read chunks first
+        swmr (bool): if True, local files are opened in SWMR mode so a writer in another process can append to them
+        max_idle (int): maximum number of files kept open with no handle referring to them
+        idle_timeout (Optional[float]): seconds an unused file is kept open, kept until evicted if None
+        hits (int): number of handles served by a file that was already open
+        misses (int): number of handles that had to open the file
+        evictions (int): number of idle files closed
+    """
+    def __init__(self) -> None:
+        """
+        The constructor for the Hdf5HandlePool class.
+        """
+        self.rdcc_nbytes: Optional[int] = None
+        self.rdcc_nslots: Optional[int] = None
+        self.rdcc_w0: Optional[float] = None
+        self.swmr: bool = True
+        self.max_idle: int = 32
+        self.idle_timeout: Optional[float] = 300.0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._entries: Dict[Hashable, _PoolEntry] = {}
+        self._lock: threading.RLock = threading.RLock()
+
+    def configure(self, rdcc_nbytes: Optional[int] = None, rdcc_nslots: Optional[int] = None,
+                  rdcc_w0: Optional[float] = None, swmr: bool = True, max_idle: int = 32,
+                  idle_timeout: Optional[float] = 300.0) -> "Hdf5HandlePool":
+        """
+        Sets how files are opened and how long they are kept. Idle files are closed so files opened from now on use
+        the new settings.
+
+        :param rdcc_nbytes: (Optional[int]) size in bytes of the chunk cache of each dataset
+        :param rdcc_nslots: (Optional[int]) number of slots of the chunk cache hash table
+        :param rdcc_w0: (Optional[float]) chunk cache eviction policy between 0 and 1
+        :param swmr: (bool) if True, local files are opened in SWMR mode where they support it
+        :param max_idle: (int) maximum number of files kept open with no handle referring to them
+        :param idle_timeout: (Optional[float]) seconds an unused file is kept open
+        :return: (Hdf5HandlePool) the pool
+        """
+        with self._lock:
+            self.rdcc_nbytes = rdcc_nbytes
+            self.rdcc_nslots = rdcc_nslots
+            self.rdcc_w0 = rdcc_w0
+            self.swmr = swmr
+            self.max_idle = max_idle
+            self.idle_timeout = idle_timeout
+            self.clear()
+        return self
+
+    def open_options(self, **kwargs) -> Dict[str, Any]:
+        """
+        Gets the arguments files are opened with, the arguments passed overriding the chunk cache settings of the
+        pool.
+
+        :return: (Dict[str, Any]) arguments for h5py.File
+        """
+        options = {name: value for name, value in (("rdcc_nbytes", self.rdcc_nbytes),
+                                                   ("rdcc_nslots", self.rdcc_nslots),
+                                                   ("rdcc_w0", self.rdcc_w0)) if value is not None}
+        options.update(kwargs)
+        return options
+
+    def acquire(self, key: Optional[Hashable], open_file: Callable[[], h5py.File],
+                resources: Optional[List[Any]] = None) -> Hdf5Handle:
+        """
+        Gets a handle to a file, opening it only if no file with the same key is open.
+
+        :param key: (Optional[Hashable]) path, version and open arguments of the file, the file is not shared if None
+        :param open_file: (Callable[[], h5py.File]) opens the file
+        :param resources: (Optional[List[Any]]) objects the file is read from, such as a file object, closed with the
+                          file, or straight away if the file is already open
+        :return: (Hdf5Handle) the handle, to be closed when done with
+        """
+        resources = resources or []
+        with self._lock:
+            self._evict_expired()
+            entry = self._entries.get(key) if key is not None else None
+            if entry is not None and not entry.stale:
+                self.hits += 1
+                entry.references += 1
+                for resource in resources:
+                    resource.close()
+                return Hdf5Handle(pool=self, entry=entry)
+            self.misses += 1
+        entry = _PoolEntry(key=key, file=open_file(), resources=resources)
+        entry.references += 1
+        if key is not None:
+            with self._lock:
+                current = self._entries.get(key)
+                if current is not None and not current.stale:
+                    # another thread opened the file at the same time
+                    current.references += 1
+                    entry.close()
+                    return Hdf5Handle(pool=self, entry=current)
+                self._entries[key] = entry
+        else:
+            entry.stale = True
+        return Hdf5Handle(pool=self, entry=entry)
+
+    def release(self, entry: _PoolEntry) -> None:
+        """
+        Drops a reference to a file, closing it if it is stale or too many files are idle.
+
+        :param entry: (_PoolEntry) the file
+        :return: None
+        """
+        with self._lock:
+            entry.references -= 1
+            entry.last_used = time.monotonic()
+            if entry.references > 0:
+                return
+            if entry.stale:
+                self._close(entry=entry)
+                return
+            idle = sorted((candidate for candidate in self._entries.values() if candidate.references == 0),
+                          key=lambda candidate: candidate.last_used)
+            for candidate in idle[:max(len(idle) - self.max_idle, 0)]:
+                self._close(entry=candidate)
+                self.evictions += 1
+
+    def _evict_expired(self) -> None:
+        """
+        Closes the files that have been idle for longer than idle_timeout (private).
+
+        :return: None
+        """
+        if self.idle_timeout is None:
+            return
+        now = time.monotonic()
+        for entry in list(self._entries.values()):
+            if entry.references == 0 and now - entry.last_used > self.idle_timeout:
+                self._close(entry=entry)
+                self.evictions += 1
+
+    def _close(self, entry: _PoolEntry) -> None:
+        if self._entries.get(entry.key) is entry:
+            del self._entries[entry.key]
+        entry.close()
+
+    def invalidate_path(self, path: str) -> None:
+        """
+        Closes the idle files opened from a path and stops sharing the ones in use, which are closed when their last
+        handle is. Called before a file is written.
+
+        :param path: (str) path to the file
+        :return: None
+        """
+        self._invalidate_where(lambda key: key[0] == path)
+
+    def clear(self) -> None:
+        """
+        Closes every idle file and stops sharing the ones in use.
+
+        :return: None
+        """
+        self._invalidate_where(lambda key: True)
+
+    def _invalidate_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        with self._lock:
+            for entry in list(self._entries.values()):
+                if not predicate(entry.key):
+                    continue
+                entry.stale = True
+                del self._entries[entry.key]
+                if entry.references == 0:
+                    entry.close()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Gets the counters of the pool.
+
+        :return: (Dict[str, int]) hits, misses, evictions, open files and files in use
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "open": len(self._entries),
+                    "in_use": sum(1 for entry in self._entries.values() if entry.references > 0)}
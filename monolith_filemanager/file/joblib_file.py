@@ -33,3 +33,21 @@ class JoblibFile(File):
         :param data: (python dict) data to be written to file
         """
         joblib.dump(data, self.path)
+
+    def supports_buffer_write(self) -> bool:
+        """
+        Checks to see if the file can be written to a binary file object with write_to_buffer.
+
+        :return: True
+        """
+        return True
+
+    def write_to_buffer(self, data: Any, buffer: Any) -> None:
+        """
+        Writes data to a binary file object.
+
+        :param data: (python object) data to be written
+        :param buffer: (Any) writable binary file object
+        :return: None
+        """
+        joblib.dump(data, buffer)
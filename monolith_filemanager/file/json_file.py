@@ -36,3 +36,22 @@ class JSONFile(File):
         """
         with open(self.path, 'w') as data_file:
             json.dump(data, data_file)
+
+    def supports_buffer_write(self) -> bool:
+        """
+        Checks to see if the file can be written to a binary file object with write_to_buffer.
+
+        :return: True
+        """
+        return True
+
+    def write_to_buffer(self, data: Any, buffer: Any) -> None:
+        """
+        Writes data to a binary file object.
+
+        :param data: (python dict) data to be written
+        :param buffer: (Any) writable binary file object
+        :return: None
+        """
+        with self.text_buffer(buffer) as data_file:
+            json.dump(data, data_file)
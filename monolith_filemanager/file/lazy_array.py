@@ -0,0 +1,223 @@
+import threading
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+from .errors import NumpyFileError
+
+
+class LazyArray:
+    """
+    This is a class for indexing an array stored in a .npy file object without reading all of it. Only the header is
+    read when the proxy is made, indexing reads the rows the index touches along the first axis and then applies the
+    rest of the index to them. Rows of file objects with a prefetch_ranges method, such as S3ReadFile, are fetched
+    with concurrent ranged requests. Arrays stored in Fortran order are read in full the first time they are indexed.
+
+    Attributes:
+        shape (Tuple[int, ...]): shape of the array
+        dtype (np.dtype): data type of the array
+        fortran_order (bool): True if the array is stored in Fortran order
+        offset (int): offset of the data from the start of the file object
+    """
+    def __init__(self, buffer: Any, offset: int = 0) -> None:
+        """
+        The constructor for the LazyArray class. The file object is closed with the proxy.
+
+        :param buffer: (Any) readable, seekable binary file object holding a .npy file
+        :param offset: (int) offset of the .npy file from the start of the file object
+        """
+        self._buffer: Any = buffer
+        self._lock: threading.RLock = threading.RLock()
+        self._loaded: Optional[np.ndarray] = None
+        buffer.seek(offset)
+        version = np.lib.format.read_magic(buffer)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(buffer)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(buffer)
+        if dtype.hasobject:
+            raise NumpyFileError(message="arrays of python objects cannot be read lazily")
+        self.shape: Tuple[int, ...] = shape
+        self.dtype: np.dtype = dtype
+        self.fortran_order: bool = fortran_order
+        self.offset: int = buffer.tell()
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    @property
+    def size(self) -> int:
+        return int(np.prod(self.shape, dtype=np.int64))
+
+    @property
+    def nbytes(self) -> int:
+        return self.size * self.dtype.itemsize
+
+    @property
+    def row_bytes(self) -> int:
+        """
+        Gets the number of bytes of one row along the first axis.
+
+        :return: (int) bytes per row
+        """
+        return int(np.prod(self.shape[1:], dtype=np.int64)) * self.dtype.itemsize
+
+    def __len__(self) -> int:
+        if self.ndim == 0:
+            raise TypeError("len() of unsized object")
+        return self.shape[0]
+
+    def __repr__(self) -> str:
+        return "LazyArray(shape={}, dtype={})".format(self.shape, self.dtype)
+
+    def __array__(self, dtype: Any = None, copy: Any = None) -> np.ndarray:
+        data = self.load()
+        return data if dtype is None else data.astype(dtype)
+
+    def __enter__(self) -> "LazyArray":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def load(self) -> np.ndarray:
+        """
+        Reads the whole array.
+
+        :return: (np.ndarray) the array
+        """
+        if self._loaded is not None:
+            return self._loaded
+        data = self._read_rows(first=0, stop=self.shape[0] if self.ndim > 0 else 1)
+        if not self.fortran_order:
+            return data
+        self._loaded = data.reshape(-1).reshape(self.shape[::-1]).transpose()
+        return self._loaded
+
+    def __getitem__(self, key: Any) -> Any:
+        """
+        Reads the rows an index touches and applies the index to them.
+
+        :param key: (Any) numpy index, the first entry of which selects the rows read
+        :return: (Any) the indexed data
+        """
+        if not isinstance(key, tuple):
+            key = (key,)
+        if self.ndim == 0 or self.fortran_order or len(key) == 0 or key[0] is Ellipsis or key[0] is None:
+            return self.load()[key]
+        rows, rest = key[0], key[1:]
+        if isinstance(rows, (int, np.integer)):
+            row = self._row_indexes(rows=np.asarray(rows))
+            return self._read_rows(first=int(row), stop=int(row) + 1)[(0,) + rest]
+        if isinstance(rows, slice):
+            start, stop, step = rows.indices(self.shape[0])
+            indexes = range(start, stop, step)
+            if len(indexes) == 0:
+                return np.empty((0,) + tuple(self.shape[1:]), dtype=self.dtype)[rest]
+            if abs(step) == 1:
+                first = min(indexes[0], indexes[-1])
+                data = self._read_rows(first=first, stop=max(indexes[0], indexes[-1]) + 1)
+                return data[(slice(start - first, None, step),) + rest]
+            rows = np.arange(start, stop, step)
+        indexes = self._row_indexes(rows=np.asarray(rows))
+        runs = self._runs(rows=np.unique(indexes))
+        if not runs:
+            return np.empty((0,) + tuple(self.shape[1:]), dtype=self.dtype)[rest]
+        data = np.concatenate(self._read_runs(runs=runs))
+        numbers = np.concatenate([np.arange(first, stop) for first, stop in runs])
+        return data[(np.searchsorted(numbers, indexes),) + rest]
+
+    def _row_indexes(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Turns an index along the first axis into row numbers, checking that they are in bounds (private).
+
+        :param rows: (np.ndarray) integer or boolean index
+        :return: (np.ndarray) row numbers, in the order and shape of the index
+        """
+        if rows.dtype == bool:
+            if rows.shape != (self.shape[0],):
+                raise IndexError("boolean index of shape {} does not match axis 0 with size {}".format(
+                    rows.shape, self.shape[0]))
+            return np.flatnonzero(rows)
+        if rows.size == 0:
+            return rows.astype(np.int64)
+        if not np.issubdtype(rows.dtype, np.integer):
+            raise IndexError("only integers, slices and integer or boolean arrays are valid indices")
+        if rows.min() < -self.shape[0] or rows.max() >= self.shape[0]:
+            raise IndexError("index out of bounds for axis 0 with size {}".format(self.shape[0]))
+        return np.where(rows < 0, rows + self.shape[0], rows)
+
+    def _runs(self, rows: np.ndarray) -> List[Tuple[int, int]]:
+        """
+        Groups sorted row numbers into runs of rows read with one request, joining runs separated by less than a
+        block of the file object (private).
+
+        :param rows: (np.ndarray) sorted, unique row numbers
+        :return: (List[Tuple[int, int]]) first row and row after the last of each run
+        """
+        gap = max(getattr(self._buffer, "block_size", 0) // max(self.row_bytes, 1), 1)
+        runs = []
+        for row in rows.tolist():
+            if runs and row - runs[-1][1] < gap:
+                runs[-1][1] = row + 1
+            else:
+                runs.append([row, row + 1])
+        return [(first, stop) for first, stop in runs]
+
+    def _read_runs(self, runs: List[Tuple[int, int]]) -> List[np.ndarray]:
+        """
+        Reads runs of rows, prefetching as many runs at a time as fit in half of the block cache of the file object
+        (private).
+
+        :param runs: (List[Tuple[int, int]]) first row and row after the last of each run
+        :return: (List[np.ndarray]) the rows of each run
+        """
+        prefetch = getattr(self._buffer, "prefetch_ranges", None)
+        budget = getattr(self._buffer, "max_blocks", 0) * getattr(self._buffer, "block_size", 0) // 2
+        parts, batch, batch_bytes = [], [], 0
+        for run in runs + [None]:
+            run_bytes = (run[1] - run[0]) * self.row_bytes if run is not None else 0
+            if run is None or (batch and batch_bytes + run_bytes > budget):
+                if prefetch is not None and len(batch) > 1:
+                    prefetch([(self.offset + first * self.row_bytes, self.offset + stop * self.row_bytes)
+                              for first, stop in batch])
+                parts.extend(self._read_rows(first=first, stop=stop) for first, stop in batch)
+                batch, batch_bytes = [], 0
+            if run is not None:
+                batch.append(run)
+                batch_bytes += run_bytes
+        return parts
+
+    def _read_rows(self, first: int, stop: int) -> np.ndarray:
+        """
+        Reads rows along the first axis straight into a new array (private).
+
+        :param first: (int) first row
+        :param stop: (int) row after the last
+        :return: (np.ndarray) the rows
+        """
+        shape = (stop - first,) + tuple(self.shape[1:]) if self.ndim > 0 else ()
+        data = np.empty(shape, dtype=self.dtype)
+        if data.nbytes == 0:
+            return data
+        view = memoryview(data.reshape(-1).view(np.uint8))
+        count = 0
+        with self._lock:
+            self._buffer.seek(self.offset + first * self.row_bytes)
+            while count < data.nbytes:
+                read = self._buffer.readinto(view[count:])
+                if not read:
+                    break
+                count += read
+        if count != data.nbytes:
+            raise NumpyFileError(message="expected {} bytes but the file ended after {}".format(data.nbytes, count))
+        return data
+
+    def close(self) -> None:
+        """
+        Closes the file object the array is read from.
+
+        :return: None
+        """
+        self._buffer.close()
@@ -1,12 +1,82 @@
-from typing import Any, Union
+import io
+import os
+from collections.abc import Mapping
+from typing import Any, Iterator, List, Optional, Union
 
 from scipy.io import loadmat, whosmat
+from scipy.io.matlab import matfile_version
 import numpy as np
 import pandas as pd
 
 from .base import File
 from .errors import MatlabFileError
+from ..components.lru_cache import LRUCache
 from ..file import FilePath
+from ..singleton import Singleton
+
+
+class MatlabBytesCache(LRUCache, metaclass=Singleton):
+    """
+    This is a class for the process wide cache of the raw bytes of mat files, keyed by path, mtime and size so a
+    changed file is read again. Files larger than max_bytes are not cached.
+    """
+    def __init__(self) -> None:
+        """
+        The constructor for the MatlabBytesCache class.
+        """
+        super().__init__(max_entries=64, max_bytes=256 * 1024 ** 2, size_function=len)
+
+
+class MatlabVariables(Mapping):
+    """
+    This is a class for reading the variables of a MATLAB v7.3 file, which is an hdf5 file, as a mapping. Variables
+    are h5py datasets and groups, so only the chunks sliced are read. MATLAB stores arrays in column-major order so
+    the axes of a dataset are the reverse of those in MATLAB.
+
+    Attributes:
+        files (List[str]): names of the variables
+    """
+    def __init__(self, file: Any, variable_names: Optional[List[str]] = None) -> None:
+        """
+        The constructor for the MatlabVariables class. The hdf5 file is closed with the mapping.
+
+        :param file: (Any) the hdf5 file opened read-only
+        :param variable_names: (Optional[List[str]]) names of the variables exposed, every variable if None
+        """
+        self._file: Any = file
+        self.files: List[str] = [name for name in file if not name.startswith("#")
+                                 and (variable_names is None or name in variable_names)]
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.files:
+            raise KeyError("{} is not a variable in the file".format(key))
+        return self._file[key]
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self.files
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.files)
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def __repr__(self) -> str:
+        return "MatlabVariables(files={})".format(self.files)
+
+    def __enter__(self) -> "MatlabVariables":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes the hdf5 file the variables are read from.
+
+        :return: None
+        """
+        self._file.close()
 
 
 class MatlabFile(File):
@@ -20,46 +90,47 @@ class MatlabFile(File):
         :param path: (str/FilePath) path to the file
         """
         super().__init__(path=path)
-        self._file_data = {}
 
-    def load_bytes(self, file_path: str) -> bytes:
+    @staticmethod
+    def load_bytes(file_path: str) -> bytes:
         """
-        Load the raw data from S3 or locally.
+        Load the raw data of a local file, through the MatlabBytesCache.
 
         :param file_path: (str) full file path of data to load (e.g. './demo/Battery/mydata.mat')
         :return: (bytes) raw data bytes
         """
-
-        # Get raw data (or filename)
-        if file_path not in self._file_data:
-            # real_path = dataset_manager.get_dataset_file_path(file_path)
-            with open(file_path) as file:
-                self._file_data[file_path] = file.read()
-            return self._file_data[file_path]
-        else:
-            return self._file_data[file_path]
-
-    def _load_data(self, file_path: str) -> pd.DataFrame:
+        status = os.stat(file_path)
+        key = (file_path, status.st_mtime_ns, status.st_size)
+        cache = MatlabBytesCache()
+        data = cache.get(key)
+        if data is LRUCache.MISSING:
+            with open(file_path, "rb") as file:
+                data = file.read()
+            cache.put(key, data)
+        return data
+
+    def _load_data(self, file_path: str, variable_names: Optional[List[str]] = None) -> pd.DataFrame:
         """
         Load the data from a single file into a DataFrame.
 
         :param file_path: (str) full path of file
+        :param variable_names: (Optional[List[str]]) names of the variables loaded, every variable if None
         :return: (DataFrame) by merging requested variables of the same shape
         """
 
         # Load full cycle data and get columns for each cycle
         bytes_obj = self.load_bytes(file_path)
-        data = loadmat(bytes_obj)
+        data = loadmat(io.BytesIO(bytes_obj), variable_names=variable_names)
 
-        variables = list(data.keys())
+        variables = [key for key in data.keys() if not key.startswith("__")]
 
         # Get all requested variables (names and shapes)
-        whos = whosmat(bytes_obj)
+        whos = whosmat(io.BytesIO(bytes_obj))
         whos = [(name, shape, dtype) for name, shape, dtype in whos if name in variables]
 
         # Make sure there is only one unique shape for requested variables
         shapes = np.array([np.array(shape) for name, shape, dtype in whos])
-        if len(np.unique(shapes, axis=0)) != 1:
+        if len(np.unique(shapes, axis=0)) > 1:
             message = ", ".join([f"{name}: {shape}" for name, shape, dtype in whos])
             raise MatlabFileError(f'Unable to combine variables: {variables} due to different shapes: {message}')
 
@@ -83,13 +154,19 @@ class MatlabFile(File):
 
         return pd.DataFrame() if df is None else df
 
-    def read(self, **kwargs) -> Any:
+    def read(self, variable_names: Optional[List[str]] = None, **kwargs) -> Any:
         """
-        Gets data from file defined by the file path.
+        Gets data from file defined by the file path. v7.3 files are opened with h5py and their variables read
+        lazily, other versions are loaded by scipy which skips the variables not requested without decoding them.
 
-        :return: Data from the mat file
+        :param variable_names: (Optional[List[str]]) names of the variables read, every variable if None
+        :param kwargs: passed to scipy.io.loadmat, or to h5py.File for v7.3 files
+        :return: Data from the mat file, a MatlabVariables to be closed when done with for v7.3 files
         """
-        return loadmat(self.path)
+        if matfile_version(str(self.path))[0] == 2:
+            from .hdf5_file import Hdf5File
+            return MatlabVariables(file=Hdf5File(path=self.path).read(**kwargs), variable_names=variable_names)
+        return loadmat(self.path, variable_names=variable_names, **kwargs)
 
     def write(self, data: Any) -> None:
         raise MatlabFileError(message="write is not supported for matlab files")
@@ -0,0 +1,167 @@
+import io
+import zipfile
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Tuple, Union
+
+import numpy as np
+
+from .base import File
+from .errors import NumpyFileError
+from .zip_writer import ZipStreamWriter
+from ..path import FilePath
+
+
+class NpzArchive(Mapping):
+    """
+    This is a class for reading the arrays of an .npz archive as a mapping. Members are found through the central
+    directory of the archive when it is opened and an array is only read, and decompressed, when it is accessed, so
+    on an S3ReadFile only the end of the archive and the members accessed are downloaded.
+
+    Attributes:
+        files (List[str]): names of the arrays in the archive
+    """
+    def __init__(self, buffer: Any) -> None:
+        """
+        The constructor for the NpzArchive class. The file object is closed with the archive.
+
+        :param buffer: (Any) readable, seekable binary file object holding an .npz archive
+        """
+        self._buffer: Any = buffer
+        self._zip: zipfile.ZipFile = zipfile.ZipFile(buffer)
+        self._members: Dict[str, str] = {name[:-4] if name.endswith(".npy") else name: name
+                                         for name in self._zip.namelist()}
+        self.files: List[str] = list(self._members)
+
+    def __getitem__(self, key: str) -> Any:
+        """
+        Reads an array from the archive.
+
+        :param key: (str) name of the array
+        :return: (np.ndarray) the array, or the bytes of members that are not .npy files
+        """
+        member = self._members.get(key)
+        if member is None:
+            raise KeyError("{} is not a file in the archive".format(key))
+        if not member.endswith(".npy"):
+            return self._zip.read(member)
+        with self._zip.open(member) as file:
+            return np.lib.format.read_array(file, allow_pickle=False)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._members
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.files)
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def __repr__(self) -> str:
+        return "NpzArchive(files={})".format(self.files)
+
+    def __enter__(self) -> "NpzArchive":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes the archive and the file object it is read from.
+
+        :return: None
+        """
+        self._zip.close()
+        self._buffer.close()
+
+
+class NpzFile(File):
+    """
+    This is a class for managing the reading and writing of .npz archives of numpy arrays.
+    """
+    SUPPORTED_FORMATS = ["npz"]
+    CHUNK_SIZE: int = 4 * 1024 * 1024
+
+    def __init__(self, path: Union[str, FilePath]) -> None:
+        """
+        The constructor for the NpzFile class.
+
+        :param path: (str/FilePath) path to the file
+        """
+        super().__init__(path=path)
+
+    def read(self, **kwargs) -> NpzArchive:
+        """
+        Gets the arrays of the file defined by the file path, reading each one when it is accessed.
+
+        :return: (NpzArchive) mapping of array names to arrays, to be closed when done with
+        """
+        return self.read_lazy(buffer=open(self.path, "rb"))
+
+    def read_lazy(self, buffer: Any) -> NpzArchive:
+        """
+        Gets the arrays of an archive in a seekable binary file object, reading each one when it is accessed.
+
+        :param buffer: (Any) readable, seekable binary file object, closed with the archive
+        :return: (NpzArchive) mapping of array names to arrays
+        """
+        return NpzArchive(buffer=buffer)
+
+    def write(self, data: Dict[str, Any]) -> None:
+        """
+        Writes arrays to file.
+
+        :param data: (Dict[str, Any]) arrays to be written, keyed by name
+        :return: None
+        """
+        with open(self.path, "wb") as buffer:
+            self.write_to_buffer(data=data, buffer=buffer)
+
+    def supports_buffer_write(self) -> bool:
+        """
+        Checks to see if the file can be written to a binary file object with write_to_buffer.
+
+        :return: True
+        """
+        return True
+
+    def write_to_buffer(self, data: Dict[str, Any], buffer: Any) -> None:
+        """
+        Writes arrays to a binary file object, which does not need to be seekable. Arrays are stored as they are
+        unless compression_level is set, in which case they are deflated in chunks of CHUNK_SIZE bytes across
+        threads.
+
+        :param data: (Dict[str, Any]) arrays to be written, keyed by name
+        :param buffer: (Any) writable binary file object
+        :return: None
+        """
+        if not isinstance(data, Mapping) or not all(isinstance(name, str) for name in data):
+            raise NumpyFileError(message="data written to {} has to be a dictionary of arrays keyed by name".format(
+                self.path))
+        writer = ZipStreamWriter(buffer=buffer, compression_level=self.compression_level, chunk_size=self.CHUNK_SIZE)
+        writer.write_members(self._member(name=name, array=array) for name, array in data.items())
+        writer.close()
+
+    def _member(self, name: str, array: Any) -> Tuple[str, int, List[Any]]:
+        """
+        Serialises an array to the .npy format without copying its data if it is contiguous (private).
+
+        :param name: (str) name of the array
+        :param array: (Any) the array
+        :return: (Tuple[str, int, List[Any]]) member name, size and chunks of the .npy file
+        """
+        array = np.asanyarray(array)
+        if array.dtype.hasobject:
+            raise NumpyFileError(message="{} is an array of python objects which cannot be written to {}".format(
+                name, self.path))
+        header = io.BytesIO()
+        header_data = np.lib.format.header_data_from_array_1_0(array)
+        try:
+            np.lib.format.write_array_header_1_0(header, header_data)
+        except ValueError:
+            header = io.BytesIO()
+            np.lib.format.write_array_header_2_0(header, header_data)
+        if header_data["fortran_order"]:
+            array = array.T
+        data = np.ascontiguousarray(array).reshape(-1).view(np.uint8)
+        return name + ".npy", header.tell() + data.nbytes, [header.getvalue(), data]
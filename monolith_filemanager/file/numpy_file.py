@@ -2,6 +2,8 @@ import numpy as np
 from typing import Any, Union
 
 from .base import File
+from .errors import NumpyFileError
+from .lazy_array import LazyArray
 from ..path import FilePath
 
 
@@ -10,6 +12,7 @@ class NumpyFile(File):
     This is a class for managing the reading and writing of numpy objects.
     """
     SUPPORTED_FORMATS = ["npy"]
+    LAZY_MMAP_MODES = ["r", "c"]
 
     def __init__(self, path: Union[str, FilePath]) -> None:
         """
@@ -21,11 +24,27 @@ class NumpyFile(File):
 
     def read(self, **kwargs) -> Any:
         """
-        Gets data from file defined by the file path.
+        Gets data from file defined by the file path. Passing mmap_mode memory maps the file instead of reading it,
+        so slicing a large array only reads the pages it touches.
 
-        :return: Data from the json file
+        :return: (Union[np.ndarray, np.memmap]) Data from the numpy file
         """
-        return np.load(self.path)
+        return np.load(self.path, **kwargs)
+
+    def read_lazy(self, buffer: Any, mmap_mode: str = "r") -> LazyArray:
+        """
+        Gets a read-only proxy of the array in a seekable binary file object that reads only the rows it is indexed
+        with. This stands in for a memory map where the file is not on local disk, such as an S3ReadFile.
+
+        :param buffer: (Any) readable, seekable binary file object, closed with the proxy
+        :param mmap_mode: (str) "r", or "c" as every index returns a new array that can be changed
+        :return: (LazyArray) the proxy
+        """
+        if mmap_mode not in self.LAZY_MMAP_MODES:
+            buffer.close()
+            raise NumpyFileError(message="{} files that are not on local disk can only be opened with mmap_mode in "
+                                         "{}, not {}".format(self.path, self.LAZY_MMAP_MODES, mmap_mode))
+        return LazyArray(buffer=buffer)
 
     def write(self, data: Any) -> None:
         """
@@ -36,3 +55,21 @@ class NumpyFile(File):
         """
 
         return np.save(self.path, data, allow_pickle=False)
+
+    def supports_buffer_write(self) -> bool:
+        """
+        Checks to see if the file can be written to a binary file object with write_to_buffer.
+
+        :return: True
+        """
+        return True
+
+    def write_to_buffer(self, data: Any, buffer: Any) -> None:
+        """
+        Writes data to a binary file object.
+
+        :param data: (python object) data to be written
+        :param buffer: (Any) writable binary file object
+        :return: None
+        """
+        np.save(buffer, data, allow_pickle=False)
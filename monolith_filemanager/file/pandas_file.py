@@ -1,8 +1,11 @@
+import os
+
 import pandas as pd
-from typing import Any, Union
+from typing import Any, Hashable, Iterator, List, Optional, Tuple, Union
 
 from .base import File
 from .errors import PandasFileError
+from ..components.lru_cache import LRUCache
 from ..path import FilePath
 
 accepted_methods = Union[pd.read_parquet, pd.read_csv, pd.read_excel, pd.read_table, pd.read_table]
@@ -23,6 +26,14 @@ class PandasFile(File):
 
     SUPPORTED_FORMATS = list(LOADING_METHODS.keys())
 
+    BUFFER_WRITE_FORMATS = ["parquet", "csv", "dat", "data"]
+
+    BUFFER_READ_FORMATS = ["parquet", "csv", "dat", "data"]
+
+    CHUNK_FORMATS = ["csv", "dat", "data"]
+
+    FOOTER_CACHE = LRUCache(max_entries=256)
+
     LOADING_KWARGS = {
         "dat": {"sep": "\s+"},
         "data": {"sep": "\s+"}
@@ -55,12 +66,234 @@ class PandasFile(File):
 
     def read(self, **kwargs) -> Any:
         """
-        Gets data from file defined by file path.
-        
+        Gets data from file defined by file path. Parquet files accept columns and filters, which pandas pushes down
+        to the reader, and row_groups to read only some row groups. Passing chunksize to csv, dat and data files
+        returns an iterator of data frames of chunksize rows instead, so files larger than memory can be processed.
+
         :return: Data from file
         """
+        if kwargs.get("chunksize") is not None:
+            return self._iter_chunks(source=self.path, **kwargs)
+        if self.path.file_type == "parquet" and kwargs.get("row_groups") is not None:
+            stat = os.stat(self.path)
+            with open(self.path, "rb") as buffer:
+                return self._read_parquet(buffer=buffer, validator=(str(self.path), stat.st_mtime_ns, stat.st_size),
+                                          **kwargs)
         return self.LOADING_METHODS[self.path.file_type](self.path, **kwargs)
 
+    def supports_buffer_read(self) -> bool:
+        """
+        Checks to see if the file can be read from a file object with read_from_buffer.
+
+        :return: True if the file type is in self.BUFFER_READ_FORMATS, False if not
+        """
+        return self.path.file_type in self.BUFFER_READ_FORMATS
+
+    def read_from_buffer(self, buffer: Any, **kwargs) -> Any:
+        """
+        Reads a data frame from a seekable binary file object. Parquet files accept columns, filters and row_groups:
+        the footer is cached per file version, row groups whose statistics rule out the filters are skipped and only
+        the column chunks needed are read. File objects with a prefetch_ranges method, such as S3ReadFile, have the
+        byte ranges of those column chunks fetched concurrently before they are decoded. Passing chunksize to csv,
+        dat and data files returns an iterator of data frames that reads the file object as it goes.
+
+        :param buffer: (Any) readable, seekable binary file object
+        :return: (Union[pd.DataFrame, Iterator[pd.DataFrame]]) data from the file object
+        """
+        if kwargs.get("chunksize") is not None:
+            return self._iter_chunks(source=buffer, **kwargs)
+        if self.path.file_type == "parquet":
+            validator = None
+            if getattr(buffer, "etag", None) is not None:
+                validator = (buffer.name, buffer.etag, buffer.size)
+            return self._read_parquet(buffer=buffer, validator=validator, **kwargs)
+        return self.LOADING_METHODS[self.path.file_type](buffer, **kwargs)
+
+    def _iter_chunks(self, source: Any, chunksize: int, **kwargs) -> Iterator[pd.DataFrame]:
+        """
+        Reads a text table chunksize rows at a time (private). Only one chunk and the read buffer of the source are
+        held in memory at once.
+
+        :param source: (Any) path or binary file object of the table
+        :param chunksize: (int) number of rows in each data frame
+        :param kwargs: passed to the pandas loading method
+        :return: (Iterator[pd.DataFrame]) the data frames in file order
+        """
+        if self.path.file_type not in self.CHUNK_FORMATS:
+            raise PandasFileError(message="chunked reads are only supported for {}, not {}".format(
+                self.CHUNK_FORMATS, self.path.file_type))
+        with self.LOADING_METHODS[self.path.file_type](source, chunksize=chunksize, **kwargs) as reader:
+            for chunk in reader:
+                yield chunk
+
+    def _read_parquet(self, buffer: Any, validator: Optional[Hashable], columns: Optional[List[str]] = None,
+                      filters: Optional[list] = None, row_groups: Optional[List[int]] = None,
+                      **kwargs) -> pd.DataFrame:
+        """
+        Reads the selected columns and row groups of a parquet file object (private).
+
+        :param buffer: (Any) readable, seekable binary file object
+        :param validator: (Optional[Hashable]) identifies the version of the file for the footer cache, the footer
+                          is not cached if None
+        :param columns: (Optional[List[str]]) columns to be read, all columns if None
+        :param filters: (Optional[list]) pyarrow filters in disjunctive normal form, a list of (column, op, value)
+                        tuples or a list of such lists
+        :param row_groups: (Optional[List[int]]) indexes of the row groups to be read, all row groups if None
+        :param kwargs: passed to pyarrow.Table.to_pandas
+        :return: (pd.DataFrame) the data read
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        metadata = self.FOOTER_CACHE.get(validator) if validator is not None else LRUCache.MISSING
+        if metadata is LRUCache.MISSING:
+            metadata = pq.read_metadata(buffer)
+            if validator is not None:
+                self.FOOTER_CACHE.put(validator, metadata)
+        parquet_file = pq.ParquetFile(buffer, metadata=metadata)
+        filters = self._normalise_filters(filters=filters)
+        groups = list(range(metadata.num_row_groups)) if row_groups is None else list(row_groups)
+        if filters:
+            groups = [group for group in groups if self._may_match(row_group=metadata.row_group(group),
+                                                                   filters=filters)]
+        read_columns = columns
+        if columns is not None and filters:
+            read_columns = list(columns) + [predicate[0] for conjunction in filters for predicate in conjunction
+                                            if predicate[0] not in columns]
+        tables = [parquet_file.read_row_groups(batch, columns=read_columns, use_threads=True)
+                  for batch in self._prefetch_batches(buffer=buffer, metadata=metadata, groups=groups,
+                                                      columns=read_columns)]
+        if tables:
+            table = pa.concat_tables(tables)
+        else:
+            table = parquet_file.schema_arrow.empty_table()
+            if read_columns is not None:
+                table = table.select(read_columns)
+        if filters:
+            if not hasattr(pq, "filters_to_expression"):
+                raise PandasFileError(message="filtering parquet files needs pyarrow 10 or later, not {}".format(
+                    pa.__version__))
+            table = table.filter(pq.filters_to_expression(filters))
+        if columns is not None:
+            table = table.select(list(columns))
+        return table.to_pandas(**kwargs)
+
+    @staticmethod
+    def _prefetch_batches(buffer: Any, metadata: Any, groups: List[int],
+                          columns: Optional[List[str]]) -> Iterator[List[int]]:
+        """
+        Splits the row groups into batches whose column chunks fit in the block cache of the file object and
+        prefetches each batch just before it is read (private). A row group larger than the block cache is read on
+        its own without a prefetch, as its blocks would be evicted before they are read. File objects without
+        prefetch_ranges get a single batch.
+
+        :param buffer: (Any) readable, seekable binary file object
+        :param metadata: (pyarrow.parquet.FileMetaData) footer of the file
+        :param groups: (List[int]) indexes of the row groups to be read
+        :param columns: (Optional[List[str]]) columns to be read, all columns if None
+        :return: (Iterator[List[int]]) the batches of row groups, yielded once they are prefetched
+        """
+        if not groups:
+            return
+        if not hasattr(buffer, "prefetch_ranges"):
+            yield groups
+            return
+        capacity = getattr(buffer, "max_blocks", 1) * getattr(buffer, "block_size", 1)
+        budget = capacity // 2
+        batch: List[int] = []
+        ranges: List[Tuple[int, int]] = []
+        size = 0
+        for group in groups:
+            group_ranges = PandasFile._column_ranges(row_group=metadata.row_group(group), columns=columns)
+            group_size = sum(end - start for start, end in group_ranges)
+            if batch and (size + group_size > budget or group_size > capacity):
+                buffer.prefetch_ranges(ranges)
+                yield batch
+                batch, ranges, size = [], [], 0
+            if group_size > capacity:
+                yield [group]
+                continue
+            batch.append(group)
+            ranges += group_ranges
+            size += group_size
+        if batch:
+            buffer.prefetch_ranges(ranges)
+            yield batch
+
+    @staticmethod
+    def _column_ranges(row_group: Any, columns: Optional[List[str]]) -> List[Tuple[int, int]]:
+        """
+        Gets the byte ranges of the column chunks of a row group (private).
+
+        :param row_group: (pyarrow.parquet.RowGroupMetaData) metadata of the row group
+        :param columns: (Optional[List[str]]) columns to be read, all columns if None
+        :return: (List[Tuple[int, int]]) offset of the first byte and offset after the last byte of each chunk
+        """
+        ranges = []
+        for index in range(row_group.num_columns):
+            column = row_group.column(index)
+            if columns is not None and column.path_in_schema.split(".")[0] not in columns:
+                continue
+            start = column.data_page_offset
+            if column.has_dictionary_page and column.dictionary_page_offset is not None:
+                start = min(start, column.dictionary_page_offset)
+            ranges.append((start, start + column.total_compressed_size))
+        return ranges
+
+    @staticmethod
+    def _normalise_filters(filters: Optional[list]) -> List[List[tuple]]:
+        """
+        Puts filters in disjunctive normal form, a list of lists of (column, op, value) tuples (private).
+
+        :param filters: (Optional[list]) a list of tuples or a list of lists of tuples
+        :return: (List[List[tuple]]) the filters, empty if there are none
+        """
+        if not filters:
+            return []
+        if isinstance(filters[0], tuple):
+            return [list(filters)]
+        return [list(conjunction) for conjunction in filters]
+
+    @staticmethod
+    def _may_match(row_group: Any, filters: List[List[tuple]]) -> bool:
+        """
+        Checks the min and max statistics of a row group against filters (private).
+
+        :param row_group: (pyarrow.parquet.RowGroupMetaData) metadata of the row group
+        :param filters: (List[List[tuple]]) filters in disjunctive normal form
+        :return: (bool) False if no row of the row group can match the filters
+        """
+        statistics = {}
+        for index in range(row_group.num_columns):
+            column = row_group.column(index)
+            if column.statistics is not None and column.statistics.has_min_max:
+                statistics[column.path_in_schema] = (column.statistics.min, column.statistics.max)
+
+        def predicate_may_match(name: str, operation: str, value: Any) -> bool:
+            if name not in statistics:
+                return True
+            minimum, maximum = statistics[name]
+            try:
+                if operation in ("=", "=="):
+                    return minimum <= value <= maximum
+                if operation == "!=":
+                    return not minimum == maximum == value
+                if operation == "<":
+                    return minimum < value
+                if operation == "<=":
+                    return minimum <= value
+                if operation == ">":
+                    return maximum > value
+                if operation == ">=":
+                    return maximum >= value
+                if operation == "in":
+                    return any(minimum <= item <= maximum for item in value)
+            except TypeError:
+                return True
+            return True
+
+        return any(all(predicate_may_match(*predicate) for predicate in conjunction) for conjunction in filters)
+
     def write(self, data: pd.DataFrame) -> None:
         """
         Writes data to file.
@@ -68,16 +301,48 @@ class PandasFile(File):
         :param data: (pandas data frame) data to be written to file
         :return: None
         """
+        self._check_data(data=data)
+        if self.path.file_type == "parquet":
+            self._map_write_functions(data=data)(self.path, index=False)
+        else:
+            self._map_write_functions(data=data)(self.path, header=True, index=False)
+
+    def supports_buffer_write(self) -> bool:
+        """
+        Checks to see if the file can be written to a binary file object with write_to_buffer.
+
+        :return: True if the file type is in self.BUFFER_WRITE_FORMATS, False if not
+        """
+        return self.path.file_type in self.BUFFER_WRITE_FORMATS
+
+    def write_to_buffer(self, data: pd.DataFrame, buffer: Any) -> None:
+        """
+        Writes data to a binary file object.
+
+        :param data: (pandas data frame) data to be written
+        :param buffer: (Any) writable binary file object
+        :return: None
+        """
+        self._check_data(data=data)
+        if self.path.file_type == "parquet":
+            self._map_write_functions(data=data)(buffer, index=False)
+        else:
+            with self.text_buffer(buffer) as text_buffer:
+                self._map_write_functions(data=data)(text_buffer, header=True, index=False)
+
+    def _check_data(self, data: Any) -> None:
+        """
+        Checks that the data is a pandas data frame (hidden).
+
+        :param data: (Any) data to be written to file
+        :return: None
+        """
         if not isinstance(data, pd.DataFrame):
             raise PandasFileError(
                 message=
                 "data passed to write method isn't a pandas data frame. Please use pandas data frame for {}".format(
                     self.SUPPORTED_FORMATS
                 ))
-        if self.path.file_type == "parquet":
-            self._map_write_functions(data=data)(self.path, index=False)
-        else:
-            self._map_write_functions(data=data)(self.path, header=True, index=False)
 
     @staticmethod
     def supports_s3():
@@ -40,3 +40,21 @@ class StandardPickleFile(File):
         """
         with open(self.path, "wb") as file:
             pickle.dump(data, file)
+
+    def supports_buffer_write(self) -> bool:
+        """
+        Checks to see if the file can be written to a binary file object with write_to_buffer.
+
+        :return: True
+        """
+        return True
+
+    def write_to_buffer(self, data: Any, buffer: Any) -> None:
+        """
+        Writes data to a binary file object.
+
+        :param data: (python object) data to be written
+        :param buffer: (Any) writable binary file object
+        :return: None
+        """
+        pickle.dump(data, buffer)
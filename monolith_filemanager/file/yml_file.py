@@ -1,4 +1,4 @@
-from typing import Dict, Union
+from typing import Any, Dict, Union
 
 import yaml
 
@@ -46,3 +46,24 @@ class YmlFile(File):
         file = open(yml_path, 'w')
         yaml.dump(data, file)
         file.close()
+
+    def supports_buffer_write(self) -> bool:
+        """
+        Checks to see if the file can be written to a binary file object with write_to_buffer.
+
+        :return: True
+        """
+        return True
+
+    def write_to_buffer(self, data: Dict, buffer: Any) -> None:
+        """
+        Writes data to a binary file object.
+
+        :param data: (dict) data to be written
+        :param buffer: (Any) writable binary file object
+        :return: None
+        """
+        if not isinstance(data, dict):
+            raise YamlFileError(message="{} data supplied instead of dict".format(type(data)))
+        with self.text_buffer(buffer) as file:
+            yaml.dump(data, file)
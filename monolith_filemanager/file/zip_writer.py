@@ -0,0 +1,180 @@
+import struct
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+
+ZIP64_LIMIT: int = 0xFFFFFFFF
+# deflate can grow incompressible data slightly, members this close to the limit are written as zip64
+ZIP64_MARGIN: int = 64 * 1024 * 1024
+_MASK: int = 0xFFFFFFFF
+# bit 3: sizes and CRC follow the data in a data descriptor, bit 11: names are utf-8
+_FLAGS: int = 0x808
+
+
+def _deflate(data: Any, level: int, last: bool) -> bytes:
+    """
+    Compresses one piece of a member to raw deflate data. Every piece but the last ends on a byte boundary with a
+    sync flush, so pieces compressed independently join into one deflate stream.
+
+    :param data: (Any) bytes-like piece
+    :param level: (int) zlib compression level
+    :param last: (bool) True if the piece is the last of its member
+    :return: (bytes) the compressed piece
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+
+class _Member:
+    """
+    This is a class for the state of a member of a ZipStreamWriter (private).
+    """
+    def __init__(self, name: str, offset: int, zip64: bool) -> None:
+        self.name: bytes = name.encode("utf-8")
+        self.offset: int = offset
+        self.zip64: bool = zip64
+        self.crc: int = 0
+        self.compressed_size: int = 0
+        self.size: int = 0
+
+
+class ZipStreamWriter:
+    """
+    This is a class for writing a zip archive to a binary file object that does not need to be seekable, such as an
+    S3WriteFile. Members are split into pieces that are deflated concurrently across threads and written in order,
+    with their CRC and sizes in a data descriptor after them. Members, offsets and archives too large for the zip
+    format are written with zip64 records.
+
+    Attributes:
+        compression_level (Optional[int]): zlib level members are deflated at, members are stored if None
+        chunk_size (int): number of bytes of a member compressed by one thread
+        max_workers (Optional[int]): number of threads compressing pieces, decided by ThreadPoolExecutor if None
+    """
+    def __init__(self, buffer: Any, compression_level: Optional[int] = None, chunk_size: int = 4 * 1024 * 1024,
+                 max_workers: Optional[int] = None) -> None:
+        """
+        The constructor for the ZipStreamWriter class.
+
+        :param buffer: (Any) writable binary file object, left open when the archive is closed
+        :param compression_level: (Optional[int]) zlib level members are deflated at, members are stored if None
+        :param chunk_size: (int) number of bytes of a member compressed by one thread
+        :param max_workers: (Optional[int]) number of threads compressing pieces
+        """
+        self.compression_level: Optional[int] = compression_level
+        self.chunk_size: int = chunk_size
+        self.max_workers: Optional[int] = max_workers
+        self._buffer: Any = buffer
+        self._offset: int = 0
+        self._members: List[_Member] = []
+        self._current: Optional[_Member] = None
+        now = time.localtime()
+        self._time: int = now.tm_hour << 11 | now.tm_min << 5 | now.tm_sec // 2
+        self._date: int = max(now.tm_year - 1980, 0) << 9 | now.tm_mon << 5 | now.tm_mday
+
+    @property
+    def method(self) -> int:
+        return zlib.DEFLATED if self.compression_level is not None else 0
+
+    def write_members(self, members: Iterable[Tuple[str, int, List[Any]]]) -> None:
+        """
+        Writes members to the archive. Pieces of every member are compressed concurrently, a bounded number ahead of
+        the piece being written, so memory use does not grow with the archive.
+
+        :param members: (Iterable[Tuple[str, int, List[Any]]]) name, uncompressed size and bytes-like chunks of each
+                        member, chunks larger than chunk_size are split into pieces
+        :return: None
+        """
+        if self.compression_level is None:
+            for member, piece, last in self._pieces(members=members):
+                self._write_piece(member=member, data=piece, compressed=piece, last=last)
+            return
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = deque()
+            for member, piece, last in self._pieces(members=members):
+                pending.append((member, piece, last, executor.submit(_deflate, piece, self.compression_level, last)))
+                if len(pending) > 2 * executor._max_workers:
+                    self._write_pending(pending=pending)
+            while pending:
+                self._write_pending(pending=pending)
+
+    def _pieces(self, members: Iterable[Tuple[str, int, List[Any]]]) -> Iterator[Tuple[_Member, Any, bool]]:
+        """
+        Splits members into pieces of at most chunk_size bytes (private). Members are created as their first piece is
+        reached, their offsets being set when the piece is written.
+
+        :param members: (Iterable[Tuple[str, int, List[Any]]]) name, uncompressed size and chunks of each member
+        :return: (Iterator[Tuple[_Member, Any, bool]]) member, piece and whether the piece is the last of the member
+        """
+        for name, size, chunks in members:
+            member = _Member(name=name, offset=-1, zip64=size + ZIP64_MARGIN >= ZIP64_LIMIT)
+            views = [memoryview(chunk).cast("B") for chunk in chunks] or [memoryview(b"")]
+            for index, view in enumerate(views):
+                starts = range(0, len(view), self.chunk_size) or range(1)
+                for start in starts:
+                    last = index == len(views) - 1 and start == starts[-1]
+                    yield member, view[start:start + self.chunk_size], last
+
+    def _write_pending(self, pending: deque) -> None:
+        member, piece, last, future = pending.popleft()
+        self._write_piece(member=member, data=piece, compressed=future.result(), last=last)
+
+    def _write(self, data: Any) -> None:
+        self._buffer.write(data)
+        self._offset += memoryview(data).nbytes
+
+    def _write_piece(self, member: _Member, data: Any, compressed: Any, last: bool) -> None:
+        """
+        Writes a piece of a member, starting the member with its local header if it has not been started and ending
+        it with its data descriptor if the piece is the last (private).
+
+        :param member: (_Member) the member the piece belongs to
+        :param data: (Any) the uncompressed piece
+        :param compressed: (Any) the piece as written to the archive
+        :param last: (bool) True if the piece is the last of its member
+        :return: None
+        """
+        if member.offset < 0:
+            member.offset = self._offset
+            extra = struct.pack("<HHQQ", 1, 16, 0, 0) if member.zip64 else b""
+            self._write(struct.pack("<IHHHHHIIIHH", 0x04034b50, 45 if member.zip64 else 20, _FLAGS, self.method,
+                                    self._time, self._date, 0, _MASK if member.zip64 else 0,
+                                    _MASK if member.zip64 else 0, len(member.name), len(extra)) + member.name + extra)
+        member.crc = zlib.crc32(data, member.crc)
+        member.size += len(data)
+        member.compressed_size += memoryview(compressed).nbytes
+        self._write(compressed)
+        if last:
+            if not member.zip64 and max(member.size, member.compressed_size) >= ZIP64_LIMIT:
+                raise ValueError("{} was declared smaller than it is".format(member.name.decode("utf-8")))
+            self._write(struct.pack("<IIQQ" if member.zip64 else "<IIII", 0x08074b50, member.crc,
+                                    member.compressed_size, member.size))
+            self._members.append(member)
+
+    def close(self) -> None:
+        """
+        Writes the central directory and the end of the archive. The file object is left open.
+
+        :return: None
+        """
+        directory_offset = self._offset
+        for member in self._members:
+            values = [value for value in (member.size, member.compressed_size, member.offset) if value >= ZIP64_LIMIT]
+            extra = struct.pack("<HH" + "Q" * len(values), 1, 8 * len(values), *values) if values else b""
+            fields = [_MASK if value >= ZIP64_LIMIT else value
+                      for value in (member.compressed_size, member.size, member.offset)]
+            self._write(struct.pack("<IHHHHHHIIIHHHHHII", 0x02014b50, 45, 45 if values else 20, _FLAGS, self.method,
+                                    self._time, self._date, member.crc, fields[0], fields[1], len(member.name),
+                                    len(extra), 0, 0, 0, 0o644 << 16, fields[2]) + member.name + extra)
+        directory_size = self._offset - directory_offset
+        count = len(self._members)
+        if count >= 0xFFFF or directory_offset >= ZIP64_LIMIT or directory_size >= ZIP64_LIMIT:
+            end_offset = self._offset
+            self._write(struct.pack("<IQHHIIQQQQ", 0x06064b50, 44, 45, 45, 0, 0, count, count, directory_size,
+                                    directory_offset))
+            self._write(struct.pack("<IIQI", 0x07064b50, 0, end_offset, 1))
+        self._write(struct.pack("<IHHHHIIH", 0x06054b50, 0, 0, min(count, 0xFFFF), min(count, 0xFFFF),
+                                _MASK if directory_size >= ZIP64_LIMIT else directory_size,
+                                _MASK if directory_offset >= ZIP64_LIMIT else directory_offset, 0))
@@ -1,16 +1,21 @@
 import os
+from typing import Optional
 
 
 class FilePath(str):
     """
-    This is a class for managing the path to a file.
+    This is a class for managing the path to a file. Compressed files such as data.csv.gz have the file type of the
+    file inside them and the compression as a separate attribute.
 
     Attributes:
         file (str): name of file at the end of path
-        file_type (str): file extension
+        file_type (str): file extension, ignoring the compression extension
+        compression (Optional[str]): compression extension (gz, bz2, xz or zst), None if the file is not compressed
         root (str): string leading up to the file
         s3 (bool): True if pointing to s3
     """
+    COMPRESSION_EXTENSIONS = ["gz", "bz2", "xz", "zst"]
+
     def __init__(self, path: str) -> None:
         """
         The constructor for the FilePath class.
@@ -20,6 +25,7 @@ class FilePath(str):
         super().__init__()
         self.file: str = path.split("/")[-1]
         self.file_type: str = self.get_file_type(file_string=self.file)
+        self.compression: Optional[str] = self.get_compression(file_string=self.file)
         self.root: str = "/".join(path.split("/")[0:-1]) + "/"
         self.s3: bool = self.check_if_s3(path_string=path)
 
@@ -36,12 +42,32 @@ class FilePath(str):
     @staticmethod
     def get_file_type(file_string: str) -> str:
         """
-        Gets file extension.
+        Gets file extension. The extension before a compression extension is used for compressed files, so
+        data.csv.gz gives csv while archive.gz gives gz.
 
         :param file_string: (str) file to be checked
         :return: (str) file extension
         """
-        return file_string.split(".")[-1] if "." in file_string else None
+        if "." not in file_string:
+            return None
+        extensions = file_string.split(".")
+        if FilePath.get_compression(file_string=file_string) is not None:
+            return extensions[-2]
+        return extensions[-1]
+
+    @staticmethod
+    def get_compression(file_string: str) -> Optional[str]:
+        """
+        Gets the compression extension of a compressed file, which needs an extension before it to say what is
+        compressed.
+
+        :param file_string: (str) file to be checked
+        :return: (Optional[str]) compression extension, None if the file is not compressed
+        """
+        extensions = file_string.split(".")
+        if len(extensions) > 2 and extensions[-2] != "" and extensions[-1] in FilePath.COMPRESSION_EXTENSIONS:
+            return extensions[-1]
+        return None
 
     @property
     def root_exists(self) -> bool:
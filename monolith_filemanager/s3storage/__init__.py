@@ -1,9 +1,18 @@
 import os
-from typing import Tuple, List, Union, Any
+import tempfile
+from typing import Dict, Tuple, List, Union, Any, Optional, Iterable, Iterator
 
 from .bucket_manager import BucketManager
+from .client_manager import ClientManager
+from .content_cache import ContentCache
 from .errors import V1EngineError
 from .file_manager import FileManager
+from .listing_cache import ListingCache
+from .metadata_cache import MetadataCache
+from .s3_file import S3ReadFile, S3WriteFile
+from .transfer import TransferSettings
+from ..components.dir_entry import DirEntry
+from ..components.name_increment import candidate_names
 from ..path import FilePath
 
 
@@ -12,8 +21,9 @@ class V1Engine(BucketManager, FileManager):
     This is the main interface for managing operations for s3 buckets and files.
 
     Attributes:
-        resource (object): object managing the resource for s3 connection
-        client (object): object managing the client for s3 connection
+        resource (object): object managing the resource for s3 connection (one per thread)
+        client (object): object managing the client for s3 connection (one per process)
+        client_manager (ClientManager): builds the client and resources lazily and rebuilds them after a fork
     """
     _singleton = None
 
@@ -24,8 +34,11 @@ class V1Engine(BucketManager, FileManager):
 
     def __init__(self) -> None:
         """
-        The constructor for the V1Engine class.
+        The constructor for the V1Engine class. The singleton is only initialised on its first construction so the
+        clients and tuned settings are reused by every later construction.
         """
+        if self.__dict__.get("_initialised"):
+            return
         try:
             import boto3
         except ImportError:
@@ -33,10 +46,146 @@ class V1Engine(BucketManager, FileManager):
                 message="AWS s3 file management requires boto3 to work. Run the command: 'file-install-aws' to install "
                         "the required modules"
         )
+        self.client_manager: ClientManager = ClientManager()
         BucketManager.__init__(self)
         FileManager.__init__(self)
-        self.client = boto3.client('s3')
-        self.resource = boto3.resource('s3')
+        self._initialised: bool = True
+
+    @property
+    def client(self) -> Any:
+        return self.client_manager.client
+
+    @client.setter
+    def client(self, value: Optional[Any]) -> None:
+        self.client_manager.client = value
+
+    @property
+    def resource(self) -> Any:
+        return self.client_manager.resource
+
+    @resource.setter
+    def resource(self, value: Optional[Any]) -> None:
+        self.client_manager.resource = value
+
+    def configure_clients(self, max_pool_connections: Optional[int] = None, tcp_keepalive: Optional[bool] = None,
+                          connect_timeout: Optional[float] = None, read_timeout: Optional[float] = None) -> None:
+        """
+        Tunes the connections used by the s3 client and resources. The pool should have at least as many
+        connections as the transfer max_concurrency. Settings that are not passed keep their current value.
+
+        :param max_pool_connections: (Optional[int]) maximum number of connections kept open in the pool
+        :param tcp_keepalive: (Optional[bool]) if True, TCP keep-alive is turned on for the pooled connections
+        :param connect_timeout: (Optional[float]) seconds before a connection attempt times out
+        :param read_timeout: (Optional[float]) seconds before a read times out
+        :return: None
+        """
+        self.client_manager.configure(max_pool_connections=max_pool_connections, tcp_keepalive=tcp_keepalive,
+                                      connect_timeout=connect_timeout, read_timeout=read_timeout)
+
+    def configure_transfer(self, part_size: Optional[int] = None, max_concurrency: Optional[int] = None,
+                           multipart_threshold: Optional[int] = None) -> None:
+        """
+        Tunes the transfers used for uploads. Settings that are not passed keep their current value.
+
+        :param part_size: (Optional[int]) size in bytes of each part of a multipart transfer
+        :param max_concurrency: (Optional[int]) maximum number of parts transferred at the same time
+        :param multipart_threshold: (Optional[int]) size in bytes above which uploads are split into parts
+        :return: None
+        """
+        self.transfer_settings.update(part_size=part_size,
+                                      max_concurrency=max_concurrency,
+                                      multipart_threshold=multipart_threshold)
+
+    def enable_listing_cache(self, ttl: Optional[float] = 5.0, max_entries: int = 1024) -> ListingCache:
+        """
+        Caches the results of ls_folder. Writes, deletes and copies made through this engine invalidate the
+        affected listings, changes made by other processes are seen once the listings expire.
+
+        :param ttl: (Optional[float]) seconds a listing is valid for
+        :param max_entries: (int) maximum number of listings held
+        :return: (ListingCache) the cache, exposing its hit and miss counters
+        """
+        self.listing_cache = ListingCache(ttl=ttl, max_entries=max_entries)
+        return self.listing_cache
+
+    def disable_listing_cache(self) -> None:
+        """
+        Stops caching the results of ls_folder and drops the cached listings.
+
+        :return: None
+        """
+        self.listing_cache = None
+
+    def enable_metadata_cache(self, ttl: Optional[float] = 2.0, max_entries: int = 10000) -> MetadataCache:
+        """
+        Caches the results of existence checks and object metadata, including objects that do not exist. Writes
+        and deletes made through this engine invalidate the affected entries.
+
+        :param ttl: (Optional[float]) seconds an entry is valid for
+        :param max_entries: (int) maximum number of entries held
+        :return: (MetadataCache) the cache, exposing its hit and miss counters
+        """
+        self.metadata_cache = MetadataCache(ttl=ttl, max_entries=max_entries)
+        return self.metadata_cache
+
+    def disable_metadata_cache(self) -> None:
+        """
+        Stops caching object metadata and drops the cached entries.
+
+        :return: None
+        """
+        self.metadata_cache = None
+
+    def enable_content_cache(self, directory: Optional[str] = None, ttl: Optional[float] = 30.0,
+                             max_bytes: int = 10 * 1024 ** 3, max_entries: int = 10000,
+                             max_age: Optional[float] = None) -> ContentCache:
+        """
+        Keeps the files read without a CacheManager in a disk cache keyed by ETag. Writes and deletes made through
+        this engine are seen on the next read, changes made by other processes once the ttl has passed.
+
+        :param directory: (Optional[str]) folder the files are stored in, ContentCache.DEFAULT_DIRECTORY if None
+        :param ttl: (Optional[float]) seconds a checked file is served without a request
+        :param max_bytes: (int) maximum total size of the files on disk
+        :param max_entries: (int) maximum number of files on disk
+        :param max_age: (Optional[float]) seconds a file can go unused before it is deleted
+        :return: (ContentCache) the cache, exposing its hit, miss and byte counters
+        """
+        self.content_cache = ContentCache(directory=directory, ttl=ttl, max_bytes=max_bytes,
+                                          max_entries=max_entries, max_age=max_age)
+        return self.content_cache
+
+    def disable_content_cache(self) -> None:
+        """
+        Stops caching downloaded files. The files already cached are left on disk.
+
+        :return: None
+        """
+        self.content_cache = None
+
+    def download_cached_file(self, storage_path: Union[FilePath, str], file_path: Optional[str] = None) -> str:
+        """
+        Gets a local copy of a file from the content cache, downloading it only if it is not cached or has changed.
+        Files too large for the cache are downloaded to the folder passed instead.
+
+        :param storage_path: (Union[FilePath, str]) storage path in the s3 storage space
+        :param file_path: (Optional[str]) folder, owned by the caller, files too large for the cache are saved in
+        :return: (str) path to the local copy of the file
+        """
+        bucket, file_name, short_file_name = V1Engine._split_s3_path(storage_path)
+        output_path = os.path.join(file_path, short_file_name) if file_path is not None else None
+        return self.download_file_to_cache(bucket_name=bucket, file_name=file_name, file_path=output_path)
+
+    def cached_etag(self, storage_path: Union[FilePath, str]) -> Optional[str]:
+        """
+        Gets the ETag of the copy of a file last read through the content cache.
+
+        :param storage_path: (Union[FilePath, str]) storage path in the s3 storage space
+        :return: (Optional[str]) the ETag, None if the file has not been read through the content cache
+        """
+        if self.content_cache is None:
+            return None
+        bucket, file_name, _ = V1Engine._split_s3_path(storage_path)
+        return self.content_cache.get_etag(bucket_name=bucket, file_name=file_name)
 
     def upload_data(self, storage_path: Union[FilePath, str], data: Any) -> None:
         """
@@ -76,40 +225,73 @@ class V1Engine(BucketManager, FileManager):
         file_names = [x for x in files.keys()]
         if folder in file_names:
             raise V1EngineError("New folder name already taken by file in this folder")
-        if self.file_exists(bucket_name=bucket, file_name=folder_name):
-            folder_name = self.increment_folder_name(bucket_name=bucket, dirname=folder_name)
-        self.upload_serialised_data(bucket_name=bucket, file_name=folder_name)
+        if not self.put_if_absent(bucket_name=bucket, file_name=folder_name):
+            folder_name = self.increment_folder_name(bucket_name=bucket, dirname=folder_name,
+                                                     existing_names=file_names + dirs)
         return folder_name
 
-    def increment_folder_name(self, bucket_name: str, dirname: str) -> str:
+    def increment_folder_name(self, bucket_name: str, dirname: str,
+                              existing_names: Optional[List[str]] = None) -> str:
         """
         Increment folder name suffix if name prefix already exists within parent file object collection.
+        The suffixes in use are read from one listing of the parent and the new folder object is created with a
+        conditional put so concurrent callers get different names.
         :param bucket_name: (str) name of bucket containing the folder object
         :param dirname: (str) folder object name to increment
+        :param existing_names: (Optional[List[str]]) names in the parent folder, listed if not passed
         :return: (str) new folder name
         """
-        count = 2
         prefix = "/".join(dirname.split("/")[:-1])
-        new_folder = prefix + f" {count}/"
-        while self.file_exists(bucket_name=bucket_name, file_name=new_folder):
-            count += 1
-            new_folder = prefix + f" {count}/"
-        self.client.put_object(Bucket=bucket_name, Key=new_folder)
-        return new_folder
+        parent_dir = "/".join(prefix.split("/")[:-1])
+        if existing_names is None:
+            files, dirs = self.ls_folder(bucket_name=bucket_name, file_name=parent_dir)
+            existing_names = list(files.keys()) + dirs
+        for name in candidate_names(name=prefix.split("/")[-1], existing_names=existing_names, folder=True):
+            new_folder = (parent_dir + "/" if parent_dir else "") + name + "/"
+            if self.put_if_absent(bucket_name=bucket_name, file_name=new_folder):
+                return new_folder
 
-    def download_raw_data_file(self, storage_path: str) -> Any:
+    def download_raw_data_file(self, storage_path: str, parallel: bool = False) -> Any:
         """
-        Downloads raw data from s3 bucket.
+        Downloads raw data from s3 bucket. When the content cache is enabled, serial reads are served from the cached
+        copy, which is only downloaded again if the ETag of the object has changed.
 
         :param storage_path: (str) storage path in the s3 storage space
-        :return: (Any) file in memory (usually serialised)
+        :param parallel: (bool) if True, downloads with concurrent ranged requests straight into a single buffer
+        :return: (Any) file in memory (usually serialised), a memoryview if parallel is True
         """
         bucket, file_name, short_file_name = V1Engine._split_s3_path(storage_path)
+        if parallel:
+            return self.download_file_to_buffer(bucket_name=bucket, file_name=file_name)
+        if self.content_cache is not None:
+            with tempfile.TemporaryDirectory() as directory:
+                path = self.download_file_to_cache(bucket_name=bucket, file_name=file_name,
+                                                   file_path=os.path.join(directory, short_file_name or "data"))
+                with open(path, "rb") as file:
+                    return file.read()
         return self.download_file_to_memory(bucket_name=bucket, file_name=file_name)
 
+    def open(self, storage_path: Union[FilePath, str], mode: str = "rb", **kwargs) -> Union[S3ReadFile, S3WriteFile]:
+        """
+        Opens an s3 object as a file object.
+
+        :param storage_path: (Union[FilePath, str]) path to the object
+        :param mode: (str) "rb" for a seekable read-only file object, "wb" for a streaming multipart writer
+        :param kwargs: passed to the S3ReadFile (block_size, read_ahead, max_blocks) or S3WriteFile (part_size,
+                       max_concurrency) constructor
+        :return: (Union[S3ReadFile, S3WriteFile]) the file object
+        """
+        bucket, file_name, _ = V1Engine._split_s3_path(storage_path)
+        if mode == "rb":
+            return S3ReadFile(engine=self, bucket_name=bucket, file_name=file_name, **kwargs)
+        if mode == "wb":
+            return S3WriteFile(engine=self, bucket_name=bucket, file_name=file_name, **kwargs)
+        raise V1EngineError(message="mode {} is not supported for s3 objects".format(mode))
+
     def download_data_file(self, storage_path: Union[FilePath, str], file_path: Union[FilePath, str]) -> str:
         """
-        Download data file to disk.
+        Download data file to disk. A copy already downloaded to file_path is revalidated with IfModifiedSince and
+        only downloaded again if the object has changed.
 
         :param storage_path: (Union[FilePath, str]) storage path in the s3 storage space
         :param file_path: (Union[FilePath, str]) path where file is to be saved
@@ -117,7 +299,7 @@ class V1Engine(BucketManager, FileManager):
         """
         bucket, file_name, short_file_name = V1Engine._split_s3_path(storage_path)
         output_path = os.path.join(file_path, short_file_name)
-        self.download_file_to_disk(bucket_name=bucket, file_name=file_name, file_path=output_path)
+        self.download_file_if_modified(bucket_name=bucket, file_name=file_name, file_path=output_path)
         return output_path
 
     def delete(self, storage_path: Union[FilePath, str], folder=False) -> None:
@@ -144,6 +326,32 @@ class V1Engine(BucketManager, FileManager):
         bucket, file_name, short_file_name = V1Engine._split_s3_path(storage_path)
         return self.file_exists(bucket_name=bucket, file_name=file_name)
 
+    def stat_many(self, storage_paths: Iterable[Union[FilePath, str]]) -> Dict[str, Optional[dict]]:
+        """
+        Gets the metadata of many paths. Paths in the same folder are checked with one listing of the folder.
+
+        :param storage_paths: (Iterable[Union[FilePath, str]]) paths to be checked
+        :return: (Dict[str, Optional[dict]]) last_modified, size and etag of each path, None for missing paths
+        """
+        buckets: Dict[str, Dict[str, str]] = {}
+        for storage_path in storage_paths:
+            bucket, file_name, _ = V1Engine._split_s3_path(storage_path)
+            buckets.setdefault(bucket, {})[storage_path] = file_name
+        stats = {}
+        for bucket, paths in buckets.items():
+            found = self.stat_objects(bucket_name=bucket, keys=paths.values())
+            stats.update({storage_path: found[file_name] for storage_path, file_name in paths.items()})
+        return stats
+
+    def exists_many(self, storage_paths: Iterable[Union[FilePath, str]]) -> Dict[str, bool]:
+        """
+        Checks to see if many paths exist. Paths in the same folder are checked with one listing of the folder.
+
+        :param storage_paths: (Iterable[Union[FilePath, str]]) paths to be checked
+        :return: (Dict[str, bool]) True for each path that exists, False if not
+        """
+        return {storage_path: stat is not None for storage_path, stat in self.stat_many(storage_paths).items()}
+
     def ls(self, storage_path: Union[FilePath, str]) -> Tuple[dict, List[str]]:
         """
         Lists all the sub directories and sub files belonging to the self.path.
@@ -154,6 +362,31 @@ class V1Engine(BucketManager, FileManager):
         bucket, file_name, short_file_name = V1Engine._split_s3_path(storage_path)
         return self.ls_folder(bucket_name=bucket, file_name=file_name)
 
+    def iterdir(self, storage_path: Union[FilePath, str]) -> Iterator[DirEntry]:
+        """
+        Yields the sub directories and sub files of a path as each page of the listing arrives.
+
+        :param storage_path: (Union[FilePath, str]) path to be inspected
+        :return: (Iterator[DirEntry]) the entries of the folder
+        """
+        bucket, file_name, _ = V1Engine._split_s3_path(storage_path)
+        return self.iter_folder(bucket_name=bucket, file_name=file_name)
+
+    def list_page(self, storage_path: Union[FilePath, str], page_size: int = 1000,
+                  cursor: Optional[str] = None) -> Tuple[List[DirEntry], Optional[str]]:
+        """
+        Lists one page of the sub directories and sub files of a path.
+
+        :param storage_path: (Union[FilePath, str]) path to be inspected
+        :param page_size: (int) maximum number of entries in the page (s3 caps this at 1000)
+        :param cursor: (Optional[str]) cursor returned with the previous page, the first page if None
+        :return: (Tuple[List[DirEntry], Optional[str]]) entries of the page and the cursor of the next page, None
+                 if this is the last page
+        """
+        bucket, file_name, _ = V1Engine._split_s3_path(storage_path)
+        return self.list_folder_page(bucket_name=bucket, file_name=file_name, page_size=page_size,
+                                     continuation_token=cursor)
+
     @staticmethod
     def _split_s3_path(storage_path: Union[FilePath, str]) -> Tuple[str, str, str]:
         """
@@ -0,0 +1,216 @@
+import asyncio
+import functools
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+from .copy_journal import CopyJournal
+from .errors import V1EngineError
+from ..path import FilePath
+
+
+class AsyncV1Engine:
+    """
+    This is the asyncio interface for managing operations for s3 files. boto3 is blocking, so the calls of the
+    V1Engine are run on a dedicated thread pool sized to the concurrency limit, and an asyncio semaphore per event
+    loop keeps the number of requests in flight at that limit. Every request in flight occupies one thread of the
+    pool: any number of coroutines can await the engine at once, but only max_concurrency requests run at a time and
+    running that many needs that many threads. Coroutines waiting for a slot do not hold a thread.
+
+    Attributes:
+        engine (V1Engine): the engine the requests are run with
+        max_concurrency (int): maximum number of s3 requests in flight at the same time
+    """
+    _singleton = None
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._singleton:
+            cls._singleton = super(AsyncV1Engine, cls).__new__(cls)
+        return cls._singleton
+
+    DEFAULT_MAX_CONCURRENCY: int = 64
+
+    def __init__(self, max_concurrency: Optional[int] = None, engine: Optional[Any] = None) -> None:
+        """
+        The constructor for the AsyncV1Engine class. The singleton is only initialised on its first construction,
+        later constructions return it unchanged and raise an error if they ask for other settings, which have to be
+        changed with configure.
+
+        :param max_concurrency: (Optional[int]) maximum number of s3 requests, and so threads, in flight at the same
+                                time, DEFAULT_MAX_CONCURRENCY if None
+        :param engine: (Optional[V1Engine]) the engine the requests are run with, the V1Engine singleton if None
+        """
+        if self.__dict__.get("_initialised"):
+            if (max_concurrency is not None and max_concurrency != self.max_concurrency) or \
+                    (engine is not None and engine is not self.engine):
+                raise V1EngineError(message="the AsyncV1Engine has already been created with max_concurrency {} and "
+                                            "another engine, please use configure to change them".format(
+                                                self.max_concurrency))
+            return
+        if engine is None:
+            from . import V1Engine
+            engine = V1Engine()
+        self.engine: Any = engine
+        self.max_concurrency: int = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = \
+            weakref.WeakKeyDictionary()
+        self._lock: threading.Lock = threading.Lock()
+        self.configure(max_concurrency=max_concurrency if max_concurrency is not None
+                       else self.DEFAULT_MAX_CONCURRENCY)
+        self._initialised: bool = True
+
+    def configure(self, max_concurrency: Optional[int] = None, engine: Optional[Any] = None) -> None:
+        """
+        Changes the concurrency limit or the engine of the singleton. The client connection pool is grown to the limit
+        if it is smaller. Requests already in flight finish on the old thread pool.
+
+        :param max_concurrency: (Optional[int]) maximum number of s3 requests, and so threads, in flight at the same
+                                time, unchanged if None
+        :param engine: (Optional[V1Engine]) the engine the requests are run with, unchanged if None
+        :return: None
+        """
+        if engine is not None:
+            self.engine = engine
+        if max_concurrency is None:
+            max_concurrency = self.max_concurrency
+        if max_concurrency < 1:
+            raise V1EngineError(message="max concurrency has to be at least 1")
+        client_manager = getattr(self.engine, "client_manager", None)
+        if client_manager is not None and client_manager.max_pool_connections < max_concurrency:
+            self.engine.configure_clients(max_pool_connections=max_concurrency)
+        with self._lock:
+            old_executor = self._executor
+            self._executor = None
+            self.max_concurrency = max_concurrency
+            self._semaphores = weakref.WeakKeyDictionary()
+        if old_executor is not None:
+            old_executor.shutdown(wait=False)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """
+        Gets the thread pool the requests are run on, starting it if needed (private).
+
+        :return: (ThreadPoolExecutor) the thread pool
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="async-s3")
+            return self._executor
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        """
+        Gets the semaphore of the running event loop (private).
+
+        :return: (asyncio.Semaphore) the semaphore limiting the requests in flight from the loop
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def run(self, function: Callable, *args, **kwargs) -> Any:
+        """
+        Runs a blocking function on the engine's thread pool once a slot is free. The function holds a thread of
+        the pool until it returns.
+
+        :param function: (Callable) the blocking function
+        :param args: positional arguments passed to the function
+        :param kwargs: keyword arguments passed to the function
+        :return: (Any) what the function returns
+        """
+        async with self._semaphore():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), functools.partial(function, *args, **kwargs))
+
+    async def upload_data(self, storage_path: Union[FilePath, str], data: Any) -> None:
+        """
+        Uploads serialised data to s3 bucket.
+
+        :param storage_path: (Union[FilePath, str]) storage path in s3
+        :param data: (bytes) data to be uploaded
+        :return: None
+        """
+        await self.run(self.engine.upload_data, storage_path=storage_path, data=data)
+
+    async def download_raw_data_file(self, storage_path: Union[FilePath, str]) -> Any:
+        """
+        Downloads raw data from s3 bucket.
+
+        :param storage_path: (Union[FilePath, str]) storage path in the s3 storage space
+        :return: (Any) file in memory (usually serialised)
+        """
+        return await self.run(self.engine.download_raw_data_file, storage_path=storage_path)
+
+    async def exists(self, storage_path: Union[FilePath, str]) -> bool:
+        """
+        Checks to see if the path exists.
+
+        :param storage_path: (Union[FilePath, str]) path to be checked
+        :return: (bool) True if path exists, False if not
+        """
+        return await self.run(self.engine.exists, storage_path=storage_path)
+
+    async def ls(self, storage_path: Union[FilePath, str]) -> Tuple[dict, List[str]]:
+        """
+        Lists all the sub directories and sub files belonging to the storage path.
+
+        :param storage_path: (Union[FilePath, str]) path to be inspected
+        :return: (Tuple[dict, List[str]]) sub directories and sub files
+        """
+        return await self.run(self.engine.ls, storage_path=storage_path)
+
+    async def delete(self, storage_path: Union[FilePath, str], folder: bool = False) -> None:
+        """
+        Deletes the file from s3 or folder and file contents from s3.
+
+        :param storage_path: (Union[FilePath, str]) storage path in the s3 storage space
+        :param folder: (bool) if True, the path is deleted as a folder
+        :return: None
+        """
+        await self.run(self.engine.delete, storage_path=storage_path, folder=folder)
+
+    async def copy(self, storage_path: Union[FilePath, str], new_storage_path: Union[FilePath, str]) -> None:
+        """
+        Copies an object server side.
+
+        :param storage_path: (Union[FilePath, str]) path of the object being copied
+        :param new_storage_path: (Union[FilePath, str]) path the object is copied to
+        :return: None
+        """
+        bucket, file_name, _ = self.engine._split_s3_path(storage_path)
+        new_bucket, new_file_name, _ = self.engine._split_s3_path(new_storage_path)
+        await self.run(self.engine.copy_object, bucket_name=bucket, file_name=file_name,
+                       new_bucket_name=new_bucket, new_file_name=new_file_name)
+
+    async def copy_folder(self, storage_path: Union[FilePath, str], new_storage_path: Union[FilePath, str],
+                          journal: Optional[CopyJournal] = None) -> List[str]:
+        """
+        Copies every object in a folder server side. The copies of a single folder run on the engine's own
+        transfer thread pool.
+
+        :param storage_path: (Union[FilePath, str]) path of the folder being copied
+        :param new_storage_path: (Union[FilePath, str]) path the folder is copied to
+        :param journal: (Optional[CopyJournal]) journal of completed copies used to resume an interrupted copy
+        :return: (List[str]) keys of the objects in the folder that was copied
+        """
+        bucket, folder_name, _ = self.engine._split_s3_path(storage_path)
+        new_bucket, new_folder_name, _ = self.engine._split_s3_path(new_storage_path)
+        return await self.run(self.engine.copy_prefix, bucket_name=bucket, prefix=f"{folder_name}/",
+                              new_bucket_name=new_bucket, new_prefix=f"{new_folder_name}/", journal=journal)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Shuts down the thread pool. The next request starts a new one.
+
+        :param wait: (bool) if True, waits for the requests in flight to finish
+        :return: None
+        """
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=wait)
@@ -1,6 +1,7 @@
 from typing import Optional, Dict, Any
 
 from .errors import BucketManagetError
+from .inventory import BucketInventory
 
 
 class BucketManager:
@@ -11,7 +12,8 @@ class BucketManager:
         resource (Any): object managing the resource for s3 connection (None unless overridden by subclass like V1Engine)
         client (Any): object managing the client for s3 connection (None unless overridden by subclass like V1Engine)
         buckets (dict): keeps reference of buckets. Keys are made of bucket names
-        bucket_contents (dict) keeps reference of bucket contents. Keys are made of bucket names
+        bucket_contents (Dict[str, BucketInventory]) keeps the inventory of bucket contents. Keys are made of bucket
+                                                    names
     """
     def __init__(self):
         """
@@ -20,7 +22,7 @@ class BucketManager:
         self.resource: Optional[Any] = None
         self.client: Optional[Any] = None
         self.buckets: Dict = dict()
-        self.bucket_contents: Dict = dict()
+        self.bucket_contents: Dict[str, BucketInventory] = dict()
 
     def get_buckets(self) -> None:
         """
@@ -47,19 +49,25 @@ class BucketManager:
                                                                                                     ))
         return bucket
 
-    def get_bucket_contents(self, bucket_name: str) -> None:
+    def get_bucket_contents(self, bucket_name: str, rebuild: bool = False) -> BucketInventory:
         """
-        Gets a list of files from a bucket and stores it in self.bucket_contents with the key of the bucket name.
-        
+        Gets the inventory of every file in a bucket and stores it in self.bucket_contents with the key of the bucket
+        name. The inventory is built the first time and only updated with new keys after that.
+
         :param bucket_name: (str) name of the bucket required
-        :return: None
+        :param rebuild: (bool) if True, the whole bucket is listed again so deleted and overwritten keys are picked up
+        :return: (BucketInventory) the inventory of the bucket
         """
         self.get_bucket(name=bucket_name)
-        package = dict()
-        contents = self.client.list_objects_v2(Bucket=bucket_name)["Contents"]
-        package["keys"] = [i["Key"] for i in contents]
-        package["contents"] = contents
-        self.bucket_contents[bucket_name] = package
+        inventory = self.bucket_contents.get(bucket_name)
+        if inventory is None:
+            inventory = BucketInventory(client=self.client, bucket_name=bucket_name)
+            self.bucket_contents[bucket_name] = inventory
+        if rebuild:
+            inventory.build()
+        else:
+            inventory.update()
+        return inventory
 
     def _check_bucket_cache(self) -> None:
         """
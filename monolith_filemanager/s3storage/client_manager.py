@@ -0,0 +1,153 @@
+import os
+import threading
+import weakref
+from typing import Any, Optional
+
+
+class ClientManager:
+    """
+    This is a class for managing the boto3 s3 client and resources. The client is thread safe so one is built lazily
+    per process and rebuilt after a fork. Resources are not thread safe so one is built lazily per thread.
+
+    Attributes:
+        max_pool_connections (int): maximum number of connections kept open in the client's connection pool
+        tcp_keepalive (bool): if True, TCP keep-alive is turned on for the pooled connections where botocore
+                              supports it
+        connect_timeout (Optional[float]): seconds before a connection attempt times out (botocore default if None)
+        read_timeout (Optional[float]): seconds before a read times out (botocore default if None)
+    """
+    def __init__(self, max_pool_connections: int = 50, tcp_keepalive: bool = True,
+                 connect_timeout: Optional[float] = None, read_timeout: Optional[float] = None) -> None:
+        """
+        The constructor for the ClientManager class.
+
+        :param max_pool_connections: (int) maximum number of connections kept open in the client's connection pool
+        :param tcp_keepalive: (bool) if True, TCP keep-alive is turned on for the pooled connections
+        :param connect_timeout: (Optional[float]) seconds before a connection attempt times out
+        :param read_timeout: (Optional[float]) seconds before a read times out
+        """
+        self.max_pool_connections: int = max_pool_connections
+        self.tcp_keepalive: bool = tcp_keepalive
+        self.connect_timeout: Optional[float] = connect_timeout
+        self.read_timeout: Optional[float] = read_timeout
+        self._lock: threading.Lock = threading.Lock()
+        self._pid: int = os.getpid()
+        self._client: Optional[Any] = None
+        self._client_override: Optional[Any] = None
+        self._resource_override: Optional[Any] = None
+        self._local: threading.local = threading.local()
+        self._generation: int = 0
+        _register(self)
+
+    def configure(self, max_pool_connections: Optional[int] = None, tcp_keepalive: Optional[bool] = None,
+                  connect_timeout: Optional[float] = None, read_timeout: Optional[float] = None) -> None:
+        """
+        Updates the connection settings. Clients and resources built with the old settings are dropped and rebuilt
+        on their next use. Settings that are not passed keep their current value.
+
+        :param max_pool_connections: (Optional[int]) maximum number of connections kept open in the pool
+        :param tcp_keepalive: (Optional[bool]) if True, TCP keep-alive is turned on for the pooled connections
+        :param connect_timeout: (Optional[float]) seconds before a connection attempt times out
+        :param read_timeout: (Optional[float]) seconds before a read times out
+        :return: None
+        """
+        with self._lock:
+            if max_pool_connections is not None:
+                self.max_pool_connections = max_pool_connections
+            if tcp_keepalive is not None:
+                self.tcp_keepalive = tcp_keepalive
+            if connect_timeout is not None:
+                self.connect_timeout = connect_timeout
+            if read_timeout is not None:
+                self.read_timeout = read_timeout
+            self._client = None
+            self._generation += 1
+
+    def _config(self) -> Any:
+        """
+        Packages the connection settings into a botocore config (private). TCP keep-alive is left out on botocore
+        versions older than 1.23 that do not have the setting.
+
+        :return: (botocore.config.Config) the config
+        """
+        from botocore.config import Config
+        settings = {"max_pool_connections": self.max_pool_connections}
+        if "tcp_keepalive" in Config.OPTION_DEFAULTS:
+            settings["tcp_keepalive"] = self.tcp_keepalive
+        if self.connect_timeout is not None:
+            settings["connect_timeout"] = self.connect_timeout
+        if self.read_timeout is not None:
+            settings["read_timeout"] = self.read_timeout
+        return Config(**settings)
+
+    def _check_fork(self) -> None:
+        """
+        Drops everything built by the parent process if this is running in a forked child (private).
+
+        :return: None
+        """
+        if self._pid != os.getpid():
+            self._after_fork()
+
+    def _after_fork(self) -> None:
+        """
+        Resets the state inherited from the parent process. The lock is replaced as it may have been held by a
+        thread that does not exist in the child (private).
+
+        :return: None
+        """
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._client = None
+        self._local = threading.local()
+        self._generation += 1
+
+    @property
+    def client(self) -> Any:
+        if self._client_override is not None:
+            return self._client_override
+        self._check_fork()
+        client = self._client
+        if client is None:
+            with self._lock:
+                if self._client is None:
+                    import boto3
+                    self._client = boto3.client("s3", config=self._config())
+                client = self._client
+        return client
+
+    @client.setter
+    def client(self, value: Optional[Any]) -> None:
+        # an injected client (e.g. a mock) is used as is, None goes back to lazily built clients
+        self._client_override = value
+
+    @property
+    def resource(self) -> Any:
+        if self._resource_override is not None:
+            return self._resource_override
+        self._check_fork()
+        if getattr(self._local, "generation", None) != self._generation:
+            import boto3
+            self._local.resource = boto3.session.Session().resource("s3", config=self._config())
+            self._local.generation = self._generation
+        return self._local.resource
+
+    @resource.setter
+    def resource(self, value: Optional[Any]) -> None:
+        self._resource_override = value
+
+
+_MANAGERS: "weakref.WeakSet[ClientManager]" = weakref.WeakSet()
+
+
+def _register(manager: ClientManager) -> None:
+    _MANAGERS.add(manager)
+
+
+def _reset_after_fork() -> None:
+    for manager in list(_MANAGERS):
+        manager._after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,311 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from typing import Callable, Dict, Hashable, Iterable, Optional
+
+from .errors import ContentCacheError
+from ..components.lru_cache import LRUCache
+
+
+class _DiskIndex(LRUCache):
+    """
+    This is a class for the in-process index of the entries of a ContentCache. Entries removed from the index,
+    whether evicted, expired or invalidated, are deleted from disk.
+    """
+    def put(self, key: Hashable, value: str) -> bool:
+        """
+        Stores the path of an entry. An entry already indexed is replaced without deleting its file as the file has
+        just been written again.
+
+        :param key: (Hashable) the name of the entry
+        :param value: (str) path to the cached file
+        :return: (bool) False if the file is larger than max_bytes and was not stored
+        """
+        with self._lock:
+            if key in self._entries:
+                LRUCache._remove(self, key)
+            super().put(key, value)
+            return key in self._entries
+
+    def _remove(self, key: Hashable) -> None:
+        path, _, _ = self._entries[key]
+        super()._remove(key)
+        shutil.rmtree(os.path.dirname(path), ignore_errors=True)
+
+
+class ContentCache:
+    """
+    This is a class for a size bounded cache of s3 objects downloaded to local disk, keyed by bucket, key and ETag.
+    Every entry is a folder named after the hash of the three holding the file under its original name, so readers
+    that go by the file extension can open it directly. Files are downloaded next to their final path and moved
+    into place with os.replace, so a reader never sees a partly written file even when several processes share the
+    directory. Once an object has been checked against s3 it is served without any request for ttl seconds, after
+    that a conditional request with the cached ETag confirms the cached file can be reused.
+
+    Attributes:
+        directory (str): folder the entries are stored in
+        ttl (Optional[float]): seconds a checked object is served without a request, every read makes a HEAD request
+                               if None
+        max_bytes (int): maximum total size of the entries on disk
+        max_entries (int): maximum number of entries on disk
+        max_age (Optional[float]): seconds an entry can go unused before it is deleted, kept until evicted if None
+        hits (int): number of reads served from disk
+        misses (int): number of reads that had to download the object
+        not_modified (int): number of conditional requests that confirmed a cached file was still current
+        downloaded_bytes (int): number of bytes downloaded to fill the cache
+        served_bytes (int): number of bytes served from the cache without downloading them
+    """
+    DEFAULT_DIRECTORY: str = os.path.join(tempfile.gettempdir(), "monolith-filemanager-content")
+    FILL_PREFIX: str = ".fill-"
+
+    def __init__(self, directory: Optional[str] = None, ttl: Optional[float] = 30.0,
+                 max_bytes: int = 10 * 1024 ** 3, max_entries: int = 10000, max_age: Optional[float] = None) -> None:
+        """
+        The constructor for the ContentCache class. Entries left in the directory by earlier processes are indexed
+        on first use, least recently used first.
+
+        :param directory: (Optional[str]) folder the entries are stored in, DEFAULT_DIRECTORY if None
+        :param ttl: (Optional[float]) seconds a checked object is served without a request
+        :param max_bytes: (int) maximum total size of the entries on disk
+        :param max_entries: (int) maximum number of entries on disk
+        :param max_age: (Optional[float]) seconds an entry can go unused before it is deleted
+        """
+        self.directory: str = directory if directory is not None else self.DEFAULT_DIRECTORY
+        self.ttl: Optional[float] = ttl
+        self.max_bytes: int = max_bytes
+        self.max_entries: int = max_entries
+        self.max_age: Optional[float] = max_age
+        self.hits: int = 0
+        self.misses: int = 0
+        self.not_modified: int = 0
+        self.downloaded_bytes: int = 0
+        self.served_bytes: int = 0
+        self._index: _DiskIndex = _DiskIndex(max_entries=max_entries, ttl=max_age, max_bytes=max_bytes,
+                                             size_function=lambda path: os.path.getsize(path))
+        self._checked: LRUCache = LRUCache(max_entries=max_entries, ttl=ttl)
+        self._versions: LRUCache = LRUCache(max_entries=max_entries)
+        self._lock: threading.RLock = threading.RLock()
+        self._loaded: bool = False
+
+    @staticmethod
+    def _entry_name(bucket_name: str, file_name: str, etag: str) -> str:
+        return hashlib.sha1("{}\n{}\n{}".format(bucket_name, file_name, etag).encode("utf-8")).hexdigest()
+
+    def _load(self) -> None:
+        """
+        Indexes the entries already in the directory and deletes the files of fills that never finished (private).
+
+        :return: None
+        """
+        with self._lock:
+            if self._loaded:
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            entries = []
+            for entry in os.scandir(self.directory):
+                if not entry.is_dir():
+                    continue
+                for file in os.scandir(entry.path):
+                    if file.name.startswith(self.FILL_PREFIX):
+                        os.remove(file.path)
+                    else:
+                        entries.append((file.stat().st_mtime, entry.name, file.path))
+            for _, name, path in sorted(entries):
+                if not self._index.put(name, path):
+                    shutil.rmtree(os.path.dirname(path), ignore_errors=True)
+            self._loaded = True
+
+    def get_checked(self, bucket_name: str, file_name: str) -> Optional[str]:
+        """
+        Gets the cached file of an object that has been checked against s3 within the last ttl seconds.
+
+        :param bucket_name: (str) the name of the bucket
+        :param file_name: (str) the key of the object
+        :return: (Optional[str]) path to the cached file, None if the object needs checking
+        """
+        name = self._checked.get((bucket_name, file_name), None)
+        if name is None:
+            return None
+        return self._get(name=name)
+
+    def get_etag(self, bucket_name: str, file_name: str) -> Optional[str]:
+        """
+        Gets the ETag of the last version of an object cached by this process, to be sent with a conditional request.
+
+        :param bucket_name: (str) the name of the bucket
+        :param file_name: (str) the key of the object
+        :return: (Optional[str]) the ETag, None if no version of the object has been cached
+        """
+        return self._versions.get((bucket_name, file_name), None)
+
+    def confirm(self, bucket_name: str, file_name: str, etag: str) -> Optional[str]:
+        """
+        Gets the cached file of an object that s3 has just reported as not modified since the version with an ETag.
+
+        :param bucket_name: (str) the name of the bucket
+        :param file_name: (str) the key of the object
+        :param etag: (str) the ETag sent with the conditional request
+        :return: (Optional[str]) path to the cached file, None if it has been evicted since
+        """
+        path = self.get(bucket_name=bucket_name, file_name=file_name, etag=etag)
+        if path is not None:
+            with self._lock:
+                self.not_modified += 1
+        return path
+
+    def get(self, bucket_name: str, file_name: str, etag: str) -> Optional[str]:
+        """
+        Gets the cached file of an object at a version, recording that the object has just been checked.
+
+        :param bucket_name: (str) the name of the bucket
+        :param file_name: (str) the key of the object
+        :param etag: (str) the ETag of the object returned by s3
+        :return: (Optional[str]) path to the cached file, None if the version is not cached
+        """
+        name = self._entry_name(bucket_name=bucket_name, file_name=file_name, etag=etag)
+        path = self._get(name=name)
+        if path is not None:
+            self._checked.put((bucket_name, file_name), name)
+            self._versions.put((bucket_name, file_name), etag)
+        return path
+
+    def _get(self, name: str) -> Optional[str]:
+        """
+        Gets the path of an entry, marking it as the most recently used (private). Entries written by other
+        processes sharing the directory are indexed when they are first asked for.
+
+        :param name: (str) the name of the entry
+        :return: (Optional[str]) path to the cached file, None if the entry is not cached
+        """
+        self._load()
+        path = self._index.get(name, None)
+        if path is None:
+            path = self._find(name=name)
+        if path is not None:
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                # another process sharing the directory evicted the entry
+                self._index.invalidate(name)
+                path = None
+        with self._lock:
+            if path is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.served_bytes += os.path.getsize(path)
+        return path
+
+    def _find(self, name: str) -> Optional[str]:
+        """
+        Indexes an entry found on disk (private).
+
+        :param name: (str) the name of the entry
+        :return: (Optional[str]) path to the cached file, None if there is no finished file for the entry
+        """
+        entry_directory = os.path.join(self.directory, name)
+        if not os.path.isdir(entry_directory):
+            return None
+        for file in os.scandir(entry_directory):
+            if not file.name.startswith(self.FILL_PREFIX):
+                self._index.put(name, file.path)
+                return file.path
+        return None
+
+    def fits(self, size: int) -> bool:
+        """
+        Checks to see if an object is small enough to be cached.
+
+        :param size: (int) size of the object in bytes
+        :return: (bool) True if the object is no larger than max_bytes
+        """
+        return size <= self.max_bytes
+
+    def fill(self, bucket_name: str, file_name: str, etag: str, download: Callable[[str], None],
+             size: Optional[int] = None) -> str:
+        """
+        Downloads an object into the cache, evicting the least recently used entries if the cache is full. Objects
+        larger than max_bytes are not kept on disk.
+
+        :param bucket_name: (str) the name of the bucket
+        :param file_name: (str) the key of the object
+        :param etag: (str) the ETag of the version being downloaded
+        :param download: (Callable[[str], None]) downloads the version to the path passed
+        :param size: (Optional[int]) size of the object if known, in which case a too large object is not downloaded
+        :return: (str) path to the cached file
+        """
+        if size is not None and not self.fits(size=size):
+            raise ContentCacheError(message="{} is {} bytes which is more than the {} bytes of the cache".format(
+                file_name, size, self.max_bytes))
+        self._load()
+        name = self._entry_name(bucket_name=bucket_name, file_name=file_name, etag=etag)
+        entry_directory = os.path.join(self.directory, name)
+        os.makedirs(entry_directory, exist_ok=True)
+        path = os.path.join(entry_directory, file_name.split("/")[-1] or name)
+        descriptor, fill_path = tempfile.mkstemp(prefix=self.FILL_PREFIX, dir=entry_directory)
+        os.close(descriptor)
+        try:
+            download(fill_path)
+            os.replace(fill_path, path)
+        except BaseException:
+            if os.path.exists(fill_path):
+                os.remove(fill_path)
+            raise
+        with self._lock:
+            self.downloaded_bytes += os.path.getsize(path)
+        if not self._index.put(name, path):
+            shutil.rmtree(entry_directory, ignore_errors=True)
+            raise ContentCacheError(message="{} is more than the {} bytes of the cache".format(file_name,
+                                                                                              self.max_bytes))
+        self._checked.put((bucket_name, file_name), name)
+        self._versions.put((bucket_name, file_name), etag)
+        return path
+
+    def invalidate_keys(self, bucket_name: str, keys: Iterable[str]) -> None:
+        """
+        Makes the next reads of keys that have been written or deleted check the ETag again. The cached files are
+        kept as they are still valid for their own ETag.
+
+        :param bucket_name: (str) the name of the bucket
+        :param keys: (Iterable[str]) the keys that have changed
+        :return: None
+        """
+        for key in keys:
+            self._checked.invalidate((bucket_name, key))
+
+    def invalidate_prefix(self, bucket_name: str, prefix: str) -> None:
+        """
+        Makes the next reads of every key under a prefix check the ETag again.
+
+        :param bucket_name: (str) the name of the bucket
+        :param prefix: (str) the prefix that has changed
+        :return: None
+        """
+        self._checked.invalidate_where(lambda key: key[0] == bucket_name and key[1].startswith(prefix))
+
+    def clear(self) -> None:
+        """
+        Deletes every entry from disk, keeping the counters.
+
+        :return: None
+        """
+        self._load()
+        with self._lock:
+            self._index.invalidate_where(lambda key: True)
+            self._checked.clear()
+            self._versions.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Gets the counters of the cache.
+
+        :return: (Dict[str, int]) hits, misses, not modified responses, evictions, entries and bytes on disk, and
+                 bytes downloaded and served
+        """
+        stats = self._index.stats()
+        with self._lock:
+            stats.update({"hits": self.hits, "misses": self.misses, "not_modified": self.not_modified,
+                          "downloaded_bytes": self.downloaded_bytes, "served_bytes": self.served_bytes})
+        return stats
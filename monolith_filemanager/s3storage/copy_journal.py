@@ -0,0 +1,98 @@
+import hashlib
+import os
+import tempfile
+import threading
+from typing import Optional, Set
+
+
+class CopyJournal:
+    """
+    This is a class for recording which keys of a folder copy have been completed so an interrupted rename or move
+    can resume without copying the same keys again. The journal is a text file with one completed source key per line.
+
+    Attributes:
+        path (str): path to the journal file
+        completed (Set[str]): source keys that have been copied
+    """
+    JOURNAL_DIRECTORY: str = os.path.join(tempfile.gettempdir(), "monolith-filemanager-journals")
+
+    def __init__(self, path: str) -> None:
+        """
+        The constructor for the CopyJournal class. Keys recorded by a previous run are loaded from the file.
+
+        :param path: (str) path to the journal file
+        """
+        self.path: str = path
+        self.completed: Set[str] = set()
+        self._lock: threading.Lock = threading.Lock()
+        self._file: Optional[object] = None
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as journal_file:
+                self.completed = {line.rstrip("\n") for line in journal_file if line.endswith("\n")}
+
+    @classmethod
+    def for_copy(cls, source: str, destination: str) -> "CopyJournal":
+        """
+        Gets the journal for copying one s3 path to another, stored in JOURNAL_DIRECTORY.
+
+        :param source: (str) s3 path being copied
+        :param destination: (str) s3 path being copied to
+        :return: (CopyJournal) the journal
+        """
+        os.makedirs(cls.JOURNAL_DIRECTORY, exist_ok=True)
+        return cls(path=cls._path_for(source=source, destination=destination))
+
+    @classmethod
+    def in_progress(cls, source: str, destination: str) -> bool:
+        """
+        Checks to see if a copy of one s3 path to another was interrupted and left its journal behind.
+
+        :param source: (str) s3 path being copied
+        :param destination: (str) s3 path being copied to
+        :return: (bool) True if the journal of the copy exists
+        """
+        return os.path.exists(cls._path_for(source=source, destination=destination))
+
+    @classmethod
+    def _path_for(cls, source: str, destination: str) -> str:
+        name = hashlib.sha1("{}\n{}".format(source, destination).encode("utf-8")).hexdigest()
+        return os.path.join(cls.JOURNAL_DIRECTORY, name + ".journal")
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.completed
+
+    def record(self, key: str) -> None:
+        """
+        Records a source key as copied. The line is flushed straight away so it survives the process being killed.
+
+        :param key: (str) source key that has been copied
+        :return: None
+        """
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(key + "\n")
+            self._file.flush()
+            self.completed.add(key)
+
+    def close(self) -> None:
+        """
+        Closes the journal file keeping it on disk.
+
+        :return: None
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def remove(self) -> None:
+        """
+        Closes and deletes the journal once the copy (and deletion of the sources) has finished.
+
+        :return: None
+        """
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.completed = set()
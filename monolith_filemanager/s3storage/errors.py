@@ -16,3 +16,9 @@ class V1EngineError(Exception):
 
     def __init__(self, message):
         super().__init__(message)
+
+
+class ContentCacheError(Exception):
+
+    def __init__(self, message):
+        super().__init__(message)
@@ -1,9 +1,21 @@
-from botocore.exceptions import ClientError
+from botocore.exceptions import ClientError, ParamValidationError
+from concurrent.futures import ThreadPoolExecutor
+import datetime
+import io
 import os
-from typing import Any, Tuple, List, Optional
+import shutil
+import tempfile
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, Tuple, List, Optional
 from urllib.parse import unquote
 
+from .content_cache import ContentCache
+from .copy_journal import CopyJournal
 from .errors import FileManagerError
+from .listing_cache import ListingCache
+from .metadata_cache import MetadataCache
+from .transfer import TransferSettings
+from ..components.dir_entry import DirEntry
 
 
 class FileManager:
@@ -13,10 +25,23 @@ class FileManager:
     Attributes:
         resource (object): object managing the resource for s3 connection (None unless overridden by subclass like V1Engine)
         client (object): object managing the client for s3 connection (None unless overridden by subclass like V1Engine)
+        transfer_settings (TransferSettings): part size, concurrency and multipart threshold used for transfers
+        listing_cache (Optional[ListingCache]): cache of folder listings, listings are not cached if None
+        metadata_cache (Optional[MetadataCache]): cache of object metadata, metadata is not cached if None
+        content_cache (Optional[ContentCache]): disk cache of downloaded objects used by download_file_to_cache
     """
 
     BASE_DIR = os.getcwd()
     FILE_PATH = "/tests/monolith_filemanager.connection_type.s3storage/"
+    DELETE_BATCH_SIZE = 1000
+    MULTIPART_COPY_THRESHOLD = 5 * 1024 ** 3
+    COPY_PART_SIZE = 512 * 1024 ** 2
+    MAXIMUM_PARTS = 10000
+    LISTING_GROUP_SIZE = 2
+    MISSING_CODES = ("404", "NoSuchKey", "NotFound")
+    NOT_MODIFIED_CODES = ("304", "NotModified")
+    STREAM_CHUNK_SIZE = 1024 ** 2
+    CONFLICT_CODES = ("412", "PreconditionFailed", "409", "ConditionalRequestConflict")
 
     def __init__(self):
         """
@@ -24,6 +49,41 @@ class FileManager:
         """
         self.resource = None
         self.client = None
+        self.transfer_settings: TransferSettings = TransferSettings()
+        self.listing_cache: Optional[ListingCache] = None
+        self.metadata_cache: Optional[MetadataCache] = None
+        self.content_cache: Optional[ContentCache] = None
+
+    def invalidate_keys(self, bucket_name: str, keys: Iterable[str]) -> None:
+        """
+        Drops the cached state made stale by keys being written or deleted.
+
+        :param bucket_name: (str) name of bucket the keys are in
+        :param keys: (Iterable[str]) keys that have changed
+        :return: None
+        """
+        keys = list(keys)
+        if self.listing_cache is not None:
+            self.listing_cache.invalidate_keys(bucket_name=bucket_name, keys=keys)
+        if self.metadata_cache is not None:
+            self.metadata_cache.invalidate_keys(bucket_name=bucket_name, keys=keys)
+        if self.content_cache is not None:
+            self.content_cache.invalidate_keys(bucket_name=bucket_name, keys=keys)
+
+    def invalidate_prefix(self, bucket_name: str, prefix: str) -> None:
+        """
+        Drops the cached state made stale by every key under a prefix changing.
+
+        :param bucket_name: (str) name of bucket the keys are in
+        :param prefix: (str) prefix of the keys that have changed
+        :return: None
+        """
+        if self.listing_cache is not None:
+            self.listing_cache.invalidate_prefix(bucket_name=bucket_name, prefix=prefix)
+        if self.metadata_cache is not None:
+            self.metadata_cache.invalidate_prefix(bucket_name=bucket_name, prefix=prefix)
+        if self.content_cache is not None:
+            self.content_cache.invalidate_prefix(bucket_name=bucket_name, prefix=prefix)
 
     @staticmethod
     def _prep_remote_name(name: str) -> str:
@@ -47,39 +107,189 @@ class FileManager:
         :param bucket_name: (str) name of bucket for file to be stored in
         :param file_name: (str) file name to save file as in s3
         :param file_path: (str) path to file being uploaded
-        :return:
+        :return: None
         """
         self.client.upload_file(file_path,
                                 bucket_name,
-                                file_name)
+                                file_name,
+                                Config=self.transfer_settings.to_boto_config())
+        self.invalidate_keys(bucket_name=bucket_name, keys=[file_name])
 
     def upload_serialised_data(self, bucket_name: str, file_name: str, data: Optional[bytes] = None) -> None:
         """
-        Uploads serialised data to bucket.
+        Uploads serialised data to bucket. Bytes larger than the multipart threshold are uploaded as a concurrent
+        multipart upload.
 
         :param bucket_name: (str) name of bucket for data to be stored in
         :param file_name: (str) name for which the data is stored under
         :param data: (Optional[bytes]) data to be stored in s3
         :return: None
         """
-        if data:
+        if isinstance(data, (bytes, bytearray, memoryview)) and \
+                len(data) > self.transfer_settings.multipart_threshold:
+            self.client.upload_fileobj(io.BytesIO(data),
+                                       bucket_name,
+                                       file_name,
+                                       Config=self.transfer_settings.to_boto_config())
+        elif data:
             self.client.put_object(Body=data, Bucket=bucket_name, Key=file_name)
         else:
             self.client.put_object(Bucket=bucket_name, Key=file_name)
+        self.invalidate_keys(bucket_name=bucket_name, keys=[file_name])
+
+    def put_if_absent(self, bucket_name: str, file_name: str, data: bytes = b"") -> bool:
+        """
+        Creates an object only if the key is free, so concurrent writers cannot both claim the same name. Falls back
+        to a HEAD request followed by a PUT with botocore releases that do not support conditional writes.
+
+        :param bucket_name: (str) name of bucket for data to be stored in
+        :param file_name: (str) name for which the data is stored under
+        :param data: (bytes) data to be stored in s3
+        :return: (bool) True if the object was created, False if the key was already taken
+        """
+        try:
+            self.client.put_object(Body=data, Bucket=bucket_name, Key=file_name, IfNoneMatch="*")
+        except ParamValidationError:
+            if self.file_exists(bucket_name=bucket_name, file_name=file_name):
+                return False
+            self.client.put_object(Body=data, Bucket=bucket_name, Key=file_name)
+        except ClientError as error:
+            if str(error.response.get("Error", {}).get("Code")) in self.CONFLICT_CODES:
+                return False
+            raise
+        self.invalidate_keys(bucket_name=bucket_name, keys=[file_name])
+        return True
 
-    def download_file_to_disk(self, bucket_name: str, file_name: str, file_path: str) -> None:
+    def download_file_to_disk(self, bucket_name: str, file_name: str, file_path: str,
+                              if_match: Optional[str] = None) -> None:
         """
         Downloads file from bucket to disk (alter self.BASE_DIR and self.FILE_PATH to alter download destination).
 
         :param bucket_name: (str) name of bucket for file to be downloaded from
         :param file_name: (str) name of file being downloaded
         :param file_path: (str) path of where file is stored
+        :param if_match: (Optional[str]) if passed, the file is downloaded with concurrent ranged requests that fail
+                         unless the object still has this ETag
         :return: None
         """
+        if if_match is not None:
+            size = self.client.head_object(Bucket=bucket_name, Key=file_name, IfMatch=if_match)["ContentLength"]
+            self.download_ranges_to_file(bucket_name=bucket_name, file_name=file_name, file_path=file_path,
+                                         size=size, etag=if_match)
+            return
         self.client.download_file(bucket_name,
                                   file_name,
                                   file_path)
 
+    def download_file_to_cache(self, bucket_name: str, file_name: str, file_path: Optional[str] = None) -> str:
+        """
+        Gets a local copy of a file from self.content_cache, downloading it only if the cached copy is missing or out
+        of date. A copy checked within the ttl of the cache is returned without any request, otherwise the file is
+        requested with IfNoneMatch set to the ETag of the cached copy and the body is only sent if it has changed.
+        Files larger than the cache are downloaded to file_path instead.
+
+        :param bucket_name: (str) name of bucket for file to be downloaded from
+        :param file_name: (str) name of file being downloaded
+        :param file_path: (Optional[str]) path files too large for the cache are downloaded to, owned by the caller
+        :return: (str) path to the cached copy of the file, or file_path
+        """
+        if self.content_cache is None:
+            raise FileManagerError(message="no content cache is set to download {} to".format(file_name))
+        path = self.content_cache.get_checked(bucket_name=bucket_name, file_name=file_name)
+        if path is not None:
+            return path
+        etag = self.content_cache.get_etag(bucket_name=bucket_name, file_name=file_name)
+        response = None
+        if etag is not None:
+            try:
+                response = self.client.get_object(Bucket=bucket_name, Key=file_name, IfNoneMatch=etag)
+            except ClientError as error:
+                if str(error.response.get("Error", {}).get("Code")) not in self.NOT_MODIFIED_CODES:
+                    raise
+                path = self.content_cache.confirm(bucket_name=bucket_name, file_name=file_name, etag=etag)
+                if path is not None:
+                    return path
+        if response is None:
+            try:
+                response = self.client.get_object(Bucket=bucket_name, Key=file_name)
+            except ClientError as error:
+                if str(error.response.get("Error", {}).get("Code")) in self.MISSING_CODES:
+                    raise FileManagerError(message="{} does not exist in the bucket {}".format(file_name,
+                                                                                             bucket_name))
+                raise
+        etag = response["ETag"]
+        path = self.content_cache.get(bucket_name=bucket_name, file_name=file_name, etag=etag)
+        if path is not None:
+            response["Body"].close()
+            return path
+        if not self.content_cache.fits(size=response["ContentLength"]):
+            if file_path is None:
+                response["Body"].close()
+                raise FileManagerError(message="{} is too large for the content cache".format(file_name))
+            self._write_response(response=response, bucket_name=bucket_name, file_name=file_name,
+                                 file_path=file_path)
+            return file_path
+        return self.content_cache.fill(bucket_name=bucket_name, file_name=file_name, etag=etag,
+                                       download=lambda fill_path: self._write_response(
+                                           response=response, bucket_name=bucket_name, file_name=file_name,
+                                           file_path=fill_path), size=response["ContentLength"])
+
+    def _write_response(self, response: dict, bucket_name: str, file_name: str, file_path: str) -> None:
+        """
+        Writes the body of a get_object response to disk (private). Bodies above the multipart threshold are
+        dropped and downloaded again with concurrent ranged requests pinned to the same ETag.
+
+        :param response: (dict) the get_object response
+        :param bucket_name: (str) name of bucket for the file
+        :param file_name: (str) name of the file
+        :param file_path: (str) path the body is written to
+        :return: None
+        """
+        if response.get("ContentLength", 0) >= self.transfer_settings.multipart_threshold:
+            response["Body"].close()
+            self.download_ranges_to_file(bucket_name=bucket_name, file_name=file_name, file_path=file_path,
+                                         size=response["ContentLength"], etag=response["ETag"])
+            return
+        with open(file_path, "wb") as file:
+            shutil.copyfileobj(response["Body"], file, self.STREAM_CHUNK_SIZE)
+
+    def download_file_if_modified(self, bucket_name: str, file_name: str, file_path: str) -> bool:
+        """
+        Downloads file from bucket to disk unless the copy already at file_path is up to date. The modification time
+        of the copy is set to the LastModified time of the object, so the next call sends it as IfModifiedSince and
+        the body is skipped on a 304. The body is written to a temporary file that replaces file_path once complete
+        so a failed download never leaves a partial file that looks up to date.
+
+        :param bucket_name: (str) name of bucket for file to be downloaded from
+        :param file_name: (str) name of file being downloaded
+        :param file_path: (str) path of where file is stored
+        :return: (bool) True if the file was downloaded, False if the copy at file_path was up to date
+        """
+        kwargs = {}
+        if os.path.isfile(file_path):
+            kwargs["IfModifiedSince"] = datetime.datetime.fromtimestamp(os.path.getmtime(file_path),
+                                                                        tz=datetime.timezone.utc)
+        try:
+            response = self.client.get_object(Bucket=bucket_name, Key=file_name, **kwargs)
+        except ClientError as error:
+            if kwargs and str(error.response.get("Error", {}).get("Code")) in self.NOT_MODIFIED_CODES:
+                return False
+            raise
+        descriptor, download_path = tempfile.mkstemp(prefix="." + os.path.basename(file_path) + ".",
+                                                     dir=os.path.dirname(file_path) or None)
+        os.close(descriptor)
+        try:
+            self._write_response(response=response, bucket_name=bucket_name, file_name=file_name,
+                                 file_path=download_path)
+            modified = response["LastModified"].timestamp()
+            os.utime(download_path, (modified, modified))
+            os.replace(download_path, file_path)
+        except BaseException:
+            if os.path.exists(download_path):
+                os.remove(download_path)
+            raise
+        return True
+
     def download_file_to_memory(self, bucket_name: str, file_name: str) -> Any:
         """
         Downloads file to memory.
@@ -91,6 +301,102 @@ class FileManager:
         outcome = self.client.get_object(Bucket=bucket_name, Key=file_name)
         return outcome["Body"].read()
 
+    def download_file_to_buffer(self, bucket_name: str, file_name: str) -> memoryview:
+        """
+        Downloads file to memory using parallel ranged GET requests. The size is obtained with a HEAD request and the
+        ranges are written straight into one preallocated buffer so the file is never copied in memory.
+
+        :param bucket_name: (str) name of bucket for file to be downloaded from
+        :param file_name: (str) name of file being downloaded
+        :return: (memoryview) view of the downloaded bytes
+        """
+        size = self.client.head_object(Bucket=bucket_name, Key=file_name)["ContentLength"]
+        buffer = bytearray(size)
+        view = memoryview(buffer)
+        part_size = self.transfer_settings.part_size
+        ranges = [(start, min(start + part_size, size)) for start in range(0, size, part_size)]
+
+        def download_range(byte_range: Tuple[int, int]) -> None:
+            start, end = byte_range
+            self.download_range_into(bucket_name=bucket_name, file_name=file_name, buffer=view[start:end], start=start)
+
+        self._map_ranges(function=download_range, ranges=ranges)
+        return view
+
+    def download_ranges_to_file(self, bucket_name: str, file_name: str, file_path: str, size: int,
+                                etag: str) -> None:
+        """
+        Downloads a file to disk with concurrent ranged GET requests pinned to an ETag, each range being written at
+        its offset in the file.
+
+        :param bucket_name: (str) name of bucket for file to be downloaded from
+        :param file_name: (str) name of file being downloaded
+        :param file_path: (str) path the file is written to
+        :param size: (int) size of the file in bytes
+        :param etag: (str) the requests fail if the object no longer has this ETag
+        :return: None
+        """
+        with open(file_path, "wb") as file:
+            file.truncate(size)
+        part_size = self.transfer_settings.part_size
+        ranges = [(start, min(start + part_size, size)) for start in range(0, size, part_size)]
+
+        def download_range(byte_range: Tuple[int, int]) -> None:
+            start, end = byte_range
+            outcome = self.client.get_object(Bucket=bucket_name, Key=file_name,
+                                             Range="bytes={}-{}".format(start, end - 1), IfMatch=etag)
+            position = start
+            with open(file_path, "r+b") as file:
+                file.seek(start)
+                for chunk in outcome["Body"].iter_chunks(chunk_size=self.STREAM_CHUNK_SIZE):
+                    file.write(chunk)
+                    position += len(chunk)
+            if position != end:
+                raise FileManagerError(message="expected {} bytes from {} but received {}".format(
+                    end - start, file_name, position - start))
+
+        self._map_ranges(function=download_range, ranges=ranges)
+
+    def _map_ranges(self, function: Callable[[Tuple[int, int]], None], ranges: List[Tuple[int, int]]) -> None:
+        """
+        Calls a function on every byte range, in a thread pool if there is more than one range (private).
+
+        :param function: (Callable[[Tuple[int, int]], None]) downloads a range
+        :param ranges: (List[Tuple[int, int]]) start and end of each range
+        :return: None
+        """
+        if len(ranges) <= 1:
+            for byte_range in ranges:
+                function(byte_range)
+            return
+        with ThreadPoolExecutor(max_workers=min(self.transfer_settings.max_concurrency, len(ranges))) as pool:
+            # list forces any exception raised in a worker to be raised here
+            list(pool.map(function, ranges))
+
+    def download_range_into(self, bucket_name: str, file_name: str, buffer: memoryview, start: int,
+                            etag: Optional[str] = None) -> None:
+        """
+        Downloads a byte range of a file directly into a buffer. The range downloaded is the size of the buffer.
+
+        :param bucket_name: (str) name of bucket for file to be downloaded from
+        :param file_name: (str) name of file being downloaded
+        :param buffer: (memoryview) writable buffer the bytes are written to
+        :param start: (int) offset in the file of the first byte to be downloaded
+        :param etag: (Optional[str]) if passed, the request fails if the object no longer has this etag
+        :return: None
+        """
+        end = start + len(buffer) - 1
+        kwargs = {"IfMatch": etag} if etag else {}
+        outcome = self.client.get_object(Bucket=bucket_name, Key=file_name, Range="bytes={}-{}".format(start, end),
+                                         **kwargs)
+        position = 0
+        for chunk in outcome["Body"].iter_chunks(chunk_size=1024 * 1024):
+            buffer[position:position + len(chunk)] = chunk
+            position += len(chunk)
+        if position != len(buffer):
+            raise FileManagerError(message="expected {} bytes from {} but received {}".format(
+                len(buffer), file_name, position))
+
     def delete_file(self, bucket_name: str, file_name: str) -> None:
         """
         Deletes file from bucket.
@@ -101,6 +407,202 @@ class FileManager:
         """
         bucket = self.resource.Bucket(bucket_name)
         bucket.objects.filter(Prefix=file_name).delete()
+        self.invalidate_prefix(bucket_name=bucket_name, prefix=file_name)
+
+    def delete_keys(self, bucket_name: str, keys: Iterable[str]) -> Dict[str, str]:
+        """
+        Deletes keys from bucket with DeleteObjects requests of up to 1000 keys sent concurrently. Batches are sent
+        as soon as they fill so keys can be passed in as a generator over a listing.
+
+        :param bucket_name: (str) name of bucket for the keys
+        :param keys: (Iterable[str]) keys to be deleted
+        :return: (Dict[str, str]) error message for each key that could not be deleted
+        """
+        errors: Dict[str, str] = {}
+        lock = threading.Lock()
+        max_concurrency = self.transfer_settings.max_concurrency
+        slots = threading.BoundedSemaphore(max_concurrency)
+
+        def delete_batch(batch: List[str]) -> None:
+            try:
+                outcome = self.client.delete_objects(Bucket=bucket_name,
+                                                     Delete={"Objects": [{"Key": key} for key in batch],
+                                                             "Quiet": True})
+                failed = {error["Key"]: "{}: {}".format(error.get("Code"), error.get("Message"))
+                          for error in outcome.get("Errors", [])}
+            except ClientError as error:
+                failed = {key: str(error) for key in batch}
+            finally:
+                slots.release()
+            self.invalidate_keys(bucket_name=bucket_name, keys=batch)
+            with lock:
+                errors.update(failed)
+
+        with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+            futures = []
+            batch: List[str] = []
+            for key in keys:
+                batch.append(key)
+                if len(batch) == self.DELETE_BATCH_SIZE:
+                    slots.acquire()
+                    futures.append(pool.submit(delete_batch, batch))
+                    batch = []
+            if batch:
+                slots.acquire()
+                futures.append(pool.submit(delete_batch, batch))
+            for future in futures:
+                future.result()
+        return errors
+
+    def delete_prefixes(self, bucket_name: str, prefixes: Iterable[str]) -> Dict[str, str]:
+        """
+        Deletes every key starting with any of the prefixes using batched DeleteObjects requests. Prefixes are not
+        terminated with a "/" so the semantics match delete_file.
+
+        :param bucket_name: (str) name of bucket for the keys
+        :param prefixes: (Iterable[str]) prefixes of the keys to be deleted
+        :return: (Dict[str, str]) error message for each key that could not be deleted
+        """
+        prefixes = sorted(set(prefixes))
+        # a prefix that starts with another prefix would list the same keys twice
+        prefixes = [prefix for index, prefix in enumerate(prefixes)
+                    if not any(prefix.startswith(other) for other in prefixes[:index])]
+        return self.delete_keys(bucket_name=bucket_name,
+                                keys=self.list_keys(bucket_name=bucket_name, prefixes=prefixes))
+
+    def list_keys(self, bucket_name: str, prefixes: Iterable[str]) -> Iterator[str]:
+        """
+        Lists the keys starting with any of the prefixes page by page.
+
+        :param bucket_name: (str) name of bucket to be listed
+        :param prefixes: (Iterable[str]) prefixes of the keys
+        :return: (Iterator[str]) the keys
+        """
+        paginator = self.client.get_paginator('list_objects_v2')
+        for prefix in prefixes:
+            for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix):
+                for s3_object in page.get("Contents", []):
+                    yield s3_object["Key"]
+
+    def list_prefix(self, bucket_name: str, prefix: str, delimiter: Optional[str] = None) -> Iterator[Tuple[str, bool]]:
+        """
+        Lists the keys starting with a prefix page by page. With a delimiter only one level is listed and the
+        folders below it are returned as common prefixes.
+
+        :param bucket_name: (str) name of bucket to be listed
+        :param prefix: (str) prefix of the keys
+        :param delimiter: (Optional[str]) character grouping keys into folders, the listing is recursive if None
+        :return: (Iterator[Tuple[str, bool]]) each key or common prefix and True if it is a common prefix
+        """
+        paginator = self.client.get_paginator('list_objects_v2')
+        parameters = {"Bucket": bucket_name, "Prefix": prefix}
+        if delimiter is not None:
+            parameters["Delimiter"] = delimiter
+        for page in paginator.paginate(**parameters):
+            for s3_object in page.get("Contents", []):
+                yield s3_object["Key"], False
+            for common_prefix in page.get("CommonPrefixes", []):
+                yield common_prefix["Prefix"], True
+
+    def copy_object(self, bucket_name: str, file_name: str, new_bucket_name: str, new_file_name: str,
+                    size: Optional[int] = None) -> None:
+        """
+        Copies an object server side. Objects larger than the 5GB CopyObject limit are copied with a multipart
+        upload made of UploadPartCopy requests sent concurrently.
+
+        :param bucket_name: (str) name of bucket the object is copied from
+        :param file_name: (str) key of the object being copied
+        :param new_bucket_name: (str) name of bucket the object is copied to
+        :param new_file_name: (str) key the object is copied to
+        :param size: (Optional[int]) size of the object, a HEAD request is made if not passed
+        :return: None
+        """
+        source = {"Bucket": bucket_name, "Key": file_name}
+        head = None
+        if size is None:
+            head = self.client.head_object(**source)
+            size = head["ContentLength"]
+        if size <= self.MULTIPART_COPY_THRESHOLD:
+            self.client.copy_object(CopySource=source, Bucket=new_bucket_name, Key=new_file_name)
+            self.invalidate_keys(bucket_name=new_bucket_name, keys=[new_file_name])
+            return
+        if head is None:
+            head = self.client.head_object(**source)
+        extra = {"Metadata": head.get("Metadata", {})}
+        if head.get("ContentType"):
+            extra["ContentType"] = head["ContentType"]
+        upload_id = self.client.create_multipart_upload(Bucket=new_bucket_name, Key=new_file_name,
+                                                        **extra)["UploadId"]
+        part_size = max(self.COPY_PART_SIZE, -(-size // self.MAXIMUM_PARTS))
+
+        def copy_part(part_number: int) -> dict:
+            start = (part_number - 1) * part_size
+            end = min(start + part_size, size) - 1
+            outcome = self.client.upload_part_copy(Bucket=new_bucket_name, Key=new_file_name, UploadId=upload_id,
+                                                   PartNumber=part_number, CopySource=source,
+                                                   CopySourceRange="bytes={}-{}".format(start, end))
+            return {"PartNumber": part_number, "ETag": outcome["CopyPartResult"]["ETag"]}
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.transfer_settings.max_concurrency) as pool:
+                parts = list(pool.map(copy_part, range(1, -(-size // part_size) + 1)))
+            self.client.complete_multipart_upload(Bucket=new_bucket_name, Key=new_file_name, UploadId=upload_id,
+                                                  MultipartUpload={"Parts": parts})
+        except BaseException:
+            self.client.abort_multipart_upload(Bucket=new_bucket_name, Key=new_file_name, UploadId=upload_id)
+            raise
+        self.invalidate_keys(bucket_name=new_bucket_name, keys=[new_file_name])
+
+    def copy_prefix(self, bucket_name: str, prefix: str, new_bucket_name: str, new_prefix: str,
+                    journal: Optional[CopyJournal] = None) -> List[str]:
+        """
+        Copies every key starting with prefix so it starts with new_prefix instead. Copies run on a bounded thread
+        pool while the listing is still paging. Keys already in the journal are skipped and every copied key is
+        recorded in it.
+
+        :param bucket_name: (str) name of bucket the keys are copied from
+        :param prefix: (str) prefix of the keys being copied
+        :param new_bucket_name: (str) name of bucket the keys are copied to
+        :param new_prefix: (str) prefix replacing prefix in the copied keys
+        :param journal: (Optional[CopyJournal]) journal of completed copies used to resume an interrupted copy
+        :return: (List[str]) every source key under prefix, including the ones skipped because of the journal
+        """
+        max_concurrency = self.transfer_settings.max_concurrency
+        slots = threading.BoundedSemaphore(max_concurrency * 2)
+        keys: List[str] = []
+        futures = []
+
+        def copy(key: str, size: int) -> None:
+            try:
+                self.copy_object(bucket_name=bucket_name, file_name=key, new_bucket_name=new_bucket_name,
+                                 new_file_name=new_prefix + key[len(prefix):], size=size)
+                if journal is not None:
+                    journal.record(key)
+            finally:
+                slots.release()
+
+        paginator = self.client.get_paginator('list_objects_v2')
+        with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+            try:
+                for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix):
+                    for s3_object in page.get("Contents", []):
+                        key = s3_object["Key"]
+                        keys.append(key)
+                        if journal is not None and key in journal:
+                            continue
+                        slots.acquire()
+                        futures.append(pool.submit(copy, key, s3_object["Size"]))
+                    # surfaces failed copies without waiting for the whole listing
+                    for future in [future for future in futures if future.done()]:
+                        future.result()
+                        futures.remove(future)
+                for future in futures:
+                    future.result()
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+        return keys
 
     def delete_folder(self, bucket_name: str, file_name: str) -> None:
         """
@@ -114,26 +616,117 @@ class FileManager:
 
     def file_exists(self, bucket_name, file_name) -> bool:
         """
-        Check if file exists in a bucket.
+        Check if file exists in a bucket. The answer is served from self.metadata_cache when it is set.
 
         :param bucket_name: (str) name of bucket for file
         :param file_name: (str) name of file to search for
-        :return: None
+        :return: (bool) True if the file exists, False if not
+        """
+        if self.metadata_cache is not None:
+            stat = self.metadata_cache.get_stat(bucket_name=bucket_name, file_name=file_name)
+            if stat is not MetadataCache.MISSING:
+                return stat is not None
+        return self._head_stat(bucket_name=bucket_name, file_name=file_name) is not None
+
+    def stat_objects(self, bucket_name: str, keys: Iterable[str]) -> Dict[str, Optional[dict]]:
+        """
+        Gets the metadata of many objects. Keys sharing a folder are checked with one listing of the folder and
+        the others with concurrent HEAD requests. Results are served from and stored in self.metadata_cache when
+        it is set.
+
+        :param bucket_name: (str) name of bucket for the objects
+        :param keys: (Iterable[str]) keys of the objects
+        :return: (Dict[str, Optional[dict]]) last_modified, size and etag of each key, None for missing keys
+        """
+        keys = list(dict.fromkeys(keys))
+        stats: Dict[str, Optional[dict]] = {}
+        groups: Dict[str, List[str]] = {}
+        for key in keys:
+            if self.metadata_cache is not None:
+                stat = self.metadata_cache.get_stat(bucket_name=bucket_name, file_name=key)
+                if stat is not MetadataCache.MISSING:
+                    stats[key] = stat
+                    continue
+            # a listing with a delimiter rolls folder objects into common prefixes so they are checked with HEAD
+            folder = key.rsplit("/", 1)[0] + "/" if "/" in key and not key.endswith("/") else None
+            groups.setdefault(folder, []).append(key)
+
+        def head(key: str) -> Dict[str, Optional[dict]]:
+            return {key: self._head_stat(bucket_name=bucket_name, file_name=key)}
+
+        with ThreadPoolExecutor(max_workers=self.transfer_settings.max_concurrency) as pool:
+            futures = []
+            for folder, group in groups.items():
+                if folder is not None and len(group) >= self.LISTING_GROUP_SIZE:
+                    futures.append(pool.submit(self._listing_stats, bucket_name, folder, group))
+                else:
+                    futures += [pool.submit(head, key) for key in group]
+            for future in futures:
+                stats.update(future.result())
+        return {key: stats[key] for key in keys}
+
+    def _head_stat(self, bucket_name: str, file_name: str) -> Optional[dict]:
+        """
+        Gets the metadata of an object with a HEAD request, caching it when self.metadata_cache is set (private).
+
+        :param bucket_name: (str) name of bucket for the object
+        :param file_name: (str) key of the object
+        :return: (Optional[dict]) last_modified, size and etag of the object, None if it does not exist
         """
         try:
-            self.client.head_object(Bucket=bucket_name, Key=file_name)
-            return True
-        except ClientError:
-            return False
+            head = self.client.head_object(Bucket=bucket_name, Key=file_name)
+            stat = {"last_modified": head["LastModified"].strftime("%Y-%m-%d %H:%M:%S") if head.get("LastModified")
+                    else None, "size": head.get("ContentLength"), "etag": head.get("ETag")}
+        except ClientError as error:
+            if str(error.response.get("Error", {}).get("Code")) not in self.MISSING_CODES:
+                raise
+            stat = None
+        if self.metadata_cache is not None:
+            self.metadata_cache.put_stat(bucket_name=bucket_name, file_name=file_name, stat=stat)
+        return stat
+
+    def _listing_stats(self, bucket_name: str, folder: str, keys: List[str]) -> Dict[str, Optional[dict]]:
+        """
+        Gets the metadata of keys in the same folder with one listing of the folder, caching it when
+        self.metadata_cache is set. The listing stops once it has passed the last key being checked (private).
+
+        :param bucket_name: (str) name of bucket for the objects
+        :param folder: (str) prefix of the folder ending in "/"
+        :param keys: (List[str]) keys in the folder
+        :return: (Dict[str, Optional[dict]]) last_modified, size and etag of each key, None for missing keys
+        """
+        wanted = set(keys)
+        last_key = max(keys)
+        stats: Dict[str, Optional[dict]] = {key: None for key in keys}
+        paginator = self.client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=bucket_name, Prefix=folder, Delimiter="/"):
+            contents = page.get("Contents", [])
+            for s3_object in contents:
+                if s3_object["Key"] in wanted:
+                    last_modified, size = self.get_file_info(s3_object)
+                    stats[s3_object["Key"]] = {"last_modified": last_modified, "size": size,
+                                               "etag": s3_object.get("ETag")}
+            # keys are listed in order so later pages cannot hold any of the keys being checked
+            if contents and contents[-1]["Key"] >= last_key:
+                break
+        if self.metadata_cache is not None:
+            for key, stat in stats.items():
+                self.metadata_cache.put_stat(bucket_name=bucket_name, file_name=key, stat=stat)
+        return stats
 
     def ls_folder(self, bucket_name: str, file_name: str) -> Tuple[dict, List[str]]:
         """
-        Lists all the sub directories and sub files belonging to the self.path.
+        Lists all the sub directories and sub files belonging to the self.path. The listing is served from
+        self.listing_cache when it is set.
 
         :param bucket_name: (str) the name of the bucket
         :param file_name: (str) the name of the file
         :return: (Tuple[List[str], List[str]]) sub files with metadata and sub directories
         """
+        if self.listing_cache is not None:
+            listing = self.listing_cache.get_listing(bucket_name=bucket_name, prefix=file_name)
+            if listing is not None:
+                return listing
         paginator = self.client.get_paginator('list_objects')
         prefix = file_name
         if prefix and not prefix.endswith("/"):
@@ -148,8 +741,56 @@ class FileManager:
                 for x in result.get("Contents"):
                     last_modified, size = self.get_file_info(x)
                     files[unquote(x.get('Key').split("/")[-1])] = {"last_modified": last_modified, "size": size}
+        if self.listing_cache is not None:
+            self.listing_cache.put_listing(bucket_name=bucket_name, prefix=file_name, files=files, dirs=dirs)
         return files, dirs
 
+    def list_folder_page(self, bucket_name: str, file_name: str, page_size: int = 1000,
+                         continuation_token: Optional[str] = None) -> Tuple[List[DirEntry], Optional[str]]:
+        """
+        Lists one page of the sub directories and sub files of a folder.
+
+        :param bucket_name: (str) the name of the bucket
+        :param file_name: (str) the name of the folder
+        :param page_size: (int) maximum number of entries in the page (s3 caps this at 1000)
+        :param continuation_token: (Optional[str]) token returned with the previous page, the first page if None
+        :return: (Tuple[List[DirEntry], Optional[str]]) entries of the page and the token for the next page, None
+                 if this is the last page
+        """
+        prefix = file_name
+        if prefix and not prefix.endswith("/"):
+            prefix += "/"
+        parameters = {"Bucket": bucket_name, "Prefix": prefix, "Delimiter": "/", "MaxKeys": page_size}
+        if continuation_token is not None:
+            parameters["ContinuationToken"] = continuation_token
+        result = self.client.list_objects_v2(**parameters)
+        entries = [DirEntry(name=unquote(x["Prefix"].split("/")[-2]), is_dir=True)
+                   for x in result.get("CommonPrefixes", [])]
+        for x in result.get("Contents", []):
+            # the folder object itself is listed under its own prefix
+            if x["Key"] == prefix:
+                continue
+            last_modified, size = self.get_file_info(x)
+            entries.append(DirEntry(name=unquote(x["Key"].split("/")[-1]), is_dir=False, size=size,
+                                    last_modified=last_modified))
+        return entries, result.get("NextContinuationToken") if result.get("IsTruncated") else None
+
+    def iter_folder(self, bucket_name: str, file_name: str) -> Iterator[DirEntry]:
+        """
+        Yields the sub directories and sub files of a folder as each page of the listing arrives.
+
+        :param bucket_name: (str) the name of the bucket
+        :param file_name: (str) the name of the folder
+        :return: (Iterator[DirEntry]) the entries of the folder
+        """
+        continuation_token = None
+        while True:
+            entries, continuation_token = self.list_folder_page(bucket_name=bucket_name, file_name=file_name,
+                                                                continuation_token=continuation_token)
+            yield from entries
+            if continuation_token is None:
+                return
+
     @staticmethod
     def get_file_info(s3_object: dict) -> Tuple[str, int]:
         """
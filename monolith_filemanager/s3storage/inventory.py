@@ -0,0 +1,340 @@
+import calendar
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import unquote
+
+import globre
+
+
+class BucketInventory:
+    """
+    This is a class for a complete index of the objects in a bucket, stored in a sqlite file on local disk. The
+    bucket is listed concurrently by sharding it on its top level folders and every page is followed, so the index is
+    not truncated at 1000 keys. Once built, ls, search and du queries are answered from the index without calling s3.
+
+    Attributes:
+        client (Any): s3 client used to list the bucket
+        bucket_name (str): name of the bucket indexed
+        path (str): path to the sqlite file, ":memory:" keeps the index in memory
+        max_concurrency (int): maximum number of shards listed at the same time
+    """
+    INVENTORY_DIRECTORY: str = os.path.join(tempfile.gettempdir(), "monolith-filemanager-inventories")
+    SHARD_DEPTH: int = 2
+    PAGE_SIZE: int = 1000
+    QUERY_BATCH_SIZE: int = 512
+
+    def __init__(self, client: Any, bucket_name: str, path: Optional[str] = None, max_concurrency: int = 16) -> None:
+        """
+        The constructor for the BucketInventory class. An index left by a previous run at path is reused.
+
+        :param client: (Any) s3 client used to list the bucket
+        :param bucket_name: (str) name of the bucket indexed
+        :param path: (Optional[str]) path to the sqlite file, a file in INVENTORY_DIRECTORY named after the bucket if
+                     None
+        :param max_concurrency: (int) maximum number of shards listed at the same time
+        """
+        if path is None:
+            os.makedirs(self.INVENTORY_DIRECTORY, exist_ok=True)
+            name = hashlib.sha1(bucket_name.encode("utf-8")).hexdigest()
+            path = os.path.join(self.INVENTORY_DIRECTORY, name + ".sqlite")
+        self.client: Any = client
+        self.bucket_name: str = bucket_name
+        self.path: str = path
+        self.max_concurrency: int = max_concurrency
+        self._lock: threading.RLock = threading.RLock()
+        self._connection: sqlite3.Connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(
+            "CREATE TABLE IF NOT EXISTS objects (key TEXT PRIMARY KEY, size INTEGER NOT NULL, "
+            "last_modified INTEGER NOT NULL, etag TEXT, generation INTEGER NOT NULL) WITHOUT ROWID;"
+            "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL);"
+        )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM objects").fetchone()[0]
+
+    @property
+    def built(self) -> bool:
+        """
+        True if the index has been fully built at least once.
+        """
+        return self._get_meta("generation") is not None
+
+    @property
+    def refreshed_at(self) -> Optional[float]:
+        """
+        Unix time of the last build or update, None if the index has never been built.
+        """
+        value = self._get_meta("refreshed_at")
+        return float(value) if value is not None else None
+
+    def build(self) -> None:
+        """
+        Lists the whole bucket and replaces the index with the listing. Keys that are no longer in the bucket are
+        removed from the index.
+
+        :return: None
+        """
+        generation = int(self._get_meta("generation") or 0) + 1
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            shards = self._discover_shards(executor=executor, generation=generation)
+            list(executor.map(lambda shard: self._index_shard(shard=shard, generation=generation), shards))
+        with self._lock:
+            self._connection.execute("DELETE FROM objects WHERE generation < ?", (generation,))
+            self._set_meta("generation", str(generation))
+            self._set_meta("refreshed_at", str(time.time()))
+            self._connection.commit()
+
+    def update(self) -> None:
+        """
+        Adds the keys written since the last build or update. Each shard is listed with StartAfter set to the last
+        key indexed under it so only the keys sorting after it are requested. This picks up every new object for key
+        layouts that grow in order, such as dated or numbered keys. Keys overwritten or deleted in the middle of a
+        shard are only picked up by build.
+
+        :return: None
+        """
+        if not self.built:
+            self.build()
+            return
+        generation = int(self._get_meta("generation"))
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            shards = self._discover_shards(executor=executor, generation=generation)
+            list(executor.map(lambda shard: self._index_shard(shard=shard, generation=generation,
+                                                              start_after=self._last_key(prefix=shard)), shards))
+        with self._lock:
+            self._set_meta("refreshed_at", str(time.time()))
+            self._connection.commit()
+
+    def ls(self, prefix: str = "") -> Tuple[Dict[str, dict], List[str]]:
+        """
+        Lists the sub files and sub directories of a folder in the same form as FileManager.ls_folder. Each sub
+        directory is skipped over with a single seek so large sub directories do not slow the listing down.
+
+        :param prefix: (str) the folder, the root of the bucket if empty
+        :return: (Tuple[Dict[str, dict], List[str]]) sub files with metadata and sub directories
+        """
+        if prefix and not prefix.endswith("/"):
+            prefix += "/"
+        end = self._prefix_end(prefix)
+        files = {}
+        dirs = []
+        cursor = prefix + "\0"
+        while True:
+            rows = self._range(start=cursor, end=end, columns="key, size, last_modified",
+                               limit=self.QUERY_BATCH_SIZE)
+            if not rows:
+                break
+            cursor = rows[-1][0] + "\0"
+            for key, size, last_modified in rows:
+                name = key[len(prefix):]
+                if "/" in name:
+                    folder = name[:name.index("/") + 1]
+                    dirs.append(unquote(folder[:-1]))
+                    cursor = self._prefix_end(prefix + folder)
+                    break
+                files[unquote(name)] = {"last_modified": self._format_time(last_modified), "size": size}
+        return files, dirs
+
+    def keys(self, prefix: str = "") -> Iterator[str]:
+        """
+        Yields every indexed key starting with a prefix in order.
+
+        :param prefix: (str) prefix of the keys
+        :return: (Iterator[str]) the keys
+        """
+        end = self._prefix_end(prefix)
+        cursor = prefix
+        while True:
+            rows = self._range(start=cursor, end=end, columns="key", limit=self.QUERY_BATCH_SIZE)
+            if not rows:
+                return
+            for row in rows:
+                yield row[0]
+            cursor = rows[-1][0] + "\0"
+
+    def search(self, file_pattern: str) -> List[str]:
+        """
+        Gets the keys matching a glob pattern. Only the keys starting with the literal prefix of the pattern are
+        scanned.
+
+        :param file_pattern: (str) glob pattern matched against whole keys
+        :return: (List[str]) the matching keys
+        """
+        literal_prefix, pattern = globre.compile(file_pattern, flags=globre.EXACT, split_prefix=True)
+        return [key for key in self.keys(prefix=literal_prefix or "") if pattern.match(key)]
+
+    def du(self, prefix: str = "") -> Tuple[int, int]:
+        """
+        Gets the number of objects and their total size under a prefix.
+
+        :param prefix: (str) prefix of the keys counted
+        :return: (Tuple[int, int]) number of objects and total size in bytes
+        """
+        end = self._prefix_end(prefix)
+        query = "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM objects WHERE key >= ?"
+        parameters = [prefix]
+        if end is not None:
+            query += " AND key < ?"
+            parameters.append(end)
+        with self._lock:
+            count, size = self._connection.execute(query, parameters).fetchone()
+        return count, size
+
+    def close(self) -> None:
+        """
+        Closes the sqlite file.
+
+        :return: None
+        """
+        with self._lock:
+            self._connection.close()
+
+    def _discover_shards(self, executor: ThreadPoolExecutor, generation: int) -> List[str]:
+        """
+        Splits the bucket into folder prefixes that can be listed concurrently by listing the top levels of the
+        bucket with a delimiter (private). Keys found directly in these levels are indexed on the way.
+
+        :param executor: (ThreadPoolExecutor) pool the levels are listed with
+        :param generation: (int) generation the keys found are stored with
+        :return: (List[str]) prefixes covering every key not already indexed
+        """
+        shards = [""]
+        for _ in range(self.SHARD_DEPTH):
+            if len(shards) >= self.max_concurrency:
+                break
+            levels = executor.map(lambda shard: self._list_level(prefix=shard, generation=generation), shards)
+            shards = [folder for level in levels for folder in level]
+        return shards
+
+    def _list_level(self, prefix: str, generation: int) -> List[str]:
+        """
+        Lists one level of a folder, indexing its keys (private).
+
+        :param prefix: (str) the folder
+        :param generation: (int) generation the keys are stored with
+        :return: (List[str]) prefixes of the sub folders
+        """
+        folders = []
+        for page in self._pages(prefix=prefix, delimiter="/"):
+            self._store(contents=page.get("Contents", []), generation=generation)
+            folders += [common_prefix["Prefix"] for common_prefix in page.get("CommonPrefixes", [])]
+        return folders
+
+    def _index_shard(self, shard: str, generation: int, start_after: Optional[str] = None) -> None:
+        """
+        Lists every key under a shard and stores it in the index (private).
+
+        :param shard: (str) prefix of the shard
+        :param generation: (int) generation the keys are stored with
+        :param start_after: (Optional[str]) only keys sorting after this one are listed if passed
+        :return: None
+        """
+        for page in self._pages(prefix=shard, start_after=start_after):
+            self._store(contents=page.get("Contents", []), generation=generation)
+
+    def _pages(self, prefix: str, delimiter: Optional[str] = None,
+               start_after: Optional[str] = None) -> Iterator[dict]:
+        """
+        Yields every page of a listing, following the continuation tokens (private).
+
+        :param prefix: (str) prefix of the keys listed
+        :param delimiter: (Optional[str]) character grouping keys into folders, the listing is recursive if None
+        :param start_after: (Optional[str]) only keys sorting after this one are listed if passed
+        :return: (Iterator[dict]) the list_objects_v2 responses
+        """
+        parameters = {"Bucket": self.bucket_name, "Prefix": prefix, "MaxKeys": self.PAGE_SIZE}
+        if delimiter is not None:
+            parameters["Delimiter"] = delimiter
+        if start_after is not None:
+            parameters["StartAfter"] = start_after
+        while True:
+            page = self.client.list_objects_v2(**parameters)
+            yield page
+            if not page.get("IsTruncated"):
+                return
+            parameters["ContinuationToken"] = page["NextContinuationToken"]
+
+    def _store(self, contents: List[dict], generation: int) -> None:
+        """
+        Stores the objects of a listing page in the index (private).
+
+        :param contents: (List[dict]) the "Contents" of a list_objects_v2 response
+        :param generation: (int) generation the keys are stored with
+        :return: None
+        """
+        if not contents:
+            return
+        rows = [(s3_object["Key"], s3_object.get("Size", 0),
+                 calendar.timegm(s3_object["LastModified"].utctimetuple()),
+                 s3_object.get("ETag", "").strip('"') or None, generation) for s3_object in contents]
+        with self._lock:
+            self._connection.executemany("INSERT OR REPLACE INTO objects VALUES (?, ?, ?, ?, ?)", rows)
+
+    def _range(self, start: str, end: Optional[str], columns: str, limit: int) -> List[tuple]:
+        """
+        Gets the rows with keys from start (inclusive) to end (exclusive) in order (private).
+
+        :param start: (str) first key of the range
+        :param end: (Optional[str]) end of the range, unbounded if None
+        :param columns: (str) columns selected
+        :param limit: (int) maximum number of rows returned
+        :return: (List[tuple]) the rows
+        """
+        query = "SELECT {} FROM objects WHERE key >= ?".format(columns)
+        parameters = [start]
+        if end is not None:
+            query += " AND key < ?"
+            parameters.append(end)
+        query += " ORDER BY key LIMIT ?"
+        parameters.append(limit)
+        with self._lock:
+            return self._connection.execute(query, parameters).fetchall()
+
+    def _last_key(self, prefix: str) -> Optional[str]:
+        """
+        Gets the last indexed key starting with a prefix (private).
+
+        :param prefix: (str) prefix of the key
+        :return: (Optional[str]) the last key, None if no key starts with the prefix
+        """
+        end = self._prefix_end(prefix)
+        query = "SELECT MAX(key) FROM objects WHERE key >= ?"
+        parameters = [prefix]
+        if end is not None:
+            query += " AND key < ?"
+            parameters.append(end)
+        with self._lock:
+            return self._connection.execute(query, parameters).fetchone()[0]
+
+    def _get_meta(self, name: str) -> Optional[str]:
+        with self._lock:
+            row = self._connection.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row is not None else None
+
+    def _set_meta(self, name: str, value: str) -> None:
+        with self._lock:
+            self._connection.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (name, value))
+
+    @staticmethod
+    def _prefix_end(prefix: str) -> Optional[str]:
+        """
+        Gets the smallest string sorting after every string starting with a prefix (private). sqlite compares text
+        by its UTF-8 bytes, which sorts the same way as code points.
+
+        :param prefix: (str) the prefix
+        :return: (Optional[str]) the end of the prefix range, None if the range is unbounded
+        """
+        if not prefix:
+            return None
+        return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+    @staticmethod
+    def _format_time(timestamp: int) -> str:
+        return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(timestamp))
@@ -0,0 +1,94 @@
+from typing import Iterable, List, Optional, Tuple
+
+from ..components.lru_cache import LRUCache
+
+
+class ListingCache(LRUCache):
+    """
+    This is a class for caching the results of FileManager.ls_folder keyed by bucket and prefix. Writes, deletes and
+    copies made through the engine invalidate the listings of every folder above the keys they change. Changes made
+    by other processes are only seen once the entries expire.
+    """
+    def __init__(self, ttl: Optional[float] = 5.0, max_entries: int = 1024) -> None:
+        """
+        The constructor for the ListingCache class.
+
+        :param ttl: (Optional[float]) seconds a listing is valid for
+        :param max_entries: (int) maximum number of listings held
+        """
+        super().__init__(max_entries=max_entries, ttl=ttl)
+
+    @staticmethod
+    def folder_prefix(prefix: str) -> str:
+        """
+        Normalises a folder name into the prefix that is listed.
+
+        :param prefix: (str) name of the folder
+        :return: (str) the prefix ending in "/", or "" for the root of the bucket
+        """
+        if prefix and not prefix.endswith("/"):
+            prefix += "/"
+        return prefix
+
+    @staticmethod
+    def _parents(key: str) -> List[str]:
+        """
+        Gets the prefixes of every folder above a key (private).
+
+        :param key: (str) the key
+        :return: (List[str]) the prefixes from the root of the bucket down
+        """
+        parts = key.split("/")[:-1]
+        return [""] + ["/".join(parts[:index]) + "/" for index in range(1, len(parts) + 1)]
+
+    def get_listing(self, bucket_name: str, prefix: str) -> Optional[Tuple[dict, List[str]]]:
+        """
+        Gets a copy of a cached listing.
+
+        :param bucket_name: (str) the name of the bucket
+        :param prefix: (str) the folder listed
+        :return: (Optional[Tuple[dict, List[str]]]) files with metadata and sub directories, None if not cached
+        """
+        listing = self.get((bucket_name, self.folder_prefix(prefix)))
+        if listing is self.MISSING:
+            return None
+        files, dirs = listing
+        return {name: dict(info) for name, info in files.items()}, list(dirs)
+
+    def put_listing(self, bucket_name: str, prefix: str, files: dict, dirs: List[str]) -> None:
+        """
+        Stores a copy of a listing.
+
+        :param bucket_name: (str) the name of the bucket
+        :param prefix: (str) the folder listed
+        :param files: (dict) files with metadata
+        :param dirs: (List[str]) sub directories
+        :return: None
+        """
+        self.put((bucket_name, self.folder_prefix(prefix)),
+                 ({name: dict(info) for name, info in files.items()}, list(dirs)))
+
+    def invalidate_keys(self, bucket_name: str, keys: Iterable[str]) -> None:
+        """
+        Invalidates the listings of every folder above keys that have been written or deleted.
+
+        :param bucket_name: (str) the name of the bucket
+        :param keys: (Iterable[str]) the keys that have changed
+        :return: None
+        """
+        prefixes = set()
+        for key in keys:
+            prefixes.update(self._parents(key))
+        for prefix in prefixes:
+            self.invalidate((bucket_name, prefix))
+
+    def invalidate_prefix(self, bucket_name: str, prefix: str) -> None:
+        """
+        Invalidates every listing under a prefix and the listings of the folders above it.
+
+        :param bucket_name: (str) the name of the bucket
+        :param prefix: (str) the prefix that has changed
+        :return: None
+        """
+        self.invalidate_where(lambda key: key[0] == bucket_name and key[1].startswith(prefix))
+        self.invalidate_keys(bucket_name=bucket_name, keys=[prefix])
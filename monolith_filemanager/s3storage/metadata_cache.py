@@ -0,0 +1,65 @@
+from typing import Any, Iterable, Optional
+
+from ..components.lru_cache import LRUCache
+
+
+class MetadataCache(LRUCache):
+    """
+    This is a class for caching the metadata of s3 objects keyed by bucket and key. Objects that do not exist are
+    cached as None so repeated checks for missing objects do not make a request either. Writes and deletes made
+    through the engine invalidate the affected entries, changes made by other processes are seen once the entries
+    expire.
+    """
+    def __init__(self, ttl: Optional[float] = 2.0, max_entries: int = 10000) -> None:
+        """
+        The constructor for the MetadataCache class.
+
+        :param ttl: (Optional[float]) seconds an entry is valid for
+        :param max_entries: (int) maximum number of entries held
+        """
+        super().__init__(max_entries=max_entries, ttl=ttl)
+
+    def get_stat(self, bucket_name: str, file_name: str) -> Any:
+        """
+        Gets the cached metadata of an object.
+
+        :param bucket_name: (str) the name of the bucket
+        :param file_name: (str) the key of the object
+        :return: (Any) the metadata, None if the object is known to be missing, MetadataCache.MISSING if not cached
+        """
+        stat = self.get((bucket_name, file_name))
+        if isinstance(stat, dict):
+            return dict(stat)
+        return stat
+
+    def put_stat(self, bucket_name: str, file_name: str, stat: Optional[dict]) -> None:
+        """
+        Stores the metadata of an object.
+
+        :param bucket_name: (str) the name of the bucket
+        :param file_name: (str) the key of the object
+        :param stat: (Optional[dict]) the metadata, None if the object does not exist
+        :return: None
+        """
+        self.put((bucket_name, file_name), dict(stat) if stat is not None else None)
+
+    def invalidate_keys(self, bucket_name: str, keys: Iterable[str]) -> None:
+        """
+        Invalidates the entries of keys that have been written or deleted.
+
+        :param bucket_name: (str) the name of the bucket
+        :param keys: (Iterable[str]) the keys that have changed
+        :return: None
+        """
+        for key in keys:
+            self.invalidate((bucket_name, key))
+
+    def invalidate_prefix(self, bucket_name: str, prefix: str) -> None:
+        """
+        Invalidates the entries of every key under a prefix.
+
+        :param bucket_name: (str) the name of the bucket
+        :param prefix: (str) the prefix that has changed
+        :return: None
+        """
+        self.invalidate_where(lambda key: key[0] == bucket_name and key[1].startswith(prefix))
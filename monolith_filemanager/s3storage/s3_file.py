@@ -0,0 +1,473 @@
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional, Tuple
+
+from .errors import FileManagerError
+from .transfer import MB
+
+
+class S3ReadFile(io.RawIOBase):
+    """
+    This is a class for reading an s3 object as a seekable, read-only file object. Bytes are fetched with ranged GET
+    requests in blocks that are kept in a LRU cache, so libraries that accept file objects only download the parts
+    of the object they read.
+
+    Attributes:
+        bucket_name (str): name of the bucket the object is in
+        file_name (str): key of the object
+        size (int): size of the object in bytes
+        etag (Optional[str]): etag of the object, every range is requested with it so a changed object is not mixed
+        block_size (int): size in bytes of each block fetched and cached
+        read_ahead (int): number of extra blocks fetched when the object is read sequentially, at most max_blocks - 1
+        max_blocks (int): number of blocks kept in the cache before the least recently used is dropped
+        hits (int): number of block reads served from the cache
+        misses (int): number of block reads that had to be fetched
+    """
+    def __init__(self, engine: Any, bucket_name: str, file_name: str, block_size: int = MB, read_ahead: int = 4,
+                 max_blocks: int = 64, size: Optional[int] = None, etag: Optional[str] = None) -> None:
+        """
+        The constructor for the S3ReadFile class.
+
+        :param engine: (FileManager) the engine used to make the requests
+        :param bucket_name: (str) name of the bucket the object is in
+        :param file_name: (str) key of the object
+        :param block_size: (int) size in bytes of each block fetched and cached
+        :param read_ahead: (int) number of extra blocks fetched when the object is read sequentially
+        :param max_blocks: (int) number of blocks kept in the cache
+        :param size: (Optional[int]) size of the object, a HEAD request is made if size is not passed
+        :param etag: (Optional[str]) etag of the object, taken from the HEAD request if size is not passed
+        """
+        super().__init__()
+        if block_size < 1 or max_blocks < 1 or read_ahead < 0:
+            raise FileManagerError(message="block size and max blocks have to be positive and read ahead not negative")
+        self._engine: Any = engine
+        self.bucket_name: str = bucket_name
+        self.file_name: str = file_name
+        if size is None:
+            head = engine.client.head_object(Bucket=bucket_name, Key=file_name)
+            size = head["ContentLength"]
+            etag = head.get("ETag")
+        self.size: int = size
+        self.etag: Optional[str] = etag
+        self.block_size: int = block_size
+        self.read_ahead: int = read_ahead
+        self.max_blocks: int = max_blocks
+        self.hits: int = 0
+        self.misses: int = 0
+        self._position: int = 0
+        self._last_block: int = -2
+        self._blocks: OrderedDict = OrderedDict()
+        self._lock: threading.RLock = threading.RLock()
+
+    @property
+    def name(self) -> str:
+        """
+        Gets the path of the object.
+
+        :return: (str) s3 path of the object
+        """
+        return "s3://{}/{}".format(self.bucket_name, self.file_name)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def writable(self) -> bool:
+        return False
+
+    def tell(self) -> int:
+        self._checkClosed()
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """
+        Moves the position of the file object.
+
+        :param offset: (int) offset relative to whence
+        :param whence: (int) io.SEEK_SET, io.SEEK_CUR or io.SEEK_END
+        :return: (int) new position
+        """
+        self._checkClosed()
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self.size + offset
+        else:
+            raise ValueError("invalid whence {}".format(whence))
+        if position < 0:
+            raise ValueError("negative seek position {}".format(position))
+        self._position = position
+        return position
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Reads bytes from the current position.
+
+        :param size: (int) number of bytes to read, all remaining bytes if negative
+        :return: (bytes) bytes read
+        """
+        self._checkClosed()
+        remaining = max(self.size - self._position, 0)
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+        buffer = bytearray(size)
+        count = self.readinto(buffer)
+        del buffer[count:]
+        return bytes(buffer)
+
+    def readall(self) -> bytes:
+        return self.read()
+
+    def readinto(self, buffer: Any) -> int:
+        """
+        Reads bytes from the current position into a writable buffer. Full blocks that are not cached are downloaded
+        straight into the buffer without going through the cache.
+
+        :param buffer: (Any) writable buffer
+        :return: (int) number of bytes read
+        """
+        self._checkClosed()
+        view = memoryview(buffer).cast("B")
+        count = 0
+        with self._lock:
+            while count < len(view) and self._position < self.size:
+                index, offset = divmod(self._position, self.block_size)
+                direct = self._uncached_run(index=index, limit=len(view) - count) if offset == 0 else 0
+                if direct > 0:
+                    length = min(direct * self.block_size, self.size - self._position)
+                    self._fetch_into(view[count:count + length], start=self._position)
+                    self.misses += direct
+                    self._last_block = index + direct - 1
+                else:
+                    block = self._get_block(index=index)
+                    length = min(len(block) - offset, len(view) - count)
+                    view[count:count + length] = block[offset:offset + length]
+                count += length
+                self._position += length
+        return count
+
+    def prefetch(self, start: int, end: int) -> None:
+        """
+        Loads the blocks covering a byte range into the cache with one request.
+
+        :param start: (int) offset of the first byte
+        :param end: (int) offset after the last byte
+        :return: None
+        """
+        end = min(end, self.size)
+        if start >= end:
+            return
+        first = start // self.block_size
+        last = (end - 1) // self.block_size
+        with self._lock:
+            if all(index in self._blocks for index in range(first, last + 1)):
+                return
+        self._load_blocks(first=first, last=last)
+
+    def prefetch_ranges(self, ranges: List[Tuple[int, int]], max_concurrency: Optional[int] = None) -> None:
+        """
+        Loads the blocks covering several byte ranges into the cache. Blocks that are already cached are skipped and
+        each run of neighbouring blocks is fetched with one request, the runs being fetched concurrently.
+
+        :param ranges: (List[Tuple[int, int]]) offset of the first byte and offset after the last byte of each range
+        :param max_concurrency: (Optional[int]) maximum number of requests at the same time, defaults to the engine
+                                transfer settings
+        :return: None
+        """
+        indexes = set()
+        for start, end in ranges:
+            end = min(end, self.size)
+            if start < end:
+                indexes.update(range(start // self.block_size, (end - 1) // self.block_size + 1))
+        with self._lock:
+            indexes = sorted(index for index in indexes if index not in self._blocks)
+        runs = []
+        for index in indexes:
+            if runs and runs[-1][1] == index - 1:
+                runs[-1][1] = index
+            else:
+                runs.append([index, index])
+        if len(runs) < 2:
+            for first, last in runs:
+                self._load_blocks(first=first, last=last)
+            return
+        if max_concurrency is None:
+            max_concurrency = self._engine.transfer_settings.max_concurrency
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(runs))) as executor:
+            list(executor.map(lambda run: self._load_blocks(first=run[0], last=run[1]), runs))
+
+    def _uncached_run(self, index: int, limit: int) -> int:
+        """
+        Counts the blocks from index onwards that are not cached and that the read fills completely (private).
+
+        :param index: (int) index of the first block
+        :param limit: (int) number of bytes left to be read
+        :return: (int) number of blocks
+        """
+        run = 0
+        while (run + 1) * self.block_size <= limit and (index + run) * self.block_size < self.size \
+                and index + run not in self._blocks:
+            run += 1
+        return run
+
+    def _get_block(self, index: int) -> bytes:
+        """
+        Gets a block from the cache, fetching it (and the read ahead blocks if reading sequentially) if missing
+        (private).
+
+        :param index: (int) index of the block
+        :return: (bytes) the block
+        """
+        block = self._blocks.get(index)
+        if block is not None:
+            self._blocks.move_to_end(index)
+            self.hits += 1
+        else:
+            self.misses += 1
+            last = index
+            if index == self._last_block + 1:
+                # the read ahead never pushes the blocks it is fetched with out of the cache
+                last_block = (self.size - 1) // self.block_size
+                last = min(index + min(self.read_ahead, self.max_blocks - 1), last_block)
+                while last > index and last in self._blocks:
+                    last -= 1
+            block = self._load_blocks(first=index, last=last)
+        self._last_block = index
+        return block
+
+    def _load_blocks(self, first: int, last: int) -> bytes:
+        """
+        Fetches blocks first to last (inclusive) with one request and adds them to the cache (private).
+
+        :param first: (int) index of the first block
+        :param last: (int) index of the last block
+        :return: (bytes) the first block, which may already have been evicted from the cache
+        """
+        start = first * self.block_size
+        end = min((last + 1) * self.block_size, self.size)
+        data = bytearray(end - start)
+        self._fetch_into(memoryview(data), start=start)
+        blocks = [bytes(data[offset:offset + self.block_size]) for offset in range(0, len(data), self.block_size)]
+        with self._lock:
+            for index, block in enumerate(blocks, start=first):
+                self._blocks[index] = block
+                self._blocks.move_to_end(index)
+            while len(self._blocks) > self.max_blocks:
+                self._blocks.popitem(last=False)
+        return blocks[0]
+
+    def _fetch_into(self, buffer: memoryview, start: int) -> None:
+        """
+        Downloads the range starting at start into the buffer (private).
+
+        :param buffer: (memoryview) buffer to be filled
+        :param start: (int) offset of the first byte
+        :return: None
+        """
+        self._engine.download_range_into(bucket_name=self.bucket_name, file_name=self.file_name, buffer=buffer,
+                                         start=start, etag=self.etag)
+
+    def close(self) -> None:
+        """
+        Closes the file object and drops the cached blocks.
+
+        :return: None
+        """
+        self._blocks.clear()
+        super().close()
+
+
+class S3WriteFile(io.RawIOBase):
+    """
+    This is a class for writing an s3 object as a write-only file object. Bytes are buffered until a part is full
+    and the part is then uploaded on a thread pool while writing carries on, so serialisation and upload overlap and
+    no more than max_concurrency + 1 parts are held in memory. Objects smaller than one part are uploaded with a single
+    PUT when the file object is closed.
+
+    Attributes:
+        bucket_name (str): name of the bucket the object is written to
+        file_name (str): key of the object
+        part_size (int): size in bytes of each uploaded part
+        max_concurrency (int): maximum number of parts uploading at the same time
+    """
+    MAXIMUM_PARTS: int = 10000
+    MINIMUM_PART_SIZE: int = 5 * MB
+
+    def __init__(self, engine: Any, bucket_name: str, file_name: str, part_size: Optional[int] = None,
+                 max_concurrency: Optional[int] = None) -> None:
+        """
+        The constructor for the S3WriteFile class.
+
+        :param engine: (FileManager) the engine used to make the requests
+        :param bucket_name: (str) name of the bucket the object is written to
+        :param file_name: (str) key of the object
+        :param part_size: (Optional[int]) size in bytes of each part, defaults to the engine transfer settings
+        :param max_concurrency: (Optional[int]) parts uploading at the same time, defaults to the engine settings
+        :raises: (FileManagerError) if the part size is below the 5MB minimum of s3
+        """
+        super().__init__()
+        part_size = part_size or engine.transfer_settings.part_size
+        if part_size < self.MINIMUM_PART_SIZE:
+            raise FileManagerError(message="part size {} is below the minimum of {} bytes for s3".format(
+                part_size, self.MINIMUM_PART_SIZE))
+        self._engine: Any = engine
+        self.bucket_name: str = bucket_name
+        self.file_name: str = file_name
+        self.part_size: int = part_size
+        self.max_concurrency: int = max_concurrency or engine.transfer_settings.max_concurrency
+        self._buffer: bytearray = bytearray()
+        self._written: int = 0
+        self._upload_id: Optional[str] = None
+        self._parts: list = []
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._slots: threading.BoundedSemaphore = threading.BoundedSemaphore(self.max_concurrency)
+
+    @property
+    def name(self) -> str:
+        """
+        Gets the path of the object.
+
+        :return: (str) s3 path of the object
+        """
+        return "s3://{}/{}".format(self.bucket_name, self.file_name)
+
+    def readable(self) -> bool:
+        return False
+
+    def seekable(self) -> bool:
+        return False
+
+    def writable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        self._checkClosed()
+        return self._written
+
+    def write(self, data: Any) -> int:
+        """
+        Writes bytes, uploading a part every time the buffer holds a full part.
+
+        :param data: (Any) bytes-like object to be written
+        :return: (int) number of bytes written
+        """
+        self._checkClosed()
+        view = memoryview(data).cast("B")
+        self._buffer += view
+        self._written += len(view)
+        while len(self._buffer) >= self.part_size:
+            self._submit_part(data=bytes(self._buffer[:self.part_size]))
+            del self._buffer[:self.part_size]
+        return len(view)
+
+    def _submit_part(self, data: bytes) -> None:
+        """
+        Uploads a part on the thread pool, blocking while max_concurrency parts are already uploading (private).
+
+        :param data: (bytes) the part
+        :return: None
+        """
+        if self._upload_id is None:
+            outcome = self._engine.client.create_multipart_upload(Bucket=self.bucket_name, Key=self.file_name)
+            self._upload_id = outcome["UploadId"]
+            self._pool = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        part_number = len(self._parts) + 1
+        if part_number > self.MAXIMUM_PARTS:
+            raise FileManagerError(message="{} needs more than {} parts, increase the part size".format(
+                self.name, self.MAXIMUM_PARTS))
+        self._slots.acquire()
+        try:
+            future = self._pool.submit(self._upload_part, part_number, data)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        self._parts.append(future)
+
+    def _upload_part(self, part_number: int, data: bytes) -> dict:
+        """
+        Uploads a part (private).
+
+        :param part_number: (int) number of the part starting at 1
+        :param data: (bytes) the part
+        :return: (dict) part number and etag needed to complete the upload
+        """
+        outcome = self._engine.client.upload_part(Bucket=self.bucket_name, Key=self.file_name,
+                                                  UploadId=self._upload_id, PartNumber=part_number, Body=data)
+        return {"PartNumber": part_number, "ETag": outcome["ETag"]}
+
+    def close(self) -> None:
+        """
+        Uploads what is left in the buffer and completes the upload. The upload is aborted if any part fails.
+
+        :return: None
+        """
+        if self.closed:
+            return
+        try:
+            if self._upload_id is None:
+                self._engine.upload_serialised_data(bucket_name=self.bucket_name, file_name=self.file_name,
+                                                    data=bytes(self._buffer))
+            else:
+                if len(self._buffer) > 0:
+                    self._submit_part(data=bytes(self._buffer))
+                parts = [future.result() for future in self._parts]
+                self._engine.client.complete_multipart_upload(Bucket=self.bucket_name, Key=self.file_name,
+                                                              UploadId=self._upload_id,
+                                                              MultipartUpload={"Parts": parts})
+                self._engine.invalidate_keys(bucket_name=self.bucket_name, keys=[self.file_name])
+        except BaseException:
+            self.abort()
+            raise
+        self._release()
+        super().close()
+
+    def abort(self) -> None:
+        """
+        Discards the data written so far without creating the object.
+
+        :return: None
+        """
+        if self.closed:
+            return
+        for future in self._parts:
+            future.cancel()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+        if self._upload_id is not None:
+            self._engine.client.abort_multipart_upload(Bucket=self.bucket_name, Key=self.file_name,
+                                                       UploadId=self._upload_id)
+        self._release()
+        super().close()
+
+    def _release(self) -> None:
+        """
+        Drops the buffer and the thread pool (private).
+
+        :return: None
+        """
+        self._buffer = bytearray()
+        self._parts = []
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+    def __del__(self) -> None:
+        # a file object that was never closed was not finished, so the partial object is not created
+        if not self.closed:
+            try:
+                self.abort()
+            except Exception:
+                pass
@@ -0,0 +1,75 @@
+from typing import Any
+
+from .errors import FileManagerError
+
+MB: int = 1024 * 1024
+
+
+class TransferSettings:
+    """
+    This is a class for managing the tuning of s3 transfers (multipart uploads and ranged downloads).
+
+    Attributes:
+        part_size (int): size in bytes of each part of a multipart transfer
+        max_concurrency (int): maximum number of threads transferring parts at the same time
+        multipart_threshold (int): size in bytes above which a transfer is split into parts
+    """
+    MINIMUM_PART_SIZE: int = 5 * MB
+
+    def __init__(self, part_size: int = 8 * MB, max_concurrency: int = 10, multipart_threshold: int = 8 * MB) -> None:
+        """
+        The constructor for the TransferSettings class.
+
+        :param part_size: (int) size in bytes of each part of a multipart transfer (s3 minimum is 5MB)
+        :param max_concurrency: (int) maximum number of threads transferring parts at the same time
+        :param multipart_threshold: (int) size in bytes above which a transfer is split into parts
+        """
+        self.part_size: int = part_size
+        self.max_concurrency: int = max_concurrency
+        self.multipart_threshold: int = multipart_threshold
+        self._check()
+
+    def _check(self) -> None:
+        """
+        Checks that the settings are accepted by s3 (private).
+
+        :return: None
+        """
+        if self.part_size < self.MINIMUM_PART_SIZE:
+            raise FileManagerError(message="part size {} is below the s3 minimum of {}".format(
+                self.part_size, self.MINIMUM_PART_SIZE))
+        if self.max_concurrency < 1:
+            raise FileManagerError(message="max concurrency has to be at least 1")
+        if self.multipart_threshold < 0:
+            raise FileManagerError(message="multipart threshold cannot be negative")
+
+    def update(self, **kwargs) -> None:
+        """
+        Updates the settings that are passed in, leaving the others untouched.
+
+        :param kwargs: any of part_size, max_concurrency, multipart_threshold
+        :return: None
+        """
+        settings = {"part_size": self.part_size,
+                    "max_concurrency": self.max_concurrency,
+                    "multipart_threshold": self.multipart_threshold}
+        for key, value in kwargs.items():
+            if key not in settings:
+                raise FileManagerError(message="{} is not a transfer setting".format(key))
+            if value is not None:
+                settings[key] = value
+        # constructing a throwaway object runs the checks before anything is changed
+        TransferSettings(**settings)
+        self.__dict__.update(settings)
+
+    def to_boto_config(self) -> Any:
+        """
+        Packages the settings into a boto3 TransferConfig used by the managed upload and download functions.
+
+        :return: (boto3.s3.transfer.TransferConfig) the transfer config
+        """
+        from boto3.s3.transfer import TransferConfig
+        return TransferConfig(multipart_threshold=self.multipart_threshold,
+                              multipart_chunksize=self.part_size,
+                              max_concurrency=self.max_concurrency,
+                              use_threads=self.max_concurrency > 1)
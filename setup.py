@@ -52,7 +52,9 @@ setuptools.setup(
         "dill>=0.2.8"
     ],
     extras_require={
-     'flask': ["Flask>=1.0.0", "tensorflow>=2.1.0", "boto3>=1.16.43"]
+     'flask': ["Flask>=1.0.0", "tensorflow>=2.1.0", "boto3>=1.16.43"],
+     'zstd': ["zstandard>=0.15.0"],
+     'parquet': ["pyarrow>=10.0.0"]
     },
     packages=find_packages(exclude=("tests",)),
     classifiers=[
@@ -61,7 +63,7 @@ setuptools.setup(
         "Operating System :: OS Independent",
     ],
     python_requires='>=3',
-    tests_require=['pytest'],
+    tests_require=['pytest', 'moto'],
     entry_points={
         'console_scripts': [
             'file-hello = monolith_filemanager.console_commands.hello:print_logo',
@@ -0,0 +1,119 @@
+import asyncio
+import os
+from unittest import TestCase, main
+from unittest.mock import patch, MagicMock
+
+from monolith_filemanager.adapters.async_s3_processes import AsyncS3ProcessesAdapter
+from monolith_filemanager.s3storage import V1Engine
+from monolith_filemanager.s3storage.async_engine import AsyncV1Engine
+
+try:
+    from moto import mock_aws
+except ImportError:
+    from moto import mock_s3 as mock_aws
+
+
+class TestAsyncS3ProcessesAdapter(TestCase):
+
+    @patch("monolith_filemanager.adapters.async_s3_processes.AsyncV1Engine")
+    @patch("monolith_filemanager.adapters.async_s3_processes.S3ProcessesAdapter")
+    def setUp(self, mock_adapter, mock_engine) -> None:
+        async def run(function, *args, **kwargs):
+            return function(*args, **kwargs)
+
+        mock_engine.return_value.run.side_effect = run
+        self.test = AsyncS3ProcessesAdapter(file_path="s3://bucket/folder")
+        self.adapter = mock_adapter.return_value
+
+    @patch("monolith_filemanager.adapters.async_s3_processes.AsyncV1Engine")
+    @patch("monolith_filemanager.adapters.async_s3_processes.S3ProcessesAdapter")
+    def test___init__(self, mock_adapter, mock_engine):
+        test = AsyncS3ProcessesAdapter(file_path="s3://bucket/folder", caching="cache")
+
+        self.assertEqual("s3://bucket/folder", mock_adapter.call_args[1]["file_path"])
+        self.assertEqual("cache", mock_adapter.call_args[1]["caching"])
+        self.assertEqual(mock_adapter.return_value.path, test.path)
+        self.assertEqual(mock_engine.return_value, test._engine)
+
+    def test_read_raw_file(self):
+        out_come = asyncio.run(self.test.read_raw_file())
+        self.adapter.read_raw_file.assert_called_once_with()
+        self.assertEqual(self.adapter.read_raw_file.return_value, out_come)
+
+    def test_write_raw_file(self):
+        asyncio.run(self.test.write_raw_file(data=b"data"))
+        self.adapter.write_raw_file.assert_called_once_with(data=b"data")
+
+    def test_exists(self):
+        out_come = asyncio.run(self.test.exists(path="s3://bucket/other"))
+        self.adapter.exists.assert_called_once_with(path="s3://bucket/other")
+        self.assertEqual(self.adapter.exists.return_value, out_come)
+
+    def test_ls(self):
+        out_come = asyncio.run(self.test.ls())
+        self.adapter.ls.assert_called_once_with(path=None)
+        self.assertEqual(self.adapter.ls.return_value, out_come)
+
+    def test_delete(self):
+        asyncio.run(self.test.delete_file())
+        asyncio.run(self.test.delete_folder())
+        self.adapter.delete_file.assert_called_once_with(path=None)
+        self.adapter.delete_folder.assert_called_once_with(path=None)
+
+    def test_copy(self):
+        asyncio.run(self.test.copy_file(new_path="s3://bucket/new.txt"))
+        out_come = asyncio.run(self.test.copy_folder(new_folder="s3://bucket/new"))
+        self.adapter.copy_file.assert_called_once_with(new_path="s3://bucket/new.txt")
+        self.adapter.copy_folder.assert_called_once_with(new_folder="s3://bucket/new")
+        self.assertEqual(self.adapter.copy_folder.return_value, out_come)
+
+    def test_search(self):
+        out_come = asyncio.run(self.test.search(file_pattern="*.csv"))
+        self.adapter.search.assert_called_once_with(file_pattern="*.csv")
+        self.assertEqual(self.adapter.search.return_value, out_come)
+
+
+@mock_aws()
+class TestAsyncS3ProcessesAdapterMoto(TestCase):
+    """
+    Runs the async adapter on a real V1Engine against a moto s3 bucket.
+    """
+    def setUp(self) -> None:
+        self.environment = patch.dict(os.environ, {"AWS_ACCESS_KEY_ID": "testing", "AWS_SECRET_ACCESS_KEY": "testing",
+                                                   "AWS_DEFAULT_REGION": "us-east-1"})
+        self.environment.start()
+        V1Engine._singleton = None
+        AsyncV1Engine._singleton = None
+        self.engine = AsyncV1Engine(max_concurrency=4)
+        self.engine.engine.client.create_bucket(Bucket="bucket")
+
+    def tearDown(self) -> None:
+        self.engine.shutdown()
+        AsyncV1Engine._singleton = None
+        V1Engine._singleton = None
+        self.environment.stop()
+
+    def test_commands(self):
+        paths = [f"s3://bucket/folder/{i}.txt" for i in range(20)]
+
+        async def run():
+            await asyncio.gather(*[AsyncS3ProcessesAdapter(file_path=path).write_raw_file(data=path.encode())
+                                   for path in paths])
+            data = await asyncio.gather(*[AsyncS3ProcessesAdapter(file_path=path).read_raw_file()
+                                          for path in paths])
+            await AsyncS3ProcessesAdapter(file_path=paths[0]).copy_file(new_path="s3://bucket/other/0.txt")
+            await AsyncS3ProcessesAdapter(file_path=paths[1]).delete_file()
+            exists = await asyncio.gather(*[AsyncS3ProcessesAdapter(file_path=path).exists()
+                                            for path in ["s3://bucket/other/0.txt", paths[1], paths[2]]])
+            files, _ = await AsyncS3ProcessesAdapter(file_path="s3://bucket/folder").ls()
+            return data, exists, files
+
+        data, exists, files = asyncio.run(run())
+
+        self.assertEqual([path.encode() for path in paths], data)
+        self.assertEqual([True, False, True], exists)
+        self.assertEqual(19, len(files))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,13 @@
 import itertools
+import os
+import tempfile
 from unittest import TestCase, main
 from unittest.mock import patch, MagicMock, call
 from monolith_filemanager.adapters.local_file_processes import LocalFileProcessesAdapter, LocalProcessesAdapterError
+from monolith_filemanager.components.dir_entry import DirEntry
+from monolith_filemanager.components.object_cache import ObjectCache
+from monolith_filemanager.file import FileMap
+from monolith_filemanager.path import FilePath
 
 
 class TestLocalFileProcessesAdapter(TestCase):
@@ -43,11 +49,27 @@ class TestLocalFileProcessesAdapter(TestCase):
         test = LocalFileProcessesAdapter(file_path="test path", caching=MagicMock())
         test.file_types = MagicMock()
         test.path = MagicMock()
+        test.path.compression = None
         out_come = test.local_file_object()
 
         test.file_types.get_file.assert_called_once_with(file_path=test.path)
         test.file_types.get_file.return_value.assert_called_once_with(path=test.path)
         self.assertEqual(test.file_types.get_file.return_value.return_value, out_come)
+        self.assertIsNone(out_come.compression_level)
+
+    @patch("monolith_filemanager.adapters.local_file_processes.CompressedFile")
+    @patch("monolith_filemanager.adapters.local_file_processes.LocalFileProcessesAdapter.__init__")
+    def test_local_file_object_compressed(self, mock_init, mock_compressed_file):
+        mock_init.return_value = None
+        test = LocalFileProcessesAdapter(file_path="test path", caching=MagicMock())
+        test.file_types = MagicMock()
+        test.path = MagicMock()
+        test.path.compression = "gz"
+        out_come = test.local_file_object(compression_level=3)
+
+        mock_compressed_file.assert_called_once_with(file=test.file_types.get_file.return_value.return_value,
+                                                     compression_level=3)
+        self.assertEqual(mock_compressed_file.return_value, out_come)
 
     @patch("flask.send_from_directory")
     @patch("monolith_filemanager.adapters.local_file_processes.LocalFileProcessesAdapter.check_local_file")
@@ -78,6 +100,44 @@ class TestLocalFileProcessesAdapter(TestCase):
         mock_check.assert_called_once_with(path=test.path)
         self.assertEqual(mock_local_file_object.return_value.read.return_value, out_come)
 
+    @patch("monolith_filemanager.adapters.local_file_processes.LocalFileProcessesAdapter.__init__")
+    def test_read_file_object_cache(self, mock_init):
+        mock_init.return_value = None
+        test = LocalFileProcessesAdapter(file_path="test path")
+        test.file_types = FileMap()
+        test.file_types.init_bindings()
+        cache = ObjectCache().enable()
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                test.path = FilePath(os.path.join(directory, "config.json"))
+                with open(test.path, "w") as file:
+                    file.write('{"a": 1}')
+
+                self.assertEqual({"a": 1}, test.read_file())
+                self.assertEqual({"a": 1}, test.read_file())
+                self.assertEqual(1, cache.stats()["hits"])
+
+                test.write_file(data={"a": 2})
+                self.assertEqual(0, len(cache))
+                self.assertEqual({"a": 2}, test.read_file())
+                self.assertEqual(1, cache.stats()["hits"])
+        finally:
+            cache.disable()
+
+    @patch("monolith_filemanager.adapters.local_file_processes.LocalFileProcessesAdapter.__init__")
+    def test_write_and_read_compressed_file(self, mock_init):
+        mock_init.return_value = None
+        test = LocalFileProcessesAdapter(file_path="test path")
+        test.file_types = FileMap()
+        test.file_types.init_bindings()
+        with tempfile.TemporaryDirectory() as directory:
+            test.path = FilePath(os.path.join(directory, "config.json.gz"))
+
+            test.write_file(data={"a": [1] * 1000}, compression_level=1)
+
+            self.assertLess(os.path.getsize(test.path), 100)
+            self.assertEqual({"a": [1] * 1000}, test.read_file())
+
     @patch("monolith_filemanager.adapters.local_file_processes.open")
     @patch("monolith_filemanager.adapters.local_file_processes.LocalFileProcessesAdapter.check_local_file")
     @patch("monolith_filemanager.adapters.local_file_processes.LocalFileProcessesAdapter.__init__")
@@ -92,6 +152,25 @@ class TestLocalFileProcessesAdapter(TestCase):
         mock_file_returned = mock_open.return_value.__enter__.return_value
         self.assertEqual(mock_file_returned.read.return_value, out_come)
 
+    @patch("monolith_filemanager.adapters.local_file_processes.open")
+    @patch("monolith_filemanager.adapters.local_file_processes.LocalFileProcessesAdapter._create_directory_if_not_exists")
+    @patch("monolith_filemanager.adapters.local_file_processes.LocalFileProcessesAdapter.check_local_file")
+    @patch("monolith_filemanager.adapters.local_file_processes.LocalFileProcessesAdapter.__init__")
+    def test_open(self, mock_init, mock_check, mock_create_dir, mock_open):
+        mock_init.return_value = None
+        test = LocalFileProcessesAdapter(file_path="test path", caching=MagicMock())
+        test.path = MagicMock()
+
+        out_come = test.open()
+        mock_check.assert_called_once_with(path=test.path)
+        mock_open.assert_called_once_with(test.path, "rb")
+        self.assertEqual(mock_open.return_value, out_come)
+
+        mock_open.reset_mock()
+        test.open(mode="wb")
+        mock_create_dir.assert_called_once_with()
+        mock_open.assert_called_once_with(test.path, "wb")
+
     @patch("monolith_filemanager.adapters.local_file_processes.LocalFileProcessesAdapter.check_local_file")
     @patch("monolith_filemanager.adapters.local_file_processes.LocalFileProcessesAdapter.__init__")
     def test_custom_read_file(self, mock_init, mock_check):
@@ -119,6 +198,7 @@ class TestLocalFileProcessesAdapter(TestCase):
 
         test.write_file(data=mock_data)
         mock_create_dir.assert_called_once()
+        mock_local_file_object.assert_called_once_with(compression_level=None)
         mock_local_file_object.return_value.write.assert_called_once_with(data=mock_data)
 
     @patch("monolith_filemanager.adapters.local_file_processes.LocalFileProcessesAdapter._create_directory_if_not_exists")
@@ -207,20 +287,49 @@ class TestLocalFileProcessesAdapter(TestCase):
         mock_create_dir.assert_called_once()
         mock_stream.save.assert_called_once_with(test.path)
 
-    @patch("monolith_filemanager.adapters.local_file_processes.os.path.exists")
     @patch("monolith_filemanager.adapters.local_file_processes.LocalFileProcessesAdapter.__init__")
-    def test_increment_files(self, mock_init, mock_exists):
+    def test_write_stream_failed(self, mock_init):
         mock_init.return_value = None
         test = LocalFileProcessesAdapter(file_path="test path", caching=MagicMock())
-        test.path = "mock/path/folder/file.txt"
-        mock_exists.return_value = False
-        test.increment_files()
-        self.assertEqual("mock/path/folder/file 2.txt", test.path)
+        mock_stream = MagicMock()
+        mock_stream.save.side_effect = OSError("disk full")
+        with tempfile.TemporaryDirectory() as directory:
+            open(os.path.join(directory, "file.txt"), "w").close()
+
+            # the file claiming the incremented name is removed
+            test.path = directory + "/file.txt"
+            with self.assertRaises(OSError):
+                test.write_stream(stream=mock_stream)
+            mock_stream.save.assert_called_once_with(directory + "/file 2.txt")
+            self.assertEqual(["file.txt"], os.listdir(directory))
+
+            # a file that was not incremented is left to the stream
+            def save(path: str) -> None:
+                open(path, "w").close()
+                raise OSError("disk full")
+
+            test.path = directory + "/other.txt"
+            mock_stream.save.side_effect = save
+            with self.assertRaises(OSError):
+                test.write_stream(stream=mock_stream)
+            self.assertEqual(["file.txt", "other.txt"], sorted(os.listdir(directory)))
 
-        test.path = "mock/path/folder/file.txt"
-        mock_exists.side_effect = [True, False]
-        test.increment_files()
-        self.assertEqual("mock/path/folder/file 3.txt", test.path)
+    @patch("monolith_filemanager.adapters.local_file_processes.LocalFileProcessesAdapter.__init__")
+    def test_increment_files(self, mock_init):
+        mock_init.return_value = None
+        test = LocalFileProcessesAdapter(file_path="test path", caching=MagicMock())
+        with tempfile.TemporaryDirectory() as directory:
+            for name in ["file.txt", "file 3.txt", "file 2"]:
+                open(os.path.join(directory, name), "w").close()
+            test.path = directory + "/file.txt"
+            test.increment_files()
+            self.assertEqual(directory + "/file 2.txt", test.path)
+            # the new name is claimed straight away
+            self.assertTrue(os.path.isfile(test.path))
+
+            test.path = directory + "/file.txt"
+            test.increment_files()
+            self.assertEqual(directory + "/file 4.txt", test.path)
 
     @patch("monolith_filemanager.adapters.local_file_processes.os.makedirs")
     @patch("monolith_filemanager.adapters.local_file_processes.LocalFileProcessesAdapter.increment_folders")
@@ -254,18 +363,19 @@ class TestLocalFileProcessesAdapter(TestCase):
         self.assertEqual("folder 2", test.create_directory_if_not_exists())
         mock_increment_folders.assert_called_once_with(dirname="mock/pardir/folder")
 
-    @patch("monolith_filemanager.adapters.local_file_processes.os.makedirs")
-    @patch("monolith_filemanager.adapters.local_file_processes.os.path.exists")
-    def test_increment_folders(self, mock_os_path_exists, mock_os_makedirs):
+    @patch("monolith_filemanager.adapters.local_file_processes.os.mkdir")
+    @patch("monolith_filemanager.adapters.local_file_processes.os.listdir")
+    def test_increment_folders(self, mock_os_listdir, mock_os_mkdir):
         mock_dirname = "mock/pardir/folder"
-        mock_os_path_exists.return_value = False
-        LocalFileProcessesAdapter.increment_folders(dirname=mock_dirname)
-        mock_os_makedirs.assert_called_once_with("mock/pardir/folder 2")
+        mock_os_listdir.return_value = ["folder", "folder 2", "file.txt"]
+        self.assertEqual("folder 3", LocalFileProcessesAdapter.increment_folders(dirname=mock_dirname))
+        mock_os_listdir.assert_called_once_with("mock/pardir")
+        mock_os_mkdir.assert_called_once_with("mock/pardir/folder 3")
 
-        mock_os_makedirs.reset_mock()
-        mock_os_path_exists.side_effect = [True, False]
-        LocalFileProcessesAdapter.increment_folders(dirname=mock_dirname)
-        mock_os_makedirs.assert_called_once_with("mock/pardir/folder 3")
+        mock_os_mkdir.reset_mock()
+        mock_os_mkdir.side_effect = [FileExistsError, None]
+        self.assertEqual("folder 4", LocalFileProcessesAdapter.increment_folders(dirname=mock_dirname))
+        mock_os_mkdir.assert_called_with("mock/pardir/folder 4")
 
     @patch("monolith_filemanager.adapters.local_file_processes.os.path")
     @patch("monolith_filemanager.adapters.local_file_processes.LocalFileProcessesAdapter.__init__")
@@ -277,6 +387,72 @@ class TestLocalFileProcessesAdapter(TestCase):
         test.exists()
         mock_os_path.exists.assert_called_once_with(test.path)
 
+    @patch("monolith_filemanager.adapters.local_file_processes.LocalFileProcessesAdapter.__init__")
+    def test_iterdir(self, mock_init):
+        mock_init.return_value = None
+        test = LocalFileProcessesAdapter(file_path="test path")
+        with tempfile.TemporaryDirectory() as directory:
+            test.path = directory
+            os.mkdir(os.path.join(directory, "b"))
+            for name in ["a.txt", "c.txt", "d.txt"]:
+                with open(os.path.join(directory, name), "w") as file:
+                    file.write("data")
+
+            out_come = sorted(test.iterdir())
+
+            first_page, cursor = test.list_page(page_size=2)
+            second_page, last_cursor = test.list_page(page_size=2, cursor=cursor)
+
+        self.assertEqual(DirEntry(name="b", is_dir=True), out_come[1])
+        self.assertEqual("a.txt", out_come[0].name)
+        self.assertEqual(4, out_come[0].size)
+        self.assertEqual(["a.txt", "b"], [entry.name for entry in first_page])
+        self.assertEqual(["c.txt", "d.txt"], [entry.name for entry in second_page])
+        self.assertIsNone(last_cursor)
+
+    @patch("monolith_filemanager.adapters.local_file_processes.LocalFileProcessesAdapter.__init__")
+    def test_list_page_listing(self, mock_init):
+        mock_init.return_value = None
+        test = LocalFileProcessesAdapter(file_path="test path")
+        with tempfile.TemporaryDirectory() as directory:
+            test.path = directory
+            for name in ["a", "b", "c", "d", "e"]:
+                open(os.path.join(directory, name), "w").close()
+
+            with patch("monolith_filemanager.adapters.local_file_processes.os.scandir",
+                       wraps=os.scandir) as mock_scandir:
+                first_page, cursor = test.list_page(page_size=2)
+                os.remove(os.path.join(directory, "c"))
+                second_page, cursor = test.list_page(page_size=2, cursor=cursor)
+                # the directory is only scanned for the first page
+                mock_scandir.assert_called_once_with(directory)
+
+                LocalFileProcessesAdapter.LISTINGS.clear()
+                last_page, last_cursor = test.list_page(page_size=2, cursor=cursor)
+                self.assertEqual(2, mock_scandir.call_count)
+
+        self.assertEqual(["a", "b"], [entry.name for entry in first_page])
+        self.assertEqual(["d"], [entry.name for entry in second_page])
+        self.assertEqual(["e"], [entry.name for entry in last_page])
+        self.assertIsNone(last_cursor)
+
+    @patch("monolith_filemanager.adapters.local_file_processes.LocalFileProcessesAdapter.__init__")
+    def test_stat_many(self, mock_init):
+        mock_init.return_value = None
+        test = LocalFileProcessesAdapter(file_path="test path")
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "test.txt")
+            with open(path, "wb") as file:
+                file.write(b"data")
+            missing = os.path.join(directory, "missing.txt")
+
+            out_come = test.stat_many(paths=[path, missing])
+            exists_out_come = test.exists_many(paths=[path, missing])
+
+        self.assertEqual(4, out_come[path]["size"])
+        self.assertIsNone(out_come[missing])
+        self.assertEqual({path: True, missing: False}, exists_out_come)
+
     @patch("monolith_filemanager.adapters.local_file_processes.LocalFileProcessesAdapter._get_file_info")
     @patch("monolith_filemanager.adapters.local_file_processes.os.path.join")
     @patch("monolith_filemanager.adapters.local_file_processes.os.walk")
@@ -1,6 +1,8 @@
+import os
 from unittest import TestCase, main
-from unittest.mock import patch, MagicMock, call
+from unittest.mock import patch, MagicMock, call, ANY
 from monolith_filemanager.adapters.s3_processes import S3ProcessesAdapter, S3ProcessesAdapterError
+from monolith_filemanager.path import FilePath
 
 
 class TestS3ProcessesAdapter(TestCase):
@@ -32,11 +34,27 @@ class TestS3ProcessesAdapter(TestCase):
         test = S3ProcessesAdapter(file_path="test path")
         test.file_types = MagicMock()
         test.path = MagicMock()
+        test.path.compression = None
         out_come = test.local_file_object()
 
         test.file_types.get_file.assert_called_once_with(file_path=test.path)
         test.file_types.get_file.return_value.assert_called_once_with(path=test.path)
         self.assertEqual(test.file_types.get_file.return_value.return_value, out_come)
+        self.assertIsNone(out_come.compression_level)
+
+    @patch("monolith_filemanager.adapters.s3_processes.CompressedFile")
+    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.__init__")
+    def test_local_file_object_compressed(self, mock_init, mock_compressed_file):
+        mock_init.return_value = None
+        test = S3ProcessesAdapter(file_path="test path")
+        test.file_types = MagicMock()
+        test.path = MagicMock()
+        test.path.compression = "gz"
+        out_come = test.local_file_object(compression_level=3)
+
+        mock_compressed_file.assert_called_once_with(file=test.file_types.get_file.return_value.return_value,
+                                                     compression_level=3)
+        self.assertEqual(mock_compressed_file.return_value, out_come)
 
     @patch("monolith_filemanager.adapters.s3_processes.FilePath")
     @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.local_file_object")
@@ -66,6 +84,149 @@ class TestS3ProcessesAdapter(TestCase):
         self.assertEqual(mock_file_path.return_value, test.path)
         self.assertEqual(mock_local_file_object.return_value.read.return_value, second_out_come)
 
+    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.open")
+    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.local_file_object")
+    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.__init__")
+    def test_read_file_chunks(self, mock_init, mock_local_file_object, mock_open):
+        mock_init.return_value = None
+        test = S3ProcessesAdapter(file_path=MagicMock())
+        test.path = MagicMock()
+        test.path.file_type = "csv"
+        test._engine = MagicMock()
+        mock_local_file_object.return_value.read_from_buffer.return_value = iter(["one", "two"])
+
+        out_come = test.read_file(chunksize=10)
+
+        mock_open.assert_not_called()
+        self.assertEqual(["one", "two"], list(out_come))
+        mock_open.assert_called_once_with(mode="rb")
+        mock_open.return_value.__exit__.assert_called_once()
+        mock_local_file_object.return_value.read_from_buffer.assert_called_once_with(
+            buffer=mock_open.return_value.__enter__.return_value, chunksize=10)
+        test._engine.download_cached_file.assert_not_called()
+
+    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.open")
+    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.local_file_object")
+    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.__init__")
+    def test_read_file_parquet(self, mock_init, mock_local_file_object, mock_open):
+        mock_init.return_value = None
+        test = S3ProcessesAdapter(file_path=MagicMock())
+        test.path = MagicMock()
+        test.path.file_type = "parquet"
+
+        out_come = test.read_file(columns=["a"], filters=[("b", "=", 1)])
+
+        mock_open.assert_called_once_with(mode="rb")
+        mock_local_file_object.return_value.read_from_buffer.assert_called_once_with(
+            buffer=mock_open.return_value.__enter__.return_value, columns=["a"], filters=[("b", "=", 1)])
+        self.assertEqual(mock_local_file_object.return_value.read_from_buffer.return_value, out_come)
+
+    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.open")
+    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.local_file_object")
+    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.__init__")
+    def test_read_file_npy_mmap_mode(self, mock_init, mock_local_file_object, mock_open):
+        mock_init.return_value = None
+        test = S3ProcessesAdapter(file_path=MagicMock())
+        test.path = MagicMock()
+        test.path.file_type = "npy"
+        test.path.compression = None
+
+        out_come = test.read_file(mmap_mode="r")
+
+        mock_open.assert_called_once_with(mode="rb")
+        mock_local_file_object.return_value.read_lazy.assert_called_once_with(buffer=mock_open.return_value,
+                                                                               mmap_mode="r")
+        self.assertEqual(mock_local_file_object.return_value.read_lazy.return_value, out_come)
+
+    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.open")
+    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.local_file_object")
+    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.__init__")
+    def test_read_file_npz(self, mock_init, mock_local_file_object, mock_open):
+        mock_init.return_value = None
+        test = S3ProcessesAdapter(file_path=MagicMock())
+        test.path = MagicMock()
+        test.path.file_type = "npz"
+        test.path.compression = None
+
+        out_come = test.read_file()
+
+        mock_open.assert_called_once_with(mode="rb")
+        mock_local_file_object.return_value.read_lazy.assert_called_once_with(buffer=mock_open.return_value)
+        self.assertEqual(mock_local_file_object.return_value.read_lazy.return_value, out_come)
+
+    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.open")
+    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.local_file_object")
+    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.__init__")
+    def test_read_file_hdf5(self, mock_init, mock_local_file_object, mock_open):
+        mock_init.return_value = None
+        test = S3ProcessesAdapter(file_path=MagicMock())
+        test.path = MagicMock()
+        test.path.file_type = "h5"
+        test.path.compression = None
+
+        out_come = test.read_file(rdcc_nbytes=1024)
+
+        mock_open.assert_called_once_with(mode="rb")
+        mock_local_file_object.return_value.read_lazy.assert_called_once_with(buffer=mock_open.return_value,
+                                                                               rdcc_nbytes=1024)
+        self.assertEqual(mock_local_file_object.return_value.read_lazy.return_value, out_come)
+
+    @patch("monolith_filemanager.adapters.s3_processes.FilePath")
+    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.local_file_object")
+    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.__init__")
+    def test_read_file_content_cache(self, mock_init, mock_local_file_object, mock_file_path):
+        mock_init.return_value = None
+        test = S3ProcessesAdapter(file_path=MagicMock())
+        test.path = MagicMock()
+        test._cache = None
+        test._engine = MagicMock()
+        test.path.file_type = "csv"
+        storage_path = test.path.to_string.return_value
+
+        out_come = test.read_file()
+
+        test._engine.download_cached_file.assert_called_once_with(storage_path=storage_path, file_path=ANY)
+        # files too large for the content cache are downloaded to a temporary folder removed after the read
+        self.assertFalse(os.path.exists(test._engine.download_cached_file.call_args[1]["file_path"]))
+        test._engine.download_data_file.assert_not_called()
+        mock_file_path.assert_called_once_with(test._engine.download_cached_file.return_value)
+        self.assertEqual(mock_local_file_object.return_value.read.return_value, out_come)
+
+    @patch("monolith_filemanager.adapters.s3_processes.FilePath")
+    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.local_file_object")
+    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.__init__")
+    def test_read_file_cache_manager(self, mock_init, mock_local_file_object, mock_file_path):
+        mock_init.return_value = None
+        test = S3ProcessesAdapter(file_path=MagicMock())
+        test.path = MagicMock()
+        test._cache = MagicMock()
+        test._engine = MagicMock()
+        test.path.file_type = "csv"
+        storage_path = test.path.to_string.return_value
+
+        out_come = test.read_file()
+
+        test._cache.create_cache.assert_called_once_with()
+        test._engine.download_data_file.assert_called_once_with(storage_path=storage_path,
+                                                                file_path=test._cache.cache_path)
+        test._engine.download_cached_file.assert_not_called()
+        mock_file_path.assert_called_once_with(test._engine.download_data_file.return_value)
+        self.assertEqual(mock_local_file_object.return_value.read.return_value, out_come)
+
+    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.__init__")
+    def test_read_file_missing_cache(self, mock_init):
+        mock_init.return_value = None
+        test = S3ProcessesAdapter(file_path=MagicMock())
+        test.path = MagicMock()
+        test.path.file_type = "csv"
+        test._cache = None
+        test._engine = MagicMock()
+        test._engine.content_cache = None
+
+        with self.assertRaises(S3ProcessesAdapterError):
+            test.read_file()
+        test._engine.download_cached_file.assert_not_called()
+
     @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.__init__")
     def test_read_raw_file(self, mock_init):
         mock_init.return_value = None
@@ -74,9 +235,22 @@ class TestS3ProcessesAdapter(TestCase):
         test._engine = MagicMock()
 
         out_come = test.read_raw_file()
-        test._engine.download_raw_data_file.assert_called_once_with(storage_path=test.path.to_string.return_value)
+        test._engine.download_raw_data_file.assert_called_once_with(storage_path=test.path.to_string.return_value,
+                                                                    parallel=False)
         self.assertEqual(out_come, test._engine.download_raw_data_file.return_value)
 
+    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.__init__")
+    def test_open(self, mock_init):
+        mock_init.return_value = None
+        test = S3ProcessesAdapter(file_path=MagicMock())
+        test.path = MagicMock()
+        test._engine = MagicMock()
+
+        out_come = test.open(block_size=10)
+        test._engine.open.assert_called_once_with(storage_path=test.path.to_string.return_value, mode="rb",
+                                                  block_size=10)
+        self.assertEqual(test._engine.open.return_value, out_come)
+
     @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.__init__")
     def test_custom_read_file(self, mock_init):
         mock_init.return_value = None
@@ -123,11 +297,55 @@ class TestS3ProcessesAdapter(TestCase):
         test.path = MagicMock()
         test._cache = MagicMock()
         mock_local_file_object.return_value.supports_s3.return_value = False
+        mock_local_file_object.return_value.supports_buffer_write.return_value = False
         mock_local_file_object.return_value.path = test.path
         mock_data = MagicMock()
         test.write_file(data=mock_data)
         test._engine.upload_data_from_file.assert_called_once_with(file_path=mock_file_path.return_value.to_string.return_value, storage_path=test.path.to_string.return_value)
 
+    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.local_file_object")
+    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.__init__")
+    def test_write_file_without_cache(self, mock_init, mock_local_file_object):
+        mock_init.return_value = None
+        test = S3ProcessesAdapter(file_path=MagicMock())
+        test._engine = MagicMock()
+        test.path = FilePath("s3://bucket/folder/data.custom")
+        test._cache = None
+        file_object = mock_local_file_object.return_value
+        file_object.supports_s3.return_value = False
+        file_object.supports_buffer_write.return_value = False
+        file_object.path = test.path
+        written = []
+        file_object.write.side_effect = lambda data: written.append(os.path.exists(os.path.dirname(file_object.path)))
+
+        test.write_file(data="data")
+
+        self.assertEqual([True], written)
+        self.assertEqual("data.custom", os.path.basename(file_object.path))
+        self.assertFalse(os.path.exists(os.path.dirname(file_object.path)))
+        test._engine.upload_data_from_file.assert_called_once_with(storage_path="s3://bucket/folder/data.custom",
+                                                                   file_path=file_object.path)
+
+    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.open")
+    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.local_file_object")
+    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.__init__")
+    def test_write_file_buffer(self, mock_init, mock_local_file_object, mock_open):
+        mock_init.return_value = None
+        test = S3ProcessesAdapter(file_path=MagicMock())
+        test._engine = MagicMock()
+        test.path = MagicMock()
+        test._cache = None
+        mock_local_file_object.return_value.supports_s3.return_value = False
+        mock_local_file_object.return_value.supports_buffer_write.return_value = True
+        mock_data = MagicMock()
+
+        test.write_file(data=mock_data)
+
+        mock_open.assert_called_once_with(mode="wb")
+        mock_local_file_object.return_value.write_to_buffer.assert_called_once_with(
+            data=mock_data, buffer=mock_open.return_value.__enter__.return_value)
+        test._engine.upload_data_from_file.assert_not_called()
+
     @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.__init__")
     def test_write_raw_file(self, mock_init):
         mock_init.return_value = None
@@ -159,62 +377,80 @@ class TestS3ProcessesAdapter(TestCase):
         self.test_folder.delete_folder()
         mock_engine.delete_file.assert_called_once_with(bucket_name="mock-bucket", file_name="mock/folder/")
 
+    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.open")
     @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.increment_files")
-    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.exists")
     @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.check_name_taken")
     @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.ls")
     @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.__init__")
-    def test_write_stream(self, mock_init, mock_ls, mock_name_taken, mock_exists, mock_increment_files):
+    def test_write_stream(self, mock_init, mock_ls, mock_name_taken, mock_increment_files, mock_open):
         mock_init.return_value = None
         test = S3ProcessesAdapter(file_path=MagicMock())
         test._engine = MagicMock()
         test.path = "mock/folder/file.txt"
-        test._cache = MagicMock()
-        mock_ls.return_value = ([], [])
+        mock_ls.return_value = ({}, [])
         mock_stream = MagicMock()
+        buffer = mock_open.return_value.__enter__.return_value
         # test name already taken
         mock_name_taken.return_value = True
         with self.assertRaises(S3ProcessesAdapterError):
             test.write_stream(mock_stream)
-        mock_stream.save.assert_called_once()
+        mock_stream.save.assert_not_called()
 
         # test already exists
-        mock_stream.reset_mock()
-
         mock_name_taken.return_value = False
-        mock_exists.return_value = True
+        mock_ls.return_value = ({"file.txt": {}}, ["folder"])
         mock_increment_files.return_value = None
         self.assertEqual("file.txt", test.write_stream(mock_stream))
-        cache_path = mock_stream.save.call_args_list[0][0][0]
-        test._engine.upload_data_from_file.assert_called_once_with(storage_path=test.path, file_path=cache_path)
-        mock_increment_files.assert_called_once_with()
-        mock_stream.save.assert_called_once()
+        mock_increment_files.assert_called_once_with(existing_names=["file.txt", "folder"])
+        mock_open.assert_called_once_with(mode="wb")
+        mock_stream.save.assert_called_once_with(buffer)
 
         # test doesn't already exist
         mock_stream.reset_mock()
-        test._engine.reset_mock()
+        mock_open.reset_mock()
         mock_increment_files.reset_mock()
-        mock_exists.return_value = False
+        mock_ls.return_value = ({"other.txt": {}}, [])
         self.assertEqual("file.txt", test.write_stream(mock_stream))
-        mock_stream.save.assert_called_once()
-        cache_path = mock_stream.save.call_args_list[0][0][0]
-        test._engine.upload_data_from_file.assert_called_once_with(storage_path=test.path, file_path=cache_path)
-        mock_increment_files.assert_has_calls = []
+        mock_stream.save.assert_called_once_with(buffer)
+        mock_increment_files.assert_not_called()
+        test._engine.upload_data_from_file.assert_not_called()
+
+        # the write fails after the name was claimed
+        mock_ls.return_value = ({"file.txt": {}}, [])
+        mock_increment_files.side_effect = lambda existing_names: setattr(test, "path", "bucket/folder/file 2.txt")
+        mock_stream.save.side_effect = OSError("connection reset")
+        test.path = "bucket/folder/file.txt"
+        with self.assertRaises(OSError):
+            test.write_stream(mock_stream)
+        test._engine.delete_keys.assert_called_once_with(bucket_name="bucket", keys=["folder/file 2.txt"])
 
-    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.exists")
+        # the write fails without a claimed name
+        test._engine.delete_keys.reset_mock()
+        mock_ls.return_value = ({}, [])
+        with self.assertRaises(OSError):
+            test.write_stream(mock_stream)
+        test._engine.delete_keys.assert_not_called()
+
+    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.ls")
     @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.__init__")
-    def test_increment_files(self, mock_init, mock_exists):
+    def test_increment_files(self, mock_init, mock_ls):
         mock_init.return_value = None
         test = S3ProcessesAdapter(file_path=MagicMock())
-        test.path = "mock/path/folder/file.txt"
-        mock_exists.return_value = False
+        test._engine = MagicMock()
+        test.path = "bucket/path/folder/file.txt"
+        mock_ls.return_value = ({"file.txt": {}, "file 3.txt": {}}, ["file 2.txt"])
+        test._engine.put_if_absent.return_value = True
         test.increment_files()
-        self.assertEqual("mock/path/folder/file 2.txt", test.path)
+        self.assertEqual("bucket/path/folder/file 4.txt", test.path)
+        mock_ls.assert_called_once_with(path="bucket/path/folder/")
+        test._engine.put_if_absent.assert_called_once_with(bucket_name="bucket", file_name="path/folder/file 4.txt")
 
-        test.path = "mock/path/folder/file.txt"
-        mock_exists.side_effect = [True, False]
-        test.increment_files()
-        self.assertEqual("mock/path/folder/file 3.txt", test.path)
+        # a concurrent writer claimed the first free name
+        test.path = "bucket/path/folder/file.txt"
+        test._engine.put_if_absent.side_effect = [False, True]
+        test.increment_files(existing_names=["file.txt", "file 2.txt"])
+        self.assertEqual("bucket/path/folder/file 4.txt", test.path)
+        mock_ls.assert_called_once()
 
     @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.__init__")
     def test_create_directory_if_not_exists(self, mock_init):
@@ -237,6 +473,31 @@ class TestS3ProcessesAdapter(TestCase):
         test.exists()
         test._engine.exists.assert_called_once_with(storage_path=test.path)
 
+    def test_iterdir(self):
+        self.test_folder._engine = MagicMock()
+        self.test_folder.path = MagicMock()
+
+        out_come = self.test_folder.iterdir()
+        page_out_come = self.test_folder.list_page(page_size=10, cursor="token", path="bucket/other")
+
+        self.test_folder._engine.iterdir.assert_called_once_with(storage_path=self.test_folder.path.to_string())
+        self.test_folder._engine.list_page.assert_called_once_with(storage_path="bucket/other", page_size=10,
+                                                                   cursor="token")
+        self.assertEqual(self.test_folder._engine.iterdir.return_value, out_come)
+        self.assertEqual(self.test_folder._engine.list_page.return_value, page_out_come)
+
+    def test_exists_many(self):
+        self.test_folder._engine = MagicMock()
+
+        out_come = self.test_folder.exists_many(paths=["mock/folder/path/a", "mock/folder/path/b"])
+        stat_out_come = self.test_folder.stat_many(paths=["mock/folder/path/a"])
+
+        self.test_folder._engine.exists_many.assert_called_once_with(
+            storage_paths=["mock/folder/path/a", "mock/folder/path/b"])
+        self.test_folder._engine.stat_many.assert_called_once_with(storage_paths=["mock/folder/path/a"])
+        self.assertEqual(self.test_folder._engine.exists_many.return_value, out_come)
+        self.assertEqual(self.test_folder._engine.stat_many.return_value, stat_out_come)
+
     @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.__init__")
     def test_ls(self, mock_init):
         mock_init.return_value = None
@@ -247,32 +508,144 @@ class TestS3ProcessesAdapter(TestCase):
         test.ls()
         test._engine.ls.assert_called_once_with(storage_path=test.path.to_string.return_value)
 
-    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.delete_file")
     @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.__init__")
-    def test_batch_delete(self, mock_init, mock_delete_file):
+    def test_batch_delete(self, mock_init):
         mock_init.return_value = None
-        test = S3ProcessesAdapter(file_path="test/path")
-        test.path = "test/path"
-        test.path = "mock/folder/path"
-        mock_paths = ["mock_folder", "mock_file"]
-        mock_delete_file.side_effect = [None, None]
-        test.batch_delete(paths=mock_paths)
-        mock_delete_file.assert_has_calls = [call(path=test.path + mock_paths[0]),
-                                             call(path=test.path + mock_paths[1])]
+        test = S3ProcessesAdapter(file_path="s3://bucket/mock/folder")
+        test.path = "s3://bucket/mock/folder"
+        test._engine = MagicMock()
+
+        out_come = test.batch_delete(paths=["mock_folder", "mock_file.txt"])
+
+        test._engine.delete_prefixes.assert_called_once_with(bucket_name="bucket",
+                                                             prefixes=["mock/folder/mock_folder",
+                                                                       "mock/folder/mock_file.txt"])
+        self.assertEqual(test._engine.delete_prefixes.return_value, out_come)
+
+    @staticmethod
+    def _list_prefix(keys, calls):
+        def list_prefix(bucket_name, prefix, delimiter=None):
+            calls.append((prefix, delimiter))
+            folders = set()
+            for key in sorted(keys):
+                if not key.startswith(prefix):
+                    continue
+                rest = key[len(prefix):]
+                if delimiter is not None and delimiter in rest:
+                    folders.add(prefix + rest.split(delimiter)[0] + delimiter)
+                else:
+                    yield key, False
+            for folder in sorted(folders):
+                yield folder, True
+        return list_prefix
+
+    def test_search(self):
+        keys = ["base/data/2023-12/part-1.parquet", "base/data/2024-01/part-1.parquet",
+                "base/data/2024-01/part-2.csv", "base/data/2024-01/nested/part-3.parquet",
+                "base/data/2024-02/part-1.parquet", "base/data/2024-02%20copy/part-1.parquet",
+                "base/other/2024-01/part-1.parquet"]
+        calls = []
+        self.test_folder.config = "s3://bucket/base"
+        self.test_folder.path = "./data"
+        self.test_folder._engine = MagicMock()
+        self.test_folder._engine.list_prefix.side_effect = self._list_prefix(keys, calls)
+
+        out_come = self.test_folder.iter_search(file_pattern="2024-*/part-*.parquet")
+
+        self.assertEqual([], calls)
+        self.assertEqual(["./data/2024-01/part-1.parquet", "./data/2024-02 copy/part-1.parquet",
+                          "./data/2024-02/part-1.parquet"], list(out_come))
+        # only the folders matching the first segment are listed
+        self.assertEqual([("base/data/2024-", "/"), ("base/data/2024-01/part-", "/"),
+                          ("base/data/2024-02%20copy/part-", "/"), ("base/data/2024-02/part-", "/")], calls)
+
+    def test_search_quoted_keys(self):
+        keys = ["base/my%20data/2024-01/part-1.parquet", "base/my%20data/2024-01%2Bx/part-1.parquet",
+                "base/my data/2024-01/part-2.parquet", "base/other/2024-01/part-1.parquet"]
+        calls = []
+        self.test_folder.config = "s3://bucket/base"
+        self.test_folder.path = "./my data"
+        self.test_folder._engine = MagicMock()
+        self.test_folder._engine.list_prefix.side_effect = self._list_prefix(keys, calls)
+
+        out_come = self.test_folder.search(file_pattern="2024-01*/part-*.parquet")
+
+        # the prefix is listed up to the space, which is quoted in some of the keys
+        self.assertEqual(["./my data/2024-01+x/part-1.parquet", "./my data/2024-01/part-1.parquet",
+                          "./my data/2024-01/part-2.parquet"], sorted(out_come))
+        self.assertEqual(("base/my", "/"), calls[0])
+
+    def test_search_recursive(self):
+        keys = ["base/data/a.txt", "base/data/b/c.txt", "base/data/b/d.csv", "base/other.txt"]
+        calls = []
+        self.test_folder.config = "s3://bucket/base"
+        self.test_folder.path = "./data"
+        self.test_folder._engine = MagicMock()
+        self.test_folder._engine.list_prefix.side_effect = self._list_prefix(keys, calls)
+
+        out_come = self.test_folder.search(file_pattern="**.txt")
+
+        self.assertEqual(["./data/a.txt", "./data/b/c.txt"], out_come)
+        self.assertEqual([("base/data/", None)], calls)
 
     def test_copy_file(self):
         mock_new_path = "mock/new/path"
         mock_engine = MagicMock()
         mock_engine._split_s3_path.side_effect = [("mock-bucket", "old/file.txt", None),
                                                   ("mock-bucket", "new/file.txt", None)]
-        mockObject = MagicMock()
-        mockObject.copy_from.return_value = None
-        mock_engine.resource.Object.return_value = mockObject
 
         self.test_file._engine = mock_engine
         self.test_file.copy_file(mock_new_path)
-        mock_engine._split_s3_path.assert_has_calls = [call(self.test_file.path), call(mock_new_path)]
-        mockObject.copy_from.assert_called_once_with(CopySource="mock-bucket/old/file.txt")
+        mock_engine._split_s3_path.assert_has_calls([call(self.test_file.path), call(mock_new_path)])
+        mock_engine.copy_object.assert_called_once_with(bucket_name="mock-bucket", file_name="old/file.txt",
+                                                        new_bucket_name="mock-bucket",
+                                                        new_file_name="new/file.txt")
+
+    def test_copy_folder(self):
+        mock_engine = MagicMock()
+        mock_engine._split_s3_path.side_effect = [("mock-bucket", "mock/folder/path", None),
+                                                  ("new-bucket", "new/path", None)]
+        mock_journal = MagicMock()
+        self.test_folder._engine = mock_engine
+
+        out_come = self.test_folder.copy_folder(new_folder="new-bucket/new/path", journal=mock_journal)
+
+        mock_engine.copy_prefix.assert_called_once_with(bucket_name="mock-bucket", prefix="mock/folder/path/",
+                                                        new_bucket_name="new-bucket", new_prefix="new/path/",
+                                                        journal=mock_journal)
+        self.assertEqual(mock_engine.copy_prefix.return_value, out_come)
+
+    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter._split_s3_path")
+    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.copy_folder")
+    @patch("monolith_filemanager.adapters.s3_processes.CopyJournal")
+    def test__transfer_folder(self, mock_journal, mock_copy_folder, mock_split_path):
+        mock_split_path.return_value = ("mock-bucket", "mock/folder/path", None)
+        mock_copy_folder.return_value = ["mock/folder/path/one.txt", "mock/folder/path/two.txt"]
+        self.test_folder._engine = MagicMock()
+        self.test_folder._engine.delete_keys.return_value = {}
+        journal = mock_journal.for_copy.return_value
+
+        self.test_folder._transfer_folder(new_folder="mock/new/path")
+
+        mock_journal.for_copy.assert_called_once_with(source="mock/folder/path", destination="mock/new/path")
+        mock_copy_folder.assert_called_once_with(new_folder="mock/new/path", journal=journal)
+        self.test_folder._engine.delete_keys.assert_called_once_with(bucket_name="mock-bucket",
+                                                                     keys=mock_copy_folder.return_value)
+        journal.remove.assert_called_once_with()
+
+        journal.remove.reset_mock()
+        self.test_folder._engine.delete_keys.return_value = {"mock/folder/path/one.txt": "AccessDenied: denied"}
+        with self.assertRaises(S3ProcessesAdapterError):
+            self.test_folder._transfer_folder(new_folder="mock/new/path")
+        journal.remove.assert_not_called()
+
+        # the journal is closed, and kept for a resume, if the copy fails
+        journal.close.reset_mock()
+        mock_copy_folder.side_effect = IOError("connection dropped")
+        with self.assertRaises(IOError):
+            self.test_folder._transfer_folder(new_folder="mock/new/path")
+        journal.close.assert_called_once_with()
+        journal.remove.assert_not_called()
 
     @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.delete_file")
     @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.copy_file")
@@ -298,20 +671,17 @@ class TestS3ProcessesAdapter(TestCase):
         mock_copy_file.assert_called_once_with(new_path='mock/folder/new_name.xlsx')
         mock_delete_file.assert_called_once_with()
 
-    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.delete_folder")
-    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.copy_folder")
+    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter._transfer_folder")
     @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.exists")
     @patch("monolith_filemanager.adapters.s3_processes.FilePath")
-    def test_rename_folder(self, mock_filepath, mock_exists, mock_copy_folder, mock_delete_folder):
+    def test_rename_folder(self, mock_filepath, mock_exists, mock_transfer_folder):
         new_name = "new_folder"
         mock_filepath.return_value = "/".join(self.test_folder.path.split("/")[:-1]) + f"/{new_name}"
         mock_exists.return_value = False
-        mock_copy_folder.return_value = None
-        mock_delete_folder.return_value = None
+        mock_transfer_folder.return_value = None
         self.test_folder.rename_folder(new_name=new_name)
 
-        mock_copy_folder.assert_called_once_with(new_folder=f"mock/folder/{new_name}")
-        mock_delete_folder.assert_called_once_with()
+        mock_transfer_folder.assert_called_once_with(new_folder=f"mock/folder/{new_name}")
 
     @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.delete_file")
     @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.copy_file")
@@ -326,18 +696,36 @@ class TestS3ProcessesAdapter(TestCase):
         mock_copy_file.assert_called_once_with(new_path=mock_filepath.return_value)
         mock_delete_file.assert_called_once_with()
 
-    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.delete_folder")
-    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.copy_folder")
+        mock_copy_file.reset_mock()
+        mock_exists.return_value = True
+        with self.assertRaises(S3ProcessesAdapterError):
+            self.test_file.move_file(destination_folder=mock_destination_folder)
+        mock_copy_file.assert_not_called()
+
+    @patch("monolith_filemanager.adapters.s3_processes.CopyJournal")
+    @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter._transfer_folder")
     @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.exists")
     @patch("monolith_filemanager.adapters.s3_processes.FilePath")
-    def test_move_folder(self, mock_filepath, mock_exists, mock_copy_folder, mock_delete_folder):
+    def test_move_folder(self, mock_filepath, mock_exists, mock_transfer_folder, mock_journal):
         mock_destination_folder = "mock/new/path"
         mock_filepath.return_value = "mock/new/path/folder"
         mock_exists.return_value = False
+        mock_journal.in_progress.return_value = False
+
+        self.test_folder.move_folder(destination_folder=mock_destination_folder)
+        mock_transfer_folder.assert_called_once_with(new_folder=mock_filepath.return_value)
+
+        mock_transfer_folder.reset_mock()
+        mock_exists.return_value = True
+        with self.assertRaises(S3ProcessesAdapterError):
+            self.test_folder.move_folder(destination_folder=mock_destination_folder)
+        mock_transfer_folder.assert_not_called()
 
+        # an interrupted move has already created the destination and is resumed
+        mock_journal.in_progress.return_value = True
         self.test_folder.move_folder(destination_folder=mock_destination_folder)
-        mock_copy_folder.assert_called_once_with(new_folder=mock_filepath.return_value)
-        mock_delete_folder.assert_called_once_with()
+        mock_journal.in_progress.assert_called_with(source="mock/folder/path", destination=mock_filepath.return_value)
+        mock_transfer_folder.assert_called_once_with(new_folder=mock_filepath.return_value)
 
     @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.move_folder")
     @patch("monolith_filemanager.adapters.s3_processes.S3ProcessesAdapter.move_file")
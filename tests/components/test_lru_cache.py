@@ -0,0 +1,79 @@
+from unittest import TestCase, main
+from unittest.mock import patch
+
+from monolith_filemanager.components.lru_cache import LRUCache
+
+
+class TestLRUCache(TestCase):
+
+    def test_get_put(self):
+        test = LRUCache(max_entries=2)
+
+        test.put("one", 1)
+        test.put("two", 2)
+
+        self.assertEqual(1, test.get("one"))
+        self.assertEqual(LRUCache.MISSING, test.get("three"))
+        self.assertEqual(None, test.get("three", None))
+        self.assertEqual({"hits": 1, "misses": 2, "evictions": 0, "entries": 2, "bytes": 0}, test.stats())
+
+    def test_eviction(self):
+        test = LRUCache(max_entries=2)
+        test.put("one", 1)
+        test.put("two", 2)
+        test.get("one")
+
+        test.put("three", 3)
+
+        self.assertIn("one", test)
+        self.assertNotIn("two", test)
+        self.assertIn("three", test)
+        self.assertEqual(1, test.evictions)
+
+    def test_max_bytes(self):
+        test = LRUCache(max_bytes=10, size_function=len)
+        test.put("one", b"12345")
+        test.put("two", b"123456")
+
+        self.assertNotIn("one", test)
+        self.assertEqual(6, test.current_bytes)
+
+        test.put("three", b"12345678901")
+        self.assertNotIn("three", test)
+        self.assertEqual(6, test.current_bytes)
+
+        test.put("two", b"1")
+        self.assertEqual(1, test.current_bytes)
+
+    @patch("monolith_filemanager.components.lru_cache.time.monotonic")
+    def test_ttl(self, mock_monotonic):
+        mock_monotonic.return_value = 100.0
+        test = LRUCache(ttl=5)
+        test.put("one", 1)
+
+        mock_monotonic.return_value = 104.0
+        self.assertEqual(1, test.get("one"))
+
+        mock_monotonic.return_value = 106.0
+        self.assertEqual(LRUCache.MISSING, test.get("one"))
+        self.assertEqual(0, len(test))
+
+    def test_invalidate(self):
+        test = LRUCache()
+        test.put(("bucket", "a/"), 1)
+        test.put(("bucket", "a/b/"), 2)
+        test.put(("other", "a/"), 3)
+
+        test.invalidate(("bucket", "missing"))
+        test.invalidate_where(lambda key: key[0] == "bucket" and key[1].startswith("a/b"))
+        self.assertEqual(2, len(test))
+
+        test.invalidate(("bucket", "a/"))
+        self.assertEqual([("other", "a/")], [key for key in [("bucket", "a/"), ("other", "a/")] if key in test])
+
+        test.clear()
+        self.assertEqual(0, len(test))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+from itertools import islice
+from unittest import TestCase, main
+
+from monolith_filemanager.components.name_increment import candidate_names
+
+
+class TestNameIncrement(TestCase):
+
+    def test_candidate_names(self):
+        existing = ["file.csv", "file 2.csv", "file 4.csv", "file 3.txt", "file 3", "other 3.csv", "file x.csv"]
+
+        out_come = list(islice(candidate_names(name="file.csv", existing_names=existing), 3))
+
+        self.assertEqual(["file 3.csv", "file 5.csv", "file 6.csv"], out_come)
+
+    def test_candidate_names_compressed(self):
+        existing = ["data.csv.gz", "data 2.csv.gz", "data.csv 3.gz", "data 3.csv"]
+
+        out_come = next(candidate_names(name="data.csv.gz", existing_names=existing))
+
+        self.assertEqual("data 3.csv.gz", out_come)
+        self.assertEqual("archive 2.gz", next(candidate_names(name="archive.gz", existing_names=[])))
+
+    def test_candidate_names_folder(self):
+        out_come = next(candidate_names(name="data.v1", existing_names=["data.v1 2", "data 2.v1"], folder=True))
+
+        self.assertEqual("data.v1 3", out_come)
+
+    def test_candidate_names_special_characters(self):
+        out_come = next(candidate_names(name="a (1)+.csv", existing_names=["a (1)+ 2.csv"]))
+
+        self.assertEqual("a (1)+ 3.csv", out_come)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+from unittest import TestCase, main
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+
+from monolith_filemanager.components.object_cache import ObjectCache, estimate_size
+from monolith_filemanager.singleton import Singleton
+
+
+class TestObjectCache(TestCase):
+
+    def setUp(self) -> None:
+        Singleton._instances.pop(ObjectCache, None)
+        self.test = ObjectCache()
+
+    def tearDown(self) -> None:
+        Singleton._instances.pop(ObjectCache, None)
+
+    def test_disabled(self):
+        read = MagicMock(return_value={"a": 1})
+
+        self.test.get_or_read(path="config.yml", validator=(1, 2), read=read)
+        self.test.get_or_read(path="config.yml", validator=(1, 2), read=read)
+
+        self.assertEqual(2, read.call_count)
+        self.assertIs(self.test, ObjectCache())
+
+    def test_get_or_read(self):
+        self.test.enable()
+        read = MagicMock(side_effect=lambda: {"a": [1, 2]})
+
+        first = self.test.get_or_read(path="config.yml", validator=(1, 2), read=read)
+        first["a"].append(3)
+        second = self.test.get_or_read(path="config.yml", validator=(1, 2), read=read)
+
+        self.assertEqual({"a": [1, 2]}, second)
+        self.assertEqual(1, read.call_count)
+
+        self.test.get_or_read(path="config.yml", validator=(1, 2), read=read, kwargs={"encoding": "utf-8"})
+        self.test.get_or_read(path="config.yml", validator=(3, 2), read=read)
+        self.test.get_or_read(path="config.yml", validator=None, read=read)
+        self.test.get_or_read(path="config.yml", validator=(3, 2), read=read, kwargs={"columns": ["a"]})
+        self.assertEqual(5, read.call_count)
+        # the entries of the old version were dropped and unhashable arguments are not cached
+        self.assertEqual(1, len(self.test))
+        self.assertEqual(1, self.test.stats()["hits"])
+
+    def test_shared(self):
+        self.test.enable(copy_on_read=False)
+        read = MagicMock(return_value=np.arange(4))
+
+        first = self.test.get_or_read(path="data.npy", validator="etag", read=read)
+        second = self.test.get_or_read(path="data.npy", validator="etag", read=read)
+
+        self.assertIs(first, second)
+        with self.assertRaises(ValueError):
+            first[0] = 10
+
+    def test_iterator(self):
+        self.test.enable()
+
+        out_come = self.test.get_or_read(path="data.csv", validator="etag", read=lambda: iter([1, 2]))
+
+        self.assertEqual([1, 2], list(out_come))
+        self.assertEqual(0, len(self.test))
+
+    def test_mmap_mode(self):
+        self.test.enable()
+        read = MagicMock(return_value=np.arange(4))
+
+        self.test.get_or_read(path="data.npy", validator="etag", read=read, kwargs={"mmap_mode": "r"})
+        self.test.get_or_read(path="data.npy", validator="etag", read=read, kwargs={"mmap_mode": "r"})
+
+        self.assertEqual(2, read.call_count)
+        self.assertEqual(0, len(self.test))
+
+    def test_byte_budget(self):
+        self.test.enable(max_bytes=1000)
+
+        self.test.get_or_read(path="one.npy", validator="etag", read=lambda: np.zeros(100))
+        self.test.get_or_read(path="two.npy", validator="etag", read=lambda: np.zeros(100))
+
+        self.assertEqual({"hits": 0, "misses": 2, "evictions": 1, "entries": 1, "bytes": 800}, self.test.stats())
+        self.test.invalidate_path(path="two.npy")
+        self.assertEqual(0, len(self.test))
+        self.test.disable()
+        self.assertFalse(self.test.enabled)
+
+    def test_estimate_size(self):
+        self.assertEqual(800, estimate_size(np.zeros(100)))
+        data_frame = pd.DataFrame({"a": ["x" * 100] * 10})
+        self.assertEqual(int(data_frame.memory_usage(index=True, deep=True).sum()), estimate_size(data_frame))
+        self.assertGreater(estimate_size({"a": ["x" * 1000]}), 1000)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+import io
 from unittest import TestCase, main
 from unittest.mock import patch
 from monolith_filemanager.file.base import File
@@ -26,5 +27,27 @@ class TestBase(TestCase):
         mock_init.assert_called_once_with(input_path)
 
 
+    @patch.multiple(File, __abstractmethods__=set())
+    def test_write_to_buffer(self):
+        test = File(path="test.txt")
+        self.assertFalse(test.supports_buffer_write())
+        with self.assertRaises(Exception):
+            test.write_to_buffer(data="test", buffer=io.BytesIO())
+
+    @patch.multiple(File, __abstractmethods__=set())
+    def test_read_from_buffer(self):
+        test = File(path="test.txt")
+        self.assertFalse(test.supports_buffer_read())
+        with self.assertRaises(Exception):
+            test.read_from_buffer(buffer=io.BytesIO())
+
+    def test_text_buffer(self):
+        buffer = io.BytesIO()
+        with File.text_buffer(buffer) as text:
+            text.write("héllo\n")
+        self.assertFalse(buffer.closed)
+        self.assertEqual("héllo\n".encode("utf-8"), buffer.getvalue())
+
+
 if __name__ == "__main__":
     main()
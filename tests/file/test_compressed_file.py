@@ -0,0 +1,144 @@
+import io
+import os
+import tempfile
+import unittest
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from monolith_filemanager.file.base import File
+from monolith_filemanager.file.compressed_file import CompressedFile, open_compressed
+from monolith_filemanager.file.errors import CompressedFileError
+from monolith_filemanager.file.json_file import JSONFile
+from monolith_filemanager.file.numpy_file import NumpyFile
+from monolith_filemanager.file.pandas_file import PandasFile
+from monolith_filemanager.path import FilePath
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class StagedFile(File):
+    """
+    File type that can only be read from and written to a path.
+    """
+    SUPPORTED_FORMATS = ["staged"]
+
+    def read(self, **kwargs) -> Any:
+        with open(self.path) as file:
+            return file.read()
+
+    def write(self, data: Any) -> None:
+        with open(self.path, "w") as file:
+            file.write(data)
+
+
+class TestOpenCompressed(unittest.TestCase):
+
+    def test_round_trip(self):
+        for compression in ["gz", "bz2", "xz"] + (["zst"] if zstandard is not None else []):
+            buffer = io.BytesIO()
+            with open_compressed(buffer=buffer, compression=compression, mode="wb", level=1) as stream:
+                stream.write(b"data" * 1000)
+            self.assertFalse(buffer.closed)
+            self.assertLess(len(buffer.getvalue()), 4000)
+
+            buffer.seek(0)
+            with open_compressed(buffer=buffer, compression=compression, mode="rb") as stream:
+                self.assertEqual(b"data" * 1000, stream.read())
+
+    def test_errors(self):
+        with self.assertRaises(CompressedFileError):
+            open_compressed(buffer=io.BytesIO(), compression="zip")
+        with self.assertRaises(CompressedFileError):
+            open_compressed(buffer=io.BytesIO(), compression="gz", mode="ab")
+
+
+class TestCompressedFile(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def path(self, name: str) -> FilePath:
+        return FilePath(os.path.join(self.directory.name, name))
+
+    def test___init__(self):
+        test = CompressedFile(file=JSONFile(path=self.path("test.json.gz")), compression_level=2)
+
+        self.assertEqual("json", test.path.file_type)
+        self.assertEqual("gz", test.path.compression)
+        self.assertEqual(2, test.compression_level)
+        self.assertEqual(-1, test.threads)
+        with self.assertRaises(CompressedFileError):
+            CompressedFile(file=JSONFile(path=self.path("test.json")))
+
+    def test_json(self):
+        test = CompressedFile(file=JSONFile(path=self.path("test.json.bz2")))
+
+        test.write(data={"one": [1, 2, 3]})
+        with open(test.path, "rb") as file:
+            self.assertEqual(b"BZh", file.read(3))
+        self.assertEqual({"one": [1, 2, 3]}, test.read())
+        self.assertEqual(test.path, test.file.path)
+
+    def test_csv(self):
+        test = CompressedFile(file=PandasFile(path=self.path("test.csv.gz")))
+        test.file.LOADING_METHODS = dict(test.file.LOADING_METHODS, csv=pd.read_csv)
+        data = pd.DataFrame({"one": range(10), "two": list("abcdefghij")})
+
+        test.write(data=data)
+
+        pd.testing.assert_frame_equal(data, test.read())
+        chunks = list(test.read(chunksize=4))
+        self.assertEqual([4, 4, 2], [len(chunk) for chunk in chunks])
+        pd.testing.assert_frame_equal(data, pd.concat(chunks, ignore_index=True))
+
+    def test_compression_level(self):
+        data = np.random.RandomState(0).randint(0, 4, 100000)
+        fast = CompressedFile(file=NumpyFile(path=self.path("fast.npy.gz")), compression_level=1)
+        small = CompressedFile(file=NumpyFile(path=self.path("small.npy.gz")), compression_level=9)
+
+        fast.write(data=data)
+        small.write(data=data)
+
+        self.assertLess(os.path.getsize(small.path), os.path.getsize(fast.path))
+
+    def test_staged(self):
+        test = CompressedFile(file=StagedFile(path=self.path("test.staged.gz")))
+
+        test.write(data="staged data")
+
+        self.assertEqual("staged data", test.read())
+        self.assertEqual(test.path, test.file.path)
+        self.assertFalse(test.supports_buffer_read())
+        self.assertTrue(test.supports_buffer_write())
+
+    @unittest.skipIf(zstandard is None, "zstandard is not installed")
+    def test_parquet_zst(self):
+        test = CompressedFile(file=PandasFile(path=self.path("test.parquet.zst")), compression_level=5, threads=2)
+        data = pd.DataFrame({"one": range(10), "two": [float(i) for i in range(10)]})
+
+        test.write(data=data)
+
+        with open(test.path, "rb") as file:
+            self.assertEqual(b"\x28\xb5\x2f\xfd", file.read(4))
+        pd.testing.assert_frame_equal(data[["two"]], test.read(columns=["two"]))
+
+    def test_write_to_buffer(self):
+        test = CompressedFile(file=JSONFile(path=self.path("test.json.gz")))
+        buffer = io.BytesIO()
+
+        test.write_to_buffer(data=[1, 2], buffer=buffer)
+        buffer.seek(0)
+
+        self.assertEqual([1, 2], test.read_from_buffer(buffer=buffer))
+
+
+if __name__ == "__main__":
+    unittest.main()
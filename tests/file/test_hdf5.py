@@ -1,29 +1,145 @@
+import io
+import os
+import tempfile
 from unittest import TestCase, main
-from unittest.mock import patch, MagicMock
-from monolith_filemanager.file.hdf5_file import Hdf5File
+from unittest.mock import patch
+
+import h5py
+import numpy as np
+
+from monolith_filemanager.file.errors import Hdf5FileError
+from monolith_filemanager.file.hdf5_file import Hdf5Dataset, Hdf5File
+from monolith_filemanager.file.hdf5_pool import Hdf5HandlePool
+from monolith_filemanager.singleton import Singleton
 
 
 class TestHdf5File(TestCase):
 
+    def setUp(self) -> None:
+        Singleton._instances.pop(Hdf5HandlePool, None)
+        self.directory = tempfile.TemporaryDirectory()
+        self.array = np.random.RandomState(0).rand(1000, 37)
+
+    def tearDown(self) -> None:
+        Hdf5HandlePool().clear()
+        Singleton._instances.pop(Hdf5HandlePool, None)
+        self.directory.cleanup()
+
     @patch("monolith_filemanager.file.hdf5_file.File.__init__")
     def test___init__(self, mock_file):
         Hdf5File(path="test")
         mock_file.assert_called_once_with(path="test")
 
-    @patch("monolith_filemanager.file.hdf5_file.h5py")
-    @patch("monolith_filemanager.file.hdf5_file.File.__init__")
-    def test_read(self, mock_file, mock_h5py):
-        mock_file.return_value = None
-        test = Hdf5File(path="test")
-        test.path = "test"
-        out_come = test.read()
-        mock_h5py.File.assert_called_once_with("test", mode='r')
-        self.assertEqual(mock_h5py.File.return_value, out_come)
-
-    @patch("monolith_filemanager.file.pickle_file.File.__init__")
-    def _test_write(self, mock_file):
-        mock_file.return_value = None
-        # No write method to test at the moment
+    def test_read(self):
+        test = Hdf5File(path=os.path.join(self.directory.name, "test.h5"))
+        test.write(data={"array": self.array})
+
+        with test.read() as first, test.read(rdcc_nbytes=1024) as other:
+            second = test.read()
+            np.testing.assert_array_equal(self.array[5:9], first["array"][5:9])
+            self.assertIs(first.file, second.file)
+            self.assertIsNot(first.file, other.file)
+            self.assertTrue(first.swmr_mode)
+            self.assertEqual({"hits": 1, "misses": 2, "evictions": 0, "open": 2, "in_use": 2},
+                             Hdf5HandlePool().stats())
+        self.assertTrue(second.file.id.valid)
+        second.close()
+        self.assertEqual(0, Hdf5HandlePool().stats()["in_use"])
+
+        # writing closes the idle handles and the new version is opened afresh
+        test.write(data={"array": self.array[:10]})
+        self.assertEqual(0, Hdf5HandlePool().stats()["open"])
+        with test.read() as h5:
+            self.assertEqual((10, 37), h5["array"].shape)
+
+    def test_write(self):
+        test = Hdf5File(path=os.path.join(self.directory.name, "test.h5"))
+        data = {
+            "array": self.array,
+            "group": {
+                "ints": np.arange(100, dtype=">i4"),
+                "strings": np.array(["x", "yy"]),
+                "scalar": 3.5,
+                "empty": np.zeros((0, 3)),
+                "nested": {"list": [1, 2, 3]},
+            },
+        }
+
+        test.write(data=data)
+
+        with h5py.File(test.path, mode="r") as h5:
+            np.testing.assert_array_equal(self.array, h5["array"][:])
+            np.testing.assert_array_equal(data["group"]["ints"], h5["group/ints"][:])
+            self.assertEqual([b"x", b"yy"], list(h5["group/strings"][:]))
+            self.assertEqual(3.5, h5["group/scalar"][()])
+            self.assertEqual((0, 3), h5["group/empty"].shape)
+            self.assertEqual([1, 2, 3], list(h5["group/nested/list"][:]))
+            self.assertIsNone(h5["array"].compression)
+            self.assertIsNotNone(h5["array"].chunks)
+
+    def test_write_parallel_gzip(self):
+        test = Hdf5File(path=os.path.join(self.directory.name, "test.h5"))
+        test.compression_level = 6
+        test.shuffle = True
+        test.max_workers = 3
+        ints = np.arange(100, dtype=">i4")
+
+        test.write(data={"array": self.array, "ints": Hdf5Dataset(ints, chunks=(7,), shuffle=False)})
+
+        with h5py.File(test.path, mode="r") as h5:
+            self.assertEqual("gzip", h5["array"].compression)
+            self.assertEqual(6, h5["array"].compression_opts)
+            self.assertTrue(h5["array"].shuffle)
+            self.assertEqual((7,), h5["ints"].chunks)
+            self.assertFalse(h5["ints"].shuffle)
+            # the chunks at the edges are read back through the filters of h5py
+            np.testing.assert_array_equal(self.array, h5["array"][:])
+            np.testing.assert_array_equal(ints, h5["ints"][:])
+
+    def test_write_lzf(self):
+        test = Hdf5File(path=os.path.join(self.directory.name, "test.h5"))
+
+        test.write(data={"array": Hdf5Dataset(self.array, compression="lzf", chunks=(100, 37))})
+
+        with h5py.File(test.path, mode="r") as h5:
+            self.assertEqual("lzf", h5["array"].compression)
+            self.assertEqual((100, 37), h5["array"].chunks)
+            np.testing.assert_array_equal(self.array, h5["array"][:])
+
+    def test_write_errors(self):
+        test = Hdf5File(path=os.path.join(self.directory.name, "test.h5"))
+
+        with self.assertRaises(Hdf5FileError):
+            test.write(data=self.array)
+        with self.assertRaises(Hdf5FileError):
+            test.write(data={"array": Hdf5Dataset(self.array, compression="zstd")})
+        with self.assertRaises(Hdf5FileError):
+            Hdf5Dataset(self.array, level=3)
+
+    def test_read_lazy(self):
+        test = Hdf5File(path=os.path.join(self.directory.name, "test.h5"))
+        test.write(data={"array": self.array})
+        with open(test.path, "rb") as file:
+            buffer = io.BytesIO(file.read())
+
+        with test.read_lazy(buffer=buffer) as h5:
+            np.testing.assert_array_equal(self.array[5:9], h5["array"][5:9])
+        self.assertTrue(buffer.closed)
+
+    def test_read_lazy_shared(self):
+        test = Hdf5File(path=os.path.join(self.directory.name, "test.h5"))
+        test.write(data={"array": self.array})
+        with open(test.path, "rb") as file:
+            data = file.read()
+        buffers = [io.BytesIO(data), io.BytesIO(data)]
+        for buffer in buffers:
+            buffer.name, buffer.etag, buffer.size = "s3://bucket/test.h5", "etag", len(data)
+
+        with test.read_lazy(buffer=buffers[0]) as first, test.read_lazy(buffer=buffers[1]) as second:
+            self.assertIs(first.file, second.file)
+            # the second file object is not needed as the version is already open
+            self.assertTrue(buffers[1].closed)
+            self.assertFalse(buffers[0].closed)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,98 @@
+from unittest import TestCase, main
+from unittest.mock import MagicMock, patch
+
+from monolith_filemanager.file.hdf5_pool import Hdf5Handle, Hdf5HandlePool
+from monolith_filemanager.singleton import Singleton
+
+
+class TestHdf5HandlePool(TestCase):
+
+    def setUp(self) -> None:
+        Singleton._instances.pop(Hdf5HandlePool, None)
+        self.test = Hdf5HandlePool()
+
+    def tearDown(self) -> None:
+        Singleton._instances.pop(Hdf5HandlePool, None)
+
+    def test_acquire_and_release(self):
+        open_file = MagicMock()
+        buffer = MagicMock()
+
+        first = self.test.acquire(key=("a", 1), open_file=open_file)
+        second = self.test.acquire(key=("a", 1), open_file=open_file, resources=[buffer])
+
+        self.assertIsInstance(first, Hdf5Handle)
+        open_file.assert_called_once_with()
+        buffer.close.assert_called_once_with()
+        self.assertEqual(open_file.return_value["x"], first["x"])
+        self.assertEqual(open_file.return_value.attrs, second.attrs)
+        first.close()
+        first.close()
+        self.assertEqual(1, self.test.stats()["in_use"])
+        second.close()
+        open_file.return_value.close.assert_not_called()
+        self.assertEqual({"hits": 1, "misses": 1, "evictions": 0, "open": 1, "in_use": 0}, self.test.stats())
+        with self.assertRaises(ValueError):
+            first["x"]
+
+    def test_unshared(self):
+        open_file = MagicMock()
+        buffer = MagicMock()
+
+        with self.test.acquire(key=None, open_file=open_file, resources=[buffer]):
+            self.assertEqual(0, self.test.stats()["open"])
+
+        open_file.return_value.close.assert_called_once_with()
+        buffer.close.assert_called_once_with()
+
+    def test_max_idle(self):
+        self.test.configure(max_idle=1)
+        files = [MagicMock(), MagicMock()]
+
+        self.test.acquire(key="a", open_file=lambda: files[0]).close()
+        self.test.acquire(key="b", open_file=lambda: files[1]).close()
+
+        files[0].close.assert_called_once_with()
+        files[1].close.assert_not_called()
+        self.assertEqual(1, self.test.stats()["evictions"])
+
+    @patch("monolith_filemanager.file.hdf5_pool.time")
+    def test_idle_timeout(self, mock_time):
+        self.test.configure(idle_timeout=10)
+        mock_time.monotonic.return_value = 100
+        file = MagicMock()
+        self.test.acquire(key="a", open_file=lambda: file).close()
+
+        mock_time.monotonic.return_value = 105
+        self.test.acquire(key="b", open_file=MagicMock()).close()
+        file.close.assert_not_called()
+        mock_time.monotonic.return_value = 111
+        self.test.acquire(key="b", open_file=MagicMock()).close()
+
+        file.close.assert_called_once_with()
+        self.assertEqual(1, self.test.stats()["open"])
+
+    def test_invalidate_path(self):
+        files = [MagicMock(), MagicMock(), MagicMock()]
+        handle = self.test.acquire(key=("a", 1), open_file=lambda: files[0])
+        self.test.acquire(key=("a", 2), open_file=lambda: files[1]).close()
+        self.test.acquire(key=("b", 1), open_file=lambda: files[2]).close()
+
+        self.test.invalidate_path(path="a")
+
+        files[0].close.assert_not_called()
+        files[1].close.assert_called_once_with()
+        files[2].close.assert_not_called()
+        self.assertEqual(1, self.test.stats()["open"])
+        handle.close()
+        files[0].close.assert_called_once_with()
+
+    def test_open_options(self):
+        self.test.configure(rdcc_nbytes=1024, rdcc_nslots=521)
+
+        self.assertEqual({"rdcc_nbytes": 1024, "rdcc_nslots": 521}, self.test.open_options())
+        self.assertEqual({"rdcc_nbytes": 10, "rdcc_nslots": 521}, self.test.open_options(rdcc_nbytes=10))
+
+
+if __name__ == "__main__":
+    main()
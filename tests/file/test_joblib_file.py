@@ -1,3 +1,5 @@
+import io
+import joblib
 
 import unittest
 from unittest.mock import patch
@@ -38,5 +40,14 @@ class TestJoblibFile(unittest.TestCase):
         )
 
 
+    def test_write_to_buffer(self):
+        test = JoblibFile(path="test.joblib")
+        buffer = io.BytesIO()
+        self.assertTrue(test.supports_buffer_write())
+        test.write_to_buffer(data={"one": 1}, buffer=buffer)
+        buffer.seek(0)
+        self.assertEqual({"one": 1}, joblib.load(buffer))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,3 +1,5 @@
+import io
+import json
 import unittest
 from unittest.mock import patch
 
@@ -39,5 +41,13 @@ class TestJSONFile(unittest.TestCase):
         )
 
 
+    def test_write_to_buffer(self):
+        test = JSONFile(path="test.json")
+        buffer = io.BytesIO()
+        self.assertTrue(test.supports_buffer_write())
+        test.write_to_buffer(data={"one": [1, 2]}, buffer=buffer)
+        self.assertEqual({"one": [1, 2]}, json.loads(buffer.getvalue()))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,106 @@
+import io
+import unittest
+
+import numpy as np
+
+from monolith_filemanager.file.errors import NumpyFileError
+from monolith_filemanager.file.lazy_array import LazyArray
+
+
+class PrefetchBuffer(io.BytesIO):
+    """
+    In memory file object recording the byte ranges prefetched and read.
+    """
+    block_size = 64
+    max_blocks = 4
+
+    def __init__(self, data: bytes) -> None:
+        super().__init__(data)
+        self.prefetched = []
+        self.read_bytes = 0
+
+    def prefetch_ranges(self, ranges, max_concurrency=None):
+        self.prefetched.append(ranges)
+
+    def readinto(self, buffer):
+        count = super().readinto(buffer)
+        self.read_bytes += count
+        return count
+
+
+def save(data: np.ndarray) -> bytes:
+    buffer = io.BytesIO()
+    np.save(buffer, data)
+    return buffer.getvalue()
+
+
+class TestLazyArray(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.data = np.arange(400, dtype=np.int64).reshape(100, 4)
+        self.test = LazyArray(buffer=io.BytesIO(save(self.data)))
+
+    def test___init__(self):
+        self.assertEqual((100, 4), self.test.shape)
+        self.assertEqual(np.dtype(np.int64), self.test.dtype)
+        self.assertFalse(self.test.fortran_order)
+        self.assertEqual(128, self.test.offset)
+        self.assertEqual(2, self.test.ndim)
+        self.assertEqual(400, self.test.size)
+        self.assertEqual(3200, self.test.nbytes)
+        self.assertEqual(32, self.test.row_bytes)
+        self.assertEqual(100, len(self.test))
+
+    def test___getitem__(self):
+        keys = [3, -1, np.int64(7), slice(2, 9), slice(None, None, -1), slice(90, 2, -3), slice(None, None, 7),
+                slice(5, 5), [1, 1, 99, -2], [], np.array([[0, 1], [2, 3]]), (slice(3, 5), 2), (4, slice(1, 3)),
+                np.arange(100) % 3 == 0, (Ellipsis, 1), None, ()]
+        for key in keys:
+            np.testing.assert_array_equal(self.data[key], self.test[key])
+        for key in [100, -101, [0, 100], 1.5, np.ones(3, dtype=bool)]:
+            with self.assertRaises(IndexError):
+                self.test[key]
+
+    def test_reads_only_rows_indexed(self):
+        buffer = PrefetchBuffer(save(self.data))
+        test = LazyArray(buffer=buffer)
+
+        np.testing.assert_array_equal(self.data[10:12], test[10:12])
+        self.assertEqual(64, buffer.read_bytes)
+
+        np.testing.assert_array_equal(self.data[[0, 1, 50, 98]], test[[0, 1, 50, 98]])
+        # rows less than a block apart are read together and the runs are prefetched together
+        self.assertEqual([[(128, 192), (1728, 1760), (3264, 3296)]], buffer.prefetched)
+        self.assertEqual(64 + 128, buffer.read_bytes)
+
+    def test_fortran_order(self):
+        data = np.asfortranarray(self.data)
+        test = LazyArray(buffer=io.BytesIO(save(data)))
+
+        self.assertTrue(test.fortran_order)
+        np.testing.assert_array_equal(data[3:5, 1], test[3:5, 1])
+        np.testing.assert_array_equal(data, np.asarray(test))
+
+    def test_scalar(self):
+        test = LazyArray(buffer=io.BytesIO(save(np.float32(3))))
+
+        self.assertEqual(3, test[()])
+        with self.assertRaises(TypeError):
+            len(test)
+
+    def test_errors(self):
+        with self.assertRaises(NumpyFileError):
+            LazyArray(buffer=io.BytesIO(save(np.array([{}, []], dtype=object))))
+        test = LazyArray(buffer=io.BytesIO(save(self.data)[:-8]))
+        with self.assertRaises(NumpyFileError):
+            test[99]
+
+    def test_close(self):
+        buffer = io.BytesIO(save(self.data))
+        with LazyArray(buffer=buffer) as test:
+            np.testing.assert_array_equal(self.data[0], test[0])
+        self.assertTrue(buffer.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
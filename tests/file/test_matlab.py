@@ -0,0 +1,99 @@
+import os
+import tempfile
+from unittest import TestCase, main
+from unittest.mock import patch
+
+import h5py
+import numpy as np
+from scipy.io import savemat
+
+from monolith_filemanager.file.errors import MatlabFileError
+from monolith_filemanager.file.hdf5_pool import Hdf5HandlePool
+from monolith_filemanager.file.matlab import MatlabBytesCache, MatlabFile, MatlabVariables
+from monolith_filemanager.singleton import Singleton
+
+
+class TestMatlabFile(TestCase):
+
+    def setUp(self) -> None:
+        Singleton._instances.pop(MatlabBytesCache, None)
+        Singleton._instances.pop(Hdf5HandlePool, None)
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "test.mat")
+        self.current = np.arange(1000, dtype=np.float64)
+        self.voltage = np.linspace(0, 1, 1000)
+
+    def tearDown(self) -> None:
+        Hdf5HandlePool().clear()
+        Singleton._instances.pop(Hdf5HandlePool, None)
+        Singleton._instances.pop(MatlabBytesCache, None)
+        self.directory.cleanup()
+
+    def write_v73(self) -> None:
+        # v7.3 files are hdf5 files with the MATLAB header in a 512 byte user block
+        with h5py.File(self.path, mode="w", userblock_size=512) as h5:
+            h5.create_dataset("current", data=self.current.reshape(-1, 1).T, chunks=(1, 100))
+            h5.create_dataset("voltage", data=self.voltage.reshape(-1, 1).T)
+            h5.create_group("#refs#")
+        with open(self.path, "r+b") as file:
+            file.write(b"MATLAB 7.3 MAT-file".ljust(116) + b"\x00" * 8 + b"\x00\x02" + b"IM")
+
+    @patch("monolith_filemanager.file.matlab.File.__init__")
+    def test___init__(self, mock_file):
+        MatlabFile(path="test")
+        mock_file.assert_called_once_with(path="test")
+
+    def test_read(self):
+        savemat(self.path, {"current": self.current, "voltage": self.voltage, "label": "cycle"})
+        test = MatlabFile(path=self.path)
+
+        data = test.read(variable_names=["current"])
+
+        np.testing.assert_array_equal(self.current, data["current"].reshape(-1))
+        self.assertNotIn("voltage", data)
+        self.assertIn("label", test.read())
+
+    def test_read_v73(self):
+        self.write_v73()
+        test = MatlabFile(path=self.path)
+
+        with test.read(variable_names=["current", "missing"]) as variables:
+            self.assertIsInstance(variables, MatlabVariables)
+            self.assertEqual(["current"], list(variables))
+            self.assertIsInstance(variables["current"], h5py.Dataset)
+            np.testing.assert_array_equal(self.current[100:200], variables["current"][0, 100:200])
+            with self.assertRaises(KeyError):
+                variables["voltage"]
+        with test.read() as variables:
+            self.assertEqual(["current", "voltage"], variables.files)
+
+    def test_load_bytes(self):
+        savemat(self.path, {"current": self.current, "voltage": self.voltage})
+        test = MatlabFile(path=self.path)
+
+        data = test.load_bytes(self.path)
+
+        with open(self.path, "rb") as file:
+            self.assertEqual(file.read(), data)
+        # the cache is shared between instances
+        self.assertIs(data, MatlabFile(path=self.path).load_bytes(self.path))
+        self.assertEqual(1, MatlabBytesCache().stats()["hits"])
+
+    def test_load_data(self):
+        savemat(self.path, {"current": self.current, "voltage": self.voltage, "time": np.arange(3)})
+        test = MatlabFile(path=self.path)
+
+        data = test._load_data(self.path, variable_names=["current", "voltage"])
+
+        self.assertEqual(["current", "voltage"], list(data.columns))
+        np.testing.assert_array_equal(self.voltage, data["voltage"].values)
+        with self.assertRaises(MatlabFileError):
+            test._load_data(self.path)
+
+    def test_write(self):
+        with self.assertRaises(MatlabFileError):
+            MatlabFile(path=self.path).write(data={})
+
+
+if __name__ == "__main__":
+    main()
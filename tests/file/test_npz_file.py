@@ -0,0 +1,108 @@
+import io
+import os
+import tempfile
+import unittest
+import zipfile
+from unittest.mock import patch
+
+import numpy as np
+
+from monolith_filemanager.file.errors import NumpyFileError
+from monolith_filemanager.file.npz_file import NpzArchive, NpzFile
+
+
+class CountingBuffer(io.BytesIO):
+    """
+    In memory file object counting the bytes read from it.
+    """
+    def __init__(self, data: bytes) -> None:
+        super().__init__(data)
+        self.read_bytes = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.read_bytes += len(data)
+        return data
+
+
+class TestNpzFile(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.data = {
+            "matrix": np.arange(2000, dtype=np.float64).reshape(100, 20),
+            "fortran": np.asfortranarray(np.arange(12).reshape(3, 4)),
+            "strided": np.arange(20)[::3],
+            "scalar": np.float32(2.5),
+            "records": np.array([(1, 2.0), (3, 4.0)], dtype=[("a", "i4"), ("b", "f8")]),
+            "dates": np.array(["2024-01-01", "2024-06-30"], dtype="datetime64[D]"),
+        }
+
+    def check(self, archive) -> None:
+        self.assertEqual(list(self.data), list(archive))
+        for name, array in self.data.items():
+            np.testing.assert_array_equal(array, archive[name])
+            self.assertEqual(np.asarray(array).dtype, archive[name].dtype)
+
+    @patch("monolith_filemanager.file.npz_file.File.__init__")
+    def test___init__(self, mock_file_init):
+        mock_file_init.return_value = None
+        NpzFile(path="test")
+        mock_file_init.assert_called_once_with(path="test")
+
+    def test_write_and_read(self):
+        with tempfile.TemporaryDirectory() as directory:
+            test = NpzFile(path=os.path.join(directory, "test.npz"))
+
+            test.write(data=self.data)
+
+            with test.read() as archive:
+                self.assertIsInstance(archive, NpzArchive)
+                self.check(archive=archive)
+            with np.load(test.path) as archive:
+                self.check(archive=archive)
+
+    def test_write_compressed(self):
+        test = NpzFile(path="test.npz")
+        test.compression_level = 6
+        test.CHUNK_SIZE = 1024
+        buffer = io.BytesIO()
+
+        test.write_to_buffer(data=self.data, buffer=buffer)
+
+        with zipfile.ZipFile(buffer) as archive:
+            info = archive.getinfo("matrix.npy")
+            self.assertEqual(zipfile.ZIP_DEFLATED, info.compress_type)
+            self.assertLess(info.compress_size, info.file_size)
+        self.assertTrue(test.supports_buffer_write())
+        self.check(archive=test.read_lazy(buffer=io.BytesIO(buffer.getvalue())))
+
+    def test_read_lazy(self):
+        buffer = io.BytesIO()
+        NpzFile(path="test.npz").write_to_buffer(data=self.data, buffer=buffer)
+        counting = CountingBuffer(buffer.getvalue())
+
+        archive = NpzFile(path="test.npz").read_lazy(buffer=counting)
+        opened = counting.read_bytes
+        np.testing.assert_array_equal(self.data["scalar"], archive["scalar"])
+
+        # only the central directory and the member accessed are read
+        self.assertLess(counting.read_bytes, 2000)
+        self.assertLess(opened, 1000)
+        self.assertIn("matrix", archive)
+        self.assertNotIn("missing", archive)
+        with self.assertRaises(KeyError):
+            archive["missing"]
+        archive.close()
+        self.assertTrue(counting.closed)
+
+    def test_write_errors(self):
+        test = NpzFile(path="test.npz")
+
+        with self.assertRaises(NumpyFileError):
+            test.write_to_buffer(data=[np.arange(3)], buffer=io.BytesIO())
+        with self.assertRaises(NumpyFileError):
+            test.write_to_buffer(data={"objects": np.array([{}, []], dtype=object)}, buffer=io.BytesIO())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,11 @@
+import io
+import os
+import tempfile
+import numpy as np
 from unittest import TestCase, main
-from unittest.mock import patch
+from unittest.mock import patch, MagicMock
+from monolith_filemanager.file.errors import NumpyFileError
+from monolith_filemanager.file.lazy_array import LazyArray
 from monolith_filemanager.file.numpy_file import NumpyFile
 
 
@@ -22,6 +28,29 @@ class TestNumpyFile(TestCase):
         mock_init.assert_called_once_with(path="test")
         mock_np.load.assert_called_once_with("/some/path.npy")
 
+    def test_read_file_mmap_mode(self):
+        with tempfile.TemporaryDirectory() as directory:
+            test = NumpyFile(path=os.path.join(directory, "test.npy"))
+            test.write(data=np.arange(100).reshape(25, 4))
+
+            out_come = test.read(mmap_mode="r")
+
+            self.assertIsInstance(out_come, np.memmap)
+            self.assertEqual([8, 9, 10, 11], list(out_come[2]))
+            del out_come
+
+    def test_read_lazy(self):
+        test = NumpyFile(path="test.npy")
+        buffer = io.BytesIO()
+        np.save(buffer, np.arange(100).reshape(25, 4))
+
+        out_come = test.read_lazy(buffer=buffer)
+
+        self.assertIsInstance(out_come, LazyArray)
+        self.assertEqual([8, 9, 10, 11], list(out_come[2]))
+        with self.assertRaises(NumpyFileError):
+            test.read_lazy(buffer=MagicMock(), mmap_mode="r+")
+
     @patch("monolith_filemanager.file.numpy_file.np")
     @patch("monolith_filemanager.file.numpy_file.NumpyFile.__init__")
     def test_write_file(self, mock_init, mock_np):
@@ -33,6 +62,14 @@ class TestNumpyFile(TestCase):
         mock_init.assert_called_once_with(path="test")
         mock_np.save.assert_called_once_with("/some/path.npy", "string object", allow_pickle=False)
 
+    def test_write_to_buffer(self):
+        test = NumpyFile(path="test.npy")
+        buffer = io.BytesIO()
+        self.assertTrue(test.supports_buffer_write())
+        test.write_to_buffer(data=np.arange(10), buffer=buffer)
+        buffer.seek(0)
+        self.assertEqual(list(range(10)), list(np.load(buffer)))
+
 
 if __name__ == "__main__":
     main()
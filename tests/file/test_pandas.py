@@ -1,8 +1,35 @@
+import io
+import os
+import tempfile
 from unittest import TestCase, main
 from unittest.mock import patch, MagicMock
 from monolith_filemanager.file.pandas_file import PandasFile
 import pandas as pd
 
+class PrefetchBuffer(io.BytesIO):
+    """
+    In memory stand in for S3ReadFile recording the ranges prefetched.
+    """
+    name = "s3://bucket/table.parquet"
+    etag = '"etag"'
+    block_size = 64
+    max_blocks = 64
+
+    def __init__(self, data):
+        super().__init__(data)
+        self.size = len(data)
+        self.prefetched = []
+
+    def prefetch_ranges(self, ranges):
+        self.prefetched.append(ranges)
+
+
+def parquet_bytes(data, row_group_size):
+    buffer = io.BytesIO()
+    data.to_parquet(buffer, index=False, row_group_size=row_group_size)
+    return buffer.getvalue()
+
+
 LOADING_METHODS = {
     "h5": pd.read_hdf,
     "parquet": pd.read_parquet,
@@ -68,5 +95,96 @@ class TestPandasFile(TestCase):
         mock_map.return_value.assert_called_once_with(test.path, header=True, index=False)
 
 
+    def test_write_to_buffer(self):
+        data = pd.DataFrame([{"one": 1, "two": 2}, {"one": 3, "two": 4}])
+
+        test = PandasFile(path="test.csv")
+        self.assertTrue(test.supports_buffer_write())
+        buffer = io.BytesIO()
+        test.write_to_buffer(data=data, buffer=buffer)
+        buffer.seek(0)
+        pd.testing.assert_frame_equal(data, pd.read_csv(buffer))
+
+        test = PandasFile(path="test.parquet")
+        buffer = io.BytesIO()
+        test.write_to_buffer(data=data, buffer=buffer)
+        buffer.seek(0)
+        pd.testing.assert_frame_equal(data, pd.read_parquet(buffer))
+
+        with self.assertRaises(Exception):
+            test.write_to_buffer(data="test", buffer=buffer)
+        self.assertFalse(PandasFile(path="test.xlsx").supports_buffer_write())
+
+    def test_read_from_buffer(self):
+        data = pd.DataFrame({"id": range(100), "group": [i // 25 for i in range(100)],
+                             **{"column_{}".format(i): [float(i)] * 100 for i in range(20)}})
+        buffer = PrefetchBuffer(parquet_bytes(data=data, row_group_size=25))
+        test = PandasFile(path="test.parquet")
+        self.assertTrue(test.supports_buffer_read())
+        self.assertFalse(PandasFile(path="test.xlsx").supports_buffer_read())
+        PandasFile.FOOTER_CACHE.clear()
+
+        out_come = test.read_from_buffer(buffer=buffer, columns=["id", "column_3"], filters=[("group", ">=", 2)])
+
+        expected = data[data["group"] >= 2][["id", "column_3"]].reset_index(drop=True)
+        pd.testing.assert_frame_equal(expected, out_come)
+        # only the two row groups that can match are fetched, with the chunks of the three columns needed
+        self.assertEqual(6, sum(len(ranges) for ranges in buffer.prefetched))
+        self.assertEqual(1, len(PandasFile.FOOTER_CACHE))
+
+        out_come = test.read_from_buffer(buffer=buffer, row_groups=[1], filters=[[("id", "<", 30)], [("id", ">", 48)]])
+        pd.testing.assert_frame_equal(data.iloc[[25, 26, 27, 28, 29, 49]].reset_index(drop=True), out_come)
+        self.assertEqual(1, PandasFile.FOOTER_CACHE.stats()["hits"])
+
+        out_come = test.read_from_buffer(buffer=buffer, columns=["id"], filters=[("group", "=", 7)])
+        self.assertEqual((0, 1), out_come.shape)
+
+    def test_read_from_buffer_large_row_groups(self):
+        data = pd.DataFrame({"id": range(100), **{"column_{}".format(i): [float(i)] * 100 for i in range(20)}})
+        buffer = PrefetchBuffer(parquet_bytes(data=data, row_group_size=50))
+        buffer.max_blocks = 1
+        PandasFile.FOOTER_CACHE.clear()
+
+        out_come = PandasFile(path="test.parquet").read_from_buffer(buffer=buffer)
+
+        pd.testing.assert_frame_equal(data, out_come)
+        # the row groups do not fit in the block cache so they are read without a prefetch
+        self.assertEqual([], buffer.prefetched)
+
+    def test_read_row_groups(self):
+        data = pd.DataFrame({"id": range(10), "value": [str(i) for i in range(10)]})
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "table.parquet")
+            with open(path, "wb") as file:
+                file.write(parquet_bytes(data=data, row_group_size=4))
+            test = PandasFile(path=path)
+
+            pd.testing.assert_frame_equal(data.iloc[4:].reset_index(drop=True),
+                                          test.read(row_groups=[1, 2]))
+            pd.testing.assert_frame_equal(data.iloc[:3][["value"]],
+                                          test.read(columns=["value"], filters=[("id", "<", 3)]))
+
+    def test_read_chunks(self):
+        data = pd.DataFrame({"id": range(10), "value": list("abcdefghij")})
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "table.csv")
+            data.to_csv(path, index=False)
+            test = PandasFile(path=path)
+            test.LOADING_METHODS = dict(test.LOADING_METHODS, csv=pd.read_csv)
+
+            chunks = list(test.read(chunksize=4))
+
+            self.assertEqual([4, 4, 2], [len(chunk) for chunk in chunks])
+            pd.testing.assert_frame_equal(data, pd.concat(chunks, ignore_index=True))
+
+            with open(path, "rb") as buffer:
+                chunks = list(test.read_from_buffer(buffer=buffer, chunksize=6, usecols=["value"]))
+            self.assertEqual([6, 4], [len(chunk) for chunk in chunks])
+            self.assertEqual(["value"], list(chunks[0].columns))
+
+        with self.assertRaises(Exception):
+            next(PandasFile(path="table.parquet").read(chunksize=4))
+
+
 if __name__ == "__main__":
     main()
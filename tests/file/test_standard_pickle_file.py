@@ -1,3 +1,5 @@
+import io
+import pickle
 from unittest import TestCase, main
 from unittest.mock import patch, MagicMock
 
@@ -39,5 +41,13 @@ class TestStandardPickleFile(TestCase):
         mock_pickle.dump.assert_called_once_with(mock_data, mock_open.return_value.__enter__.return_value)
 
 
+    def test_write_to_buffer(self):
+        test = StandardPickleFile(path="test.sav")
+        buffer = io.BytesIO()
+        self.assertTrue(test.supports_buffer_write())
+        test.write_to_buffer(data={"one": 1}, buffer=buffer)
+        self.assertEqual({"one": 1}, pickle.loads(buffer.getvalue()))
+
+
 if __name__ == "__main__":
     main()
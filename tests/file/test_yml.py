@@ -1,3 +1,5 @@
+import io
+import yaml
 from unittest import TestCase, main
 from unittest.mock import patch
 
@@ -48,5 +50,16 @@ class TestYmlFile(TestCase):
         mock_open.return_value.close.assert_called_once_with()
 
 
+    def test_write_to_buffer(self):
+        test = YmlFile(path="test.yml")
+        buffer = io.BytesIO()
+        self.assertTrue(test.supports_buffer_write())
+        test.write_to_buffer(data={"one": 1}, buffer=buffer)
+        self.assertEqual({"one": 1}, yaml.safe_load(buffer.getvalue()))
+
+        with self.assertRaises(YamlFileError):
+            test.write_to_buffer(data="test", buffer=buffer)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,78 @@
+import io
+import os
+import unittest
+import zipfile
+from unittest.mock import patch
+
+from monolith_filemanager.file.zip_writer import ZipStreamWriter
+
+
+class UnseekableBuffer(io.RawIOBase):
+    """
+    Writable file object that cannot seek or tell, like a stream uploading to s3.
+    """
+    def __init__(self) -> None:
+        super().__init__()
+        self.data = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.data += data
+        return len(data)
+
+
+class TestZipStreamWriter(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.data = os.urandom(2500) + b"x" * 5000
+        self.members = [("a.npy", len(self.data), [self.data[:100], self.data[100:]]), ("empty.npy", 0, []),
+                        ("é.npy", 3, [b"abc"])]
+
+    def write(self, **kwargs) -> zipfile.ZipFile:
+        buffer = UnseekableBuffer()
+        test = ZipStreamWriter(buffer=buffer, chunk_size=1000, **kwargs)
+        test.write_members(self.members)
+        test.close()
+        self.assertFalse(buffer.closed)
+        return zipfile.ZipFile(io.BytesIO(bytes(buffer.data)))
+
+    def check(self, archive: zipfile.ZipFile, compress_type: int) -> None:
+        self.assertIsNone(archive.testzip())
+        self.assertEqual(["a.npy", "empty.npy", "é.npy"], archive.namelist())
+        self.assertEqual(self.data, archive.read("a.npy"))
+        self.assertEqual(b"", archive.read("empty.npy"))
+        self.assertEqual(b"abc", archive.read("é.npy"))
+        self.assertEqual({compress_type}, {info.compress_type for info in archive.infolist()})
+
+    def test_stored(self):
+        archive = self.write()
+
+        self.check(archive=archive, compress_type=zipfile.ZIP_STORED)
+
+    def test_deflated(self):
+        archive = self.write(compression_level=6, max_workers=3)
+
+        self.check(archive=archive, compress_type=zipfile.ZIP_DEFLATED)
+        self.assertLess(archive.getinfo("a.npy").compress_size, 4000)
+
+    @patch("monolith_filemanager.file.zip_writer.ZIP64_MARGIN", 0)
+    @patch("monolith_filemanager.file.zip_writer.ZIP64_LIMIT", 50)
+    def test_zip64(self):
+        archive = self.write(compression_level=1)
+
+        self.check(archive=archive, compress_type=zipfile.ZIP_DEFLATED)
+        self.assertEqual(7500, archive.getinfo("a.npy").file_size)
+
+    @patch("monolith_filemanager.file.zip_writer.ZIP64_MARGIN", 0)
+    @patch("monolith_filemanager.file.zip_writer.ZIP64_LIMIT", 5000)
+    def test_declared_size_too_small(self):
+        test = ZipStreamWriter(buffer=io.BytesIO())
+
+        with self.assertRaises(ValueError):
+            test.write_members([("a.npy", 10, [self.data])])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import asyncio
+import threading
+import time
+from unittest import TestCase, main
+from unittest.mock import MagicMock
+
+from monolith_filemanager.s3storage import V1Engine
+from monolith_filemanager.s3storage.async_engine import AsyncV1Engine
+from monolith_filemanager.s3storage.errors import V1EngineError
+
+
+class LocalEngine:
+    """
+    In memory stand-in for the V1Engine that records how many requests were in flight at once.
+    """
+    _split_s3_path = staticmethod(V1Engine._split_s3_path)
+
+    def __init__(self) -> None:
+        self.objects = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def _request(self) -> None:
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.01)
+        with self.lock:
+            self.in_flight -= 1
+
+    def upload_data(self, storage_path, data):
+        self._request()
+        self.objects[storage_path] = data
+
+    def download_raw_data_file(self, storage_path):
+        self._request()
+        return self.objects[storage_path]
+
+    def exists(self, storage_path):
+        self._request()
+        return storage_path in self.objects
+
+    def copy_object(self, bucket_name, file_name, new_bucket_name, new_file_name):
+        self._request()
+        self.objects[f"{new_bucket_name}/{new_file_name}"] = self.objects[f"{bucket_name}/{file_name}"]
+
+
+class TestAsyncV1Engine(TestCase):
+
+    def setUp(self) -> None:
+        AsyncV1Engine._singleton = None
+        self.local_engine = LocalEngine()
+        self.test = AsyncV1Engine(max_concurrency=8, engine=self.local_engine)
+
+    def tearDown(self) -> None:
+        self.test.shutdown()
+        AsyncV1Engine._singleton = None
+
+    def test___init__(self):
+        self.assertEqual(id(self.test), id(AsyncV1Engine()))
+        self.assertEqual(id(self.test), id(AsyncV1Engine(max_concurrency=8, engine=self.local_engine)))
+        self.assertEqual(8, self.test.max_concurrency)
+        self.assertEqual(self.local_engine, self.test.engine)
+
+        # other settings are not silently ignored
+        with self.assertRaises(V1EngineError):
+            AsyncV1Engine(max_concurrency=2)
+        with self.assertRaises(V1EngineError):
+            AsyncV1Engine(engine=LocalEngine())
+        self.assertEqual(8, self.test.max_concurrency)
+
+    def test_concurrency(self):
+        async def run():
+            await asyncio.gather(*[self.test.upload_data(storage_path=f"bucket/{i}", data=bytes([i]))
+                                   for i in range(200)])
+            return await asyncio.gather(*[self.test.download_raw_data_file(storage_path=f"bucket/{i}")
+                                          for i in range(200)])
+
+        out_come = asyncio.run(run())
+
+        self.assertEqual([bytes([i]) for i in range(200)], out_come)
+        self.assertEqual(8, self.local_engine.max_in_flight)
+
+    def test_copy(self):
+        async def run():
+            await self.test.upload_data(storage_path="bucket/a/1", data=b"one")
+            await self.test.copy(storage_path="bucket/a/1", new_storage_path="other/b/1")
+            return await self.test.exists(storage_path="other/b/1")
+
+        self.assertTrue(asyncio.run(run()))
+        self.assertEqual(b"one", self.local_engine.objects["other/b/1"])
+
+    def test_copy_folder(self):
+        self.test.engine = MagicMock()
+        self.test.engine._split_s3_path = V1Engine._split_s3_path
+
+        out_come = asyncio.run(self.test.copy_folder(storage_path="bucket/a", new_storage_path="other/b"))
+
+        self.test.engine.copy_prefix.assert_called_once_with(bucket_name="bucket", prefix="a/",
+                                                             new_bucket_name="other", new_prefix="b/", journal=None)
+        self.assertEqual(self.test.engine.copy_prefix.return_value, out_come)
+
+    def test_configure(self):
+        self.test.engine = MagicMock()
+        self.test.engine.client_manager.max_pool_connections = 50
+
+        self.test.configure(max_concurrency=100)
+
+        self.assertEqual(100, self.test.max_concurrency)
+        self.test.engine.configure_clients.assert_called_once_with(max_pool_connections=100)
+
+        with self.assertRaises(V1EngineError):
+            self.test.configure(max_concurrency=0)
+
+        self.test.configure(engine=self.local_engine)
+        self.assertEqual(self.local_engine, self.test.engine)
+        self.assertEqual(100, self.test.max_concurrency)
+
+    def test_errors(self):
+        async def run():
+            return await self.test.download_raw_data_file(storage_path="bucket/missing")
+
+        with self.assertRaises(KeyError):
+            asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -47,22 +47,23 @@ class TestBucketManager(TestCase):
             test.get_bucket(name="test")
         mock_check.assert_called_once_with()
 
-    def test_get_bucket_contents(self):
+    @patch("monolith_filemanager.s3storage.bucket_manager.BucketInventory")
+    def test_get_bucket_contents(self, mock_inventory):
         test = BucketManager()
-
         test.client = MagicMock()
-        test.client.list_objects_v2.return_value = {"Contents": [
-            {"Key": "one"}, {"Key": "two"}, {"Key": "three"}, {"Key": "four"}
-        ]}
         test.get_bucket = MagicMock()
-        test.get_bucket_contents(bucket_name="test")
-        test.get_bucket.assert_called_once_with(name="test")
 
-        self.assertEqual(["test"], list(test.bucket_contents.keys()))
-        self.assertEqual(['keys', 'contents'], list(test.bucket_contents["test"].keys()))
-        self.assertEqual(['one', 'two', 'three', 'four'], list(test.bucket_contents["test"]["keys"]))
-        self.assertEqual([{'Key': 'one'}, {'Key': 'two'}, {'Key': 'three'}, {'Key': 'four'}],
-                         list(test.bucket_contents["test"]["contents"]))
+        out_come = test.get_bucket_contents(bucket_name="test")
+
+        test.get_bucket.assert_called_once_with(name="test")
+        mock_inventory.assert_called_once_with(client=test.client, bucket_name="test")
+        mock_inventory.return_value.update.assert_called_once_with()
+        self.assertEqual(mock_inventory.return_value, out_come)
+        self.assertEqual({"test": mock_inventory.return_value}, test.bucket_contents)
+
+        test.get_bucket_contents(bucket_name="test", rebuild=True)
+        mock_inventory.assert_called_once_with(client=test.client, bucket_name="test")
+        mock_inventory.return_value.build.assert_called_once_with()
 
     def test_check_bucket_cache(self):
         test = BucketManager()
@@ -0,0 +1,95 @@
+import os
+import threading
+from collections import OrderedDict
+from unittest import TestCase, main
+from unittest.mock import patch, MagicMock
+
+from monolith_filemanager.s3storage.client_manager import ClientManager
+
+
+class TestClientManager(TestCase):
+
+    @patch("boto3.client")
+    def test_client(self, mock_client):
+        test = ClientManager(max_pool_connections=20)
+
+        self.assertEqual(mock_client.return_value, test.client)
+        self.assertEqual(mock_client.return_value, test.client)
+
+        mock_client.assert_called_once()
+        config = mock_client.call_args[1]["config"]
+        self.assertEqual(20, config.max_pool_connections)
+        self.assertTrue(config.tcp_keepalive)
+
+    @patch.dict(os.environ, {"AWS_ACCESS_KEY_ID": "testing", "AWS_SECRET_ACCESS_KEY": "testing",
+                             "AWS_DEFAULT_REGION": "us-east-1"})
+    def test_client_real(self):
+        from botocore.config import Config
+        test = ClientManager(max_pool_connections=20)
+
+        self.assertEqual(20, test.client.meta.config.max_pool_connections)
+
+        # botocore versions without the tcp_keepalive setting reject it
+        defaults = OrderedDict((key, value) for key, value in Config.OPTION_DEFAULTS.items() if key != "tcp_keepalive")
+        with patch.object(Config, "OPTION_DEFAULTS", defaults):
+            config = test._config()
+        self.assertEqual(20, config.max_pool_connections)
+        self.assertFalse(hasattr(config, "tcp_keepalive"))
+
+    @patch("boto3.client")
+    def test_client_after_fork(self, mock_client):
+        mock_client.side_effect = [MagicMock(), MagicMock()]
+        test = ClientManager()
+        parent_client = test.client
+
+        # pretend the manager was inherited from another process
+        test._pid = os.getpid() + 1
+
+        self.assertNotEqual(parent_client, test.client)
+        self.assertEqual(2, mock_client.call_count)
+        self.assertEqual(os.getpid(), test._pid)
+
+    @patch("boto3.session.Session")
+    def test_resource(self, mock_session):
+        mock_session.side_effect = lambda: MagicMock()
+        test = ClientManager()
+        resources = []
+
+        main_resource = test.resource
+        self.assertEqual(main_resource, test.resource)
+
+        thread = threading.Thread(target=lambda: resources.append(test.resource))
+        thread.start()
+        thread.join()
+
+        self.assertNotEqual(main_resource, resources[0])
+        self.assertEqual(2, mock_session.call_count)
+
+    @patch("boto3.client")
+    def test_configure(self, mock_client):
+        mock_client.side_effect = [MagicMock(), MagicMock()]
+        test = ClientManager()
+        old_client = test.client
+
+        test.configure(max_pool_connections=100, read_timeout=30)
+
+        self.assertEqual(100, test.max_pool_connections)
+        self.assertTrue(test.tcp_keepalive)
+        self.assertNotEqual(old_client, test.client)
+        self.assertEqual(30, mock_client.call_args[1]["config"].read_timeout)
+
+    @patch("boto3.client")
+    def test_override(self, mock_client):
+        test = ClientManager()
+        mock_override = MagicMock()
+
+        test.client = mock_override
+        self.assertEqual(mock_override, test.client)
+        mock_client.assert_not_called()
+
+        test.client = None
+        self.assertEqual(mock_client.return_value, test.client)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import os
+import tempfile
+from unittest import TestCase, main
+from unittest.mock import MagicMock
+
+from monolith_filemanager.s3storage.content_cache import ContentCache
+from monolith_filemanager.s3storage.errors import ContentCacheError
+
+
+def writer(data):
+    def download(path):
+        with open(path, "wb") as file:
+            file.write(data)
+    return download
+
+
+class TestContentCache(TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.test = ContentCache(directory=self.directory.name, ttl=30, max_bytes=10)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_fill(self):
+        self.assertIsNone(self.test.get_checked(bucket_name="bucket", file_name="a/data.csv"))
+        self.assertIsNone(self.test.get(bucket_name="bucket", file_name="a/data.csv", etag="1"))
+
+        path = self.test.fill(bucket_name="bucket", file_name="a/data.csv", etag="1", download=writer(b"abc"))
+
+        self.assertEqual("data.csv", os.path.basename(path))
+        with open(path, "rb") as file:
+            self.assertEqual(b"abc", file.read())
+        self.assertEqual(path, self.test.get_checked(bucket_name="bucket", file_name="a/data.csv"))
+        self.assertEqual(path, self.test.get(bucket_name="bucket", file_name="a/data.csv", etag="1"))
+        self.assertIsNone(self.test.get(bucket_name="bucket", file_name="a/data.csv", etag="2"))
+        self.assertEqual({"hits": 2, "misses": 2, "not_modified": 0, "evictions": 0, "entries": 1, "bytes": 3,
+                          "downloaded_bytes": 3, "served_bytes": 6}, self.test.stats())
+
+    def test_confirm(self):
+        self.assertIsNone(self.test.get_etag(bucket_name="bucket", file_name="data.csv"))
+        path = self.test.fill(bucket_name="bucket", file_name="data.csv", etag="1", download=writer(b"abc"))
+        self.assertEqual("1", self.test.get_etag(bucket_name="bucket", file_name="data.csv"))
+
+        self.assertEqual(path, self.test.confirm(bucket_name="bucket", file_name="data.csv", etag="1"))
+        self.assertIsNone(self.test.confirm(bucket_name="bucket", file_name="data.csv", etag="2"))
+        self.assertEqual(1, self.test.stats()["not_modified"])
+
+    def test_fill_failed(self):
+        download = MagicMock(side_effect=IOError("connection dropped"))
+
+        with self.assertRaises(IOError):
+            self.test.fill(bucket_name="bucket", file_name="data.csv", etag="1", download=download)
+
+        self.assertEqual([], [name for _, _, names in os.walk(self.directory.name) for name in names])
+        self.assertIsNone(self.test.get(bucket_name="bucket", file_name="data.csv", etag="1"))
+
+    def test_eviction(self):
+        first = self.test.fill(bucket_name="bucket", file_name="one", etag="1", download=writer(b"123456"))
+        self.test.fill(bucket_name="bucket", file_name="two", etag="1", download=writer(b"123456"))
+
+        self.assertFalse(os.path.exists(first))
+        self.assertIsNone(self.test.get(bucket_name="bucket", file_name="one", etag="1"))
+        self.assertEqual(1, self.test.stats()["evictions"])
+
+    def test_fill_too_large(self):
+        download = MagicMock()
+
+        with self.assertRaises(ContentCacheError):
+            self.test.fill(bucket_name="bucket", file_name="big", etag="1", download=download, size=11)
+        download.assert_not_called()
+
+        # files found to be too large once downloaded are deleted straight away
+        with self.assertRaises(ContentCacheError):
+            self.test.fill(bucket_name="bucket", file_name="big", etag="1", download=writer(b"12345678901"))
+        self.assertEqual([], os.listdir(self.directory.name))
+        self.assertTrue(self.test.fits(size=10))
+        self.assertFalse(self.test.fits(size=11))
+
+    def test_invalidate_keys(self):
+        self.test.fill(bucket_name="bucket", file_name="a/one", etag="1", download=writer(b"1"))
+        self.test.fill(bucket_name="bucket", file_name="b/two", etag="1", download=writer(b"2"))
+
+        self.test.invalidate_keys(bucket_name="bucket", keys=["a/one"])
+        self.assertIsNone(self.test.get_checked(bucket_name="bucket", file_name="a/one"))
+        self.test.invalidate_prefix(bucket_name="bucket", prefix="b/")
+        self.assertIsNone(self.test.get_checked(bucket_name="bucket", file_name="b/two"))
+        # the files are still valid for their ETag
+        self.assertIsNotNone(self.test.get(bucket_name="bucket", file_name="a/one", etag="1"))
+
+    def test_shared_directory(self):
+        path = self.test.fill(bucket_name="bucket", file_name="one", etag="1", download=writer(b"1"))
+        with open(os.path.join(os.path.dirname(path), ContentCache.FILL_PREFIX + "left"), "wb"):
+            pass
+
+        other = ContentCache(directory=self.directory.name)
+
+        self.assertEqual(path, other.get(bucket_name="bucket", file_name="one", etag="1"))
+        self.assertEqual(["one"], os.listdir(os.path.dirname(path)))
+        second = other.fill(bucket_name="bucket", file_name="two", etag="1", download=writer(b"2"))
+        self.assertEqual(second, self.test.get(bucket_name="bucket", file_name="two", etag="1"))
+
+        self.test.clear()
+        self.assertEqual([], os.listdir(self.directory.name))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import os
+import tempfile
+from unittest import TestCase, main
+from unittest.mock import patch
+
+from monolith_filemanager.s3storage.copy_journal import CopyJournal
+
+
+class TestCopyJournal(TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "test.journal")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_record(self):
+        test = CopyJournal(path=self.path)
+        test.record("a/1")
+        test.record("a/2")
+
+        self.assertIn("a/1", test)
+        self.assertNotIn("a/3", test)
+
+        # a new journal on the same file resumes from the recorded keys
+        resumed = CopyJournal(path=self.path)
+        self.assertEqual({"a/1", "a/2"}, resumed.completed)
+        test.close()
+
+    def test_partial_line(self):
+        with open(self.path, "w") as journal_file:
+            journal_file.write("a/1\na/2")
+
+        test = CopyJournal(path=self.path)
+
+        self.assertEqual({"a/1"}, test.completed)
+
+    def test_remove(self):
+        test = CopyJournal(path=self.path)
+        test.record("a/1")
+
+        test.remove()
+
+        self.assertFalse(os.path.exists(self.path))
+        self.assertNotIn("a/1", test)
+
+    def test_for_copy(self):
+        with patch.object(CopyJournal, "JOURNAL_DIRECTORY", self.directory.name):
+            test = CopyJournal.for_copy(source="bucket/a", destination="bucket/b")
+            same = CopyJournal.for_copy(source="bucket/a", destination="bucket/b")
+            other = CopyJournal.for_copy(source="bucket/a", destination="bucket/c")
+
+        self.assertEqual(self.directory.name, os.path.dirname(test.path))
+        self.assertEqual(test.path, same.path)
+        self.assertNotEqual(test.path, other.path)
+
+    def test_in_progress(self):
+        with patch.object(CopyJournal, "JOURNAL_DIRECTORY", self.directory.name):
+            self.assertFalse(CopyJournal.in_progress(source="bucket/a", destination="bucket/b"))
+            test = CopyJournal.for_copy(source="bucket/a", destination="bucket/b")
+            test.record("a/1")
+            test.close()
+
+            self.assertTrue(CopyJournal.in_progress(source="bucket/a", destination="bucket/b"))
+            test.remove()
+            self.assertFalse(CopyJournal.in_progress(source="bucket/a", destination="bucket/b"))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,23 @@
 import datetime
+import io
+import os
+import tempfile
 from unittest import TestCase, main
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
+
+import boto3
+from botocore.exceptions import ClientError, ParamValidationError
+from monolith_filemanager.components.dir_entry import DirEntry
+from monolith_filemanager.s3storage.content_cache import ContentCache
+from monolith_filemanager.s3storage.errors import FileManagerError
 from monolith_filemanager.s3storage.file_manager import FileManager
+from monolith_filemanager.s3storage.listing_cache import ListingCache
+from monolith_filemanager.s3storage.metadata_cache import MetadataCache
+
+try:
+    from moto import mock_aws
+except ImportError:
+    from moto import mock_s3 as mock_aws
 
 
 class TestFileManager(TestCase):
@@ -20,9 +36,12 @@ class TestFileManager(TestCase):
         test = FileManager()
         test.client = MagicMock()
 
+        test.transfer_settings = MagicMock()
+
         test.upload_file_from_disk(bucket_name="test-bucket", file_name="foo/bar/saved-file", file_path="local/test-file")
 
-        test.client.upload_file.assert_called_once_with("local/test-file", "test-bucket", "foo/bar/saved-file")
+        test.client.upload_file.assert_called_once_with("local/test-file", "test-bucket", "foo/bar/saved-file",
+                                                        Config=test.transfer_settings.to_boto_config.return_value)
 
     def test_upload_serialised_data(self):
         test = FileManager()
@@ -42,6 +61,23 @@ class TestFileManager(TestCase):
 
         test.client.put_object.assert_called_once_with(Bucket="test-bucket", Key="test-file")
 
+    def test_upload_serialised_data_multipart(self):
+        test = FileManager()
+        test.client = MagicMock()
+        test.transfer_settings.multipart_threshold = 10
+
+        test.upload_serialised_data(bucket_name="test-bucket", file_name="test-file", data=b"small")
+        test.client.put_object.assert_called_once_with(Body=b"small", Bucket="test-bucket", Key="test-file")
+        test.client.upload_fileobj.assert_not_called()
+
+        test.client.reset_mock()
+        test.upload_serialised_data(bucket_name="test-bucket", file_name="test-file", data=b"larger than ten")
+        test.client.put_object.assert_not_called()
+        args, kwargs = test.client.upload_fileobj.call_args
+        self.assertEqual(b"larger than ten", args[0].read())
+        self.assertEqual(("test-bucket", "test-file"), args[1:])
+        self.assertEqual(10, kwargs["Config"].multipart_threshold)
+
     def test_download_file_to_disk(self):
         test = FileManager()
         test.client = MagicMock()
@@ -51,6 +87,93 @@ class TestFileManager(TestCase):
                                                           "test.txt",
                                                           "test path")
 
+    def test_download_file_to_cache(self):
+        test = FileManager()
+        test.client = MagicMock()
+        test.client.get_object.side_effect = lambda **kwargs: {"ETag": '"etag"', "ContentLength": 3,
+                                                                "Body": io.BytesIO(b"abc")}
+
+        with self.assertRaises(FileManagerError):
+            test.download_file_to_cache(bucket_name="test-bucket", file_name="a/test.txt")
+
+        with tempfile.TemporaryDirectory() as directory:
+            test.content_cache = ContentCache(directory=directory, ttl=30)
+            path = test.download_file_to_cache(bucket_name="test-bucket", file_name="a/test.txt")
+            self.assertEqual(path, test.download_file_to_cache(bucket_name="test-bucket", file_name="a/test.txt"))
+            with open(path, "rb") as file:
+                self.assertEqual(b"abc", file.read())
+            test.client.get_object.assert_called_once_with(Bucket="test-bucket", Key="a/test.txt")
+
+            # once the ttl is dropped the file is revalidated and the body is skipped on a 304
+            test.client.get_object.side_effect = ClientError({"Error": {"Code": "304"}}, "GetObject")
+            test.invalidate_keys(bucket_name="test-bucket", keys=["a/test.txt"])
+            self.assertEqual(path, test.download_file_to_cache(bucket_name="test-bucket", file_name="a/test.txt"))
+            test.client.get_object.assert_called_with(Bucket="test-bucket", Key="a/test.txt", IfNoneMatch='"etag"')
+            self.assertEqual(1, test.content_cache.stats()["not_modified"])
+
+            test.client.get_object.side_effect = lambda **kwargs: {"ETag": '"changed"', "ContentLength": 3,
+                                                                    "Body": io.BytesIO(b"def")}
+            test.invalidate_prefix(bucket_name="test-bucket", prefix="a/")
+            new_path = test.download_file_to_cache(bucket_name="test-bucket", file_name="a/test.txt")
+            with open(new_path, "rb") as file:
+                self.assertEqual(b"def", file.read())
+
+            test.client.get_object.side_effect = ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+            with self.assertRaises(FileManagerError):
+                test.download_file_to_cache(bucket_name="test-bucket", file_name="b/missing.txt")
+
+    def test_download_file_to_cache_too_large(self):
+        test = FileManager()
+        test.client = MagicMock()
+        body = io.BytesIO(b"abcdef")
+        test.client.get_object.return_value = {"ETag": '"etag"', "ContentLength": 6, "Body": body}
+
+        with tempfile.TemporaryDirectory() as directory:
+            test.content_cache = ContentCache(directory=os.path.join(directory, "cache"), ttl=30, max_bytes=5)
+            with self.assertRaises(FileManagerError):
+                test.download_file_to_cache(bucket_name="test-bucket", file_name="test.txt")
+            self.assertTrue(body.closed)
+
+            test.client.get_object.return_value["Body"] = io.BytesIO(b"abcdef")
+            file_path = os.path.join(directory, "test.txt")
+            self.assertEqual(file_path, test.download_file_to_cache(bucket_name="test-bucket", file_name="test.txt",
+                                                                    file_path=file_path))
+            with open(file_path, "rb") as file:
+                self.assertEqual(b"abcdef", file.read())
+            self.assertEqual([], os.listdir(test.content_cache.directory))
+
+    def test_download_file_if_modified(self):
+        test = FileManager()
+        test.client = MagicMock()
+        modified = datetime.datetime(2021, 5, 1, tzinfo=datetime.timezone.utc)
+        test.client.get_object.return_value = {"ETag": '"etag"', "ContentLength": 3, "Body": io.BytesIO(b"abc"),
+                                               "LastModified": modified}
+
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "test.txt")
+            self.assertTrue(test.download_file_if_modified(bucket_name="test-bucket", file_name="test.txt",
+                                                           file_path=file_path))
+            test.client.get_object.assert_called_once_with(Bucket="test-bucket", Key="test.txt")
+            self.assertEqual(modified.timestamp(), os.path.getmtime(file_path))
+
+            test.client.get_object.side_effect = ClientError({"Error": {"Code": "304"}}, "GetObject")
+            self.assertFalse(test.download_file_if_modified(bucket_name="test-bucket", file_name="test.txt",
+                                                            file_path=file_path))
+            test.client.get_object.assert_called_with(Bucket="test-bucket", Key="test.txt",
+                                                      IfModifiedSince=modified)
+
+            # a failed download leaves the previous copy in place
+            body = MagicMock()
+            body.read.side_effect = OSError("connection reset")
+            test.client.get_object.side_effect = None
+            test.client.get_object.return_value = {"ETag": '"changed"', "ContentLength": 3, "Body": body,
+                                                   "LastModified": modified}
+            with self.assertRaises(OSError):
+                test.download_file_if_modified(bucket_name="test-bucket", file_name="test.txt", file_path=file_path)
+            self.assertEqual(["test.txt"], os.listdir(directory))
+            with open(file_path, "rb") as file:
+                self.assertEqual(b"abc", file.read())
+
     def test_download_file_to_memory(self):
         test = FileManager()
         test.client = MagicMock()
@@ -61,6 +184,68 @@ class TestFileManager(TestCase):
         test.client.get_object.assert_called_once_with(Bucket='test-bucket', Key='test.txt')
         self.assertEqual("test", out_come)
 
+    def test_put_if_absent(self):
+        test = FileManager()
+        test.client = MagicMock()
+
+        self.assertTrue(test.put_if_absent(bucket_name="test-bucket", file_name="a/1", data=b"data"))
+        test.client.put_object.assert_called_once_with(Body=b"data", Bucket="test-bucket", Key="a/1",
+                                                       IfNoneMatch="*")
+
+        test.client.put_object.side_effect = ClientError({"Error": {"Code": "PreconditionFailed"}}, "PutObject")
+        self.assertFalse(test.put_if_absent(bucket_name="test-bucket", file_name="a/1"))
+
+        test.client.put_object.side_effect = ClientError({"Error": {"Code": "AccessDenied"}}, "PutObject")
+        with self.assertRaises(ClientError):
+            test.put_if_absent(bucket_name="test-bucket", file_name="a/1")
+
+    def test_put_if_absent_fallback(self):
+        test = FileManager()
+        test.client = MagicMock()
+        test.file_exists = MagicMock(return_value=False)
+        test.client.put_object.side_effect = [ParamValidationError(report="IfNoneMatch"), None]
+
+        self.assertTrue(test.put_if_absent(bucket_name="test-bucket", file_name="a/1"))
+        test.client.put_object.assert_called_with(Body=b"", Bucket="test-bucket", Key="a/1")
+
+        test.file_exists.return_value = True
+        test.client.put_object.side_effect = ParamValidationError(report="IfNoneMatch")
+        self.assertFalse(test.put_if_absent(bucket_name="test-bucket", file_name="a/1"))
+
+    def test_download_file_to_buffer(self):
+        test = FileManager()
+        test.client = MagicMock()
+        test.transfer_settings = MagicMock(part_size=4, max_concurrency=3)
+        data = b"0123456789"
+        test.client.head_object.return_value = {"ContentLength": len(data)}
+
+        def get_object(Bucket, Key, Range):
+            start, end = [int(i) for i in Range.replace("bytes=", "").split("-")]
+            body = MagicMock()
+            body.iter_chunks.return_value = [data[start:end + 1]]
+            return {"Body": body}
+
+        test.client.get_object.side_effect = get_object
+
+        out_come = test.download_file_to_buffer(bucket_name="test-bucket", file_name="test.txt")
+
+        self.assertIsInstance(out_come, memoryview)
+        self.assertEqual(data, out_come.tobytes())
+        test.client.head_object.assert_called_once_with(Bucket="test-bucket", Key="test.txt")
+        self.assertEqual(sorted(["bytes=0-3", "bytes=4-7", "bytes=8-9"]),
+                         sorted(i[1]["Range"] for i in test.client.get_object.call_args_list))
+
+    def test_download_range_into(self):
+        test = FileManager()
+        test.client = MagicMock()
+        test.client.get_object.return_value["Body"].iter_chunks.return_value = [b"ab"]
+        buffer = bytearray(3)
+
+        with self.assertRaises(FileManagerError):
+            test.download_range_into(bucket_name="test-bucket", file_name="test.txt", buffer=memoryview(buffer),
+                                     start=5)
+        test.client.get_object.assert_called_once_with(Bucket="test-bucket", Key="test.txt", Range="bytes=5-7")
+
     def test_delete_file(self):
         test = FileManager()
         test.client = MagicMock()
@@ -77,6 +262,138 @@ class TestFileManager(TestCase):
         mock_bucket.objects.filter.assert_called_once_with(Prefix="test.txt")
         mock_objects.delete.assert_called_once_with()
 
+    def test_delete_keys(self):
+        test = FileManager()
+        test.client = MagicMock()
+        test.transfer_settings.max_concurrency = 2
+        batches = []
+
+        def delete_objects(Bucket, Delete):
+            keys = [i["Key"] for i in Delete["Objects"]]
+            batches.append(keys)
+            self.assertTrue(Delete["Quiet"])
+            if "key-5" in keys:
+                return {"Errors": [{"Key": "key-5", "Code": "AccessDenied", "Message": "Access Denied"}]}
+            return {}
+
+        test.client.delete_objects.side_effect = delete_objects
+
+        out_come = test.delete_keys(bucket_name="test-bucket", keys=("key-{}".format(i) for i in range(2500)))
+
+        self.assertEqual({"key-5": "AccessDenied: Access Denied"}, out_come)
+        self.assertEqual([1000, 1000, 500], sorted([len(i) for i in batches], reverse=True))
+        self.assertEqual(2500, len(set(key for batch in batches for key in batch)))
+
+        test.client.delete_objects.side_effect = ClientError({"Error": {"Code": "500"}}, "DeleteObjects")
+        out_come = test.delete_keys(bucket_name="test-bucket", keys=["one", "two"])
+        self.assertEqual(["one", "two"], sorted(out_come.keys()))
+
+    def test_delete_prefixes(self):
+        test = FileManager()
+        test.list_keys = MagicMock()
+        test.delete_keys = MagicMock()
+
+        out_come = test.delete_prefixes(bucket_name="test-bucket", prefixes=["b/", "a", "a/c", "b/"])
+
+        test.list_keys.assert_called_once_with(bucket_name="test-bucket", prefixes=["a", "b/"])
+        test.delete_keys.assert_called_once_with(bucket_name="test-bucket", keys=test.list_keys.return_value)
+        self.assertEqual(test.delete_keys.return_value, out_come)
+
+    def test_list_keys(self):
+        test = FileManager()
+        test.client = MagicMock()
+        paginator = test.client.get_paginator.return_value
+        paginator.paginate.side_effect = [[{"Contents": [{"Key": "a/1"}, {"Key": "a/2"}]}, {}],
+                                          [{"Contents": [{"Key": "b"}]}]]
+
+        out_come = list(test.list_keys(bucket_name="test-bucket", prefixes=["a/", "b"]))
+
+        self.assertEqual(["a/1", "a/2", "b"], out_come)
+        test.client.get_paginator.assert_called_once_with("list_objects_v2")
+        paginator.paginate.assert_any_call(Bucket="test-bucket", Prefix="a/")
+        paginator.paginate.assert_any_call(Bucket="test-bucket", Prefix="b")
+
+    def test_list_prefix(self):
+        test = FileManager()
+        test.client = MagicMock()
+        paginator = test.client.get_paginator.return_value
+        paginator.paginate.return_value = [{"Contents": [{"Key": "a/1"}], "CommonPrefixes": [{"Prefix": "a/b/"}]},
+                                           {"Contents": [{"Key": "a/2"}]}]
+
+        out_come = list(test.list_prefix(bucket_name="test-bucket", prefix="a/", delimiter="/"))
+
+        self.assertEqual([("a/1", False), ("a/b/", True), ("a/2", False)], out_come)
+        paginator.paginate.assert_called_once_with(Bucket="test-bucket", Prefix="a/", Delimiter="/")
+
+        list(test.list_prefix(bucket_name="test-bucket", prefix="a/"))
+        paginator.paginate.assert_called_with(Bucket="test-bucket", Prefix="a/")
+
+    def test_copy_object(self):
+        test = FileManager()
+        test.client = MagicMock()
+
+        test.copy_object(bucket_name="test-bucket", file_name="a/1", new_bucket_name="new-bucket",
+                         new_file_name="b/1", size=10)
+
+        test.client.head_object.assert_not_called()
+        test.client.copy_object.assert_called_once_with(CopySource={"Bucket": "test-bucket", "Key": "a/1"},
+                                                        Bucket="new-bucket", Key="b/1")
+
+    def test_copy_object_multipart(self):
+        test = FileManager()
+        test.client = MagicMock()
+        test.MULTIPART_COPY_THRESHOLD = 10
+        test.COPY_PART_SIZE = 4
+        test.client.head_object.return_value = {"ContentLength": 10, "ContentType": "text/csv", "Metadata": {}}
+        test.client.create_multipart_upload.return_value = {"UploadId": "upload"}
+        test.client.upload_part_copy.side_effect = lambda **kwargs: {
+            "CopyPartResult": {"ETag": kwargs["CopySourceRange"]}}
+
+        test.copy_object(bucket_name="test-bucket", file_name="a/1", new_bucket_name="new-bucket",
+                         new_file_name="b/1", size=11)
+
+        test.client.create_multipart_upload.assert_called_once_with(Bucket="new-bucket", Key="b/1", Metadata={},
+                                                                    ContentType="text/csv")
+        test.client.complete_multipart_upload.assert_called_once_with(
+            Bucket="new-bucket", Key="b/1", UploadId="upload",
+            MultipartUpload={"Parts": [{"PartNumber": 1, "ETag": "bytes=0-3"},
+                                       {"PartNumber": 2, "ETag": "bytes=4-7"},
+                                       {"PartNumber": 3, "ETag": "bytes=8-10"}]})
+
+        test.client.upload_part_copy.side_effect = ClientError({"Error": {"Code": "500"}}, "UploadPartCopy")
+        with self.assertRaises(ClientError):
+            test.copy_object(bucket_name="test-bucket", file_name="a/1", new_bucket_name="new-bucket",
+                             new_file_name="b/1", size=11)
+        test.client.abort_multipart_upload.assert_called_once_with(Bucket="new-bucket", Key="b/1",
+                                                                   UploadId="upload")
+
+    def test_copy_prefix(self):
+        test = FileManager()
+        test.client = MagicMock()
+        test.copy_object = MagicMock()
+        paginator = test.client.get_paginator.return_value
+        paginator.paginate.return_value = [{"Contents": [{"Key": "a/1", "Size": 1}, {"Key": "a/2", "Size": 2}]},
+                                           {"Contents": [{"Key": "a/b/3", "Size": 3}]}]
+        journal = MagicMock()
+        journal.__contains__.side_effect = lambda key: key == "a/2"
+
+        out_come = test.copy_prefix(bucket_name="test-bucket", prefix="a/", new_bucket_name="new-bucket",
+                                    new_prefix="c/", journal=journal)
+
+        self.assertEqual(["a/1", "a/2", "a/b/3"], out_come)
+        paginator.paginate.assert_called_once_with(Bucket="test-bucket", Prefix="a/")
+        self.assertEqual(2, test.copy_object.call_count)
+        test.copy_object.assert_any_call(bucket_name="test-bucket", file_name="a/1", new_bucket_name="new-bucket",
+                                         new_file_name="c/1", size=1)
+        test.copy_object.assert_any_call(bucket_name="test-bucket", file_name="a/b/3",
+                                         new_bucket_name="new-bucket", new_file_name="c/b/3", size=3)
+        self.assertEqual({"a/1", "a/b/3"}, {i[0][0] for i in journal.record.call_args_list})
+
+        test.copy_object.side_effect = ClientError({"Error": {"Code": "500"}}, "CopyObject")
+        with self.assertRaises(ClientError):
+            test.copy_prefix(bucket_name="test-bucket", prefix="a/", new_bucket_name="new-bucket",
+                             new_prefix="c/")
+
     def test_file_exists(self):
         test = FileManager()
         test.client = MagicMock()
@@ -85,6 +402,69 @@ class TestFileManager(TestCase):
 
         test.client.head_object.assert_called_once_with(Bucket="test-bucket", Key="test.txt")
 
+    def test_file_exists_cached(self):
+        test = FileManager()
+        test.client = MagicMock()
+        test.metadata_cache = MetadataCache()
+        test.client.head_object.side_effect = ClientError({"Error": {"Code": "404"}}, "HeadObject")
+
+        self.assertFalse(test.file_exists(bucket_name="test-bucket", file_name="test.txt"))
+        self.assertFalse(test.file_exists(bucket_name="test-bucket", file_name="test.txt"))
+        test.client.head_object.assert_called_once()
+
+        # the negative entry is dropped once the file is written
+        test.upload_serialised_data(bucket_name="test-bucket", file_name="test.txt", data=b"data")
+        test.client.head_object.side_effect = None
+        test.client.head_object.return_value = {"ContentLength": 4, "ETag": "etag",
+                                                "LastModified": datetime.datetime(2020, 1, 1)}
+        self.assertTrue(test.file_exists(bucket_name="test-bucket", file_name="test.txt"))
+
+        test.client.head_object.side_effect = ClientError({"Error": {"Code": "403"}}, "HeadObject")
+        with self.assertRaises(ClientError):
+            test.file_exists(bucket_name="test-bucket", file_name="other.txt")
+
+    def test_stat_objects(self):
+        test = FileManager()
+        test.client = MagicMock()
+        timestamp = datetime.datetime(2020, 1, 1)
+        paginator = test.client.get_paginator.return_value
+        paginator.paginate.return_value = [
+            {"Contents": [{"Key": "a/1", "LastModified": timestamp, "Size": 1, "ETag": "one"},
+                          {"Key": "a/2", "LastModified": timestamp, "Size": 2, "ETag": "two"}]},
+            {"Contents": [{"Key": "a/4", "LastModified": timestamp, "Size": 4, "ETag": "four"}]},
+            {"Contents": [{"Key": "a/5", "LastModified": timestamp, "Size": 5, "ETag": "five"}]},
+        ]
+
+        def head_object(Bucket, Key):
+            if Key == "b/1":
+                return {"LastModified": timestamp, "ContentLength": 10, "ETag": "b"}
+            raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+
+        test.client.head_object.side_effect = head_object
+
+        out_come = test.stat_objects(bucket_name="test-bucket", keys=["a/1", "a/3", "a/4", "b/1", "c/", "a/1"])
+
+        self.assertEqual({"a/1": {"last_modified": "2020-01-01 00:00:00", "size": 1, "etag": "one"},
+                          "a/3": None,
+                          "a/4": {"last_modified": "2020-01-01 00:00:00", "size": 4, "etag": "four"},
+                          "b/1": {"last_modified": "2020-01-01 00:00:00", "size": 10, "etag": "b"},
+                          "c/": None}, out_come)
+        paginator.paginate.assert_called_once_with(Bucket="test-bucket", Prefix="a/", Delimiter="/")
+        self.assertEqual({"b/1", "c/"}, {i[1]["Key"] for i in test.client.head_object.call_args_list})
+
+    def test_stat_objects_cached(self):
+        test = FileManager()
+        test.client = MagicMock()
+        test.metadata_cache = MetadataCache()
+        test.metadata_cache.put_stat(bucket_name="test-bucket", file_name="a/1", stat=None)
+        test.client.head_object.return_value = {"ContentLength": 2}
+
+        out_come = test.stat_objects(bucket_name="test-bucket", keys=["a/1", "a/2"])
+
+        self.assertEqual({"a/1": None, "a/2": {"last_modified": None, "size": 2, "etag": None}}, out_come)
+        test.client.head_object.assert_called_once_with(Bucket="test-bucket", Key="a/2")
+        self.assertIn(("test-bucket", "a/2"), test.metadata_cache)
+
     def test_ls_folder(self):
         test = FileManager()
         test.client = MagicMock()
@@ -128,6 +508,129 @@ class TestFileManager(TestCase):
         )
         self.assertEqual(expected_out_come, out_come)
 
+    def test_list_folder_page(self):
+        test = FileManager()
+        test.client = MagicMock()
+        timestamp = datetime.datetime(2020, 1, 1)
+        test.client.list_objects_v2.return_value = {
+            "CommonPrefixes": [{"Prefix": "some/folder/sub%20dir/"}],
+            "Contents": [{"Key": "some/folder/", "LastModified": timestamp, "Size": 0},
+                         {"Key": "some/folder/alpha", "LastModified": timestamp, "Size": 100}],
+            "IsTruncated": True, "NextContinuationToken": "token-2"}
+
+        entries, token = test.list_folder_page(bucket_name="test-bucket", file_name="some/folder", page_size=2)
+
+        self.assertEqual([DirEntry(name="sub dir", is_dir=True),
+                          DirEntry(name="alpha", is_dir=False, size=100, last_modified="2020-01-01 00:00:00")],
+                         entries)
+        self.assertEqual("token-2", token)
+        test.client.list_objects_v2.assert_called_once_with(Bucket="test-bucket", Prefix="some/folder/",
+                                                            Delimiter="/", MaxKeys=2)
+
+        test.client.list_objects_v2.return_value = {"IsTruncated": False}
+        entries, token = test.list_folder_page(bucket_name="test-bucket", file_name="some/folder/",
+                                               continuation_token="token-2")
+        self.assertEqual(([], None), (entries, token))
+        test.client.list_objects_v2.assert_called_with(Bucket="test-bucket", Prefix="some/folder/", Delimiter="/",
+                                                       MaxKeys=1000, ContinuationToken="token-2")
+
+    def test_iter_folder(self):
+        test = FileManager()
+        test.list_folder_page = MagicMock()
+        test.list_folder_page.side_effect = [([DirEntry(name="a", is_dir=True)], "token"),
+                                             ([DirEntry(name="b", is_dir=True)], None)]
+
+        out_come = test.iter_folder(bucket_name="test-bucket", file_name="folder")
+
+        self.assertEqual(DirEntry(name="a", is_dir=True), next(out_come))
+        test.list_folder_page.assert_called_once_with(bucket_name="test-bucket", file_name="folder",
+                                                      continuation_token=None)
+        self.assertEqual([DirEntry(name="b", is_dir=True)], list(out_come))
+        test.list_folder_page.assert_called_with(bucket_name="test-bucket", file_name="folder",
+                                                 continuation_token="token")
+
+    def test_ls_folder_cached(self):
+        test = FileManager()
+        test.client = MagicMock()
+        test.resource = MagicMock()
+        test.listing_cache = ListingCache()
+        paginator = test.client.get_paginator.return_value
+        paginator.paginate.return_value = [{'CommonPrefixes': [{'Prefix': 'some/folder/foo/'}]}]
+
+        out_come = test.ls_folder(bucket_name="test-bucket", file_name="some/folder")
+        out_come[1].append("mutated")
+        cached_out_come = test.ls_folder(bucket_name="test-bucket", file_name="some/folder/")
+
+        self.assertEqual(({}, ["foo"]), cached_out_come)
+        paginator.paginate.assert_called_once()
+        self.assertEqual(1, test.listing_cache.hits)
+        self.assertEqual(1, test.listing_cache.misses)
+
+        # writes below the folder invalidate its listing
+        test.upload_serialised_data(bucket_name="test-bucket", file_name="some/folder/foo/new.txt", data=b"new")
+        test.ls_folder(bucket_name="test-bucket", file_name="some/folder")
+        self.assertEqual(2, paginator.paginate.call_count)
+
+        test.delete_file(bucket_name="test-bucket", file_name="some")
+        test.ls_folder(bucket_name="test-bucket", file_name="some/folder")
+        self.assertEqual(3, paginator.paginate.call_count)
+
+        test.copy_object(bucket_name="test-bucket", file_name="a", new_bucket_name="test-bucket",
+                         new_file_name="some/folder/a", size=1)
+        test.ls_folder(bucket_name="test-bucket", file_name="some/folder")
+        self.assertEqual(4, paginator.paginate.call_count)
+
+        test.delete_keys(bucket_name="test-bucket", keys=["some/folder/a"])
+        test.ls_folder(bucket_name="test-bucket", file_name="some/folder")
+        self.assertEqual(5, paginator.paginate.call_count)
+
+
+
+@mock_aws()
+class TestFileManagerMoto(TestCase):
+    """
+    Runs the downloads pinned to an ETag against a moto s3 bucket.
+    """
+    def setUp(self) -> None:
+        self.environment = patch.dict(os.environ, {"AWS_ACCESS_KEY_ID": "testing", "AWS_SECRET_ACCESS_KEY": "testing",
+                                                   "AWS_DEFAULT_REGION": "us-east-1"})
+        self.environment.start()
+        self.directory = tempfile.TemporaryDirectory()
+        self.test = FileManager()
+        self.test.client = boto3.client("s3")
+        self.test.client.create_bucket(Bucket="bucket")
+        self.test.client.put_object(Bucket="bucket", Key="data.bin", Body=b"0123456789")
+        self.etag = self.test.client.head_object(Bucket="bucket", Key="data.bin")["ETag"]
+        self.test.transfer_settings.part_size = 4
+        self.test.transfer_settings.multipart_threshold = 2
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+        self.environment.stop()
+
+    def test_download_file_to_disk_if_match(self):
+        file_path = os.path.join(self.directory.name, "data.bin")
+
+        self.test.download_file_to_disk(bucket_name="bucket", file_name="data.bin", file_path=file_path,
+                                        if_match=self.etag)
+
+        with open(file_path, "rb") as file:
+            self.assertEqual(b"0123456789", file.read())
+
+        self.test.client.put_object(Bucket="bucket", Key="data.bin", Body=b"changed")
+        with self.assertRaises(ClientError):
+            self.test.download_file_to_disk(bucket_name="bucket", file_name="data.bin", file_path=file_path,
+                                            if_match=self.etag)
+
+    def test_download_file_to_cache_large(self):
+        self.test.content_cache = ContentCache(directory=os.path.join(self.directory.name, "cache"), ttl=30)
+
+        path = self.test.download_file_to_cache(bucket_name="bucket", file_name="data.bin")
+
+        with open(path, "rb") as file:
+            self.assertEqual(b"0123456789", file.read())
+        self.assertEqual(path, self.test.download_file_to_cache(bucket_name="bucket", file_name="data.bin"))
+
 
 if __name__ == "__main__":
     main()
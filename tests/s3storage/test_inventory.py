@@ -0,0 +1,100 @@
+import datetime
+from unittest import TestCase, main
+
+from monolith_filemanager.s3storage.inventory import BucketInventory
+
+
+class FakeClient:
+
+    def __init__(self, keys):
+        self.objects = {key: 10 for key in keys}
+        self.calls = []
+
+    def list_objects_v2(self, Bucket, Prefix, MaxKeys, Delimiter=None, StartAfter=None, ContinuationToken=None):
+        self.calls.append({"Prefix": Prefix, "Delimiter": Delimiter, "StartAfter": StartAfter})
+        start = StartAfter if ContinuationToken is None else ContinuationToken
+        contents = []
+        prefixes = []
+        for key in sorted(self.objects):
+            if not key.startswith(Prefix) or (start is not None and key <= start):
+                continue
+            rest = key[len(Prefix):]
+            if Delimiter is not None and Delimiter in rest:
+                common_prefix = Prefix + rest[:rest.index(Delimiter) + 1]
+                if common_prefix not in prefixes:
+                    prefixes.append(common_prefix)
+                continue
+            contents.append({"Key": key, "Size": self.objects[key], "ETag": '"etag"',
+                             "LastModified": datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)})
+        page = {"Contents": contents[:MaxKeys], "CommonPrefixes": [{"Prefix": p} for p in prefixes]}
+        if len(contents) > MaxKeys:
+            page["IsTruncated"] = True
+            page["NextContinuationToken"] = contents[MaxKeys - 1]["Key"]
+        return page
+
+
+class TestBucketInventory(TestCase):
+
+    def setUp(self) -> None:
+        self.keys = ["top.txt", "a/", "a/one.txt", "a/two.txt", "a/b/three.txt", "a/b/c/four.txt", "d/five.csv",
+                     "d/e/six.csv"]
+        self.client = FakeClient(keys=self.keys)
+        self.test = BucketInventory(client=self.client, bucket_name="bucket", path=":memory:", max_concurrency=4)
+        self.test.PAGE_SIZE = 2
+
+    def tearDown(self) -> None:
+        self.test.close()
+
+    def test_build(self):
+        self.assertFalse(self.test.built)
+        self.test.build()
+
+        self.assertTrue(self.test.built)
+        self.assertEqual(sorted(self.keys), list(self.test.keys()))
+        self.assertEqual(len(self.keys), len(self.test))
+
+        del self.client.objects["a/two.txt"]
+        self.test.build()
+        self.assertNotIn("a/two.txt", list(self.test.keys()))
+
+    def test_update(self):
+        self.test.build()
+        self.client.objects["a/zz.txt"] = 5
+        self.client.objects["d/e/a.csv"] = 5
+        self.client.calls = []
+
+        self.test.update()
+
+        self.assertIn("a/zz.txt", list(self.test.keys()))
+        # keys sorting before the last indexed key of their shard are only picked up by a build
+        self.assertNotIn("d/e/a.csv", list(self.test.keys()))
+        self.assertIn({"Prefix": "d/e/", "Delimiter": None, "StartAfter": "d/e/six.csv"}, self.client.calls)
+
+    def test_ls(self):
+        self.test.build()
+
+        files, dirs = self.test.ls(prefix="a")
+
+        self.assertEqual(["b"], dirs)
+        self.assertEqual({"one.txt": {"last_modified": "2020-01-01 00:00:00", "size": 10},
+                          "two.txt": {"last_modified": "2020-01-01 00:00:00", "size": 10}}, files)
+        self.assertEqual((["top.txt"], ["a", "d"]), (list(self.test.ls()[0]), self.test.ls()[1]))
+
+    def test_search(self):
+        self.test.build()
+
+        self.assertEqual(["a/b/c/four.txt", "a/b/three.txt"], self.test.search(file_pattern="a/b/**.txt"))
+        self.assertEqual(["d/e/six.csv", "d/five.csv"], self.test.search(file_pattern="d/**.csv"))
+        self.assertEqual([], self.test.search(file_pattern="*.csv"))
+
+    def test_du(self):
+        self.test.build()
+
+        self.assertEqual((2, 20), self.test.du(prefix="a/b"))
+        self.assertEqual((5, 50), self.test.du(prefix="a/"))
+        self.assertEqual((8, 80), self.test.du())
+        self.assertEqual((0, 0), self.test.du(prefix="missing/"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+from unittest import TestCase, main
+
+from monolith_filemanager.s3storage.listing_cache import ListingCache
+
+
+class TestListingCache(TestCase):
+
+    def setUp(self) -> None:
+        self.test = ListingCache()
+        for prefix in ["", "a", "a/b", "a/b/c", "a/d", "b"]:
+            self.test.put_listing(bucket_name="bucket", prefix=prefix, files={}, dirs=[])
+        self.test.put_listing(bucket_name="other", prefix="a", files={}, dirs=[])
+
+    def cached(self, bucket_name: str = "bucket") -> list:
+        return sorted(key[1] for key in self.test._entries if key[0] == bucket_name)
+
+    def test_get_listing(self):
+        self.test.put_listing(bucket_name="bucket", prefix="a", files={"f": {"size": 1}}, dirs=["b"])
+
+        out_come = self.test.get_listing(bucket_name="bucket", prefix="a/")
+        out_come[0]["f"]["size"] = 2
+
+        self.assertEqual(({"f": {"size": 1}}, ["b"]), self.test.get_listing(bucket_name="bucket", prefix="a"))
+        self.assertIsNone(self.test.get_listing(bucket_name="bucket", prefix="missing"))
+
+    def test_invalidate_keys(self):
+        self.test.invalidate_keys(bucket_name="bucket", keys=["a/b/file.txt"])
+
+        self.assertEqual(["a/b/c/", "a/d/", "b/"], self.cached())
+        self.assertEqual(["a/"], self.cached("other"))
+
+    def test_invalidate_prefix(self):
+        self.test.invalidate_prefix(bucket_name="bucket", prefix="a/b")
+
+        self.assertEqual(["a/d/", "b/"], self.cached())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+import io
+import zipfile
+from unittest import TestCase, main
+from unittest.mock import MagicMock, patch
+
+from monolith_filemanager.s3storage.errors import FileManagerError
+from monolith_filemanager.s3storage.s3_file import S3ReadFile, S3WriteFile
+
+
+class MockEngine:
+
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+        self.requests = []
+        self.client = MagicMock()
+        self.client.head_object.return_value = {"ContentLength": len(data), "ETag": '"etag"'}
+
+    def download_range_into(self, bucket_name, file_name, buffer, start, etag=None):
+        self.requests.append((start, start + len(buffer)))
+        buffer[:] = self.data[start:start + len(buffer)]
+
+
+class TestS3ReadFile(TestCase):
+
+    def setUp(self) -> None:
+        self.data = bytes(range(256)) * 4
+        self.engine = MockEngine(data=self.data)
+
+    def test___init__(self):
+        test = S3ReadFile(engine=self.engine, bucket_name="bucket", file_name="key.bin", block_size=100)
+        self.engine.client.head_object.assert_called_once_with(Bucket="bucket", Key="key.bin")
+        self.assertEqual(len(self.data), test.size)
+        self.assertEqual('"etag"', test.etag)
+        self.assertEqual("s3://bucket/key.bin", test.name)
+
+        self.engine.client.reset_mock()
+        S3ReadFile(engine=self.engine, bucket_name="bucket", file_name="key.bin", size=10)
+        self.engine.client.head_object.assert_not_called()
+
+        with self.assertRaises(FileManagerError):
+            S3ReadFile(engine=self.engine, bucket_name="bucket", file_name="key.bin", size=10, block_size=0)
+
+    def test_seek_and_read(self):
+        test = S3ReadFile(engine=self.engine, bucket_name="bucket", file_name="key.bin", block_size=100,
+                          read_ahead=0)
+        test.seek(150)
+        self.assertEqual(self.data[150:160], test.read(10))
+        self.assertEqual(160, test.tell())
+        self.assertEqual([(100, 200)], self.engine.requests)
+
+        test.seek(-4, io.SEEK_END)
+        self.assertEqual(self.data[-4:], test.read(100))
+        self.assertEqual(b"", test.read(10))
+
+        test.seek(-30, io.SEEK_CUR)
+        self.assertEqual(self.data[-30:], test.read())
+
+        with self.assertRaises(ValueError):
+            test.seek(-1)
+
+    def test_block_cache(self):
+        test = S3ReadFile(engine=self.engine, bucket_name="bucket", file_name="key.bin", block_size=100,
+                          read_ahead=0, max_blocks=2)
+        test.seek(0)
+        test.read(10)
+        test.seek(20)
+        test.read(10)
+        self.assertEqual(1, test.misses)
+        self.assertEqual(1, test.hits)
+
+        test.seek(500)
+        test.read(1)
+        test.seek(900)
+        test.read(1)
+        test.seek(0)
+        test.read(1)
+        # block 0 was evicted by blocks 5 and 9
+        self.assertEqual(4, test.misses)
+        self.assertEqual(4, len(self.engine.requests))
+
+    def test_read_ahead(self):
+        test = S3ReadFile(engine=self.engine, bucket_name="bucket", file_name="key.bin", block_size=100,
+                          read_ahead=3)
+        test.read(10)
+        # first read is not sequential so no read ahead
+        self.assertEqual([(0, 100)], self.engine.requests)
+        test.seek(100)
+        test.read(10)
+        self.assertEqual([(0, 100), (100, 500)], self.engine.requests)
+        test.seek(300)
+        self.assertEqual(self.data[300:310], test.read(10))
+        self.assertEqual(2, len(self.engine.requests))
+
+    def test_read_ahead_more_than_max_blocks(self):
+        test = S3ReadFile(engine=self.engine, bucket_name="bucket", file_name="key.bin", block_size=100,
+                          read_ahead=4, max_blocks=2)
+        for start in range(0, 400, 10):
+            self.assertEqual(self.data[start:start + 10], test.read(10))
+        # the read ahead is cut down to the blocks the cache can hold
+        self.assertEqual([(0, 100), (100, 300), (300, 500)], self.engine.requests)
+        self.assertEqual(2, len(test._blocks))
+
+    def test_readinto_direct(self):
+        test = S3ReadFile(engine=self.engine, bucket_name="bucket", file_name="key.bin", block_size=100)
+        buffer = bytearray(350)
+        self.assertEqual(350, test.readinto(buffer))
+        self.assertEqual(self.data[:350], bytes(buffer))
+        # three full blocks straight into the buffer, the partial block through the cache with read ahead
+        self.assertEqual([(0, 300), (300, 800)], self.engine.requests)
+        self.assertEqual([3, 4, 5, 6, 7], list(test._blocks.keys()))
+
+    def test_prefetch(self):
+        test = S3ReadFile(engine=self.engine, bucket_name="bucket", file_name="key.bin", block_size=100)
+        test.prefetch(start=250, end=420)
+        self.assertEqual([(200, 500)], self.engine.requests)
+        test.prefetch(start=300, end=400)
+        self.assertEqual(1, len(self.engine.requests))
+        test.seek(260)
+        self.assertEqual(self.data[260:450], test.read(190))
+        self.assertEqual(1, len(self.engine.requests))
+
+    def test_prefetch_ranges(self):
+        test = S3ReadFile(engine=self.engine, bucket_name="bucket", file_name="key.bin", block_size=100)
+        test.prefetch(start=0, end=100)
+
+        test.prefetch_ranges([(50, 150), (420, 450), (160, 190), (900, 2000)], max_concurrency=4)
+
+        self.assertEqual([(0, 100), (100, 200), (400, 500), (900, 1024)], sorted(self.engine.requests))
+        test.seek(120)
+        self.assertEqual(self.data[120:190], test.read(70))
+        test.seek(910)
+        self.assertEqual(self.data[910:], test.read())
+        self.assertEqual(4, len(self.engine.requests))
+
+    def test_zip_member(self):
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w") as zip_file:
+            zip_file.writestr("big.bin", b"x" * 5000)
+            zip_file.writestr("small.txt", b"hello")
+        engine = MockEngine(data=archive.getvalue())
+        test = S3ReadFile(engine=engine, bucket_name="bucket", file_name="archive.zip", block_size=512)
+
+        with zipfile.ZipFile(test) as zip_file:
+            self.assertEqual(b"hello", zip_file.read("small.txt"))
+        fetched = sum(end - start for start, end in engine.requests)
+        self.assertLess(fetched, len(archive.getvalue()))
+
+    def test_close(self):
+        test = S3ReadFile(engine=self.engine, bucket_name="bucket", file_name="key.bin")
+        test.read(1)
+        test.close()
+        self.assertTrue(test.closed)
+        with self.assertRaises(ValueError):
+            test.read(1)
+
+
+class TestS3WriteFile(TestCase):
+
+    def setUp(self) -> None:
+        # parts of a few bytes keep the tests small
+        minimum_part_size = patch.object(S3WriteFile, "MINIMUM_PART_SIZE", 1)
+        minimum_part_size.start()
+        self.addCleanup(minimum_part_size.stop)
+        self.engine = MagicMock()
+        self.engine.transfer_settings.part_size = 4
+        self.engine.transfer_settings.max_concurrency = 2
+        self.engine.client.create_multipart_upload.return_value = {"UploadId": "upload id"}
+        self.uploaded = {}
+
+        def upload_part(Bucket, Key, UploadId, PartNumber, Body):
+            self.uploaded[PartNumber] = Body
+            return {"ETag": "etag {}".format(PartNumber)}
+
+        self.engine.client.upload_part.side_effect = upload_part
+
+    def test_small_object(self):
+        with S3WriteFile(engine=self.engine, bucket_name="bucket", file_name="key.txt") as test:
+            self.assertEqual(3, test.write(b"abc"))
+            self.assertEqual(3, test.tell())
+        self.assertTrue(test.closed)
+        self.engine.upload_serialised_data.assert_called_once_with(bucket_name="bucket", file_name="key.txt",
+                                                                   data=b"abc")
+        self.engine.client.create_multipart_upload.assert_not_called()
+
+    def test_multipart(self):
+        test = S3WriteFile(engine=self.engine, bucket_name="bucket", file_name="key.txt")
+        test.write(b"abcdef")
+        test.write(memoryview(b"ghijk"))
+        self.engine.client.create_multipart_upload.assert_called_once_with(Bucket="bucket", Key="key.txt")
+        test.close()
+
+        self.assertEqual({1: b"abcd", 2: b"efgh", 3: b"ijk"}, self.uploaded)
+        self.engine.client.complete_multipart_upload.assert_called_once_with(
+            Bucket="bucket", Key="key.txt", UploadId="upload id",
+            MultipartUpload={"Parts": [{"PartNumber": i, "ETag": "etag {}".format(i)} for i in [1, 2, 3]]})
+        self.engine.upload_serialised_data.assert_not_called()
+        self.engine.client.abort_multipart_upload.assert_not_called()
+
+    def test_abort(self):
+        with self.assertRaises(KeyError):
+            with S3WriteFile(engine=self.engine, bucket_name="bucket", file_name="key.txt") as test:
+                test.write(b"abcdefgh")
+                raise KeyError("serialisation failed")
+        self.engine.client.abort_multipart_upload.assert_called_once_with(Bucket="bucket", Key="key.txt",
+                                                                          UploadId="upload id")
+        self.engine.client.complete_multipart_upload.assert_not_called()
+
+        self.engine.reset_mock()
+        self.engine.client.upload_part.side_effect = Exception("upload failed")
+        test = S3WriteFile(engine=self.engine, bucket_name="bucket", file_name="key.txt")
+        test.write(b"abcdefgh")
+        with self.assertRaises(Exception):
+            test.close()
+        self.engine.client.abort_multipart_upload.assert_called_once_with(Bucket="bucket", Key="key.txt",
+                                                                          UploadId="upload id")
+        self.assertTrue(test.closed)
+
+    def test_minimum_part_size(self):
+        with patch.object(S3WriteFile, "MINIMUM_PART_SIZE", 5 * 1024 ** 2):
+            with self.assertRaises(FileManagerError):
+                S3WriteFile(engine=self.engine, bucket_name="bucket", file_name="key.txt")
+            with self.assertRaises(FileManagerError):
+                S3WriteFile(engine=self.engine, bucket_name="bucket", file_name="key.txt",
+                            part_size=5 * 1024 ** 2 - 1)
+            test = S3WriteFile(engine=self.engine, bucket_name="bucket", file_name="key.txt",
+                               part_size=5 * 1024 ** 2)
+        self.assertEqual(5 * 1024 ** 2, test.part_size)
+        self.engine.client.create_multipart_upload.assert_not_called()
+
+    def test_maximum_parts(self):
+        test = S3WriteFile(engine=self.engine, bucket_name="bucket", file_name="key.txt")
+        test.MAXIMUM_PARTS = 2
+        with self.assertRaises(FileManagerError):
+            test.write(b"abcdefghijkl")
+        test.abort()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+from unittest import TestCase, main
+
+from monolith_filemanager.s3storage.errors import FileManagerError
+from monolith_filemanager.s3storage.transfer import TransferSettings, MB
+
+
+class TestTransferSettings(TestCase):
+
+    def test___init__(self):
+        test = TransferSettings()
+        self.assertEqual(8 * MB, test.part_size)
+        self.assertEqual(10, test.max_concurrency)
+        self.assertEqual(8 * MB, test.multipart_threshold)
+
+        with self.assertRaises(FileManagerError):
+            TransferSettings(part_size=MB)
+        with self.assertRaises(FileManagerError):
+            TransferSettings(max_concurrency=0)
+
+    def test_update(self):
+        test = TransferSettings()
+        test.update(part_size=16 * MB, max_concurrency=None)
+        self.assertEqual(16 * MB, test.part_size)
+        self.assertEqual(10, test.max_concurrency)
+
+        with self.assertRaises(FileManagerError):
+            test.update(chunk_size=MB)
+        with self.assertRaises(FileManagerError):
+            test.update(part_size=MB)
+        self.assertEqual(16 * MB, test.part_size)
+
+    def test_to_boto_config(self):
+        test = TransferSettings(part_size=16 * MB, max_concurrency=4, multipart_threshold=32 * MB)
+        out_come = test.to_boto_config()
+        self.assertEqual(16 * MB, out_come.multipart_chunksize)
+        self.assertEqual(4, out_come.max_concurrency)
+        self.assertEqual(32 * MB, out_come.multipart_threshold)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,35 @@
+import os
+import tempfile
 from unittest import TestCase, main
-from mock import patch, MagicMock
+from mock import patch, MagicMock, ANY
 from monolith_filemanager.s3storage import V1Engine, V1EngineError
+from monolith_filemanager.s3storage.content_cache import ContentCache
+
+try:
+    from moto import mock_aws
+except ImportError:
+    from moto import mock_s3 as mock_aws
 
 
 class TestV1Engine(TestCase):
 
-    @patch("boto3.resource")
-    @patch("boto3.client")
     @patch("monolith_filemanager.s3storage.FileManager.__init__")
     @patch("monolith_filemanager.s3storage.BucketManager.__init__")
-    def setUp(self, bucket_init_mock, file_init_mock, mock_client, mock_resource) -> None:
+    def setUp(self, bucket_init_mock, file_init_mock) -> None:
+        V1Engine._singleton = None
         self.test = V1Engine()
+        self.test.client = MagicMock()
+        self.test.resource = MagicMock()
+        self.test.listing_cache = None
+        self.test.metadata_cache = None
+        self.test.content_cache = None
 
-    @patch("boto3.resource")
+    @patch("boto3.session.Session")
     @patch("boto3.client")
     @patch("monolith_filemanager.s3storage.FileManager.__init__")
     @patch("monolith_filemanager.s3storage.BucketManager.__init__")
-    def test___init__(self, bucket_init_mock, file_init_mock, mock_client, mock_resource):
+    def test___init__(self, bucket_init_mock, file_init_mock, mock_client, mock_session):
+        V1Engine._singleton = None
         # fire the __init__
         test = V1Engine()
 
@@ -24,14 +37,77 @@ class TestV1Engine(TestCase):
         bucket_init_mock.assert_called_once_with(test)
         file_init_mock.assert_called_once_with(test)
 
-        # check that the client and resource __init__ s are fired once with the 's3' argument
-        mock_client.assert_called_once_with("s3")
-        mock_resource.assert_called_once_with("s3")
+        # the client and resource are only built when they are first used
+        mock_client.assert_not_called()
+        self.assertEqual(mock_client.return_value, test.client)
+        self.assertEqual(mock_client.return_value, test.client)
+        mock_client.assert_called_once_with("s3", config=ANY)
+        self.assertEqual(mock_session.return_value.resource.return_value, test.resource)
+        mock_session.return_value.resource.assert_called_once_with("s3", config=ANY)
 
         test_two = V1Engine()
 
-        # test the singleton implementation
+        # test the singleton implementation and that it is only initialised once
         self.assertEqual(id(test), id(test_two))
+        bucket_init_mock.assert_called_once_with(test)
+        self.assertEqual(mock_client.return_value, test_two.client)
+        mock_client.assert_called_once_with("s3", config=ANY)
+
+    def test_enable_listing_cache(self):
+        cache = self.test.enable_listing_cache(ttl=10, max_entries=5)
+
+        self.assertEqual(cache, self.test.listing_cache)
+        self.assertEqual(10, cache.ttl)
+        self.assertEqual(5, cache.max_entries)
+
+        self.test.disable_listing_cache()
+        self.assertIsNone(self.test.listing_cache)
+
+    def test_enable_metadata_cache(self):
+        cache = self.test.enable_metadata_cache(ttl=1, max_entries=5)
+
+        self.assertEqual(cache, self.test.metadata_cache)
+        self.assertEqual(1, cache.ttl)
+
+        self.test.disable_metadata_cache()
+        self.assertIsNone(self.test.metadata_cache)
+
+    @patch("monolith_filemanager.s3storage.FileManager.stat_objects")
+    def test_stat_many(self, mock_stat_objects):
+        mock_stat_objects.side_effect = [{"a/1": {"size": 1}, "a/2": None}, {"c": {"size": 3}}]
+
+        out_come = self.test.stat_many(storage_paths=["s3://one/a/1", "one/a/2", "two/c"])
+
+        self.assertEqual({"s3://one/a/1": {"size": 1}, "one/a/2": None, "two/c": {"size": 3}}, out_come)
+        self.assertEqual(["a/1", "a/2"], list(mock_stat_objects.call_args_list[0][1]["keys"]))
+        self.assertEqual("two", mock_stat_objects.call_args_list[1][1]["bucket_name"])
+
+        mock_stat_objects.side_effect = [{"a/1": {"size": 1}, "a/2": None}]
+        out_come = self.test.exists_many(storage_paths=["one/a/1", "one/a/2"])
+        self.assertEqual({"one/a/1": True, "one/a/2": False}, out_come)
+
+    @patch("monolith_filemanager.s3storage.FileManager.list_folder_page")
+    @patch("monolith_filemanager.s3storage.FileManager.iter_folder")
+    def test_iterdir(self, mock_iter_folder, mock_list_folder_page):
+        self.assertEqual(mock_iter_folder.return_value, self.test.iterdir(storage_path="s3://one/two"))
+        mock_iter_folder.assert_called_once_with(bucket_name="one", file_name="two")
+
+        out_come = self.test.list_page(storage_path="s3://one/two", page_size=5, cursor="token")
+        self.assertEqual(mock_list_folder_page.return_value, out_come)
+        mock_list_folder_page.assert_called_once_with(bucket_name="one", file_name="two", page_size=5,
+                                                      continuation_token="token")
+
+    def test_configure_clients(self):
+        self.test.client_manager = MagicMock()
+        self.test.configure_clients(max_pool_connections=100)
+        self.test.client_manager.configure.assert_called_once_with(max_pool_connections=100, tcp_keepalive=None,
+                                                                   connect_timeout=None, read_timeout=None)
+
+    def test_configure_transfer(self):
+        self.test.transfer_settings = MagicMock()
+        self.test.configure_transfer(max_concurrency=20)
+        self.test.transfer_settings.update.assert_called_once_with(part_size=None, max_concurrency=20,
+                                                                   multipart_threshold=None)
 
     @patch("monolith_filemanager.s3storage.FileManager.upload_serialised_data")
     def test_upload_data(self, mock_upload):
@@ -45,10 +121,9 @@ class TestV1Engine(TestCase):
         mock_upload.assert_called_once_with(bucket_name='one', file_name='two/three', file_path=mock_file_path)
 
     @patch("monolith_filemanager.s3storage.V1Engine.increment_folder_name")
-    @patch("monolith_filemanager.s3storage.FileManager.file_exists")
     @patch("monolith_filemanager.s3storage.V1Engine.ls_folder")
-    @patch("monolith_filemanager.s3storage.FileManager.upload_serialised_data")
-    def test_create_folder(self, mock_upload, mock_ls_folder, mock_file_exits, mock_increment_folder_name):
+    @patch("monolith_filemanager.s3storage.FileManager.put_if_absent")
+    def test_create_folder(self, mock_put_if_absent, mock_ls_folder, mock_increment_folder_name):
         # test with name clash
         mock_ls_folder.return_value = ({"file1.txt": {}, "three": {}}, ["dir1", "dir2"])
         mock_file_path = "s3://one/two/three/four"
@@ -56,49 +131,127 @@ class TestV1Engine(TestCase):
             self.test.create_folder(storage_path=mock_file_path)
 
         # test with no name clash and no incrementing
-        mock_file_exits.return_value = False
+        mock_put_if_absent.return_value = True
         mock_ls_folder.return_value = ({"file1.txt": {}, "file2.txt": {}}, ["dir1", "dir2"])
-        mock_file_path = "s3://one/two/three/four"
-        self.test.create_folder(storage_path=mock_file_path)
-        mock_upload.assert_called_once_with(bucket_name="one", file_name="two/three/")
-        mock_increment_folder_name.assert_has_calls = []
+        self.assertEqual("two/three/", self.test.create_folder(storage_path=mock_file_path))
+        mock_put_if_absent.assert_called_once_with(bucket_name="one", file_name="two/three/")
+        mock_increment_folder_name.assert_not_called()
 
         # test with no name clash and with incrementing
-        mock_file_exits.reset_mock()
-        mock_upload.reset_mock()
         mock_increment_folder_name.return_value = "two/three 2/"
-        mock_file_exits.return_value = True
-        mock_ls_folder.return_value = ({"file1.txt": {}, "file2.txt": {}}, ["dir1", "dir2"])
-        mock_file_path = "s3://one/two/three/four"
-        self.test.create_folder(storage_path=mock_file_path)
-        mock_upload.assert_called_once_with(bucket_name="one", file_name="two/three 2/")
-        mock_increment_folder_name.assert_called_once_with(bucket_name="one", dirname="two/three/")
+        mock_put_if_absent.return_value = False
+        self.assertEqual("two/three 2/", self.test.create_folder(storage_path=mock_file_path))
+        mock_increment_folder_name.assert_called_once_with(bucket_name="one", dirname="two/three/",
+                                                           existing_names=["file1.txt", "file2.txt", "dir1", "dir2"])
 
-    @patch("monolith_filemanager.s3storage.file_manager.FileManager.file_exists")
-    def test_increment_folder_name(self, mock_file_exists):
+    @patch("monolith_filemanager.s3storage.V1Engine.ls_folder")
+    @patch("monolith_filemanager.s3storage.file_manager.FileManager.put_if_absent")
+    def test_increment_folder_name(self, mock_put_if_absent, mock_ls_folder):
         mock_bucket = "mock-bucket"
-        mock_dirname = "mock/folder/file"
-        mock_file_exists.return_value = False
+        mock_dirname = "mock/folder/"
+        mock_ls_folder.return_value = ({"folder 2": {}}, ["folder", "folder 3"])
+        mock_put_if_absent.return_value = True
 
-        self.test.increment_folder_name(bucket_name=mock_bucket, dirname=mock_dirname)
-        self.test.client.put_object.assert_called_once_with(Bucket=mock_bucket, Key="mock/folder 2/")
+        self.assertEqual("mock/folder 4/", self.test.increment_folder_name(bucket_name=mock_bucket,
+                                                                           dirname=mock_dirname))
+        mock_ls_folder.assert_called_once_with(bucket_name=mock_bucket, file_name="mock")
+        mock_put_if_absent.assert_called_once_with(bucket_name=mock_bucket, file_name="mock/folder 4/")
 
-        self.test.client.reset_mock()
-        mock_file_exists.side_effect = [True, False]
-        self.test.increment_folder_name(bucket_name=mock_bucket, dirname=mock_dirname)
-        self.test.client.put_object.assert_called_once_with(Bucket=mock_bucket, Key="mock/folder 3/")
+        mock_put_if_absent.reset_mock()
+        mock_put_if_absent.side_effect = [False, True]
+        self.assertEqual("folder 3/", self.test.increment_folder_name(bucket_name=mock_bucket, dirname="folder/",
+                                                                      existing_names=["folder"]))
+        mock_put_if_absent.assert_called_with(bucket_name=mock_bucket, file_name="folder 3/")
 
     @patch("monolith_filemanager.s3storage.FileManager.download_file_to_memory")
     def test_download_raw_data_file(self, mock_download):
         self.test.download_raw_data_file(storage_path="s3://one/two/three")
         mock_download.assert_called_once_with(bucket_name='one', file_name='two/three')
 
-    @patch("monolith_filemanager.s3storage.FileManager.download_file_to_disk")
-    def test_download_data_file(self, mock_download_file_to_disk):
+    @patch("monolith_filemanager.s3storage.FileManager.download_file_to_buffer")
+    def test_download_raw_data_file_parallel(self, mock_download):
+        out_come = self.test.download_raw_data_file(storage_path="s3://one/two/three", parallel=True)
+        mock_download.assert_called_once_with(bucket_name='one', file_name='two/three')
+        self.assertEqual(mock_download.return_value, out_come)
+
+    @patch("monolith_filemanager.s3storage.FileManager.download_file_to_buffer")
+    @patch("monolith_filemanager.s3storage.FileManager.download_file_to_cache")
+    def test_download_raw_data_file_cached(self, mock_download, mock_download_buffer):
+        self.test.content_cache = MagicMock()
+        with tempfile.NamedTemporaryFile() as file:
+            file.write(b"data")
+            file.flush()
+            mock_download.return_value = file.name
+
+            self.assertEqual(b"data", self.test.download_raw_data_file(storage_path="s3://one/two/three"))
+        mock_download.assert_called_once_with(bucket_name="one", file_name="two/three", file_path=ANY)
+
+        # parallel reads always go straight to s3 into one buffer
+        out_come = self.test.download_raw_data_file(storage_path="s3://one/two/three", parallel=True)
+        mock_download_buffer.assert_called_once_with(bucket_name="one", file_name="two/three")
+        self.assertEqual(mock_download_buffer.return_value, out_come)
+        mock_download.assert_called_once()
+
+    @patch("monolith_filemanager.s3storage.S3ReadFile")
+    def test_open(self, mock_read_file):
+        out_come = self.test.open(storage_path="s3://one/two/three", block_size=10)
+        mock_read_file.assert_called_once_with(engine=self.test, bucket_name="one", file_name="two/three",
+                                               block_size=10)
+        self.assertEqual(mock_read_file.return_value, out_come)
+
+        with self.assertRaises(V1EngineError):
+            self.test.open(storage_path="s3://one/two/three", mode="r+")
+
+    @patch("monolith_filemanager.s3storage.S3WriteFile")
+    def test_open_write(self, mock_write_file):
+        out_come = self.test.open(storage_path="s3://one/two/three", mode="wb", part_size=10)
+        mock_write_file.assert_called_once_with(engine=self.test, bucket_name="one", file_name="two/three",
+                                                part_size=10)
+        self.assertEqual(mock_write_file.return_value, out_come)
+
+    @patch("monolith_filemanager.s3storage.FileManager.download_file_to_cache")
+    def test_download_cached_file(self, mock_download_file_to_cache):
+        out_come = self.test.download_cached_file(storage_path="s3://one/two/three.csv")
+
+        mock_download_file_to_cache.assert_called_once_with(bucket_name="one", file_name="two/three.csv",
+                                                            file_path=None)
+        self.assertEqual(mock_download_file_to_cache.return_value, out_come)
+
+        self.test.download_cached_file(storage_path="s3://one/two/three.csv", file_path="folder")
+        mock_download_file_to_cache.assert_called_with(bucket_name="one", file_name="two/three.csv",
+                                                       file_path="folder/three.csv")
+
+    def test_content_cache_opt_in(self):
+        V1Engine._singleton = None
+        test = V1Engine()
+        self.assertIsNone(test.content_cache)
+
+        out_come = test.enable_content_cache(directory="cache", ttl=5, max_bytes=10)
+
+        self.assertEqual(out_come, test.content_cache)
+        self.assertEqual(("cache", 5, 10), (out_come.directory, out_come.ttl, out_come.max_bytes))
+        test.disable_content_cache()
+        self.assertIsNone(test.content_cache)
+
+    @patch("monolith_filemanager.s3storage.FileManager.download_file_if_modified")
+    def test_download_data_file(self, mock_download_file_if_modified):
         self.test.download_data_file(storage_path="s3://one/two/three", file_path="test path")
-        mock_download_file_to_disk.assert_called_once_with(bucket_name="one",
-                                                           file_name="two/three",
-                                                           file_path='test path/three')
+        mock_download_file_if_modified.assert_called_once_with(bucket_name="one",
+                                                               file_name="two/three",
+                                                               file_path='test path/three')
+
+    @patch("monolith_filemanager.s3storage.FileManager.download_file_to_cache")
+    @patch("monolith_filemanager.s3storage.FileManager.download_file_if_modified")
+    def test_download_data_file_content_cache(self, mock_download_file_if_modified, mock_download_file_to_cache):
+        self.test.content_cache = MagicMock()
+
+        self.test.download_data_file(storage_path="s3://one/two/three", file_path="test path")
+
+        # files for a CacheManager are downloaded straight into its cache path
+        mock_download_file_if_modified.assert_called_once_with(bucket_name="one",
+                                                               file_name="two/three",
+                                                               file_path='test path/three')
+        mock_download_file_to_cache.assert_not_called()
 
     @patch("monolith_filemanager.s3storage.FileManager.delete_file")
     def test_delete(self, mock_delete_file):
@@ -116,5 +269,77 @@ class TestV1Engine(TestCase):
         mock_ls.assert_called_once_with(bucket_name='this', file_name='is/a/folder')
 
 
+@mock_aws()
+class TestV1EngineDefaults(TestCase):
+    """
+    Runs the engine with the settings it is constructed with against a moto s3 bucket.
+    """
+    def setUp(self) -> None:
+        self.environment = patch.dict(os.environ, {"AWS_ACCESS_KEY_ID": "testing", "AWS_SECRET_ACCESS_KEY": "testing",
+                                                   "AWS_DEFAULT_REGION": "us-east-1"})
+        self.environment.start()
+        self.directory = tempfile.TemporaryDirectory()
+        self.content_directory = patch.object(ContentCache, "DEFAULT_DIRECTORY",
+                                              os.path.join(self.directory.name, "content"))
+        self.content_directory.start()
+        V1Engine._singleton = None
+        self.test = V1Engine()
+        self.test.client.create_bucket(Bucket="bucket")
+        self.test.upload_data(storage_path="s3://bucket/folder/data.bin", data=b"0123456789")
+
+    def tearDown(self) -> None:
+        V1Engine._singleton = None
+        self.content_directory.stop()
+        self.directory.cleanup()
+        self.environment.stop()
+
+    def test_download_raw_data_file(self):
+        self.assertIsNone(self.test.content_cache)
+
+        self.assertEqual(b"0123456789", self.test.download_raw_data_file(storage_path="s3://bucket/folder/data.bin"))
+        out_come = self.test.download_raw_data_file(storage_path="s3://bucket/folder/data.bin", parallel=True)
+
+        self.assertIsInstance(out_come, memoryview)
+        self.assertEqual(b"0123456789", out_come.tobytes())
+        self.assertFalse(os.path.exists(ContentCache.DEFAULT_DIRECTORY))
+
+    def test_download_data_file(self):
+        cache_path = os.path.join(self.directory.name, "cache")
+        os.mkdir(cache_path)
+
+        out_come = self.test.download_data_file(storage_path="s3://bucket/folder/data.bin", file_path=cache_path)
+
+        self.assertEqual(os.path.join(cache_path, "data.bin"), out_come)
+        with open(out_come, "rb") as file:
+            self.assertEqual(b"0123456789", file.read())
+        self.assertFalse(os.path.exists(ContentCache.DEFAULT_DIRECTORY))
+
+    def test_download_data_file_revalidated(self):
+        cache_path = os.path.join(self.directory.name, "cache")
+        os.mkdir(cache_path)
+        out_come = self.test.download_data_file(storage_path="s3://bucket/folder/data.bin", file_path=cache_path)
+
+        with patch.object(self.test, "_write_response", wraps=self.test._write_response) as mock_write_response:
+            self.assertEqual(out_come, self.test.download_data_file(storage_path="s3://bucket/folder/data.bin",
+                                                                    file_path=cache_path))
+            mock_write_response.assert_not_called()
+
+            # the object is changed after the local copy was written
+            modified = os.path.getmtime(out_come) - 60
+            os.utime(out_come, (modified, modified))
+            self.test.download_data_file(storage_path="s3://bucket/folder/data.bin", file_path=cache_path)
+            mock_write_response.assert_called_once()
+        self.assertEqual(["data.bin"], os.listdir(cache_path))
+
+    def test_download_raw_data_file_content_cache_large(self):
+        data = os.urandom(9 * 1024 ** 2)
+        self.test.upload_data(storage_path="s3://bucket/folder/large.bin", data=data)
+        self.test.enable_content_cache()
+
+        self.assertEqual(data, self.test.download_raw_data_file(storage_path="s3://bucket/folder/large.bin"))
+        self.assertEqual(data, self.test.download_raw_data_file(storage_path="s3://bucket/folder/large.bin"))
+        self.assertEqual(1, self.test.content_cache.stats()["hits"])
+
+
 if __name__ == "__main__":
     main()
@@ -7,15 +7,18 @@ from monolith_filemanager.path import FilePath
 class TestFilePath(TestCase):
 
     @patch("monolith_filemanager.path.FilePath.check_if_s3")
+    @patch("monolith_filemanager.path.FilePath.get_compression")
     @patch("monolith_filemanager.path.FilePath.get_file_type")
-    def test___init__(self, mock_get_file_type, mock_check_if_s3):
+    def test___init__(self, mock_get_file_type, mock_get_compression, mock_check_if_s3):
         test = FilePath("this/is/a/path.txt")
 
         self.assertEqual("path.txt", test.file)
         self.assertEqual("this/is/a/", test.root)
         self.assertEqual(mock_get_file_type.return_value, test.file_type)
+        self.assertEqual(mock_get_compression.return_value, test.compression)
         self.assertEqual(mock_check_if_s3.return_value, test.s3)
         mock_get_file_type.assert_called_once_with(file_string="path.txt")
+        mock_get_compression.assert_called_once_with(file_string="path.txt")
 
     def test_check_if_s3(self):
         self.assertEqual(True, FilePath.check_if_s3(path_string="s3://test"))
@@ -24,6 +27,18 @@ class TestFilePath(TestCase):
     def test_get_file_type(self):
         self.assertEqual("txt", FilePath.get_file_type(file_string="test.txt"))
         self.assertIsNone(FilePath.get_file_type(file_string="testtxt"))
+        self.assertEqual("csv", FilePath.get_file_type(file_string="test.csv.gz"))
+        self.assertEqual("parquet", FilePath.get_file_type(file_string="test.v2.parquet.zst"))
+        self.assertEqual("gz", FilePath.get_file_type(file_string="test.gz"))
+
+    def test_get_compression(self):
+        self.assertEqual("gz", FilePath.get_compression(file_string="test.csv.gz"))
+        self.assertEqual("bz2", FilePath.get_compression(file_string="test.json.bz2"))
+        self.assertEqual("xz", FilePath.get_compression(file_string="test.sav.xz"))
+        self.assertEqual("zst", FilePath.get_compression(file_string="test.npy.zst"))
+        self.assertIsNone(FilePath.get_compression(file_string="test.gz"))
+        self.assertIsNone(FilePath.get_compression(file_string="test.csv"))
+        self.assertIsNone(FilePath.get_compression(file_string="test"))
 
     @patch("monolith_filemanager.path.os")
     @patch("monolith_filemanager.path.FilePath.__init__")